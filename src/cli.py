@@ -1,6 +1,7 @@
 """CLI interface for Zeus."""
 
 import asyncio
+import json
 from pathlib import Path
 from typing import Optional
 import typer
@@ -8,9 +9,13 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.markdown import Markdown
-from src.core.run_controller import run_zeus
+from src.core.run_controller import run_zeus, resume_zeus, rerun_zeus
 from src.core.persistence import Persistence
-from src.models.schemas import UsageStats
+from src.core.batch import load_batch, run_batch
+from src.core.job_queue import SQLiteJobQueue, add_batch, work_queue
+from src.core.server import serve_zeus
+from src.llm.transport import closing_shared_pool
+from src.models.schemas import RunTimings, UsageStats
 from src.utils.read_file import read_file_content as read_file_utils
 from dotenv import load_dotenv
 
@@ -111,6 +116,31 @@ def print_response(response) -> None:
     console.print(f"[dim]Run ID: {response.run_id}[/dim]")
 
 
+def print_timings(timings: RunTimings) -> None:
+    """Print the per-phase timings of a run and its critical path."""
+    console.print(
+        f"\nTimings: {timings.wall_s:.1f}s wall, {timings.cpu_s:.1f}s CPU, "
+        f"peak RSS {timings.peak_rss_mb:.0f} MB"
+    )
+    for phase in timings.phases:
+        console.print(
+            f"  {phase.phase}: {phase.wall_s:6.1f}s wall  {phase.cpu_s:5.1f}s CPU  "
+            f"{phase.llm_calls} call(s)  queue {phase.queue_s:.1f}s  retries {phase.retries}  "
+            f"tokens {phase.tokens_in:,}/{phase.tokens_out:,}  RSS {phase.peak_rss_mb:.0f} MB"
+        )
+    if timings.critical_path:
+        path = [timings.calls[i] for i in timings.critical_path]
+        llm_time = sum(call.wall_s for call in path)
+        console.print(
+            f"  Critical path: {len(path)} call(s), {llm_time:.1f}s of {timings.wall_s:.1f}s in LLM calls"
+        )
+        for call in path:
+            console.print(
+                f"    {call.start_s:7.1f}s  {call.phase}  {call.model}  {call.wall_s:.1f}s "
+                f"(queue {call.queue_s:.1f}s, retries {call.retries}, {call.status})"
+            )
+
+
 def read_file_content(file_path: Path) -> str:
     """Read content from a file using utils."""
     try:
@@ -123,6 +153,33 @@ def read_file_content(file_path: Path) -> str:
         return ""
 
 
+def parse_fallbacks(values: list[str]) -> dict[str, list[str]]:
+    """Parse ``phase_key=model-a,model-b`` options into fallback chains."""
+    chains: dict[str, list[str]] = {}
+    for value in values:
+        phase_key, sep, models = value.partition("=")
+        chain = [m.strip() for m in models.split(",") if m.strip()]
+        if not sep or not phase_key.strip() or not chain:
+            raise typer.BadParameter(f"Expected phase_key=model[,model...], got {value!r}", param_hint="--fallback")
+        chains[phase_key.strip()] = chain
+    return chains
+
+
+def parse_tenant_weights(values: list[str]) -> dict[str, float]:
+    """Parse ``tenant=weight`` options into tenant weights."""
+    weights: dict[str, float] = {}
+    for value in values:
+        tenant, sep, weight = value.partition("=")
+        try:
+            parsed = float(weight)
+        except ValueError:
+            parsed = 0.0
+        if not sep or not tenant.strip() or parsed <= 0:
+            raise typer.BadParameter(f"Expected tenant=weight (weight > 0), got {value!r}", param_hint="--tenant-weight")
+        weights[tenant.strip()] = parsed
+    return weights
+
+
 @app.command()
 def solve(
     prompt: str = typer.Argument(..., help="Problem statement or idea to solve"),
@@ -167,6 +224,60 @@ def solve(
         None, "--output",
         help="Save output to file",
     ),
+    stream: bool = typer.Option(
+        False, "--stream",
+        help="Stream LLM responses and show partial output while phases run",
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Reuse cached responses for deterministic calls (intake, JSON repair, assembly)",
+    ),
+    cache_all: bool = typer.Option(
+        False, "--cache-all",
+        help="Cache every LLM call so re-running the same brief replays completed phases",
+    ),
+    memoize: bool = typer.Option(
+        False, "--memoize",
+        help="Reuse the brief and inventor solutions of earlier runs with unchanged inputs and prompts",
+    ),
+    fallback: Optional[list[str]] = typer.Option(
+        None, "--fallback",
+        help="Fallback chain for a phase, e.g. phase_1=model-b,model-c (can be used multiple times)",
+    ),
+    hedge_percentile: Optional[float] = typer.Option(
+        None, "--hedge-percentile",
+        help="Duplicate calls still running past this latency percentile (0-1, e.g. 0.9)",
+        min=0.0, max=1.0,
+    ),
+    max_tokens_in: Optional[int] = typer.Option(
+        None, "--max-tokens-in",
+        help="Cap on prompt tokens for the run",
+        min=1,
+    ),
+    max_tokens_out: Optional[int] = typer.Option(
+        None, "--max-tokens-out",
+        help="Cap on completion tokens for the run",
+        min=1,
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None, "--max-cost",
+        help="Cap on spend for the run in USD",
+        min=0.0,
+    ),
+    quorum: Optional[int] = typer.Option(
+        None, "--quorum",
+        help="Move on to synthesis once this many inventors have a solution",
+        min=1,
+    ),
+    inventor_deadline: Optional[float] = typer.Option(
+        None, "--inventor-deadline",
+        help="Seconds after which Phase 1 moves on with the solutions it has",
+        min=0.0,
+    ),
+    cancel_stragglers: bool = typer.Option(
+        False, "--cancel-stragglers",
+        help="Cancel inventors Phase 1 moved on without, instead of merging them in if done before synthesis",
+    ),
 ) -> None:
     """Generate a solution using Zeus's multi-inventor pipeline.
 
@@ -178,6 +289,7 @@ def solve(
     constraints = list(constraint) if constraint else []
     objectives = list(objective) if objective else []
     library_paths = [str(p) for p in library] if library else []
+    phase_fallbacks = parse_fallbacks(fallback or [])
 
     # Process context from files
     context_parts = []
@@ -200,7 +312,7 @@ def solve(
             progress.update(task, description=msg)
 
         try:
-            response = asyncio.run(run_zeus(
+            response = asyncio.run(closing_shared_pool(run_zeus(
                 prompt=prompt,
                 constraints=constraints,
                 objectives=objectives,
@@ -212,7 +324,204 @@ def solve(
                 num_inventors=inventors,
                 model=model,
                 on_progress=on_progress,
-            ))
+                stream=stream,
+                cache=cache,
+                cache_all=cache_all,
+                memoize=memoize,
+                phase_fallbacks=phase_fallbacks,
+                hedge_percentile=hedge_percentile,
+                max_tokens_in=max_tokens_in,
+                max_tokens_out=max_tokens_out,
+                max_cost_usd=max_cost,
+                inventor_quorum=quorum,
+                inventor_deadline=inventor_deadline,
+                inventor_stragglers="cancel" if cancel_stragglers else None,
+            )))
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1)
+
+    print_response(response)
+
+    if output_file:
+        output_file.write_text(response.output)
+        console.print(f"\n[green]Output saved to {output_file}[/green]")
+
+
+@app.command()
+def resume(
+    run_id: str = typer.Argument(..., help="Run ID (or prefix) of the interrupted run"),
+    model: Optional[str] = typer.Option(
+        None, "--model", "-m",
+        help="Override the model for the remaining phases",
+    ),
+    output_file: Optional[Path] = typer.Option(
+        None, "--output",
+        help="Save output to file",
+    ),
+    stream: bool = typer.Option(
+        False, "--stream",
+        help="Stream LLM responses and show partial output while phases run",
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Reuse cached responses for deterministic calls (intake, JSON repair, assembly)",
+    ),
+    hedge_percentile: Optional[float] = typer.Option(
+        None, "--hedge-percentile",
+        help="Duplicate calls still running past this latency percentile (0-1, e.g. 0.9)",
+        min=0.0, max=1.0,
+    ),
+) -> None:
+    """Resume an interrupted run from its last completed phase.
+
+    Example:
+        zeus resume 3f2a9c1d
+    """
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task(f"Resuming run {run_id}...", total=None)
+
+        def on_progress(msg: str) -> None:
+            progress.update(task, description=msg)
+
+        try:
+            response = asyncio.run(closing_shared_pool(resume_zeus(
+                run_id,
+                model=model,
+                on_progress=on_progress,
+                stream=stream,
+                cache=cache,
+                hedge_percentile=hedge_percentile,
+            )))
+        except ValueError as e:
+            console.print(f"[red]Error:[/red] {e}")
+            raise typer.Exit(1)
+
+    print_response(response)
+
+    if output_file:
+        output_file.write_text(response.output)
+        console.print(f"\n[green]Output saved to {output_file}[/green]")
+
+
+@app.command()
+def rerun(
+    run_id: str = typer.Argument(..., help="Run ID (or prefix) of the finished run"),
+    constraint: Optional[list[str]] = typer.Option(
+        None, "--constraint", "-c",
+        help="Add a constraint (can be used multiple times)",
+    ),
+    objective: Optional[list[str]] = typer.Option(
+        None, "--objective", "-o",
+        help="Add an objective (can be used multiple times)",
+    ),
+    replace: bool = typer.Option(
+        False, "--replace",
+        help="Replace the run's constraints (or objectives) with those given instead of adding to them",
+    ),
+    library: Optional[list[Path]] = typer.Option(
+        None, "--library", "-l",
+        help="Use these library files instead of the run's (can be used multiple times)",
+    ),
+    output_spec: Optional[Path] = typer.Option(
+        None, "--output-spec",
+        help="Path to a new output specification file",
+    ),
+    eval_criteria: Optional[Path] = typer.Option(
+        None, "--eval-criteria",
+        help="Path to new evaluation criteria file",
+    ),
+    cross_pollinate: Optional[bool] = typer.Option(
+        None, "--cross-pollinate/--no-cross-pollinate",
+        help="Turn Phase 2 cross-pollination on or off",
+    ),
+    inventors: Optional[int] = typer.Option(
+        None, "--inventors", "-n",
+        help="New number of parallel inventors (1-10)",
+        min=1, max=10,
+    ),
+    model: Optional[str] = typer.Option(
+        None, "--model", "-m",
+        help="Override the model for the repeated phases",
+    ),
+    from_phase: Optional[str] = typer.Option(
+        None, "--from-phase",
+        help="Repeat from this phase (phase_0 to phase_6) even if the changes leave its results valid",
+    ),
+    output_file: Optional[Path] = typer.Option(
+        None, "--output",
+        help="Save output to file",
+    ),
+    stream: bool = typer.Option(
+        False, "--stream",
+        help="Stream LLM responses and show partial output while phases run",
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Reuse cached responses for deterministic calls (intake, JSON repair, assembly)",
+    ),
+    hedge_percentile: Optional[float] = typer.Option(
+        None, "--hedge-percentile",
+        help="Duplicate calls still running past this latency percentile (0-1, e.g. 0.9)",
+        min=0.0, max=1.0,
+    ),
+) -> None:
+    """Rerun a finished run with a changed request, repeating only the affected phases.
+
+    Example:
+        zeus rerun 3f2a9c1d -c "Must run on-prem"
+        zeus rerun 3f2a9c1d --inventors 5
+        zeus rerun 3f2a9c1d --eval-criteria criteria-v2.md
+        zeus rerun 3f2a9c1d --from-phase phase_3
+    """
+    record = Persistence().load(run_id)
+    if record is None:
+        console.print(f"[red]Run not found:[/red] {run_id}")
+        raise typer.Exit(1)
+
+    changes: dict = {}
+    if constraint:
+        changes["constraints"] = ([] if replace else record.request.constraints) + list(constraint)
+    if objective:
+        changes["objectives"] = ([] if replace else record.request.objectives) + list(objective)
+    if library:
+        changes["library_paths"] = [str(p) for p in library]
+    if output_spec:
+        changes["output_spec_path"] = str(output_spec)
+    if eval_criteria:
+        changes["eval_criteria_path"] = str(eval_criteria)
+    if cross_pollinate is not None:
+        changes["enable_cross_pollination"] = cross_pollinate
+    if inventors is not None:
+        changes["num_inventors"] = inventors
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task(f"Rerunning run {run_id}...", total=None)
+
+        def on_progress(msg: str) -> None:
+            progress.update(task, description=msg)
+
+        try:
+            response = asyncio.run(closing_shared_pool(rerun_zeus(
+                record.run_id,
+                changes,
+                model=model,
+                on_progress=on_progress,
+                stream=stream,
+                cache=cache,
+                hedge_percentile=hedge_percentile,
+                from_phase=from_phase,
+            )))
         except ValueError as e:
             console.print(f"[red]Error:[/red] {e}")
             raise typer.Exit(1)
@@ -224,6 +533,439 @@ def solve(
         console.print(f"\n[green]Output saved to {output_file}[/green]")
 
 
+@app.command()
+def batch(
+    input_file: Path = typer.Argument(..., help="JSONL or CSV file of requests (one per line/row)"),
+    output_file: Path = typer.Option(
+        Path("batch_results.jsonl"), "--output",
+        help="JSONL file results are appended to as runs finish",
+    ),
+    manifest: Optional[Path] = typer.Option(
+        None, "--manifest",
+        help="Progress manifest used to resume the batch (default: <output>.manifest.jsonl)",
+    ),
+    concurrency: int = typer.Option(
+        4, "--concurrency", "-j",
+        help="Max runs in flight (across all processes)",
+        min=1,
+    ),
+    processes: int = typer.Option(
+        1, "--processes", "-P",
+        help="Worker processes to spread the runs over; they share rate limits and --total-* caps",
+        min=1,
+    ),
+    requests_per_minute: float = typer.Option(
+        0.0, "--requests-per-minute",
+        help="Max LLM requests per model per minute across all processes (0: no cap)",
+        min=0.0,
+    ),
+    max_llm_calls: Optional[int] = typer.Option(
+        None, "--max-calls",
+        help="Default LLM call cap per request (rows may set max_llm_calls)",
+        min=1,
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None, "--max-cost",
+        help="Default spend cap per request in USD (rows may set max_cost_usd)",
+        min=0.0,
+    ),
+    total_max_calls: Optional[int] = typer.Option(
+        None, "--total-max-calls",
+        help="LLM call cap shared by all requests of this invocation",
+        min=1,
+    ),
+    total_max_cost: Optional[float] = typer.Option(
+        None, "--total-max-cost",
+        help="Spend cap in USD shared by all requests of this invocation",
+        min=0.0,
+    ),
+    model: Optional[str] = typer.Option(
+        None, "--model", "-m",
+        help="Override the default model",
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Reuse cached responses for deterministic calls (intake, JSON repair, assembly)",
+    ),
+    cache_all: bool = typer.Option(
+        False, "--cache-all",
+        help="Cache every LLM call",
+    ),
+    fallback: Optional[list[str]] = typer.Option(
+        None, "--fallback",
+        help="Fallback chain for a phase, e.g. phase_1=model-b,model-c (can be used multiple times)",
+    ),
+    hedge_percentile: Optional[float] = typer.Option(
+        None, "--hedge-percentile",
+        help="Duplicate calls still running past this latency percentile (0-1, e.g. 0.9)",
+        min=0.0, max=1.0,
+    ),
+) -> None:
+    """Run many requests concurrently over one shared client.
+
+    Re-running the same command skips finished requests and resumes
+    interrupted ones.
+
+    Example:
+        zeus batch briefs.jsonl --output results.jsonl -j 8
+        zeus batch briefs.jsonl -j 64 --processes 4 --requests-per-minute 300
+    """
+    budget = {}
+    if max_llm_calls is not None:
+        budget["max_llm_calls"] = max_llm_calls
+    if max_cost is not None:
+        budget["max_cost_usd"] = max_cost
+    try:
+        items = load_batch(input_file, budget)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    def on_result(result: dict) -> None:
+        if result["status"] == "done":
+            console.print(
+                f"  [green]done[/green] {result['id']} "
+                f"[dim]{result['run_id'][:8]}[/dim] score {result['score']:.1f}"
+            )
+        else:
+            console.print(f"  [red]failed[/red] {result['id']}: {result['error']}")
+
+    console.print(
+        f"Running {len(items)} requests from {input_file} (concurrency {concurrency}"
+        + (f", {processes} processes)" if processes > 1 else ")")
+    )
+    shared_budget = {}
+    if total_max_calls is not None:
+        shared_budget["max_llm_calls"] = total_max_calls
+    if total_max_cost is not None:
+        shared_budget["max_cost_usd"] = total_max_cost
+    counts = asyncio.run(closing_shared_pool(run_batch(
+        items,
+        output_file,
+        manifest_path=manifest,
+        concurrency=concurrency,
+        model=model,
+        phase_fallbacks=parse_fallbacks(fallback or []),
+        budget=budget,
+        shared_budget=shared_budget,
+        cache=cache,
+        cache_all=cache_all,
+        hedge_percentile=hedge_percentile,
+        on_result=on_result,
+        processes=processes,
+        requests_per_minute=requests_per_minute,
+    )))
+    console.print(
+        f"\n{counts['succeeded']} succeeded, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped (already done) — results in {output_file}"
+    )
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on"),
+    port: int = typer.Option(8765, "--port", "-p", help="Port to listen on"),
+    workers: int = typer.Option(
+        4, "--workers", "-j",
+        help="Max runs in flight",
+        min=1,
+    ),
+    max_queued: int = typer.Option(
+        100, "--max-queued",
+        help="Max runs waiting for a worker; further submissions get 429",
+        min=1,
+    ),
+    max_llm_calls: Optional[int] = typer.Option(
+        None, "--max-calls",
+        help="LLM call cap per run",
+        min=1,
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None, "--max-cost",
+        help="Spend cap per run in USD",
+        min=0.0,
+    ),
+    model: Optional[str] = typer.Option(
+        None, "--model", "-m",
+        help="Override the default model",
+    ),
+    stream: bool = typer.Option(
+        False, "--stream",
+        help="Stream LLM responses, so event streams include output deltas",
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Reuse cached responses for deterministic calls (intake, JSON repair, assembly)",
+    ),
+    cache_all: bool = typer.Option(
+        False, "--cache-all",
+        help="Cache every LLM call",
+    ),
+    memoize: bool = typer.Option(
+        False, "--memoize",
+        help="Reuse briefs and inventor solutions of earlier runs with the same inputs",
+    ),
+    fallback: Optional[list[str]] = typer.Option(
+        None, "--fallback",
+        help="Fallback chain for a phase, e.g. phase_1=model-b,model-c (can be used multiple times)",
+    ),
+    hedge_percentile: Optional[float] = typer.Option(
+        None, "--hedge-percentile",
+        help="Duplicate calls still running past this latency percentile (0-1, e.g. 0.9)",
+        min=0.0, max=1.0,
+    ),
+    tenant_weight: Optional[list[str]] = typer.Option(
+        None, "--tenant-weight",
+        help="Share of LLM call slots for a tenant, e.g. acme=2 (default 1; can be used multiple times)",
+    ),
+    shared_state: Optional[Path] = typer.Option(
+        None, "--shared-state",
+        help="Directory of rate limits shared with other servers and queue workers",
+    ),
+    requests_per_minute: float = typer.Option(
+        0.0, "--requests-per-minute",
+        help="Max LLM requests per model per minute across everything sharing --shared-state (0: no cap)",
+        min=0.0,
+    ),
+) -> None:
+    """Serve runs over HTTP from a queue, sharing one client and its caches.
+
+    POST /runs queues a request (JSON ZeusRequest fields, plus an optional
+    priority and tenant); GET /runs/<id> returns its status and response, and
+    GET /runs/<id>/events streams its progress as server-sent events.
+
+    A server is a single process. To use more cores, start several on
+    different ports with the same --shared-state.
+
+    Example:
+        zeus serve --port 8765 -j 8
+        curl -X POST localhost:8765/runs -d '{"prompt": "Design a cache", "priority": 5}'
+    """
+    if requests_per_minute and shared_state is None:
+        console.print("[red]Error:[/red] --requests-per-minute needs --shared-state")
+        raise typer.Exit(1)
+    tenant_weights = parse_tenant_weights(tenant_weight or [])
+    budget = {}
+    if max_llm_calls is not None:
+        budget["max_llm_calls"] = max_llm_calls
+    if max_cost is not None:
+        budget["max_cost_usd"] = max_cost
+    console.print(f"Serving on http://{host}:{port} ({workers} workers) — Ctrl+C to stop")
+    try:
+        asyncio.run(serve_zeus(
+            host=host,
+            port=port,
+            workers=workers,
+            max_queued=max_queued,
+            model=model,
+            phase_fallbacks=parse_fallbacks(fallback or []),
+            budget=budget,
+            stream=stream,
+            cache=cache,
+            cache_all=cache_all,
+            memoize=memoize,
+            hedge_percentile=hedge_percentile,
+            tenant_weights=tenant_weights,
+            requests_per_minute=requests_per_minute,
+            shared_state=shared_state,
+        ))
+    except KeyboardInterrupt:
+        console.print("\nStopped job server.")
+    except OSError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+
+queue_app = typer.Typer(help="Queue requests in a shared directory for workers on any host")
+app.add_typer(queue_app, name="queue")
+
+
+@queue_app.command("add")
+def queue_add(
+    queue_dir: Path = typer.Argument(..., help="Queue directory shared by the workers"),
+    input_file: Path = typer.Argument(..., help="JSONL or CSV file of requests (one per line/row)"),
+    priority: int = typer.Option(0, "--priority", help="Jobs with higher priority are claimed first"),
+    max_attempts: int = typer.Option(
+        3, "--max-attempts",
+        help="Claims of a job (including expired leases) before it is failed",
+        min=1,
+    ),
+) -> None:
+    """Queue the requests of a batch file; ids already queued are skipped.
+
+    Example:
+        zeus queue add /mnt/shared/zeus-queue briefs.jsonl --priority 5
+    """
+    try:
+        items = load_batch(input_file)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    job_queue = SQLiteJobQueue(queue_dir / SQLiteJobQueue.DB_NAME, max_attempts=max_attempts)
+    try:
+        added = add_batch(job_queue, items, priority=priority)
+        counts = job_queue.counts()
+    finally:
+        job_queue.close()
+    console.print(f"Queued {added} of {len(items)} requests in {queue_dir} ({len(items) - added} already queued)")
+    console.print(", ".join(f"{n} {status}" for status, n in counts.items()))
+
+
+@queue_app.command("work")
+def queue_work(
+    queue_dir: Path = typer.Argument(..., help="Queue directory shared by the workers"),
+    concurrency: int = typer.Option(
+        4, "--concurrency", "-j",
+        help="Max runs in flight in this worker",
+        min=1,
+    ),
+    lease: float = typer.Option(
+        120.0, "--lease",
+        help="Seconds a claimed job is held without a heartbeat before others may take it over",
+        min=1.0,
+    ),
+    keep_running: bool = typer.Option(
+        False, "--keep-running",
+        help="Wait for new jobs instead of exiting once the queue is drained",
+    ),
+    requests_per_minute: float = typer.Option(
+        0.0, "--requests-per-minute",
+        help="Max LLM requests per model per minute across all workers of the queue (0: no cap)",
+        min=0.0,
+    ),
+    max_llm_calls: Optional[int] = typer.Option(
+        None, "--max-calls",
+        help="Default LLM call cap per request (rows may set max_llm_calls)",
+        min=1,
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None, "--max-cost",
+        help="Default spend cap per request in USD (rows may set max_cost_usd)",
+        min=0.0,
+    ),
+    total_max_calls: Optional[int] = typer.Option(
+        None, "--total-max-calls",
+        help="LLM call cap shared by all workers of the queue",
+        min=1,
+    ),
+    total_max_cost: Optional[float] = typer.Option(
+        None, "--total-max-cost",
+        help="Spend cap in USD shared by all workers of the queue",
+        min=0.0,
+    ),
+    model: Optional[str] = typer.Option(
+        None, "--model", "-m",
+        help="Override the default model",
+    ),
+    cache: bool = typer.Option(
+        False, "--cache",
+        help="Reuse cached responses for deterministic calls (intake, JSON repair, assembly)",
+    ),
+    cache_all: bool = typer.Option(
+        False, "--cache-all",
+        help="Cache every LLM call",
+    ),
+    fallback: Optional[list[str]] = typer.Option(
+        None, "--fallback",
+        help="Fallback chain for a phase, e.g. phase_1=model-b,model-c (can be used multiple times)",
+    ),
+    hedge_percentile: Optional[float] = typer.Option(
+        None, "--hedge-percentile",
+        help="Duplicate calls still running past this latency percentile (0-1, e.g. 0.9)",
+        min=0.0, max=1.0,
+    ),
+) -> None:
+    """Claim and run queued requests until the queue is drained.
+
+    Start one worker per host (or several) on the same queue directory.
+    Run records are kept in <queue_dir>/run_records, so a job taken over
+    after its worker died resumes from the last checkpoint.
+
+    Example:
+        zeus queue work /mnt/shared/zeus-queue -j 8 --requests-per-minute 300
+    """
+    def on_result(result: dict) -> None:
+        console.print(
+            f"  [green]done[/green] {result['id']} "
+            f"[dim]{result['run_id'][:8]}[/dim] score {result['score']:.1f}"
+        )
+
+    budget = {}
+    if max_llm_calls is not None:
+        budget["max_llm_calls"] = max_llm_calls
+    if max_cost is not None:
+        budget["max_cost_usd"] = max_cost
+    shared_budget = {}
+    if total_max_calls is not None:
+        shared_budget["max_llm_calls"] = total_max_calls
+    if total_max_cost is not None:
+        shared_budget["max_cost_usd"] = total_max_cost
+
+    if not (queue_dir / SQLiteJobQueue.DB_NAME).exists():
+        console.print(f"[red]Error:[/red] No job queue in {queue_dir}")
+        raise typer.Exit(1)
+    job_queue = SQLiteJobQueue(queue_dir / SQLiteJobQueue.DB_NAME)
+    console.print(f"Working on {queue_dir} (concurrency {concurrency}) — Ctrl+C to stop")
+    try:
+        counts = asyncio.run(closing_shared_pool(work_queue(
+            job_queue,
+            concurrency=concurrency,
+            model=model,
+            phase_fallbacks=parse_fallbacks(fallback or []),
+            budget=budget,
+            shared_budget=shared_budget,
+            cache=cache,
+            cache_all=cache_all,
+            hedge_percentile=hedge_percentile,
+            requests_per_minute=requests_per_minute,
+            shared_state=queue_dir,
+            persistence=Persistence(base_dir=queue_dir / "run_records"),
+            lease_seconds=lease,
+            keep_running=keep_running,
+            on_result=on_result,
+        )))
+    except KeyboardInterrupt:
+        console.print("\nStopped worker; its leased jobs go to other workers once their leases expire.")
+        return
+    finally:
+        job_queue.close()
+    console.print(
+        f"\n{counts['succeeded']} succeeded, {counts['failed']} failed, "
+        f"{counts['retried']} given back for retry"
+    )
+
+
+@queue_app.command("status")
+def queue_status(
+    queue_dir: Path = typer.Argument(..., help="Queue directory shared by the workers"),
+    output_file: Optional[Path] = typer.Option(
+        None, "--output",
+        help="Write the result lines of finished jobs to this JSONL file",
+    ),
+) -> None:
+    """Show how many queued jobs are waiting, running, done and failed.
+
+    Example:
+        zeus queue status /mnt/shared/zeus-queue --output results.jsonl
+    """
+    if not (queue_dir / SQLiteJobQueue.DB_NAME).exists():
+        console.print(f"[red]Error:[/red] No job queue in {queue_dir}")
+        raise typer.Exit(1)
+    job_queue = SQLiteJobQueue(queue_dir / SQLiteJobQueue.DB_NAME)
+    try:
+        counts = job_queue.counts()
+        results = job_queue.results() if output_file else []
+    finally:
+        job_queue.close()
+    console.print(", ".join(f"{n} {status}" for status, n in counts.items()))
+    if output_file:
+        output_file.write_text(
+            "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results), encoding="utf-8"
+        )
+        console.print(f"Wrote {len(results)} results to {output_file}")
+
+
 @app.command()
 def history(
     limit: int = typer.Option(10, "--limit", "-n", help="Number of runs to show"),
@@ -239,7 +981,12 @@ def history(
     console.print(f"\n[bold]Recent Zeus Runs[/bold] (showing {len(runs)})\n")
 
     for run in runs:
-        status = "ok" if run["has_response"] else "failed"
+        if run["has_response"]:
+            status = "ok"
+        elif run["status"].startswith("Interrupted"):
+            status = "interrupted"
+        else:
+            status = "failed"
         errors = f" ({run['errors']} errors)" if run["errors"] > 0 else ""
         score_str = ""
         if run.get("score") is not None:
@@ -265,12 +1012,44 @@ def show(
     console.print(f"\n[bold]Run details: {record.run_id}[/bold]\n")
     console.print(f"Timestamp: {record.timestamp}")
     console.print(f"Model: {record.model_version}")
+    if record.completed_phases:
+        console.print(f"Completed phases: {', '.join(record.completed_phases)}")
+    if record.rerun_of:
+        console.print(
+            f"Rerun of: {record.rerun_of} "
+            f"(reused: {', '.join(record.reused_phases) or 'nothing'})"
+        )
 
     if record.budget_used:
         total_tokens = record.budget_used.tokens_in + record.budget_used.tokens_out
         console.print(f"\nBudget Used:")
         console.print(f"  LLM Calls: {record.budget_used.llm_calls}")
         console.print(f"  Tokens: {record.budget_used.tokens_in:,} in / {record.budget_used.tokens_out:,} out ({total_tokens:,} total)")
+        console.print(f"  Cost: ${record.budget_used.cost_usd:.4f}")
+        console.print(
+            f"  Prompt cache: {record.budget_used.tokens_in_cached:,} cached / "
+            f"{record.budget_used.tokens_in_uncached:,} uncached input tokens"
+        )
+        console.print(
+            f"  Hedged calls: {record.budget_used.hedged_calls} "
+            f"({record.budget_used.hedge_wins} won by the hedge) | "
+            f"Model fallbacks: {record.budget_used.model_fallbacks}"
+        )
+        console.print(
+            f"  JSON repairs: {record.budget_used.json_repairs_local} local / "
+            f"{record.budget_used.json_repairs_llm} LLM | "
+            f"Truncation continuations: {record.budget_used.continuations}"
+        )
+        if record.budget_used.memoized_steps:
+            console.print(f"  Reused from phase store: {record.budget_used.memoized_steps} step(s)")
+
+    if record.timings.phases:
+        print_timings(record.timings)
+
+    if record.dropped_inventors:
+        console.print(f"\nDropped inventors: {len(record.dropped_inventors)}")
+        for inventor_id, reason in record.dropped_inventors.items():
+            console.print(f"  - {inventor_id}: {reason}")
 
     if record.inventor_solutions:
         console.print(f"\nInventors: {len(record.inventor_solutions)}")
@@ -10,6 +10,7 @@ from src.core.evaluator import Evaluator
 from src.core.assembler import Assembler
 from src.core.persistence import Persistence
 from src.core.run_controller import RunController
+from src.core.scheduler import PhaseGraph, Quorum
 
 __all__ = [
     "Normalizer",
@@ -22,4 +23,6 @@ __all__ = [
     "Assembler",
     "Persistence",
     "RunController",
+    "PhaseGraph",
+    "Quorum",
 ]
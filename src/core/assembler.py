@@ -6,19 +6,16 @@ from src.models.schemas import (
     RunRecord,
     UsageStats,
     SelfEvaluationScorecard,
+    AssemblyPayload,
 )
-from src.llm.openrouter import OpenRouterClient
+from src.llm.openrouter import OpenRouterClient, accumulate_usage
+from src.llm.structured import json_schema_format
 from src.prompts.assembly import AssemblyPrompts
 from src.core.evaluator import Evaluator
 
 logger = logging.getLogger(__name__)
 
-# Pricing per 1M tokens (USD)
-MODEL_PRICING = {
-    "anthropic/claude-sonnet-4": {"input": 3.00, "output": 15.00},
-    "anthropic/claude-3-5-sonnet": {"input": 3.00, "output": 15.00},
-    "default": {"input": 3.00, "output": 15.00},
-}
+_ASSEMBLY_FORMAT = json_schema_format(AssemblyPayload)
 
 
 class Assembler:
@@ -88,6 +85,7 @@ class Assembler:
             temperature=0.3,
             max_tokens=16384,
             model=model,
+            response_format=_ASSEMBLY_FORMAT,
         )
         logger.info("Assembly LLM response received — parsing deliverables")
 
@@ -170,7 +168,7 @@ class Assembler:
             alternative_approaches=alternative_approaches,
         )
 
-        return zeus_response, {"tokens_in": usage.get("tokens_in", 0), "tokens_out": usage.get("tokens_out", 0), "llm_calls": 1}
+        return zeus_response, accumulate_usage({"llm_calls": 1}, usage)
 
     def _format_provenance(self, record: RunRecord) -> str:
         """Format provenance data from synthesis."""
@@ -279,10 +277,8 @@ class Assembler:
         llm_calls = budget.llm_calls + 1
         total_tokens = tokens_in + tokens_out
 
-        pricing = MODEL_PRICING.get(record.model_version, MODEL_PRICING["default"])
-        cost_in = (tokens_in / 1_000_000) * pricing["input"]
-        cost_out = (tokens_out / 1_000_000) * pricing["output"]
-        cost_usd = round(cost_in + cost_out, 6)
+        # Billed (usage.cost) or list-priced per call, so mixed-model runs add up
+        cost_usd = round(budget.cost_usd + assembly_usage.get("cost_usd", 0.0), 6)
 
         return UsageStats(
             llm_calls=llm_calls,
@@ -0,0 +1,434 @@
+"""Batch execution of many Zeus requests over one shared client."""
+
+import asyncio
+import csv
+import json
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+from pydantic import ValidationError
+from src.models.schemas import BudgetConfig, BudgetUsed, ZeusRequest, ZeusResponse
+from src.llm.openrouter import OpenRouterClient
+from src.llm.cache import ResponseCache
+from src.llm.rate_limiter import SharedRateLimit
+from src.llm.transport import closing_shared_pool
+from src.core.budget import RunBudget, SharedBudget
+from src.core.persistence import Persistence
+from src.core.run_controller import RunController, build_client_kwargs
+
+logger = logging.getLogger(__name__)
+
+# Row fields that set the budget of one request rather than the request itself
+_BUDGET_FIELDS = ("max_llm_calls", "max_revisions", "max_tokens_in", "max_tokens_out", "max_cost_usd")
+# Row field naming an item; defaults to its line number
+_ID_FIELD = "id"
+# ZeusRequest fields that hold lists; in CSV cells, "|" separates entries
+_LIST_FIELDS = ("constraints", "objectives", "library_paths")
+
+_DEFAULT_CONCURRENCY = 4
+# Seconds the parent of a multi-process batch waits for a result before checking its workers
+_RESULT_POLL = 0.5
+
+
+class BatchItem:
+    """One request of a batch, with the budget it runs under."""
+
+    def __init__(self, item_id: str, request: ZeusRequest, budget: dict[str, Any] | None = None):
+        self.item_id = item_id
+        self.request = request
+        # BudgetConfig overrides for this request only
+        self.budget = budget or {}
+
+
+def load_batch(path: str | Path, budget: dict[str, Any] | None = None) -> list[BatchItem]:
+    """Read batch items from a JSONL or CSV file.
+
+    Each JSONL line (or CSV row) holds ``ZeusRequest`` fields, plus an
+    optional ``id`` and per-request budget fields (``max_llm_calls``,
+    ``max_revisions``, ``max_tokens_in``, ``max_tokens_out``,
+    ``max_cost_usd``). In CSV, list fields are a JSON array or entries
+    separated by ``|``; empty cells are ignored.
+
+    Args:
+        path: The batch file.
+        budget: Default BudgetConfig fields of the batch; each row's budget
+            is validated merged with them, as it will run.
+
+    Raises:
+        ValueError: If a line is not a valid request or budget, or ids repeat.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [
+                (i, _csv_row(row))
+                for i, row in enumerate(csv.DictReader(f), start=2)
+            ]
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = [
+                (i, json.loads(line))
+                for i, line in enumerate(f, start=1)
+                if line.strip()
+            ]
+
+    items = []
+    seen: set[str] = set()
+    for line_no, row in rows:
+        if not isinstance(row, dict):
+            raise ValueError(f"{path}:{line_no}: expected an object, got {type(row).__name__}")
+        row = dict(row)
+        item_id = str(row.pop(_ID_FIELD, None) or f"line-{line_no}")
+        if item_id in seen:
+            raise ValueError(f"{path}:{line_no}: duplicate id {item_id!r}")
+        seen.add(item_id)
+        item_budget = {k: row.pop(k) for k in _BUDGET_FIELDS if row.get(k) is not None}
+        try:
+            request = ZeusRequest.model_validate(row)
+        except ValidationError as e:
+            raise ValueError(f"{path}:{line_no}: invalid request: {e}") from e
+        try:
+            BudgetConfig(**{**(budget or {}), **item_budget})
+        except ValidationError as e:
+            raise ValueError(f"{path}:{line_no}: invalid budget: {e}") from e
+        items.append(BatchItem(item_id, request, item_budget))
+    return items
+
+
+def _csv_row(row: dict[str, str]) -> dict[str, Any]:
+    """Convert a CSV row into request fields."""
+    fields: dict[str, Any] = {}
+    for key, value in row.items():
+        if key is None or value is None or not value.strip():
+            continue
+        value = value.strip()
+        if key in _LIST_FIELDS:
+            fields[key] = json.loads(value) if value.startswith("[") else [
+                part.strip() for part in value.split("|") if part.strip()
+            ]
+        else:
+            fields[key] = value
+    return fields
+
+
+class BatchManifest:
+    """Append-only progress log of a batch, used to resume it.
+
+    Each line records one state change of an item (``started`` with its
+    run id, then ``done`` or ``failed``); the last line for an item wins.
+    A line cut short by a crash is ignored.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[entry["id"]] = entry
+
+    def status(self, item_id: str) -> str | None:
+        """Last recorded status of an item, or None if it never started."""
+        entry = self.entries.get(item_id)
+        return entry["status"] if entry else None
+
+    def run_id(self, item_id: str) -> str | None:
+        """Run id assigned to an item, or None if it never started."""
+        entry = self.entries.get(item_id)
+        return entry.get("run_id") if entry else None
+
+    def mark(self, item_id: str, status: str, **fields: Any) -> None:
+        """Record a new status for an item."""
+        entry = {"id": item_id, "status": status, **fields}
+        self.entries[item_id] = entry
+        _append_line(self.path, entry)
+
+
+def result_line(
+    item_id: str,
+    run_id: str,
+    response: ZeusResponse | None = None,
+    error: str | None = None,
+) -> dict[str, Any]:
+    """The output line of a finished item: its response, or the error it failed with."""
+    if response is None:
+        return {"id": item_id, "run_id": run_id, "status": "failed", "error": error}
+    return {
+        "id": item_id,
+        "run_id": run_id,
+        "status": "done",
+        "score": response.total_score,
+        "score_percentage": response.score_percentage,
+        "response": response.model_dump(),
+    }
+
+
+def _append_line(path: Path, value: dict[str, Any]) -> None:
+    """Append ``value`` as one JSON line in a single write, so lines of concurrent processes never interleave."""
+    data = (json.dumps(value, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+async def run_batch(
+    items: list[BatchItem],
+    output_path: str | Path,
+    manifest_path: str | Path | None = None,
+    concurrency: int = _DEFAULT_CONCURRENCY,
+    api_key: str | None = None,
+    model: str | None = None,
+    phase_models: dict[str, str] | None = None,
+    phase_fallbacks: dict[str, list[str]] | None = None,
+    budget: dict[str, Any] | None = None,
+    shared_budget: dict[str, Any] | None = None,
+    cache: bool = False,
+    cache_all: bool = False,
+    hedge_percentile: float | None = None,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+    persistence: Persistence | None = None,
+    processes: int = 1,
+    requests_per_minute: float = 0.0,
+    shared_state: str | Path | None = None,
+) -> dict[str, int]:
+    """Run a batch of requests concurrently over one shared client.
+
+    All runs share one OpenRouterClient, and so one connection pool and
+    one per-model rate limiter; at most ``concurrency`` runs are in flight.
+    Each run has its own budget: ``budget`` (BudgetConfig fields) overlaid
+    with the item's own fields. ``shared_budget`` caps the runs of this
+    call together; every run reserves from it before its calls, so the
+    caps hold however many runs are in flight.
+
+    With ``processes`` > 1 the items are split across that many worker
+    processes, each with its own event loop and client, and
+    ``concurrency`` is divided between them. The processes share their
+    rate-limit pauses, the optional ``requests_per_minute`` per model and
+    ``shared_budget`` through SQLite files in ``shared_state`` (default:
+    ``<output>.shared/``), so together they stay within the provider's
+    limits and the caps.
+
+    Progress is logged to the manifest (default: ``<output>.manifest.jsonl``).
+    Re-running the same batch skips finished items and resumes interrupted
+    ones from their last checkpoint. Each result is appended to
+    ``output_path`` as one JSON line as soon as its run finishes.
+
+    Args:
+        items: Requests to run (see ``load_batch``).
+        output_path: JSONL file results are appended to.
+        manifest_path: Progress manifest; defaults next to ``output_path``.
+        concurrency: Max runs in flight.
+        api_key: Optional API key (uses env var if not provided).
+        model: Optional model override for every run.
+        phase_models: Optional model overrides by phase key.
+        phase_fallbacks: Optional fallback models by phase key.
+        budget: Default BudgetConfig fields for every run.
+        shared_budget: Optional caps (``max_llm_calls``, ``max_tokens_in``,
+            ``max_tokens_out``, ``max_cost_usd``) on all runs together.
+        cache: Serve low-temperature calls from the response cache.
+        cache_all: Cache every call.
+        hedge_percentile: Hedge calls past this latency percentile.
+        on_result: Optional callback receiving each result line.
+        persistence: Where run records (and their checkpoints) are kept.
+        processes: Worker processes to spread the runs over.
+        requests_per_minute: Optional cap on requests per model per
+            minute across all processes (0: no cap).
+        shared_state: Directory of the state shared between processes.
+            Pass one explicitly to share it with processes started
+            elsewhere; it is then not reset.
+
+    Returns:
+        Counts of ``total``, ``skipped`` (already done), ``succeeded`` and
+        ``failed`` items.
+    """
+    output_path = Path(output_path)
+    manifest_path = Path(manifest_path or output_path.with_name(output_path.name + ".manifest.jsonl"))
+    manifest = BatchManifest(manifest_path)
+    persistence = persistence or Persistence()
+    base_budget = BudgetConfig(**(budget or {}))
+    counts = {"total": len(items), "skipped": 0, "succeeded": 0, "failed": 0}
+
+    pending = []
+    for item in items:
+        if manifest.status(item.item_id) == "done":
+            counts["skipped"] += 1
+        else:
+            pending.append(item)
+    logger.info(
+        f"Batch: {len(pending)} to run, {counts['skipped']} already done "
+        f"(concurrency {concurrency})"
+    )
+
+    fresh_state = shared_state is None and (processes > 1 or requests_per_minute > 0)
+    if fresh_state:
+        shared_state = output_path.with_name(output_path.name + ".shared")
+    if shared_state:
+        shared_state = Path(shared_state)
+        shared_state.mkdir(parents=True, exist_ok=True)
+    if fresh_state and shared_budget:
+        SharedBudget.reset(shared_state / SharedBudget.DB_NAME)
+
+    if processes > 1 and len(pending) > 1:
+        options = dict(
+            manifest_path=manifest_path,
+            concurrency=math.ceil(concurrency / processes),
+            api_key=api_key,
+            model=model,
+            phase_models=phase_models,
+            phase_fallbacks=phase_fallbacks,
+            budget=budget,
+            shared_budget=shared_budget,
+            cache=cache,
+            cache_all=cache_all,
+            hedge_percentile=hedge_percentile,
+            persistence=persistence,
+            requests_per_minute=requests_per_minute,
+            shared_state=shared_state,
+        )
+        await _run_processes(pending, output_path, options, processes, counts, on_result)
+        logger.info(f"Batch complete: {counts}")
+        return counts
+
+    shared_limits = None
+    if shared_state:
+        shared_limits = SharedRateLimit(shared_state / SharedRateLimit.DB_NAME, requests_per_minute)
+    response_cache = ResponseCache() if cache or cache_all else None
+    client_kwargs = build_client_kwargs(
+        api_key, model, base_budget, False, hedge_percentile, response_cache, cache_all, shared_limits
+    )
+    in_flight = asyncio.Semaphore(max(1, concurrency))
+    pool: RunBudget | None = None
+
+    async def run_item(client: OpenRouterClient, item: BatchItem) -> None:
+        async with in_flight:
+            run_id = manifest.run_id(item.item_id)
+            resume_id = run_id
+            run_id = run_id or str(uuid.uuid4())
+            manifest.mark(item.item_id, "started", run_id=run_id)
+
+            try:
+                # A bad item (budget, unreadable record) fails alone, not the batch
+                controller = RunController(
+                    client,
+                    persistence=persistence,
+                    on_progress=lambda msg: logger.debug(f"[{item.item_id}] {msg}"),
+                    budget_config=BudgetConfig(**{**base_budget.model_dump(), **item.budget}),
+                    library_paths=item.request.library_paths,
+                    model_overrides=phase_models,
+                    fallback_models=phase_fallbacks,
+                    budget_pool=pool,
+                )
+                resumable = resume_id is not None and persistence.load(resume_id) is not None
+                if resumable:
+                    logger.info(f"Batch item {item.item_id}: resuming run {run_id}")
+                    response = await controller.resume(run_id)
+                else:
+                    response = await controller.run(item.request, run_id=run_id)
+            except Exception as e:
+                logger.error(f"Batch item {item.item_id} failed: {e}", exc_info=True)
+                result = result_line(item.item_id, run_id, error=str(e))
+                counts["failed"] += 1
+            else:
+                result = result_line(item.item_id, run_id, response)
+                counts["succeeded"] += 1
+
+            _append_line(output_path, result)
+            manifest.mark(item.item_id, result["status"], run_id=run_id)
+            if on_result:
+                on_result(result)
+
+    try:
+        async with OpenRouterClient(**client_kwargs) as client:
+            await client.load_model_limits()
+            if shared_budget:
+                # Caps left unset here do not apply to the pool
+                pool_config = BudgetConfig(**{
+                    "max_llm_calls": 0, "max_tokens_in": 0, "max_tokens_out": 0, "max_cost_usd": 0.0,
+                    **shared_budget,
+                })
+                if shared_state:
+                    pool = SharedBudget(pool_config, shared_state / SharedBudget.DB_NAME, client.model_pricing)
+                else:
+                    pool = RunBudget(pool_config, BudgetUsed(), client.model_pricing)
+            await asyncio.gather(*(run_item(client, item) for item in pending))
+    finally:
+        if response_cache:
+            logger.info(f"LLM response cache: {response_cache.stats()}")
+            response_cache.close()
+        if isinstance(pool, SharedBudget):
+            pool.close()
+        if shared_limits:
+            shared_limits.close()
+
+    logger.info(f"Batch complete: {counts}")
+    return counts
+
+
+async def _run_processes(
+    pending: list[BatchItem],
+    output_path: Path,
+    options: dict[str, Any],
+    processes: int,
+    counts: dict[str, int],
+    on_result: Callable[[dict[str, Any]], None] | None,
+) -> None:
+    """Run ``pending`` across worker processes, counting (and passing on) their results."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    shards = [pending[i::processes] for i in range(processes)]
+    workers = [
+        context.Process(target=_run_shard, args=(shard, output_path, options, results), name=f"zeus-batch-{i}")
+        for i, shard in enumerate(shards) if shard
+    ]
+    logger.info(f"Batch: {len(pending)} runs across {len(workers)} processes")
+    for worker in workers:
+        worker.start()
+
+    reported: set[str] = set()
+    try:
+        while len(reported) < len(pending):
+            try:
+                result = await asyncio.to_thread(results.get, True, _RESULT_POLL)
+            except queue.Empty:
+                if any(worker.is_alive() for worker in workers):
+                    continue
+                try:
+                    result = results.get(timeout=_RESULT_POLL)
+                except queue.Empty:
+                    break
+            reported.add(result["id"])
+            counts["succeeded" if result["status"] == "done" else "failed"] += 1
+            if on_result:
+                on_result(result)
+        for worker in workers:
+            await asyncio.to_thread(worker.join)
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    lost = [item.item_id for item in pending if item.item_id not in reported]
+    if lost:
+        logger.error(f"Batch: {len(lost)} item(s) ended with their worker process: {', '.join(lost)}")
+        counts["failed"] += len(lost)
+
+
+def _run_shard(
+    items: list[BatchItem],
+    output_path: Path,
+    options: dict[str, Any],
+    results: Any,
+) -> None:
+    """Entry point of a batch worker process: run its items, reporting each result."""
+    asyncio.run(closing_shared_pool(run_batch(items, output_path, on_result=results.put, **options)))
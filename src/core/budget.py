@@ -0,0 +1,583 @@
+"""Run budget - call, token and cost caps enforced before each LLM call."""
+
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from src.models.schemas import BudgetConfig, BudgetUsed
+from src.llm.openrouter import CallBudget, call_budget
+
+logger = logging.getLogger(__name__)
+
+# A call is refused rather than cut below this many completion tokens
+_MIN_COMPLETION_TOKENS = 256
+# Completion tokens set aside per task when a fan-out does not say
+_DEFAULT_TASK_TOKENS_OUT = 16384
+# Seconds a process waits for another's lock on a SharedBudget
+_SHARED_LOCK_TIMEOUT = 30.0
+# Seconds a process's SharedBudget reservations outlive its last refresh
+_RESERVATION_TTL = 300.0
+# Refreshes per reservation TTL, so a late one or two do not lose them
+_REFRESHES_PER_TTL = 3
+
+
+class BudgetExceededError(Exception):
+    """Raised when a run budget (LLM calls, tokens or cost) is exhausted."""
+    pass
+
+
+class RunBudget(CallBudget):
+    """Call, token and cost caps of one run, checked before each LLM call.
+
+    Spend starts from the run's ``BudgetUsed`` (so a resumed run keeps
+    what it already spent) and grows as calls settle. Before a call, its
+    estimated prompt must fit ``max_tokens_in``; its ``max_tokens`` is then
+    cut to what is left of ``max_tokens_out`` and to what ``max_cost_usd``
+    can still pay for at the model's price, so that a call cannot spend
+    past a cap. Calls to models without known pricing are only refused
+    once the cost cap has been reached.
+
+    Work that runs concurrently draws on reservations rather than on the
+    budget directly: ``reserve`` atomically sets aside one LLM call, and a
+    share of the remaining completion tokens, for each task of a fan-out
+    before it launches, so that tasks in flight together cannot spend past
+    ``max_llm_calls`` or ``max_tokens_out``. Every request a task sends
+    (JSON repairs, continuations and hedges included) is counted as it is
+    admitted; past its reserved call, it takes one of the calls left or
+    is refused. What a task does not use goes back when its reservation
+    is released.
+
+    A budget created with a ``pool`` (itself a RunBudget, e.g. shared by
+    the runs of a batch) reserves from and reports spend to the pool as
+    well, so the pool's caps hold across all runs drawing on it.
+    """
+
+    def __init__(
+        self,
+        config: BudgetConfig,
+        used: BudgetUsed,
+        pricing: Callable[[str], tuple[float, float] | None],
+        pool: "RunBudget | None" = None,
+    ):
+        """Initialize the budget.
+
+        Args:
+            config: The run's caps; 0 disables a cap.
+            used: Spend so far.
+            pricing: Returns USD per (prompt, completion) token of a model,
+                or None if unknown (e.g. ``OpenRouterClient.model_pricing``).
+            pool: Optional shared budget this one also draws on.
+        """
+        self.config = config
+        self.pricing = pricing
+        self.pool = pool
+        self.calls = used.llm_calls
+        self.tokens_in = used.tokens_in
+        self.tokens_out = used.tokens_out
+        self.cost_usd = used.cost_usd
+        # Set aside by open reservations, not yet spent
+        self.reserved_calls = 0
+        self.reserved_tokens_out = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Reservations
+    # ------------------------------------------------------------------
+
+    def calls_left(self) -> int | None:
+        """LLM calls neither spent nor reserved, here or in the pool; None if uncapped."""
+        with self._locked():
+            return self._free_calls()
+
+    def reserve(
+        self,
+        tasks: int = 1,
+        tokens_out: int = _DEFAULT_TASK_TOKENS_OUT,
+        min_tasks: int | None = None,
+        label: str = "call",
+    ) -> list["BudgetReservation"]:
+        """Set aside one LLM call and up to ``tokens_out`` completion tokens per task.
+
+        The check and the reservation are one atomic step, for this budget
+        and its pool alike. When the budget cannot cover ``tasks`` tasks,
+        as many as it can are reserved, as long as that is at least
+        ``min_tasks`` (default: all of them; 0 accepts none). Under an output cap, the
+        reserved tasks split what is left of it evenly, up to
+        ``tokens_out`` each.
+
+        Args:
+            tasks: Number of tasks (one LLM call each) to reserve for.
+            tokens_out: Completion tokens a task may need.
+            min_tasks: Fewest tasks worth launching.
+            label: What the calls are for, used in errors and logs.
+
+        Returns:
+            One reservation per task that fits.
+
+        Raises:
+            BudgetExceededError: If fewer than ``min_tasks`` tasks fit.
+        """
+        min_tasks = tasks if min_tasks is None else min_tasks
+        with self._locked():
+            fit = tasks
+            free_calls = self._free_calls()
+            if free_calls is not None:
+                fit = min(fit, free_calls)
+
+            share = None
+            free_out = self._free_tokens_out()
+            if free_out is not None:
+                needed = min(tokens_out, _MIN_COMPLETION_TOKENS)
+                while fit > 0 and free_out // fit < needed:
+                    fit -= 1
+                share = min(tokens_out, free_out // fit) if fit else 0
+
+            if fit < min_tasks:
+                raise BudgetExceededError(
+                    f"Budget exhausted at '{label}': room for {max(fit, 0)} of {tasks} "
+                    f"LLM call(s) (used {self.calls}/{self.config.max_llm_calls or 'unlimited'} calls, "
+                    f"{self.reserved_calls} reserved)"
+                )
+            for budget in self._chain():
+                budget.reserved_calls += fit
+                budget.reserved_tokens_out += fit * (share or 0)
+
+        if fit < tasks:
+            logger.info(f"Budget covers {fit} of {tasks} '{label}' calls")
+        return [BudgetReservation(self, share) for _ in range(fit)]
+
+    def consume(self, calls: int = 1) -> None:
+        """Count LLM calls made outside any reservation as spent."""
+        self._consume(None, calls)
+
+    def _consume(self, reservation: "BudgetReservation | None", calls: int) -> None:
+        """Count ``calls`` LLM calls (made under ``reservation``, if any) as spent.
+
+        Under a reservation, only the calls its admissions have not already
+        counted (e.g. response-cache hits) are added.
+        """
+        with self._locked():
+            covered = 0
+            if reservation is not None:
+                reservation.calls_reported += calls
+                calls = max(0, reservation.calls_reported - reservation.calls_used)
+                if not reservation.released:
+                    covered = max(0, min(calls, reservation.calls - reservation.calls_used))
+                reservation.calls_used += calls
+            for budget in self._chain():
+                budget.calls += calls
+                budget.reserved_calls -= covered
+
+    def _release(self, reservation: "BudgetReservation") -> None:
+        """Return what is left of ``reservation``."""
+        with self._locked():
+            if reservation.released:
+                return
+            reservation.released = True
+            calls = max(0, reservation.calls - reservation.calls_used)
+            # Held tokens of requests that never settled (e.g. cancelled hedges) go back too
+            tokens_out = reservation.tokens_out_unspent()
+            for budget in self._chain():
+                budget.reserved_calls -= calls
+                budget.reserved_tokens_out -= tokens_out
+
+    # ------------------------------------------------------------------
+    # CallBudget hooks
+    # ------------------------------------------------------------------
+
+    def admit(self, model: str, prompt_tokens: int, max_tokens: int) -> int:
+        """Return the ``max_tokens`` a call may use.
+
+        Raises:
+            BudgetExceededError: If the call does not fit the remaining budget.
+        """
+        return self._admit(model, prompt_tokens, max_tokens, None)
+
+    def settle(self, model: str, usage: dict[str, Any], max_tokens: int = 0) -> None:
+        """Add a completed call's spend."""
+        self._settle(usage, None, max_tokens)
+
+    def _admit(
+        self,
+        model: str,
+        prompt_tokens: int,
+        max_tokens: int,
+        reservation: "BudgetReservation | None",
+    ) -> int:
+        with self._locked():
+            # A reservation's requests are counted here, so concurrent ones cannot overrun the call cap
+            covered = False
+            if reservation is not None:
+                covered = not reservation.released and reservation.calls_used < reservation.calls
+                free_calls = self._free_calls()
+                if not covered and free_calls is not None and free_calls < 1:
+                    raise BudgetExceededError(
+                        f"Call budget exhausted: no LLM call left for a request to {model} "
+                        f"(used {self.calls}/{self.config.max_llm_calls or 'unlimited'} calls, "
+                        f"{self.reserved_calls} reserved)"
+                    )
+
+            allowed = max_tokens
+            if reservation is not None and reservation.tokens_out is not None:
+                allowed = min(allowed, reservation.tokens_out_left())
+            else:
+                free_out = self._free_tokens_out()
+                if free_out is not None:
+                    allowed = min(allowed, free_out)
+
+            for budget in self._chain():
+                config = budget.config
+                if config.max_tokens_in and budget.tokens_in + prompt_tokens > config.max_tokens_in:
+                    raise BudgetExceededError(
+                        f"Input token budget exhausted: a ~{prompt_tokens:,}-token prompt to {model} "
+                        f"would exceed {config.max_tokens_in:,} (used {budget.tokens_in:,})"
+                    )
+                if config.max_cost_usd:
+                    left = config.max_cost_usd - budget.cost_usd
+                    prices = self.pricing(model)
+                    if prices is not None:
+                        left -= prompt_tokens * prices[0]
+                        if prices[1] > 0:
+                            allowed = min(allowed, int(max(left, 0) / prices[1]))
+                    if left <= 0:
+                        raise BudgetExceededError(
+                            f"Cost budget exhausted: a call to {model} would exceed "
+                            f"${config.max_cost_usd:.4f} (spent ${budget.cost_usd:.4f})"
+                        )
+
+            if allowed < min(max_tokens, _MIN_COMPLETION_TOKENS):
+                raise BudgetExceededError(
+                    f"Output budget exhausted: only {max(allowed, 0):,} completion tokens "
+                    f"left for a call to {model}"
+                )
+            if reservation is not None:
+                reservation.calls_used += 1
+                if reservation.tokens_out is not None:
+                    # Held until the request settles, so a hedge cannot spend the same tokens
+                    reservation.tokens_out_held += allowed
+                for budget in self._chain():
+                    budget.calls += 1
+                    budget.reserved_calls -= int(covered)
+
+        if allowed < max_tokens:
+            logger.info(f"max_tokens cut {max_tokens:,} → {allowed:,} to stay within the run budget")
+        return allowed
+
+    def _settle(self, usage: dict[str, Any], reservation: "BudgetReservation | None", max_tokens: int) -> None:
+        tokens_out = usage.get("tokens_out", 0)
+        with self._locked():
+            covered = 0
+            if reservation is not None:
+                reservation.tokens_out_held -= min(max_tokens, reservation.tokens_out_held)
+                if not reservation.released:
+                    covered = min(tokens_out, reservation.tokens_out_unspent())
+                reservation.tokens_out_used += tokens_out
+            for budget in self._chain():
+                budget.tokens_in += usage.get("tokens_in", 0)
+                budget.tokens_out += tokens_out
+                budget.cost_usd += usage.get("cost_usd", 0.0)
+                budget.reserved_tokens_out -= covered
+
+    # ------------------------------------------------------------------
+    # Internals (callers hold the chain's locks)
+    # ------------------------------------------------------------------
+
+    def _chain(self) -> list["RunBudget"]:
+        """This budget followed by its pools."""
+        chain = []
+        budget: RunBudget | None = self
+        while budget is not None:
+            chain.append(budget)
+            budget = budget.pool
+        return chain
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the locks of this budget and its pools, always in that order."""
+        with ExitStack() as stack:
+            for budget in self._chain():
+                stack.enter_context(budget._lock)
+            yield
+
+    def _free_calls(self) -> int | None:
+        free = None
+        for budget in self._chain():
+            if budget.config.max_llm_calls:
+                left = budget.config.max_llm_calls - budget.calls - budget.reserved_calls
+                free = left if free is None else min(free, left)
+        return None if free is None else max(free, 0)
+
+    def _free_tokens_out(self) -> int | None:
+        free = None
+        for budget in self._chain():
+            if budget.config.max_tokens_out:
+                left = budget.config.max_tokens_out - budget.tokens_out - budget.reserved_tokens_out
+                free = left if free is None else min(free, left)
+        return None if free is None else max(free, 0)
+
+
+class SharedBudget(RunBudget):
+    """A RunBudget whose spend and reservations are shared across processes.
+
+    Used as the ``pool`` of the runs of a multi-process batch: every
+    process opens the same SQLite file, and each check or update of the
+    budget happens in one write transaction that first loads the
+    counters every process has written. Reservations are kept per
+    process with an expiry that every transaction of the process, and a
+    background refresh, push back like a job lease. Those of a process
+    that died (on this host) or stopped refreshing them (on any host)
+    are dropped instead of holding the pool's calls forever.
+
+    Any check or update may wait for another process's transaction, so
+    async code calls the budget through ``asyncio.to_thread`` and enters
+    reservations with ``async with``, keeping the event loop free.
+    """
+
+    DB_NAME = "shared_budget.sqlite3"
+
+    def __init__(
+        self,
+        config: BudgetConfig,
+        path: str | Path,
+        pricing: Callable[[str], tuple[float, float] | None],
+        journal_mode: str = "WAL",
+        reservation_ttl: float = _RESERVATION_TTL,
+    ):
+        """Initialize the budget.
+
+        Args:
+            config: The caps of all processes together; 0 disables a cap.
+            path: SQLite file, or a directory to create it in.
+            pricing: Returns USD per (prompt, completion) token of a model.
+            journal_mode: SQLite journal mode of the file. WAL only works
+                for processes of one host; use ``DELETE`` for a file shared
+                between hosts.
+            reservation_ttl: Seconds this process's reservations last
+                without a refresh.
+        """
+        super().__init__(config, BudgetUsed(), pricing)
+        self.path = self._db_path(path)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        # Reservations of other processes, as of the last load
+        self._others_calls = 0
+        self._others_tokens_out = 0
+        self.reservation_ttl = reservation_ttl
+        self._conn = self._connect(self.path, journal_mode)
+        self._lock = _SharedBudgetLock(self, threading.Lock())
+        self._closed = threading.Event()
+        self._refresher = threading.Thread(target=self._refresh, name="shared-budget-refresh", daemon=True)
+        self._refresher.start()
+
+    @classmethod
+    def reset(cls, path: str | Path, journal_mode: str = "WAL") -> Path:
+        """Start a shared budget afresh, e.g. before the processes of a new batch open it."""
+        db_path = cls._db_path(path)
+        conn = cls._connect(db_path, journal_mode)
+        try:
+            conn.execute("DELETE FROM spend")
+            conn.execute("DELETE FROM reservations")
+        finally:
+            conn.close()
+        return db_path
+
+    def close(self) -> None:
+        """Drop this process's reservations and close the database connection."""
+        self._closed.set()
+        self._refresher.join()
+        with self._lock:
+            self.reserved_calls = self._others_calls
+            self.reserved_tokens_out = self._others_tokens_out
+        self._conn.close()
+
+    def _refresh(self) -> None:
+        """Keep this process's reservations from expiring while it runs, even between calls."""
+        while not self._closed.wait(self.reservation_ttl / _REFRESHES_PER_TTL):
+            try:
+                with self._lock:
+                    pass
+            except sqlite3.Error as e:
+                logger.warning(f"Shared budget: could not refresh reservations, retrying: {e}")
+
+    @classmethod
+    def _db_path(cls, path: str | Path) -> Path:
+        db_path = Path(path)
+        if db_path.suffix == "":
+            db_path = db_path / cls.DB_NAME
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        return db_path
+
+    @staticmethod
+    def _connect(db_path: Path, journal_mode: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(db_path), timeout=_SHARED_LOCK_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS spend ("
+            "id INTEGER PRIMARY KEY CHECK (id = 0), calls INTEGER NOT NULL, tokens_in INTEGER NOT NULL, "
+            "tokens_out INTEGER NOT NULL, cost_usd REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS reservations ("
+            "owner TEXT PRIMARY KEY, calls INTEGER NOT NULL, tokens_out INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL DEFAULT 0)"
+        )
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(reservations)")}
+        if "expires_at" not in existing:
+            # Files written before reservations expired
+            conn.execute("ALTER TABLE reservations ADD COLUMN expires_at REAL NOT NULL DEFAULT 0")
+        return conn
+
+    def _load(self) -> None:
+        """Read every process's counters (caller holds the transaction)."""
+        row = self._conn.execute("SELECT calls, tokens_in, tokens_out, cost_usd FROM spend").fetchone()
+        self.calls, self.tokens_in, self.tokens_out, self.cost_usd = row or (0, 0, 0, 0.0)
+
+        now = time.time()
+        own_calls = own_tokens_out = 0
+        self._others_calls = self._others_tokens_out = 0
+        rows = self._conn.execute("SELECT owner, calls, tokens_out, expires_at FROM reservations").fetchall()
+        for owner, calls, tokens_out, expires_at in rows:
+            if owner == self.owner:
+                own_calls, own_tokens_out = calls, tokens_out
+            elif self._is_dead(owner) or expires_at < now:
+                why = "exited" if expires_at >= now else "not refreshed"
+                logger.warning(f"Shared budget: dropping {calls} reserved call(s) of process {owner} ({why})")
+                self._conn.execute("DELETE FROM reservations WHERE owner = ?", (owner,))
+            else:
+                self._others_calls += calls
+                self._others_tokens_out += tokens_out
+        self.reserved_calls = self._others_calls + own_calls
+        self.reserved_tokens_out = self._others_tokens_out + own_tokens_out
+
+    def _store(self) -> None:
+        """Write this process's counters back (caller holds the transaction)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO spend VALUES (0, ?, ?, ?, ?)",
+            (self.calls, self.tokens_in, self.tokens_out, self.cost_usd),
+        )
+        own_calls = self.reserved_calls - self._others_calls
+        own_tokens_out = self.reserved_tokens_out - self._others_tokens_out
+        if own_calls or own_tokens_out:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reservations VALUES (?, ?, ?, ?)",
+                (self.owner, own_calls, own_tokens_out, time.time() + self.reservation_ttl),
+            )
+        else:
+            self._conn.execute("DELETE FROM reservations WHERE owner = ?", (self.owner,))
+
+    @staticmethod
+    def _is_dead(owner: str) -> bool:
+        """Whether ``owner`` is a process of this host that no longer runs."""
+        host, _, pid = owner.rpartition(":")
+        if host != socket.gethostname() or os.name != "posix" or not pid.isdigit():
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+
+class _SharedBudgetLock:
+    """The lock of a SharedBudget: an SQLite write transaction around a load and a store."""
+
+    def __init__(self, budget: SharedBudget, lock: threading.Lock):
+        self._budget = budget
+        self._lock = lock
+
+    def __enter__(self) -> None:
+        self._lock.acquire()
+        try:
+            self._budget._conn.execute("BEGIN IMMEDIATE")
+            self._budget._load()
+        except BaseException:
+            if self._budget._conn.in_transaction:
+                self._budget._conn.execute("ROLLBACK")
+            self._lock.release()
+            raise
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self._budget._store()
+                self._budget._conn.execute("COMMIT")
+            else:
+                self._budget._conn.execute("ROLLBACK")
+        finally:
+            self._lock.release()
+
+
+class BudgetReservation(CallBudget):
+    """One LLM call, and its completion tokens, set aside from a RunBudget for a task.
+
+    Use it as a context manager around the task: requests made inside are
+    admitted against the reservation (its call and completion tokens
+    first, then the budget's calls left and its input and cost caps) and
+    settled into it. An admitted request holds its ``max_tokens`` until it
+    settles. Report the task's LLM calls with ``consume`` so that calls
+    no request was sent for are counted too; leaving the block releases
+    what was not used.
+    """
+
+    def __init__(self, budget: RunBudget, tokens_out: int | None):
+        self.budget = budget
+        self.calls = 1
+        # None when no output cap applies
+        self.tokens_out = tokens_out
+        # Calls counted, by admission or by consume; calls the task reported
+        self.calls_used = 0
+        self.calls_reported = 0
+        self.tokens_out_used = 0
+        # Completion tokens of admitted requests not yet settled
+        self.tokens_out_held = 0
+        self.released = False
+        self._tokens: list = []
+
+    def __enter__(self) -> "BudgetReservation":
+        self._tokens.append(call_budget.set(self))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        call_budget.reset(self._tokens.pop())
+        self.release()
+
+    async def __aenter__(self) -> "BudgetReservation":
+        return self.__enter__()
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Leave the block, releasing off the event loop (see SharedBudget)."""
+        call_budget.reset(self._tokens.pop())
+        await asyncio.to_thread(self.release)
+
+    def tokens_out_unspent(self) -> int:
+        """Reserved completion tokens not yet spent."""
+        if self.tokens_out is None:
+            return 0
+        return max(0, self.tokens_out - self.tokens_out_used)
+
+    def tokens_out_left(self) -> int:
+        """Reserved completion tokens neither spent nor held by a request in flight."""
+        return max(0, self.tokens_out_unspent() - self.tokens_out_held)
+
+    def consume(self, calls: int = 1) -> None:
+        """Report LLM calls the task made (e.g. its usage's ``llm_calls``); admitted ones are not counted twice."""
+        self.budget._consume(self, calls)
+
+    def release(self) -> None:
+        """Return the unused part of the reservation; later calls are no-ops."""
+        self.budget._release(self)
+
+    def admit(self, model: str, prompt_tokens: int, max_tokens: int) -> int:
+        return self.budget._admit(model, prompt_tokens, max_tokens, self)
+
+    def settle(self, model: str, usage: dict[str, Any], max_tokens: int = 0) -> None:
+        self.budget._settle(usage, self, max_tokens)
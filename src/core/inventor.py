@@ -3,13 +3,22 @@
 import asyncio
 import json
 import logging
+from typing import Any
 from src.models.schemas import ProblemBrief, InventorConfig, InventorSolution
-from src.llm.openrouter import OpenRouterClient, OpenRouterError
+from src.llm.openrouter import OpenRouterClient, OpenRouterError, accumulate_usage
+from src.llm.structured import json_schema_format
+from src.llm.prompt_budget import PromptBudget
 from src.prompts.inventor import InventorPrompts
-from src.core.library_loader import LibraryLoader
+from src.core.library_loader import LibraryLoader, format_library_context
+from src.core.phase_store import content_hash
 
 logger = logging.getLogger(__name__)
 
+_MAX_TOKENS = 16384
+
+# The inventor id and type are filled in locally, not by the model
+_SOLUTION_FORMAT = json_schema_format(InventorSolution, exclude={"inventor_id", "inventor_type"})
+
 
 class Inventor:
     """Runs parallel divergent generation across multiple inventor configurations."""
@@ -38,42 +47,57 @@ class Inventor:
         for cfg in configs:
             logger.info(f"  Inventor {cfg.inventor_id} ({cfg.inventor_type}) — libs: {cfg.library_assignments}")
 
-        tasks = []
-        for config in configs:
-            chosen_model = (model_overrides or {}).get(config.inventor_id, model)
-            tasks.append(
-                self._run_single_inventor(problem_brief, config, model=chosen_model)
+        results = await asyncio.gather(*(
+            self.generate_solution(
+                problem_brief,
+                config,
+                model=(model_overrides or {}).get(config.inventor_id, model),
             )
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            for config in configs
+        ))
 
         solutions = []
         total_usage = {"tokens_in": 0, "tokens_out": 0, "llm_calls": 0}
-
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning(f"Inventor {configs[i].inventor_id} failed: {result}")
-                solutions.append(InventorSolution(
-                    inventor_id=configs[i].inventor_id,
-                    inventor_type=configs[i].inventor_type,
-                    content=f"[Inventor {configs[i].inventor_id} failed: {str(result)}]",
-                    assumptions=[f"Inventor {configs[i].inventor_id} failed to generate"],
-                ))
-            else:
-                solution, usage = result
-                solutions.append(solution)
-                total_usage["tokens_in"] += usage.get("tokens_in", 0)
-                total_usage["tokens_out"] += usage.get("tokens_out", 0)
-                total_usage["llm_calls"] += 1
-                logger.info(
-                    f"Inventor {solution.inventor_id} ({solution.inventor_type}) done — "
-                    f"{len(solution.content)} chars, {len(solution.assumptions)} assumptions"
-                )
+        for solution, usage in results:
+            solutions.append(solution)
+            accumulate_usage(total_usage, usage)
 
         logger.info(f"All inventors complete — {total_usage['llm_calls']} succeeded, "
                      f"{len(configs) - total_usage['llm_calls']} failed")
         return solutions, total_usage
 
+    async def generate_solution(
+        self,
+        problem_brief: ProblemBrief,
+        config: InventorConfig,
+        model: str | None = None,
+    ) -> tuple[InventorSolution, dict[str, int]]:
+        """Run one inventor.
+
+        A failed inventor yields a placeholder solution (content starting
+        with ``[Inventor``) and empty usage instead of raising, so one
+        failure never takes down the others.
+
+        Returns:
+            Tuple of (solution, usage stats including ``llm_calls``).
+        """
+        try:
+            solution, usage = await self._run_single_inventor(problem_brief, config, model=model)
+        except Exception as e:
+            logger.warning(f"Inventor {config.inventor_id} failed: {e}")
+            return InventorSolution(
+                inventor_id=config.inventor_id,
+                inventor_type=config.inventor_type,
+                content=f"[Inventor {config.inventor_id} failed: {str(e)}]",
+                assumptions=[f"Inventor {config.inventor_id} failed to generate"],
+            ), {}
+
+        logger.info(
+            f"Inventor {solution.inventor_id} ({solution.inventor_type}) done — "
+            f"{len(solution.content)} chars, {len(solution.assumptions)} assumptions"
+        )
+        return solution, {**usage, "llm_calls": 1}
+
     async def _run_single_inventor(
         self,
         problem_brief: ProblemBrief,
@@ -81,31 +105,36 @@ class Inventor:
         model: str | None = None,
     ) -> tuple[InventorSolution, dict[str, int]]:
         """Run a single inventor."""
-        logger.info(f"Inventor {config.inventor_id} ({config.inventor_type}): building library context...")
-        library_context = self._build_library_context(config)
-        logger.info(f"Inventor {config.inventor_id}: library context {len(library_context)} chars, calling LLM...")
-
         objectives_str = "\n".join(f"- {o}" for o in problem_brief.objectives) if problem_brief.objectives else "None specified"
         constraints_str = "\n".join(f"- {c}" for c in problem_brief.constraints) if problem_brief.constraints else "None specified"
 
-        prompt = InventorPrompts.GENERATE.format(
-            inventor_id=config.inventor_id,
-            inventor_type=config.inventor_type,
+        # Brief first: it is shared by every inventor, so they hit the same cached prefix
+        brief = InventorPrompts.BRIEF.format(
             problem_brief=problem_brief.problem_statement,
             objectives=objectives_str,
             constraints=constraints_str,
-            library_context=library_context,
             output_spec=problem_brief.output_spec or "Produce a comprehensive solution document",
             eval_criteria=problem_brief.eval_criteria or "Not provided",
+        )
+        prompt = InventorPrompts.GENERATE.format(
+            inventor_id=config.inventor_id,
+            inventor_type=config.inventor_type,
             emphasis=config.emphasis,
         )
 
+        logger.info(f"Inventor {config.inventor_id} ({config.inventor_type}): building library context...")
+        budget = self.llm.prompt_budget(model, _MAX_TOKENS)
+        library_context = self._build_library_context(config, budget, [InventorPrompts.SYSTEM, brief, prompt])
+        logger.info(f"Inventor {config.inventor_id}: library context {len(library_context)} chars, calling LLM...")
+
         response, usage = await self.llm.generate_json(
             prompt=prompt,
             system=InventorPrompts.SYSTEM,
             temperature=0.7,
-            max_tokens=16384,
+            max_tokens=budget.max_tokens,
             model=model,
+            response_format=_SOLUTION_FORMAT,
+            context_blocks=[brief, library_context],
         )
 
         solution = InventorSolution(
@@ -119,8 +148,26 @@ class Inventor:
 
         return solution, usage
 
-    def _build_library_context(self, config: InventorConfig) -> str:
-        """Build library context string for an inventor."""
+    def fingerprint(self, problem_brief: ProblemBrief, config: InventorConfig) -> dict[str, Any]:
+        """Inputs that determine an inventor's solution, for memoizing it.
+
+        Libraries are represented by hashes of the content the inventor
+        would read, so editing a library file invalidates the result.
+        """
+        if config.inventor_type == "tabula_rasa":
+            libraries = {}
+        elif config.inventor_type == "comprehensive":
+            libraries = self.library_loader.get_all()
+        else:
+            libraries = self.library_loader.load_multiple(config.library_assignments)
+        return {
+            "brief": problem_brief.model_dump(),
+            "config": config.model_dump(),
+            "libraries": {name: content_hash(content) for name, content in libraries.items() if content},
+        }
+
+    def _build_library_context(self, config: InventorConfig, budget: PromptBudget, fixed: list[str]) -> str:
+        """Build library context string for an inventor, sized to the call's budget."""
         if config.inventor_type == "tabula_rasa":
             return "LIBRARIES: None provided. Reason from your own knowledge only."
 
@@ -129,12 +176,7 @@ class Inventor:
             all_libs = self.library_loader.get_all()
             if not all_libs:
                 return "LIBRARIES: No libraries available."
-            parts = ["REFERENCE LIBRARIES:"]
-            for name, content in all_libs.items():
-                # Truncate very large libraries to avoid context overflow
-                truncated = content[:30000] if len(content) > 30000 else content
-                parts.append(f"\n--- {name.upper()} ---\n{truncated}")
-            return "\n".join(parts)
+            return format_library_context("REFERENCE LIBRARIES:", all_libs, budget, fixed)
 
         # Load assigned libraries
         if not config.library_assignments:
@@ -146,8 +188,4 @@ class Inventor:
         if not loaded:
             return "LIBRARIES: Assigned libraries not available."
 
-        parts = ["REFERENCE LIBRARIES:"]
-        for name, content in loaded.items():
-            truncated = content[:30000] if len(content) > 30000 else content
-            parts.append(f"\n--- {name.upper()} ---\n{truncated}")
-        return "\n".join(parts)
+        return format_library_context("REFERENCE LIBRARIES:", loaded, budget, fixed)
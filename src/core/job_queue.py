@@ -0,0 +1,485 @@
+"""Job queue - batch runs that workers on several hosts drain together.
+
+Jobs are ``ZeusRequest``s keyed by an idempotent key (a batch item's id),
+so adding the same batch twice queues each item once. A worker claims a
+job under a lease that it renews with heartbeats while the run lasts; a
+job whose lease expires (its worker crashed or lost the directory) is
+claimed again, and resumes the run from its last checkpoint when the
+records are kept in the shared directory too. Each claim gets its own
+lease token, so a worker whose lease expired cannot renew or finish the
+job it lost, even after claiming it again.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable
+from src.models.schemas import BudgetConfig, BudgetUsed, ZeusRequest
+from src.llm.openrouter import OpenRouterClient
+from src.llm.cache import ResponseCache
+from src.llm.rate_limiter import SharedRateLimit, SQLiteTransaction
+from src.core.batch import BatchItem, result_line
+from src.core.budget import RunBudget, SharedBudget
+from src.core.persistence import Persistence
+from src.core.run_controller import RunController, build_client_kwargs
+
+logger = logging.getLogger(__name__)
+
+# Seconds a claim lasts without a heartbeat
+_DEFAULT_LEASE = 120.0
+# Heartbeats per lease, so a late one or two do not lose the job
+_HEARTBEATS_PER_LEASE = 3
+# Claims of a job before it is failed (crashes or expired leases count too)
+_DEFAULT_MAX_ATTEMPTS = 3
+# Seconds an idle worker waits before trying to claim again
+_CLAIM_POLL = 2.0
+# Seconds a worker waits for another's lock on the queue
+_LOCK_TIMEOUT = 30.0
+# Journal mode of every file in a queue directory: a rollback journal relies
+# on file locks only, while WAL's shared-memory index does not work across
+# hosts or over a network filesystem
+_JOURNAL_MODE = "DELETE"
+
+
+class QueuedJob:
+    """A job claimed from a queue: what to run, and under which run id."""
+
+    def __init__(
+        self,
+        key: str,
+        request: ZeusRequest,
+        budget: dict[str, Any],
+        run_id: str,
+        attempts: int,
+        lease: str,
+    ):
+        self.key = key
+        self.request = request
+        # BudgetConfig overrides for this job only
+        self.budget = budget
+        # Kept across attempts, so a retry resumes the checkpointed run
+        self.run_id = run_id
+        self.attempts = attempts
+        # Token of this claim; heartbeats and results must present it
+        self.lease = lease
+
+
+class JobQueue(ABC):
+    """Interface of a job queue shared by workers.
+
+    Implementations must make ``claim`` atomic across every worker and
+    host using the queue, and treat a job whose lease has expired as
+    claimable again. A claim's ``lease`` token stops being accepted as
+    soon as the job is claimed again. Methods may block on storage, so
+    async callers run them with ``asyncio.to_thread``.
+    """
+
+    @abstractmethod
+    def add(self, key: str, request: ZeusRequest, budget: dict[str, Any] | None = None, priority: int = 0) -> bool:
+        """Queue a job unless ``key`` is already known.
+
+        Returns:
+            Whether the job was added.
+        """
+
+    @abstractmethod
+    def claim(self, worker: str, lease_seconds: float) -> QueuedJob | None:
+        """Lease the next job (highest priority, then oldest) to ``worker``; None if none is ready."""
+
+    @abstractmethod
+    def heartbeat(self, key: str, lease: str, lease_seconds: float) -> bool:
+        """Extend the claim ``lease`` of a job; False if the lease was lost."""
+
+    @abstractmethod
+    def complete(self, key: str, lease: str, result: dict[str, Any]) -> bool:
+        """Record a job's result line (see ``batch.result_line``).
+
+        Returns:
+            Whether it was recorded; False if the lease was lost.
+        """
+
+    @abstractmethod
+    def fail(self, key: str, lease: str, error: str) -> bool:
+        """Give a job back for another attempt, or fail it once its attempts are spent.
+
+        Returns:
+            Whether the job will be attempted again; False as well if the
+            lease was lost.
+        """
+
+    @abstractmethod
+    def counts(self) -> dict[str, int]:
+        """Jobs by status: ``queued``, ``leased``, ``done`` and ``failed``."""
+
+    @abstractmethod
+    def results(self) -> list[dict[str, Any]]:
+        """Result lines of finished jobs, in the order they finished."""
+
+    def close(self) -> None:
+        """Release the queue's resources."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in an SQLite file, e.g. in a directory shared by several hosts.
+
+    Claims, heartbeats and results are single write transactions, so
+    workers in any process or host that can lock the file agree on who
+    holds a job. Network filesystems must support SQLite's file locking.
+    Leases use wall-clock time, so hosts' clocks should be in sync to
+    well within a lease.
+    """
+
+    DB_NAME = "jobs.sqlite3"
+
+    def __init__(self, path: str | Path, max_attempts: int = _DEFAULT_MAX_ATTEMPTS):
+        """Initialize the queue.
+
+        Args:
+            path: SQLite file of the queue, e.g. ``<shared dir>/jobs.sqlite3``.
+            max_attempts: Claims of a job before it is failed.
+        """
+        db_path = Path(path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = db_path
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path), timeout=_LOCK_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA journal_mode={_JOURNAL_MODE}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                key TEXT PRIMARY KEY,
+                request TEXT NOT NULL,
+                budget TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                run_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease TEXT,
+                lease_until REAL,
+                error TEXT,
+                result TEXT,
+                created_at REAL NOT NULL,
+                finished_at REAL
+            )
+            """
+        )
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "lease" not in existing:
+            # Queues created before claims had their own token
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN lease TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, priority, created_at)")
+
+    def add(self, key: str, request: ZeusRequest, budget: dict[str, Any] | None = None, priority: int = 0) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (key, request, budget, priority, run_id, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                (key, request.model_dump_json(), json.dumps(budget or {}), priority, str(uuid.uuid4()), time.time()),
+            )
+        return cur.rowcount == 1
+
+    def claim(self, worker: str, lease_seconds: float) -> QueuedJob | None:
+        now = time.time()
+        with self._transaction():
+            self._expire(now)
+            row = self._conn.execute(
+                "SELECT key, request, budget, run_id, attempts FROM jobs "
+                "WHERE status = 'queued' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY priority DESC, created_at ASC LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            key, request, budget, run_id, attempts = row
+            lease = uuid.uuid4().hex
+            self._conn.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, lease = ?, lease_until = ?, attempts = ? "
+                "WHERE key = ?",
+                (worker, lease, now + lease_seconds, attempts + 1, key),
+            )
+        return QueuedJob(
+            key, ZeusRequest.model_validate_json(request), json.loads(budget), run_id, attempts + 1, lease
+        )
+
+    def heartbeat(self, key: str, lease: str, lease_seconds: float) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE key = ? AND lease = ? AND status = 'leased'",
+                (time.time() + lease_seconds, key, lease),
+            )
+        return cur.rowcount == 1
+
+    def complete(self, key: str, lease: str, result: dict[str, Any]) -> bool:
+        status = "done" if result["status"] == "done" else "failed"
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL "
+                "WHERE key = ? AND lease = ? AND status = 'leased'",
+                (status, json.dumps(result, ensure_ascii=False), result.get("error"), time.time(), key, lease),
+            )
+        return cur.rowcount == 1
+
+    def fail(self, key: str, lease: str, error: str) -> bool:
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT attempts, run_id FROM jobs WHERE key = ? AND lease = ? AND status = 'leased'", (key, lease)
+            ).fetchone()
+            if row is None:
+                return False
+            attempts, run_id = row
+            if attempts < self.max_attempts:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', worker = NULL, lease = NULL, lease_until = NULL, error = ? "
+                    "WHERE key = ?",
+                    (error, key),
+                )
+                return True
+            self._finish_failed(key, run_id, f"{error} (after {attempts} attempts)")
+            return False
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"queued": 0, "leased": 0, "done": 0, "failed": 0, **dict(rows)}
+
+    def results(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM jobs WHERE result IS NOT NULL ORDER BY finished_at ASC"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _expire(self, now: float) -> None:
+        """Fail expired leases of jobs whose attempts are spent (caller holds a transaction)."""
+        rows = self._conn.execute(
+            "SELECT key, run_id, attempts FROM jobs WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, self.max_attempts),
+        ).fetchall()
+        for key, run_id, attempts in rows:
+            logger.warning(f"Job {key}: lease expired on its last attempt ({attempts}) — failing it")
+            self._finish_failed(key, run_id, f"Lease expired {attempts} times")
+
+    def _finish_failed(self, key: str, run_id: str, error: str) -> None:
+        result = result_line(key, run_id, error=error)
+        self._conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, result = ?, finished_at = ?, lease_until = NULL "
+            "WHERE key = ?",
+            (error, json.dumps(result), time.time(), key),
+        )
+
+    def _transaction(self) -> SQLiteTransaction:
+        return SQLiteTransaction(self._conn, self._lock)
+
+
+def add_batch(job_queue: JobQueue, items: list[BatchItem], priority: int = 0) -> int:
+    """Queue batch items under their ids; items already queued are left as they are.
+
+    Returns:
+        The number of items added.
+    """
+    added = sum(job_queue.add(item.item_id, item.request, item.budget, priority) for item in items)
+    logger.info(f"Queued {added} of {len(items)} items ({len(items) - added} already known)")
+    return added
+
+
+async def work_queue(
+    job_queue: JobQueue,
+    concurrency: int = 4,
+    api_key: str | None = None,
+    model: str | None = None,
+    phase_models: dict[str, str] | None = None,
+    phase_fallbacks: dict[str, list[str]] | None = None,
+    budget: dict[str, Any] | None = None,
+    shared_budget: dict[str, Any] | None = None,
+    cache: bool = False,
+    cache_all: bool = False,
+    hedge_percentile: float | None = None,
+    requests_per_minute: float = 0.0,
+    shared_state: str | Path | None = None,
+    persistence: Persistence | None = None,
+    lease_seconds: float = _DEFAULT_LEASE,
+    keep_running: bool = False,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+    worker: str | None = None,
+) -> dict[str, int]:
+    """Claim and run jobs from ``job_queue`` until it is drained.
+
+    At most ``concurrency`` runs are in flight, over one shared client.
+    Each run's lease is renewed while it lasts; a run whose lease is lost
+    (another worker took the job over) is cancelled. A failed run is
+    given back to the queue until its attempts are spent.
+
+    Args:
+        job_queue: The queue to drain.
+        concurrency: Max runs in flight in this worker.
+        api_key: Optional API key (uses env var if not provided).
+        model: Optional model override for every run.
+        phase_models: Optional model overrides by phase key.
+        phase_fallbacks: Optional fallback models by phase key.
+        budget: Default BudgetConfig fields for every run.
+        shared_budget: Optional caps on all runs of every worker sharing
+            ``shared_state`` (see ``SharedBudget``); never reset here.
+        cache: Serve low-temperature calls from the response cache.
+        cache_all: Cache every call.
+        hedge_percentile: Hedge calls past this latency percentile.
+        requests_per_minute: Optional cap on requests per model per
+            minute across every worker sharing ``shared_state``.
+        shared_state: Directory of rate-limit and budget state shared with
+            other workers; required for ``requests_per_minute`` and
+            ``shared_budget``.
+        persistence: Where run records are kept; keep them in a shared
+            directory so a retried job resumes its checkpoint on any host.
+        lease_seconds: Seconds a claim lasts without a heartbeat.
+        keep_running: Wait for new jobs instead of returning once none is left.
+        on_result: Optional callback receiving each result line.
+        worker: Name of this worker in the queue; host and pid by default.
+
+    Returns:
+        Counts of ``succeeded``, ``failed`` and ``retried`` runs of this worker.
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    persistence = persistence or Persistence()
+    base_budget = BudgetConfig(**(budget or {}))
+    counts = {"succeeded": 0, "failed": 0, "retried": 0}
+
+    shared_limits = None
+    if shared_state:
+        shared_state = Path(shared_state)
+        shared_state.mkdir(parents=True, exist_ok=True)
+        shared_limits = SharedRateLimit(
+            shared_state / SharedRateLimit.DB_NAME, requests_per_minute, journal_mode=_JOURNAL_MODE
+        )
+    elif requests_per_minute or shared_budget:
+        raise ValueError("requests_per_minute and shared_budget need a shared_state directory")
+
+    response_cache = ResponseCache() if cache or cache_all else None
+    client_kwargs = build_client_kwargs(
+        api_key, model, base_budget, False, hedge_percentile, response_cache, cache_all, shared_limits
+    )
+    pool: RunBudget | None = None
+
+    async def run_job(client: OpenRouterClient, job: QueuedJob) -> None:
+        heartbeat = None
+        try:
+            # A job that cannot start (bad budget, unreadable record) is failed like any other
+            controller = RunController(
+                client,
+                persistence=persistence,
+                on_progress=lambda msg: logger.debug(f"[{job.key}] {msg}"),
+                budget_config=BudgetConfig(**{**base_budget.model_dump(), **job.budget}),
+                library_paths=job.request.library_paths,
+                model_overrides=phase_models,
+                fallback_models=phase_fallbacks,
+                budget_pool=pool,
+            )
+            # Only the job's own checkpoint, not a record whose ID shares a prefix
+            if await asyncio.to_thread(persistence.load, job.run_id, exact=True) is not None:
+                logger.info(f"Job {job.key}: resuming run {job.run_id} (attempt {job.attempts})")
+                run = asyncio.create_task(controller.resume(job.run_id))
+            else:
+                run = asyncio.create_task(controller.run(job.request, run_id=job.run_id))
+            heartbeat = asyncio.create_task(_keep_lease(job_queue, job, lease_seconds, run))
+            response = await run
+        except asyncio.CancelledError:
+            if heartbeat is not None and heartbeat.done():
+                logger.warning(f"Job {job.key}: lease lost to another worker — run stopped")
+                return
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.key} failed (attempt {job.attempts}): {e}", exc_info=True)
+            retried = await asyncio.to_thread(job_queue.fail, job.key, job.lease, str(e))
+            counts["retried" if retried else "failed"] += 1
+            return
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+
+        result = result_line(job.key, job.run_id, response)
+        if not await asyncio.to_thread(job_queue.complete, job.key, job.lease, result):
+            logger.warning(f"Job {job.key}: lease lost before the result was recorded — dropping it")
+            return
+        counts["succeeded"] += 1
+        if on_result:
+            on_result(result)
+
+    in_flight: set[asyncio.Task] = set()
+    try:
+        async with OpenRouterClient(**client_kwargs) as client:
+            await client.load_model_limits()
+            if shared_budget:
+                pool_config = BudgetConfig(**{
+                    "max_llm_calls": 0, "max_tokens_in": 0, "max_tokens_out": 0, "max_cost_usd": 0.0,
+                    **shared_budget,
+                })
+                pool = SharedBudget(
+                    pool_config, shared_state / SharedBudget.DB_NAME, client.model_pricing, journal_mode=_JOURNAL_MODE
+                )
+
+            logger.info(f"Worker {worker}: draining {await asyncio.to_thread(job_queue.counts)}")
+            while True:
+                while len(in_flight) < concurrency and (
+                    job := await asyncio.to_thread(job_queue.claim, worker, lease_seconds)
+                ):
+                    logger.info(f"Job {job.key}: claimed (attempt {job.attempts})")
+                    in_flight.add(asyncio.create_task(run_job(client, job)))
+                if not in_flight:
+                    if not keep_running:
+                        break
+                    await asyncio.sleep(_CLAIM_POLL)
+                    continue
+                done, in_flight = await asyncio.wait(
+                    in_flight, timeout=_CLAIM_POLL, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if not task.cancelled() and task.exception() is not None:
+                        logger.error(f"Worker {worker}: job task failed: {task.exception()}")
+    finally:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        if response_cache:
+            logger.info(f"LLM response cache: {response_cache.stats()}")
+            response_cache.close()
+        if isinstance(pool, SharedBudget):
+            pool.close()
+        if shared_limits:
+            shared_limits.close()
+
+    logger.info(f"Worker {worker} done: {counts}")
+    return counts
+
+
+async def _keep_lease(
+    job_queue: JobQueue,
+    job: QueuedJob,
+    lease_seconds: float,
+    run: asyncio.Task,
+) -> None:
+    """Renew a job's lease while its run lasts; cancel the run if the lease is lost."""
+    while True:
+        await asyncio.sleep(lease_seconds / _HEARTBEATS_PER_LEASE)
+        try:
+            held = await asyncio.to_thread(job_queue.heartbeat, job.key, job.lease, lease_seconds)
+        except Exception as e:
+            logger.warning(f"Job {job.key}: heartbeat failed, retrying: {e}")
+            continue
+        if not held:
+            run.cancel()
+            return
@@ -2,15 +2,23 @@
 
 import asyncio
 import logging
+from contextlib import nullcontext
 from src.models.schemas import (
     LibraryCritiqueIssue, LibraryCritiqueFinding, LibraryCritiqueResult,
 )
-from src.llm.openrouter import OpenRouterClient
+from src.llm.openrouter import OpenRouterClient, accumulate_usage
+from src.llm.structured import json_schema_format
 from src.prompts.library_critique import LibraryCritiquePrompts
 from src.core.library_loader import LibraryLoader
+from src.core.budget import BudgetReservation, RunBudget
 
 logger = logging.getLogger(__name__)
 
+_MAX_TOKENS = 4096
+
+# The library name is filled in locally, not by the model
+_FINDING_FORMAT = json_schema_format(LibraryCritiqueFinding, exclude={"library_name"})
+
 
 class LibraryCritic:
     """Runs parallel library-informed critics against a unified draft."""
@@ -24,12 +32,19 @@ class LibraryCritic:
         draft: str,
         eval_criteria: str = "",
         model: str | None = None,
+        run_budget: RunBudget | None = None,
+        max_critics: int | None = None,
     ) -> tuple[LibraryCritiqueResult, dict[str, int]]:
         """Run all library critics in parallel.
 
+        With a ``run_budget``, a call is reserved for each critic before
+        any is launched; critics the budget cannot cover are not run.
+
         Args:
             draft: The unified draft to critique.
             eval_criteria: Evaluation criteria text.
+            run_budget: Optional run budget to reserve the critics' calls from.
+            max_critics: Optional cap on the number of critics run.
 
         Returns:
             Tuple of (LibraryCritiqueResult, aggregated usage stats).
@@ -40,22 +55,44 @@ class LibraryCritic:
             logger.warning("No libraries available for critique")
             return LibraryCritiqueResult(), {"tokens_in": 0, "tokens_out": 0, "llm_calls": 0}
 
+        critics = [
+            (lib_name, lib_content) for lib_name, lib_content in available_libs.items()
+            if lib_content and lib_name in LibraryCritiquePrompts.CRITIQUE_TEMPLATES
+        ]
+        if max_critics is not None:
+            critics = critics[:max(max_critics, 0)]
+        if run_budget is not None:
+            reservations = await asyncio.to_thread(
+                run_budget.reserve, len(critics), tokens_out=_MAX_TOKENS, min_tasks=0, label="library critics"
+            )
+        else:
+            reservations = [None] * len(critics)
+        if len(reservations) < len(critics):
+            logger.warning(
+                f"Budget covers {len(reservations)} of {len(critics)} critics — skipping "
+                f"{[name for name, _ in critics[len(reservations):]]}"
+            )
+
         # Run critics in parallel
         tasks = []
         critic_names = []
-        for lib_name, lib_content in available_libs.items():
-            if lib_content and lib_name in LibraryCritiquePrompts.CRITIQUE_TEMPLATES:
-                tasks.append(self._run_single_critic(
-                    draft,
-                    lib_name,
-                    lib_content,
-                    eval_criteria,
-                    model=model,
-                ))
-                critic_names.append(lib_name)
+        for (lib_name, lib_content), reservation in zip(critics, reservations):
+            tasks.append(self._run_single_critic(
+                draft,
+                lib_name,
+                lib_content,
+                eval_criteria,
+                model=model,
+                reservation=reservation,
+            ))
+            critic_names.append(lib_name)
 
         logger.info(f"Launching {len(tasks)} library critics in parallel: {critic_names}")
         results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Critics that failed before calling the LLM still hold theirs
+        for reservation in reservations:
+            if reservation is not None:
+                await asyncio.to_thread(reservation.release)
 
         findings = []
         all_issues = []
@@ -68,8 +105,7 @@ class LibraryCritic:
             finding, usage = result
             findings.append(finding)
             all_issues.extend(finding.issues)
-            total_usage["tokens_in"] += usage.get("tokens_in", 0)
-            total_usage["tokens_out"] += usage.get("tokens_out", 0)
+            accumulate_usage(total_usage, usage)
             total_usage["llm_calls"] += 1
             issue_summary = f"{sum(1 for x in finding.issues if x.severity=='blocker')}B/" \
                             f"{sum(1 for x in finding.issues if x.severity=='major')}M/" \
@@ -100,32 +136,49 @@ class LibraryCritic:
         library_content: str,
         eval_criteria: str,
         model: str | None = None,
+        reservation: BudgetReservation | None = None,
     ) -> tuple[LibraryCritiqueFinding, dict[str, int]]:
-        """Run a single library critic."""
+        """Run a single library critic, within its budget ``reservation`` if given."""
         logger.info(f"Critic '{library_name}': preparing prompt ({len(library_content)} chars library)...")
         template = LibraryCritiquePrompts.CRITIQUE_TEMPLATES[library_name]
         questions = "\n".join(f"- {q}" for q in template["questions"])
 
-        # Truncate library content if too large
-        if len(library_content) > 30000:
-            library_content = library_content[:30000] + "\n\n[... truncated ...]"
-
         prompt = LibraryCritiquePrompts.CRITIQUE.format(
             critic_name=template["name"],
             draft=draft,
             library_name=library_name,
-            library_content=library_content,
-            eval_criteria=eval_criteria or "Not provided",
             questions=questions,
         )
 
-        response, usage = await self.llm.generate_json(
-            prompt=prompt,
-            system=LibraryCritiquePrompts.SYSTEM,
-            temperature=0.5,
-            model=model,
+        # Size the library to whatever the draft and template leave free
+        budget = self.llm.prompt_budget(model, _MAX_TOKENS)
+        frame = LibraryCritiquePrompts.CONTEXT.format(
+            library_name=library_name,
+            library_content="",
+            eval_criteria=eval_criteria or "Not provided",
+        )
+        [library_content] = budget.fit([LibraryCritiquePrompts.SYSTEM, frame, prompt], [library_content])
+
+        # Library and criteria do not change between re-critiques, the draft does
+        context = LibraryCritiquePrompts.CONTEXT.format(
+            library_name=library_name,
+            library_content=library_content,
+            eval_criteria=eval_criteria or "Not provided",
         )
 
+        async with reservation or nullcontext():
+            response, usage = await self.llm.generate_json(
+                prompt=prompt,
+                system=LibraryCritiquePrompts.SYSTEM,
+                temperature=0.5,
+                max_tokens=budget.max_tokens,
+                model=model,
+                response_format=_FINDING_FORMAT,
+                context_blocks=[context],
+            )
+            if reservation is not None:
+                await asyncio.to_thread(reservation.consume)
+
         # Parse issues
         issues = []
         for issue_data in response.get("issues", []):
@@ -2,6 +2,7 @@
 
 import logging
 from pathlib import Path
+from src.llm.prompt_budget import PromptBudget
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,32 @@ DEFAULT_LIBRARY_MAP = {
 ALL_LIBRARY_NAMES = list(DEFAULT_LIBRARY_MAP.keys())
 
 
+def format_library_context(
+    header: str,
+    libraries: dict[str, str],
+    budget: PromptBudget,
+    fixed: list[str],
+) -> str:
+    """Render libraries as one prompt block, shrunk to fit the call's budget.
+
+    Args:
+        header: Heading line for the block.
+        libraries: Dict of name -> content.
+        budget: Token plan of the call the block is for.
+        fixed: The rest of the prompt, which is never cut.
+
+    Returns:
+        The formatted block; libraries that do not fit at all are omitted.
+    """
+    titles = [f"\n--- {name.upper()} ---\n" for name in libraries]
+    bodies = budget.fit(fixed + [header] + titles, list(libraries.values()))
+    parts = [header]
+    for title, body in zip(titles, bodies):
+        if body:
+            parts.append(f"{title}{body}")
+    return "\n".join(parts)
+
+
 class LibraryLoader:
     """Loads markdown library files for use by inventors and critics."""
 
@@ -3,9 +3,11 @@
 import json
 import logging
 from pathlib import Path
+from typing import Any
 from src.models.schemas import ZeusRequest, ProblemBrief, ProblemClassification
 from src.llm.openrouter import OpenRouterClient
 from src.prompts.intake import IntakePrompts
+from src.core.phase_store import content_hash
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +93,38 @@ class Normalizer:
                      f"{len(brief.implicit_assumptions)} assumptions, {len(brief.ambiguities)} ambiguities")
         return brief, usage
 
+    def fingerprint(self, request: ZeusRequest) -> dict[str, Any]:
+        """Inputs that determine the ProblemBrief of ``request``, for memoizing Phase 0."""
+        return {
+            "prompt": request.prompt,
+            "constraints": request.constraints,
+            "objectives": request.objectives,
+            "context": self._format_context(request.context),
+            "output_spec": content_hash(self._load_file(request.output_spec_path)),
+            "eval_criteria": content_hash(self._load_file(request.eval_criteria_path)),
+        }
+
+    def carry_over(self, brief: ProblemBrief, previous: ZeusRequest, request: ZeusRequest) -> ProblemBrief:
+        """Adapt the brief of ``previous`` to ``request`` without another intake call.
+
+        Only the parts of the brief copied from the request change: the
+        user's constraints and objectives are swapped for those of
+        ``request`` (ones extracted from the prompt are kept), and the
+        output spec and eval criteria are read again. The classification
+        and problem statement stay as they were, so this is only valid
+        when the prompt and context are unchanged.
+        """
+        brief = brief.model_copy(deep=True)
+        brief.constraints = self._merge_constraints(
+            request.constraints, [c for c in brief.constraints if c not in previous.constraints]
+        )
+        brief.objectives = self._merge_lists(
+            request.objectives, [o for o in brief.objectives if o not in previous.objectives]
+        )
+        brief.output_spec = self._load_file(request.output_spec_path)
+        brief.eval_criteria = self._load_file(request.eval_criteria_path)
+        return brief
+
     def _format_context(self, context: str | dict | None) -> str:
         if context is None:
             return "None provided"
@@ -1,5 +1,6 @@
 """Persistence - RunRecord storage."""
 
+import glob
 import json
 import os
 from pathlib import Path
@@ -8,7 +9,7 @@ from src.models.schemas import RunRecord
 
 
 class Persistence:
-    """Handles RunRecord storage (append-only)."""
+    """Handles RunRecord storage: one JSON file per run, replaced atomically on each save."""
 
     DEFAULT_DIR = "run_records"
 
@@ -55,7 +56,11 @@ class Persistence:
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
     def save(self, record: RunRecord) -> Path:
-        """Save a run record to disk (append-only).
+        """Save a run record to disk, replacing the run's previous version.
+
+        The write is atomic: the record goes to a temporary file that then
+        replaces the previous version, so a crash mid-save (e.g. during a
+        checkpoint) never leaves a truncated record behind.
 
         Args:
             record: The RunRecord to save.
@@ -67,28 +72,42 @@ class Persistence:
         timestamp = datetime.fromisoformat(record.timestamp).strftime("%Y%m%d_%H%M%S")
         filename = f"{timestamp}_{record.run_id[:8]}.json"
         filepath = self.base_dir / filename
+        tmp_path = filepath.with_name(f".{filename}.tmp")
 
         # Serialize and save
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(record.model_dump(), f, indent=2, ensure_ascii=False)
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record.model_dump(), f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
         return filepath
 
-    def load(self, run_id: str) -> RunRecord | None:
+    def load(self, run_id: str, exact: bool = False) -> RunRecord | None:
         """Load a run record by ID.
 
         Args:
             run_id: The run ID to load.
+            exact: Only return the record whose ID is ``run_id``, e.g. for
+                IDs from untrusted callers. By default the first record
+                whose file name contains the ID's first 8 characters is
+                returned, so a short ID works too.
 
         Returns:
             The RunRecord if found, None otherwise.
         """
         # Search for file matching run_id
-        for filepath in self.base_dir.glob("*.json"):
+        pattern = f"*_{glob.escape(run_id[:8])}.json" if exact else "*.json"
+        for filepath in self.base_dir.glob(pattern):
             if run_id[:8] in filepath.name:
                 with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return RunRecord.model_validate(data)
+                    record = RunRecord.model_validate(json.load(f))
+                if exact and record.run_id != run_id:
+                    continue
+                return record
         return None
 
     def list_runs(self, limit: int = 50) -> list[dict]:
@@ -132,6 +151,8 @@ class Persistence:
                     )
                     if budget_stopped:
                         status = "Stopped (Budget limit)"
+                    elif not has_response and data.get("completed_phases"):
+                        status = "Interrupted (resumable)"
                     elif has_response and not errors:
                         status = "Completed"
                     elif has_response and errors:
@@ -0,0 +1,71 @@
+"""Phase store - memoized phase results keyed by a hash of their inputs."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+from src.llm.cache import SQLiteCache
+
+
+def content_hash(text: str) -> str:
+    """Short SHA-256 digest of ``text``, to stand in for large inputs in a key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class PhaseStore(SQLiteCache):
+    """SQLite-backed store of phase results, reused across runs.
+
+    Entries are keyed by a SHA-256 hash of the phase, the model that
+    produced the result, the version of the phase's prompts and the
+    phase's inputs (e.g. the ProblemBrief, the InventorConfig and hashes
+    of the library content). A changed input, model or prompt version
+    gives a new key, so bumping a prompt version invalidates its entries
+    without any explicit purge. Entries older than ``ttl_seconds`` are
+    treated as misses; the least recently used are evicted beyond
+    ``max_entries``.
+    """
+
+    DB_NAME = "phase_results.sqlite3"
+    TABLE = "phase_results"
+    COLUMNS = {"phase": "TEXT NOT NULL", "value": "TEXT NOT NULL"}
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = 2000,
+        ttl_seconds: float = 30 * 24 * 3600,
+    ):
+        """Initialize the store.
+
+        Args:
+            path: SQLite file, or a directory to create it in. Defaults to
+                $ZEUS_CACHE_DIR, else ./.zeus_cache/phase_results.sqlite3.
+            max_entries: Max number of stored results.
+            ttl_seconds: Age after which an entry is treated as a miss.
+        """
+        super().__init__(path, max_entries, None, ttl_seconds)
+
+    @staticmethod
+    def make_key(phase: str, model: str, prompt_version: dict[str, str], inputs: dict[str, Any]) -> str:
+        """Return the hash identifying a phase result.
+
+        Args:
+            phase: Phase (or step) name, e.g. ``phase_0`` or ``phase_1_inventor``.
+            model: Model that produces the result.
+            prompt_version: Version info of the phase's prompts
+                (``get_version_info()`` of its prompt class).
+            inputs: JSON-serializable inputs of the phase.
+        """
+        keyed = {"phase": phase, "model": model, "prompts": prompt_version, "inputs": inputs}
+        canonical = json.dumps(keyed, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Look up a stored result; None on a miss."""
+        row = self._lookup(key, ("value",))
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key: str, phase: str, value: dict[str, Any]) -> None:
+        """Store a result and evict entries beyond ``max_entries``."""
+        encoded = json.dumps(value, ensure_ascii=False)
+        self._store(key, len(encoded.encode("utf-8")), phase=phase, value=encoded)
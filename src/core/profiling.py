@@ -0,0 +1,141 @@
+"""Run profiling - wall, queue, CPU and memory use of phases and LLM calls."""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+from src.models.schemas import CallTiming, PhaseTiming, RunTimings
+
+logger = logging.getLogger(__name__)
+
+# A call ending this many seconds after another started still counts as its predecessor
+_CRITICAL_PATH_SLACK = 0.05
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MiB; 0 where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def critical_path(calls: list[CallTiming]) -> list[int]:
+    """Indices of the chain of calls that bounded a run's wall time, earliest first.
+
+    The chain starts from the call that ended last and steps back, each
+    time, to the call that ended last before the current one started:
+    the one it most likely waited on. Cancelled calls (e.g. the loser of
+    a hedge) are left out.
+    """
+    candidates = [i for i, call in enumerate(calls) if call.status != "cancelled"]
+    if not candidates:
+        return []
+
+    def end(i: int) -> float:
+        return calls[i].start_s + calls[i].wall_s
+
+    current = max(candidates, key=end)
+    path = [current]
+    while True:
+        start = calls[current].start_s
+        before = [
+            i for i in candidates
+            if calls[i].start_s < start and end(i) <= start + _CRITICAL_PATH_SLACK
+        ]
+        if not before:
+            break
+        current = max(before, key=end)
+        path.append(current)
+    return path[::-1]
+
+
+def kept_timings(timings: RunTimings, phases: list[str]) -> RunTimings:
+    """The timings of ``phases`` (and their calls) out of those of an earlier execution.
+
+    Used when a run is resumed or rerun: the phases it does not execute
+    again keep their timings, those it repeats start afresh. The totals
+    stay those of the earlier execution, which the next one adds to.
+    """
+    calls = [call.model_copy() for call in timings.calls if call.phase in phases]
+    return RunTimings(
+        wall_s=timings.wall_s,
+        cpu_s=timings.cpu_s,
+        peak_rss_mb=timings.peak_rss_mb,
+        phases=[phase.model_copy() for phase in timings.phases if phase.phase in phases],
+        calls=calls,
+        critical_path=critical_path(calls),
+    )
+
+
+class RunProfiler:
+    """Collects the phase and call timings of one run into a RunTimings.
+
+    CPU time and peak memory are those of the whole process, so phases
+    that overlap (Phase 2 runs alongside Phase 1) or runs sharing the
+    process (a batch) are not told apart. Timings carried over from an
+    earlier execution (see ``kept_timings``) come first on the run's
+    clock: this execution starts where that one ended.
+    """
+
+    def __init__(self, timings: RunTimings):
+        self.timings = timings
+        self._started = time.monotonic() - timings.wall_s
+        self._cpu_started = time.process_time() - timings.cpu_s
+
+    def observer(self, phase: str) -> Callable[[dict[str, Any]], None]:
+        """A ``call_observer`` recording each finished call as made in ``phase``."""
+
+        def record(call: dict[str, Any]) -> None:
+            if call["status"] == "running":
+                return
+            self.timings.calls.append(CallTiming(
+                phase=phase,
+                model=call["model"],
+                start_s=round(call["started"] - self._started, 3),
+                wall_s=round(call["ended"] - call["started"], 3),
+                queue_s=round(call["queue_ms"] / 1000, 3),
+                retries=call["retries"],
+                tokens_in=call["tokens_in"],
+                tokens_out=call["tokens_out"],
+                status=call["status"],
+            ))
+
+        return record
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Time the block as ``phase``; its calls are those recorded under the same key."""
+        started = time.monotonic()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            calls = [call for call in self.timings.calls if call.phase == phase]
+            self.timings.phases.append(PhaseTiming(
+                phase=phase,
+                start_s=round(started - self._started, 3),
+                wall_s=round(time.monotonic() - started, 3),
+                cpu_s=round(time.process_time() - cpu_started, 3),
+                peak_rss_mb=round(peak_rss_mb(), 1),
+                llm_calls=len(calls),
+                queue_s=round(sum(call.queue_s for call in calls), 3),
+                retries=sum(call.retries for call in calls),
+                tokens_in=sum(call.tokens_in for call in calls),
+                tokens_out=sum(call.tokens_out for call in calls),
+            ))
+
+    def finish(self) -> None:
+        """Fill in the run totals and its critical path."""
+        self.timings.wall_s = round(time.monotonic() - self._started, 3)
+        self.timings.cpu_s = round(time.process_time() - self._cpu_started, 3)
+        self.timings.peak_rss_mb = max(self.timings.peak_rss_mb, round(peak_rss_mb(), 1))
+        self.timings.critical_path = critical_path(self.timings.calls)
+        logger.info(
+            f"Run profile — {self.timings.wall_s:.1f}s wall, {self.timings.cpu_s:.1f}s CPU, "
+            f"{len(self.timings.calls)} calls, {len(self.timings.critical_path)} on the critical path"
+        )
@@ -1,17 +1,23 @@
 """Refiner - Phase 5: Iterative Refinement."""
 
+import asyncio
 import logging
+from contextlib import nullcontext
 from src.models.schemas import (
     ProblemBrief, LibraryCritiqueResult, LibraryCritiqueIssue,
     RefinementIteration,
 )
-from src.llm.openrouter import OpenRouterClient
+from src.llm.openrouter import OpenRouterClient, accumulate_usage
+from src.llm.prompt_budget import PromptBudget
 from src.prompts.refinement import RefinementPrompts
-from src.core.library_loader import LibraryLoader
+from src.core.library_loader import LibraryLoader, format_library_context
 from src.core.library_critic import LibraryCritic
+from src.core.budget import BudgetExceededError, RunBudget
 
 logger = logging.getLogger(__name__)
 
+_MAX_TOKENS = 16384
+
 
 class Refiner:
     """Iteratively refines the unified draft based on critique findings."""
@@ -30,15 +36,21 @@ class Refiner:
         budget_remaining: int = 10,
         generation_model: str | None = None,
         critique_model: str | None = None,
+        run_budget: RunBudget | None = None,
     ) -> tuple[str, list[RefinementIteration], dict[str, int]]:
         """Iteratively refine the draft.
 
+        Each re-critique runs at most as many critics as ``budget_remaining``
+        still allows. With a ``run_budget``, every call is also reserved
+        from it before it is made, and refinement stops once it cannot be.
+
         Args:
             draft: Current unified draft.
             critique_result: Initial critique findings.
             problem_brief: The problem brief.
             max_revisions: Maximum revision iterations.
             budget_remaining: Remaining LLM call budget.
+            run_budget: Optional run budget to reserve calls from.
 
         Returns:
             Tuple of (final_draft, refinement_history, aggregated_usage).
@@ -67,28 +79,44 @@ class Refiner:
 
             issues_str = self._format_issues(blockers + majors)
             constraints_str = "\n".join(f"- {c}" for c in problem_brief.constraints) if problem_brief.constraints else "None"
-            library_context = self._build_library_context()
 
+            # Libraries and brief are identical every iteration: later iterations read them from cache
+            brief = RefinementPrompts.BRIEF.format(
+                problem_brief=problem_brief.problem_statement,
+                constraints=constraints_str,
+            )
             prompt = RefinementPrompts.REFINE.format(
                 version=iteration,
                 draft=current_draft,
                 issues=issues_str,
-                problem_brief=problem_brief.problem_statement,
-                constraints=constraints_str,
-                library_context=library_context,
             )
+            budget = self.llm.prompt_budget(generation_model, _MAX_TOKENS)
+            library_context = self._build_library_context(budget, [RefinementPrompts.SYSTEM, brief, prompt])
+
+            reservation = None
+            if run_budget is not None:
+                try:
+                    [reservation] = await asyncio.to_thread(
+                        run_budget.reserve, tokens_out=_MAX_TOKENS, label="refinement"
+                    )
+                except BudgetExceededError as e:
+                    logger.info(f"Iteration {iteration}: budget exhausted — stopping ({e})")
+                    break
 
             logger.info(f"Iteration {iteration}: calling LLM for refinement...")
-            response, usage = await self.llm.generate_json(
-                prompt=prompt,
-                system=RefinementPrompts.SYSTEM,
-                temperature=0.5,
-                max_tokens=16384,
-                model=generation_model,
-            )
+            async with reservation or nullcontext():
+                response, usage = await self.llm.generate_json(
+                    prompt=prompt,
+                    system=RefinementPrompts.SYSTEM,
+                    temperature=0.5,
+                    max_tokens=budget.max_tokens,
+                    model=generation_model,
+                    context_blocks=[library_context, brief],
+                )
+                if reservation is not None:
+                    await asyncio.to_thread(reservation.consume)
 
-            total_usage["tokens_in"] += usage.get("tokens_in", 0)
-            total_usage["tokens_out"] += usage.get("tokens_out", 0)
+            accumulate_usage(total_usage, usage)
             total_usage["llm_calls"] += 1
             budget_remaining -= 1
 
@@ -104,10 +132,10 @@ class Refiner:
                     current_draft,
                     problem_brief.eval_criteria,
                     model=critique_model,
+                    run_budget=run_budget,
+                    max_critics=budget_remaining,
                 )
-                total_usage["tokens_in"] += critique_usage.get("tokens_in", 0)
-                total_usage["tokens_out"] += critique_usage.get("tokens_out", 0)
-                total_usage["llm_calls"] += critique_usage.get("llm_calls", 0)
+                accumulate_usage(total_usage, critique_usage)
                 budget_remaining -= critique_usage.get("llm_calls", 1)
 
                 new_blockers = current_critique.blocker_count
@@ -137,13 +165,9 @@ class Refiner:
                 lines.append(f"   Suggested fix: {issue.suggested_fix}")
         return "\n".join(lines) if lines else "No significant issues to address."
 
-    def _build_library_context(self) -> str:
-        """Build library context for refinement."""
+    def _build_library_context(self, budget: PromptBudget, fixed: list[str]) -> str:
+        """Build library context for refinement, sized to the call's budget."""
         all_libs = self.library_loader.get_all()
         if not all_libs:
             return ""
-        parts = ["AVAILABLE LIBRARIES FOR REFERENCE:"]
-        for name, content in all_libs.items():
-            truncated = content[:10000] if len(content) > 10000 else content
-            parts.append(f"\n--- {name.upper()} ---\n{truncated}")
-        return "\n".join(parts)
+        return format_library_context("AVAILABLE LIBRARIES FOR REFERENCE:", all_libs, budget, fixed)
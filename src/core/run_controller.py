@@ -2,8 +2,12 @@
 
 import asyncio
 import logging
+import sys
 import time
-from typing import Callable
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Iterator
+from pydantic import ValidationError
 
 logger = logging.getLogger(__name__)
 from src.models.schemas import (
@@ -13,16 +17,42 @@ from src.models.schemas import (
     BudgetUsed,
     BudgetConfig,
     InventorConfig,
+    InventorSolution,
+    ProblemBrief,
     CrossCritique,
     SelfEvaluationScorecard,
 )
+from src.models.events import (
+    RunEvent,
+    ProgressEvent,
+    PhaseStartedEvent,
+    RunStepEvent,
+    PhaseFinishedEvent,
+    CallStartedEvent,
+    CallFinishedEvent,
+    OutputDeltaEvent,
+    PartialResultEvent,
+    BudgetEvent,
+    ErrorEvent,
+    RunFinishedEvent,
+)
 from src.llm.openrouter import (
     OpenRouterClient,
     OpenRouterError,
     OpenRouterTimeoutError,
     OpenRouterRateLimitError,
     OpenRouterTransientError,
+    stream_listener,
+    model_fallbacks,
+    call_budget,
+    call_observer,
+    call_priority,
+    accumulate_usage,
 )
+from src.llm.cache import ResponseCache
+from src.llm.rate_limiter import CallPriority, SharedRateLimit
+from src.llm.prompt_budget import PromptTooLargeError
+from src.llm.structured import json_schema_format
 from src.core.normalizer import Normalizer
 from src.core.inventor import Inventor
 from src.core.synthesizer import Synthesizer
@@ -31,6 +61,10 @@ from src.core.library_critic import LibraryCritic
 from src.core.refiner import Refiner
 from src.core.assembler import Assembler
 from src.core.persistence import Persistence
+from src.core.phase_store import PhaseStore
+from src.core.profiling import RunProfiler, kept_timings
+from src.core.scheduler import PhaseGraph, Quorum
+from src.core.budget import BudgetExceededError, BudgetReservation, RunBudget
 from src.prompts.intake import IntakePrompts
 from src.prompts.inventor import InventorPrompts
 from src.prompts.synthesis import SynthesisPrompts
@@ -39,9 +73,115 @@ from src.prompts.refinement import RefinementPrompts
 from src.prompts.assembly import AssemblyPrompts
 
 
-class BudgetExceededError(Exception):
-    """Raised when LLM call budget is exhausted."""
-    pass
+# Minimum seconds between streamed-progress updates forwarded to on_progress
+_STREAM_PROGRESS_INTERVAL = 1.0
+# Characters of the latest partial output included in each update
+_STREAM_PREVIEW_CHARS = 60
+
+# Pipeline phases in order, as recorded in RunRecord.completed_phases
+_PHASES = ("phase_0", "phase_1", "phase_2", "phase_3", "phase_4", "phase_5", "phase_6")
+# First phase a rerun repeats when a request field changes. Constraints,
+# objectives, output spec and eval criteria are patched into the stored
+# brief (see Normalizer.carry_over) rather than re-running intake; the
+# inventors designed against the old constraints and objectives, though.
+_RERUN_FROM = {
+    "prompt": "phase_0",
+    "context": "phase_0",
+    "library_paths": "phase_1",
+    "num_inventors": "phase_1",
+    "constraints": "phase_1",
+    "objectives": "phase_1",
+    "enable_cross_pollination": "phase_2",
+    # Decided by whether the file contents changed (output spec: phase_3, eval criteria: phase_4)
+    "output_spec_path": None,
+    "eval_criteria_path": None,
+}
+
+# Priority of a phase's LLM calls when calls queue for a model (higher first).
+# The serial critical-path phases rank above Phase 1's fan-out, later ones
+# first so runs in flight finish; optional Phase 2 critiques rank last.
+_PHASE_PRIORITIES = {
+    "phase_6": 8,
+    "phase_5": 7,
+    "phase_4": 6,
+    "phase_3": 5,
+    "phase_0": 4,
+    "phase_1": 2,
+    "phase_2": 0,
+}
+
+# Record field a phase fills in, emitted as a partial result once it completes
+_PHASE_RESULTS = {
+    "phase_0": "problem_brief",
+    "phase_2": "cross_critiques",
+    "phase_3": "synthesis_result",
+    "phase_4": "library_critique",
+    "phase_5": "final_draft",
+}
+
+# Critic and target ids are filled in locally, not by the model
+_CROSS_CRITIQUE_FORMAT = json_schema_format(CrossCritique, exclude={"critic_id", "target_id"})
+
+
+class RunContext:
+    """State of one run of a RunController.
+
+    Everything a run changes lives here rather than on the controller, so
+    one controller (its client, caches and rate limiter) can serve many
+    runs at once. The run's context is bound to a ContextVar while it
+    executes and is inherited by the tasks it starts.
+
+    Attributes:
+        record: The run's record; None for phases called outside ``run()``.
+        run_id: Stamped on the run's events.
+        started: ``time.monotonic()`` at the start of the run.
+        event_sink: Extra event consumer (see ``RunController.run_stream``).
+        tenant: Group the run's LLM calls share slots fairly with (see
+            ``call_priority``); the run itself by default.
+        budget: Call, token and cost caps of the run, enforced on each call.
+        profiler: Phase and call timings of the run.
+        save_lock: Held while the record is written, so saves of the run
+            land in the order they were made.
+        library_loader, inventor, synthesizer, library_critic, refiner:
+            The controller's components, or the run's own when its request
+            sets ``library_paths``.
+    """
+
+    def __init__(
+        self,
+        controller: "RunController",
+        record: RunRecord | None = None,
+        event_sink: Callable[[RunEvent], None] | None = None,
+        tenant: str | None = None,
+    ):
+        self.controller = controller
+        self.record = record
+        self.run_id = record.run_id if record else ""
+        self.started = time.monotonic()
+        self.event_sink = event_sink
+        self.tenant = tenant or self.run_id
+        self.budget: RunBudget | None = controller._new_budget(record) if record else None
+        self.profiler: RunProfiler | None = RunProfiler(record.timings) if record else None
+        self.save_lock = asyncio.Lock()
+
+        library_paths = record.request.library_paths if record else []
+        if library_paths:
+            llm = controller.llm
+            self.library_loader = LibraryLoader(user_paths=library_paths)
+            self.inventor = Inventor(llm, self.library_loader)
+            self.synthesizer = Synthesizer(llm, self.library_loader)
+            self.library_critic = LibraryCritic(llm, self.library_loader)
+            self.refiner = Refiner(llm, self.library_loader)
+        else:
+            self.library_loader = controller.library_loader
+            self.inventor = controller.inventor
+            self.synthesizer = controller.synthesizer
+            self.library_critic = controller.library_critic
+            self.refiner = controller.refiner
+
+
+# Context of the run executing in the current task (see RunController._bind)
+_current_run: ContextVar[RunContext | None] = ContextVar("zeus_current_run", default=None)
 
 
 class RunController:
@@ -65,7 +205,7 @@ class RunController:
         6. Failures yield best-effort output with logged errors
         7. Each phase module independently replaceable
         8. Model + prompt versions recorded in RunRecord
-        9. RunRecords are append-only
+        9. RunRecords are persisted atomically
     """
 
     DEFAULT_BUDGET = BudgetConfig()
@@ -78,15 +218,34 @@ class RunController:
         budget_config: BudgetConfig | None = None,
         library_paths: list[str] | None = None,
         model_overrides: dict[str, str] | None = None,
+        fallback_models: dict[str, list[str]] | None = None,
+        budget_pool: RunBudget | None = None,
+        phase_store: PhaseStore | None = None,
+        on_event: Callable[[RunEvent], None] | None = None,
     ):
         self.llm = llm_client
         self.persistence = persistence or Persistence()
+        # Receives the message of every ProgressEvent
         self.on_progress = on_progress or (lambda msg: None)
+        # Receives every event of every run (see run_stream)
+        self.on_event = on_event
         self.budget_config = budget_config or self.DEFAULT_BUDGET
         self.model_overrides = {
             k: v for k, v in (model_overrides or {}).items()
             if isinstance(v, str) and v.strip()
         }
+        # Ordered fallback models per phase key, tried after the phase's model fails
+        self.fallback_models = {
+            k: [m.strip() for m in v if isinstance(m, str) and m.strip()]
+            for k, v in (fallback_models or {}).items()
+        }
+
+        # Shared budget every run of this controller also draws on (e.g. a batch's)
+        self.budget_pool = budget_pool
+        # Memoized Phase 0 and inventor results; reused only when set
+        self.phase_store = phase_store
+        # Context of phases called outside run(), e.g. from tests; created on first use
+        self._detached: RunContext | None = None
 
         # Initialize library loader
         self.library_loader = LibraryLoader(user_paths=library_paths)
@@ -99,39 +258,259 @@ class RunController:
         self.refiner = Refiner(llm_client, self.library_loader)
         self.assembler = Assembler(llm_client)
 
-    async def run(self, request: ZeusRequest) -> ZeusResponse:
+    async def run(self, request: ZeusRequest, run_id: str | None = None, tenant: str | None = None) -> ZeusResponse:
         """Execute the full 7-phase pipeline.
 
+        Runs of one controller may overlap: each keeps its state (budget,
+        timings, libraries) in its own RunContext.
+
         Args:
             request: The Zeus request to process.
+            run_id: Optional ID for the run, e.g. to track it before it
+                finishes; a new UUID by default.
+            tenant: Optional group whose runs share LLM call slots fairly
+                with other tenants' (weighted by the client's
+                ``tenant_weights``); each run is its own group by default.
 
         Returns:
             The final ZeusResponse.
         """
-        # Load user-specified library paths
-        if request.library_paths:
-            self.library_loader = LibraryLoader(user_paths=request.library_paths)
-            self.inventor = Inventor(self.llm, self.library_loader)
-            self.synthesizer = Synthesizer(self.llm, self.library_loader)
-            self.library_critic = LibraryCritic(self.llm, self.library_loader)
-            self.refiner = Refiner(self.llm, self.library_loader)
+        return await self._run_record(self._new_record(request, run_id=run_id), tenant=tenant)
+
+    async def run_stream(
+        self,
+        request: ZeusRequest,
+        run_id: str | None = None,
+        tenant: str | None = None,
+    ) -> AsyncIterator[RunEvent]:
+        """Execute the pipeline, yielding its events as they happen.
+
+        Events are typed (see ``src.models.events``): phase start and end,
+        LLM call start and end with tokens, streamed output deltas,
+        partial results (the brief, each inventor solution, the synthesis,
+        the critique, the final draft), budget updates and errors. The
+        last event is always a ``RunFinishedEvent`` with the response.
+        ``on_progress`` and ``on_event`` still receive them as well.
+
+        Leaving the iteration early cancels the run.
+
+        Args:
+            request: The Zeus request to process.
+            run_id: Optional ID for the run; a new UUID by default.
+            tenant: Optional fairness group of the run (see ``run``).
+        """
+        events: asyncio.Queue[RunEvent | None] = asyncio.Queue()
+        record = self._new_record(request, run_id=run_id)
+
+        async def run() -> None:
+            try:
+                await self._run_record(record, event_sink=events.put_nowait, tenant=tenant)
+            finally:
+                events.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def resume(self, run_id: str) -> ZeusResponse:
+        """Continue an interrupted run from its last checkpoint.
+
+        The record is checkpointed after every completed phase, so the
+        pipeline restarts after the last of them with the paid-for work
+        (brief, inventor solutions, synthesis, ...) and the budget counters
+        of the earlier attempt. Phases that failed are attempted again.
+
+        Args:
+            run_id: ID (or prefix) of the run to resume.
+
+        Returns:
+            The final ZeusResponse; that of the record if it already finished.
+
+        Raises:
+            ValueError: If no record exists for ``run_id``.
+        """
+        record = await self._load(run_id)
+        if record is None:
+            raise ValueError(f"Run not found: {run_id}")
+        if "phase_6" in record.completed_phases and record.final_response is not None:
+            logger.info(f"Run {record.run_id} already completed — nothing to resume")
+            return record.final_response
+
+        logger.info(
+            f"Resuming run {record.run_id} — completed: {', '.join(record.completed_phases) or 'none'}  "
+            f"[budget: {record.budget_used.llm_calls} calls]"
+        )
+        # A best-effort assembly from the failed attempt is rebuilt at the end
+        record.final_response = None
+        return await self._run_record(record)
+
+    async def rerun(self, run_id: str, request: ZeusRequest, from_phase: str | None = None) -> ZeusResponse:
+        """Run a changed request again, repeating only the phases it affects.
 
+        ``request`` is compared with the request of the finished run
+        ``run_id``; results of the phases before the first affected one
+        are taken over into a new run record (see ``_RERUN_FROM``) and the
+        pipeline continues from there. A changed number of inventors runs
+        only the inventors without a solution yet; changed constraints or
+        objectives run all inventors again; changed eval criteria repeat
+        critique, refinement and assembly.
+
+        Args:
+            run_id: ID (or prefix) of the finished run to start from.
+            request: The changed request.
+            from_phase: Repeat from this phase (e.g. ``"phase_0"``) even
+                if the changes would leave its results valid.
+
+        Returns:
+            The final ZeusResponse of the new run; that of ``run_id`` if
+            nothing changed.
+
+        Raises:
+            ValueError: If no record exists for ``run_id``, the run never
+                finished (resume it instead) or ``from_phase`` is unknown.
+        """
+        if from_phase is not None and from_phase not in _PHASES:
+            raise ValueError(f"Unknown phase: {from_phase} (one of {', '.join(_PHASES)})")
+        previous = await self._load(run_id)
+        if previous is None:
+            raise ValueError(f"Run not found: {run_id}")
+        if "phase_6" not in previous.completed_phases or previous.final_response is None:
+            raise ValueError(f"Run {previous.run_id} did not finish — resume it instead of rerunning")
+
+        record = self._new_record(request)
+        record.rerun_of = previous.run_id
+        record.reused_phases = self._carry_over(previous, record, from_phase)
+        record.timings = previous.timings.model_copy(deep=True)
+        if len(record.reused_phases) == len(_PHASES):
+            logger.info(f"Rerun of {previous.run_id}: request unchanged — nothing to run")
+            return previous.final_response
+        record.completed_phases = list(record.reused_phases)
+        logger.info(
+            f"Rerun of {previous.run_id} as {record.run_id} — "
+            f"reusing: {', '.join(record.reused_phases) or 'nothing'}"
+        )
+        return await self._run_record(record)
+
+    def _carry_over(self, previous: RunRecord, record: RunRecord, from_phase: str | None = None) -> list[str]:
+        """Copy into ``record`` the results of ``previous`` its request leaves valid.
+
+        Returns:
+            The phases taken over, i.e. those before the first phase the
+            changed request (or ``from_phase``) affects. Phase 1 is left
+            out when only the number of inventors changed: its solutions
+            are copied, and Phase 1 then runs just the inventors still
+            missing.
+        """
+        old, new = previous.request, record.request
+        changed = [field for field in ZeusRequest.model_fields if getattr(old, field) != getattr(new, field)]
+        affected = [_RERUN_FROM.get(field, "phase_0") for field in changed]
+        start = min([_PHASES.index(phase) for phase in affected if phase] + [len(_PHASES)])
+        # Inventors with a solution are kept only if the number of inventors is all that sends Phase 1 again
+        new_inventors_only = all(_RERUN_FROM.get(field) != "phase_1" or field == "num_inventors" for field in changed)
+        if from_phase is not None and _PHASES.index(from_phase) <= start:
+            start = _PHASES.index(from_phase)
+            new_inventors_only = False
+
+        brief = previous.problem_brief
+        if start > 0 and brief is not None:
+            brief = self.normalizer.carry_over(brief, old, new)
+            if brief.output_spec != previous.problem_brief.output_spec:
+                start = min(start, _PHASES.index("phase_3"))
+            if brief.eval_criteria != previous.problem_brief.eval_criteria:
+                start = min(start, _PHASES.index("phase_4"))
+        if start == len(_PHASES):
+            return list(_PHASES)
+        logger.info(f"Rerun: changed {', '.join(changed) or 'file contents'} — repeating from {_PHASES[start]}")
+
+        if start > 0:
+            record.problem_brief = brief
+        # Phase 1 keeps the solutions of inventors that are still configured
+        if start > 1 or (start == 1 and new_inventors_only):
+            record.inventor_solutions = [s.model_copy() for s in previous.inventor_solutions]
+        if start > 1:
+            record.inventor_configs = [cfg.model_copy() for cfg in previous.inventor_configs]
+            record.dropped_inventors = dict(previous.dropped_inventors)
+        if start > 2:
+            record.cross_critiques = [c.model_copy() for c in previous.cross_critiques]
+        if start > 3 and previous.synthesis_result is not None:
+            record.synthesis_result = previous.synthesis_result.model_copy(deep=True)
+
+        reused = [phase for phase in _PHASES[:start] if phase in previous.completed_phases]
+        if start > 2 and "phase_2" not in reused:
+            # Cross-pollination was off or skipped; its (empty) result stands
+            reused.insert(2, "phase_2")
+        return reused
+
+    def _new_record(self, request: ZeusRequest, run_id: str | None = None) -> RunRecord:
+        """A fresh record of ``request`` with this controller's models, prompts and budget."""
         record = RunRecord(
             request=request,
             model_version=self.llm.model,
             prompt_versions=self._get_prompt_versions(),
+            budget_config=self.budget_config,
         )
+        if run_id:
+            record.run_id = run_id
         if self.model_overrides:
             record.prompt_versions["phase_models"] = dict(self.model_overrides)
+        if self.fallback_models:
+            record.prompt_versions["phase_fallbacks"] = dict(self.fallback_models)
+        return record
 
-        start_time = time.monotonic()
+    async def _run_record(
+        self,
+        record: RunRecord,
+        event_sink: Callable[[RunEvent], None] | None = None,
+        tenant: str | None = None,
+    ) -> ZeusResponse:
+        """Run the pipeline for ``record``, skipping phases it has already completed."""
+        record.timings = kept_timings(record.timings, record.completed_phases)
+        with self._bind(RunContext(self, record, event_sink, tenant)) as run:
+            return await self._execute_run(record, run)
+
+    @contextmanager
+    def _bind(self, run: RunContext) -> Iterator[RunContext]:
+        """Make ``run`` the current run of the calling task (and the tasks it starts)."""
+        token = _current_run.set(run)
+        try:
+            yield run
+        finally:
+            _current_run.reset(token)
+
+    @property
+    def _run(self) -> RunContext:
+        """Context of the run executing in the current task."""
+        run = _current_run.get()
+        if run is not None and run.controller is self:
+            return run
+        if self._detached is None:
+            self._detached = RunContext(self)
+        return self._detached
+
+    async def _execute_run(self, record: RunRecord, run: RunContext) -> ZeusResponse:
+        """Execute the pipeline within ``run``, always saving the record and a response."""
+        request = record.request
+        start_time = run.started
+        cancelled = False
 
         try:
             await self._execute_pipeline(request, record)
 
+        except asyncio.CancelledError:
+            # Saved as it stands, e.g. when a run_stream() consumer leaves
+            cancelled = True
+            self._record_error(record, "Run cancelled")
+            raise
+
         except BudgetExceededError as e:
             logger.error(f"Budget exceeded: {e}")
-            record.errors.append(f"Budget exceeded: {str(e)}")
+            self._record_error(record, f"Budget exceeded: {str(e)}")
 
         except OpenRouterRateLimitError as e:
             elapsed = time.monotonic() - start_time
@@ -140,28 +519,30 @@ class RunController:
                 "The pipeline stopped due to too many requests. Try again in a moment."
             )
             logger.error(msg)
-            record.errors.append(msg)
+            logger.error(f"Rate limiter state: {self.llm.rate_limiter.snapshot()}")
+            self._record_error(record, msg)
 
         except OpenRouterTimeoutError as e:
             elapsed = time.monotonic() - start_time
             msg = f"LLM call timeout: {str(e)} (run elapsed: {elapsed:.1f}s)"
             logger.error(msg)
-            record.errors.append(msg)
+            self._record_error(record, msg)
 
         except OpenRouterError as e:
             logger.error(f"LLM error: {e}")
-            record.errors.append(f"LLM error: {str(e)}")
+            self._record_error(record, f"LLM error: {str(e)}")
 
         except Exception as e:
             logger.error(f"Unexpected error: {e}", exc_info=True)
-            record.errors.append(f"Unexpected error: {str(e)}")
+            self._record_error(record, f"Unexpected error: {str(e)}")
 
         finally:
             # Assemble best-effort output if not already assembled
-            if record.final_response is None:
+            if record.final_response is None and not cancelled:
                 logger.info("Attempting best-effort assembly after pipeline error...")
                 try:
-                    self.on_progress("Assembling output...")
+                    self._emit(RunStepEvent, step="assembling")
+                    self._progress("Assembling output...")
                     response, assembly_usage = await self.assembler.assemble(
                         record,
                         model=self._model_for("phase_6"),
@@ -170,76 +551,106 @@ class RunController:
                     record.final_response = response
                 except Exception as e:
                     logger.error(f"Assembly also failed: {e}")
-                    record.errors.append(f"Assembly failed: {str(e)}")
+                    self._record_error(record, f"Assembly failed: {str(e)}")
                     record.final_response = self.assembler._error_response(record)
 
+            run.profiler.finish()
+
             # INVARIANT: Every run has a persisted RunRecord
             if record.errors:
                 logger.error(f"Run completed with {len(record.errors)} error(s):")
                 for err in record.errors:
                     logger.error(f"  • {err}")
-            self.on_progress("Saving run record...")
+            self._emit(RunStepEvent, step="saving")
+            self._progress("Saving run record...")
             try:
-                self.persistence.save(record)
+                await self._save(record)
                 logger.info(f"Run record saved: {record.run_id}")
             except Exception as e:
                 logger.error(f"Failed to persist run record: {e}")
+            self._emit_budget(record)
+            self._emit(RunFinishedEvent, response=record.final_response, errors=list(record.errors))
 
         return record.final_response
 
     async def _execute_pipeline(self, request: ZeusRequest, record: RunRecord) -> None:
-        """Execute all 7 phases of the pipeline with per-phase error isolation."""
+        """Execute all 7 phases of the pipeline with per-phase error isolation.
 
-        # ── Phase 0: Intake ────────────────────────────────────
-        await self._safe_phase("Phase 0", record, self._phase_0, request, record)
+        Steps run as a dependency graph, each starting as soon as its
+        inputs are ready rather than when the previous phase ends:
 
-        # Abort only if we have no problem brief at all
-        if record.problem_brief is None:
-            logger.error("Phase 0 produced no ProblemBrief — cannot continue pipeline")
-            record.errors.append("Generation failed: Phase 0 intake produced no output")
-            return
+            libraries ──────────┐
+            Phase 0 ──→ inventor A..N ──→ Phase 3 → 4 → 5 → 6
+                            └─→ cross-critique X→Y ──┘
 
-        # ── Phase 1: Divergent Generation ─────────────────────
-        await self._safe_phase("Phase 1", record, self._phase_1, request, record)
+        Library files are read while intake runs, and each cross-critique
+        starts as soon as its critic and target inventors are done.
 
-        valid_solutions = [
-            s for s in (record.inventor_solutions or [])
-            if not s.content.startswith("[Inventor")
-        ]
-        if not valid_solutions:
-            logger.error("All inventors failed — no valid solutions produced")
-            record.errors.append("All inventors failed — no valid solutions produced")
-            return
+        Phases listed in ``record.completed_phases`` (a resumed run) are
+        not run again; their results are taken from the record.
+        """
+        done = set(record.completed_phases)
+
+        async with PhaseGraph() as graph:
+            # Nothing in Phase 0 needs the libraries
+            graph.add("libraries", self._preload_libraries)
+
+            # ── Phase 0: Intake ────────────────────────────────────
+            if "phase_0" not in done:
+                await self._safe_phase("Phase 0", record, self._phase_0, request, record)
+
+            # Abort only if we have no problem brief at all
+            if record.problem_brief is None:
+                logger.error("Phase 0 produced no ProblemBrief — cannot continue pipeline")
+                self._record_error(record, "Generation failed: Phase 0 intake produced no output")
+                return
 
-        # ── Phase 2: Cross-Pollination (optional) ─────────────
-        if request.enable_cross_pollination and len(valid_solutions) >= 2:
-            remaining = self.budget_config.max_llm_calls - record.budget_used.llm_calls
-            cross_poll_budget = min(remaining // 2, len(valid_solutions) * 2)
-            if cross_poll_budget >= 2:
-                await self._safe_phase("Phase 2", record, self._phase_2, valid_solutions, record)
+            # ── Phase 1: Divergent Generation (+ Phase 2 steps) ────
+            if "phase_1" not in done:
+                await self._safe_phase("Phase 1", record, self._phase_1, request, record, graph)
             else:
-                logger.info("Phase 2: Skipped — insufficient budget for cross-pollination")
-        else:
-            logger.info("Phase 2: Skipped (cross-pollination disabled or <2 solutions)")
+                # Checkpointed solutions stand in for the inventor steps
+                for solution in record.inventor_solutions:
+                    graph.add(f"inventor_{solution.inventor_id}", self._restored_solution, solution)
+                if "phase_2" not in done:
+                    await self._schedule_cross_pollination(request, record, graph)
+
+            valid_solutions = [s for s in (record.inventor_solutions or []) if self._is_valid_solution(s)]
+            if not valid_solutions:
+                logger.error("All inventors failed — no valid solutions produced")
+                self._record_error(record, "All inventors failed — no valid solutions produced")
+                return
+
+            # ── Phase 2: Cross-Pollination (optional) ─────────────
+            if any(f"critique_{cfg.inventor_id}" in graph for cfg in record.inventor_configs):
+                await self._safe_phase("Phase 2", record, self._phase_2, record, graph)
+
+            # Inventors Phase 1 went on without may still make it into synthesis
+            await self._collect_stragglers(record, graph)
 
         # ── Phase 3: Convergent Synthesis ──────────────────────
-        await self._safe_phase("Phase 3", record, self._phase_3, record)
+        if "phase_3" not in done:
+            await self._safe_phase("Phase 3", record, self._phase_3, record)
 
         if not record.synthesis_result or not record.synthesis_result.unified_draft:
             logger.error("Phase 3 produced empty synthesis draft")
-            record.errors.append("Synthesis produced empty draft")
+            self._record_error(record, "Synthesis produced empty draft")
             return
 
         # ── Phase 4: Library-Informed Critique ─────────────────
-        remaining = self.budget_config.max_llm_calls - record.budget_used.llm_calls
-        if remaining >= 1:
+        remaining = await self._calls_left(record)
+        if "phase_4" in done:
+            logger.info("Phase 4: Restored from checkpoint")
+        elif remaining >= 1:
             await self._safe_phase("Phase 4", record, self._phase_4, record)
         else:
             logger.info("Phase 4: Skipped — budget exhausted")
 
         # ── Phase 5: Iterative Refinement ──────────────────────
-        remaining = self.budget_config.max_llm_calls - record.budget_used.llm_calls
-        if record.library_critique and remaining >= 2:
+        remaining = await self._calls_left(record)
+        if "phase_5" in done:
+            logger.info("Phase 5: Restored from checkpoint")
+        elif record.library_critique and remaining >= 2:
             blockers = record.library_critique.blocker_count
             majors = record.library_critique.major_count
             if blockers > 0 or majors > 0:
@@ -253,7 +664,8 @@ class RunController:
                 record.final_draft = record.synthesis_result.unified_draft
 
         # ── Phase 6: Output Assembly ───────────────────────────
-        await self._safe_phase("Phase 6", record, self._phase_6, record)
+        if "phase_6" not in done:
+            await self._safe_phase("Phase 6", record, self._phase_6, record)
 
     # ------------------------------------------------------------------
     # Per-phase helpers
@@ -270,39 +682,176 @@ class RunController:
 
         Exceptions are caught, logged, and appended to record.errors so
         subsequent phases can still attempt a best-effort result.
+
+        When the client streams, partial output of every call made by the
+        phase is forwarded through ``on_progress``. Calls made by the phase
+        fall back along the phase's ``fallback_models`` chain.
+
+        A phase that completes is added to ``record.completed_phases`` and
+        the record is checkpointed, so ``resume()`` can continue after it.
+        Its wall time, CPU time and calls are added to ``record.timings``.
         """
+        phase_key = phase_name.lower().replace(" ", "_")
+        profiler = self._run.profiler
+        profile = profiler.phase(phase_key) if profiler else nullcontext()
+        self._emit(PhaseStartedEvent, phase=phase_key, name=phase_name)
+        started = time.monotonic()
+        error = None
+        with profile, self._phase_context(phase_name):
+            try:
+                await phase_fn(*args)
+                record.completed_phases.append(phase_key)
+                await self._checkpoint(record)
+            except BudgetExceededError as e:
+                error = f"Budget exceeded: {e}"
+                raise  # Budget errors propagate up to abort the pipeline
+            except OpenRouterRateLimitError as e:
+                msg = f"{phase_name} rate-limited: {e}"
+                logger.error(msg)
+                error = f"LLM error: {msg}"
+                self._record_error(record, error, phase_key)
+                raise  # Rate limits propagate so the top-level handler can surface them
+            except (OpenRouterTimeoutError, OpenRouterTransientError) as e:
+                error = f"{phase_name} LLM transient error: {e}"
+                logger.error(error)
+                self._record_error(record, error, phase_key)
+            except PromptTooLargeError as e:
+                error = f"{phase_name} prompt does not fit the model's context window: {e}"
+                logger.error(error)
+                self._record_error(record, error, phase_key)
+            except OpenRouterError as e:
+                error = f"{phase_name} LLM error: {e}"
+                logger.error(error)
+                self._record_error(record, error, phase_key)
+            except Exception as e:
+                error = f"{phase_name} unexpected error: {e}"
+                logger.error(error, exc_info=True)
+                self._record_error(record, error, phase_key)
+            finally:
+                completed = phase_key in record.completed_phases
+                self._emit(
+                    PhaseFinishedEvent,
+                    phase=phase_key,
+                    name=phase_name,
+                    status="completed" if completed else "failed",
+                    wall_s=round(time.monotonic() - started, 3),
+                    error=error,
+                )
+        if phase_key in record.completed_phases:
+            field = _PHASE_RESULTS.get(phase_key)
+            if field and getattr(record, field):
+                self._emit_result(phase_key, field, getattr(record, field))
+            self._emit_budget(record)
+
+    async def _checkpoint(self, record: RunRecord) -> None:
+        """Persist the record mid-run; a failed checkpoint never fails the run."""
         try:
-            await phase_fn(*args)
-        except BudgetExceededError:
-            raise  # Budget errors propagate up to abort the pipeline
-        except OpenRouterRateLimitError as e:
-            msg = f"{phase_name} rate-limited: {e}"
-            logger.error(msg)
-            record.errors.append(f"LLM error: {msg}")
-            raise  # Rate limits propagate so the top-level handler can surface them
-        except (OpenRouterTimeoutError, OpenRouterTransientError) as e:
-            msg = f"{phase_name} LLM transient error: {e}"
-            logger.error(msg)
-            record.errors.append(msg)
-        except OpenRouterError as e:
-            msg = f"{phase_name} LLM error: {e}"
-            logger.error(msg)
-            record.errors.append(msg)
+            await self._save(record)
+            logger.info(f"Checkpoint saved after {record.completed_phases[-1]}")
         except Exception as e:
-            msg = f"{phase_name} unexpected error: {e}"
-            logger.error(msg, exc_info=True)
-            record.errors.append(msg)
+            logger.warning(f"Failed to checkpoint run record: {e}")
+
+    async def _load(self, run_id: str) -> RunRecord | None:
+        """The record of ``run_id``, or else of the run it is a prefix of, read off the event loop."""
+        record = await asyncio.to_thread(self.persistence.load, run_id, exact=True)
+        return record or await asyncio.to_thread(self.persistence.load, run_id)
+
+    async def _save(self, record: RunRecord) -> None:
+        """Write the record (serialized and fsynced) in a worker thread, off the event loop."""
+        async with self._run.save_lock:
+            await asyncio.to_thread(self.persistence.save, record)
+
+    @contextmanager
+    def _phase_context(self, phase_name: str) -> Iterator[None]:
+        """Route the streamed output, model fallbacks, budget, timings and priority of calls made within a phase."""
+        run = self._run
+        budget_token = call_budget.set(run.budget)
+        listener_token = None
+        if self.llm.streaming:
+            listener_token = stream_listener.set(self._stream_progress(phase_name))
+        phase_key = phase_name.lower().replace(" ", "_")
+        fallbacks_token = model_fallbacks.set(tuple(self.fallback_models.get(phase_key, ())))
+        observer_token = call_observer.set(self._observe_calls(phase_key))
+        priority_token = call_priority.set(
+            CallPriority(_PHASE_PRIORITIES.get(phase_key, 0), phase_key, run.run_id or None, run.tenant or None)
+        )
+        try:
+            yield
+        finally:
+            call_priority.reset(priority_token)
+            call_observer.reset(observer_token)
+            model_fallbacks.reset(fallbacks_token)
+            if listener_token is not None:
+                stream_listener.reset(listener_token)
+            call_budget.reset(budget_token)
+
+    def _observe_calls(self, phase_key: str) -> Callable[[dict[str, Any]], None]:
+        """Build a call observer that times the calls of a phase and emits their events."""
+        profiler = self._run.profiler
+        profile = profiler.observer(phase_key) if profiler else None
+
+        def observe(call: dict[str, Any]) -> None:
+            if call["status"] == "running":
+                self._emit(CallStartedEvent, phase=phase_key, model=call["model"])
+                return
+            if profile is not None:
+                profile(call)
+            self._emit(
+                CallFinishedEvent,
+                phase=phase_key,
+                model=call["model"],
+                status=call["status"],
+                wall_s=round(call["ended"] - call["started"], 3),
+                queue_s=round(call["queue_ms"] / 1000, 3),
+                retries=call["retries"],
+                tokens_in=call["tokens_in"],
+                tokens_out=call["tokens_out"],
+            )
+
+        return observe
+
+    def _stream_progress(self, phase_name: str) -> Callable[[str], None]:
+        """Build a stream listener that emits the deltas, and throttled progress, of a phase."""
+        received = 0
+        preview = ""
+        last_emit = 0.0
+        phase_key = phase_name.lower().replace(" ", "_")
+
+        def forward(delta: str) -> None:
+            nonlocal received, preview, last_emit
+            self._emit(OutputDeltaEvent, phase=phase_key, text=delta)
+            received += len(delta)
+            preview = (preview + delta)[-_STREAM_PREVIEW_CHARS:]
+            now = time.monotonic()
+            if now - last_emit < _STREAM_PROGRESS_INTERVAL:
+                return
+            last_emit = now
+            snippet = " ".join(preview.split())
+            self._progress(
+                f"{phase_name}: streaming — {received:,} chars received … {snippet}",
+                transient=True,
+            )
+
+        return forward
 
     async def _phase_0(self, request: ZeusRequest, record: RunRecord) -> None:
         """Phase 0: Intake — normalize request into ProblemBrief."""
-        self.on_progress("Phase 0: Normalizing input...")
+        self._progress("Phase 0: Normalizing input...")
         logger.info("Phase 0: Intake — normalizing request into ProblemBrief")
-        self._check_budget(record, "intake")
-        record.problem_brief, usage = await self.normalizer.normalize(
-            request,
-            model=self._model_for("phase_0"),
-        )
+        model = self._model_for("phase_0")
+        memo_key = self._memo_key("phase_0", model, IntakePrompts, self.normalizer.fingerprint(request))
+        stored = self._memo_get(memo_key)
+        if stored is not None:
+            record.problem_brief = ProblemBrief.model_validate(stored["problem_brief"])
+            record.budget_used.memoized_steps += 1
+            logger.info("Phase 0 complete — ProblemBrief reused from the phase store")
+            return
+
+        async with await self._reserve_call(record, "intake") as reservation:
+            record.problem_brief, usage = await self.normalizer.normalize(request, model=model)
+            await asyncio.to_thread(reservation.consume, usage.get("llm_calls", 1))
         self._update_budget(record, usage)
+        self._memo_put(memo_key, "phase_0", {"problem_brief": record.problem_brief.model_dump()})
         logger.info(
             f"Phase 0 complete — classified as '{record.problem_brief.classification.problem_type}', "
             f"{len(record.problem_brief.constraints)} constraints, "
@@ -310,19 +859,54 @@ class RunController:
             f"[budget: {record.budget_used.llm_calls} calls]"
         )
 
-    async def _phase_1(self, request: ZeusRequest, record: RunRecord) -> None:
-        """Phase 1: Divergent Generation — run parallel inventors."""
-        self.on_progress("Phase 1: Running parallel inventors...")
+    async def _phase_1(self, request: ZeusRequest, record: RunRecord, graph: PhaseGraph) -> None:
+        """Phase 1: Divergent Generation — run parallel inventors.
+
+        Each inventor is its own step in ``graph``. When cross-pollination
+        is on, the Phase 2 critique steps are scheduled here too, so that
+        they can start before the slowest inventor finishes.
+
+        With an ``inventor_quorum`` or ``inventor_deadline`` budget, the
+        phase ends once enough inventors are done rather than all of them.
+        Inventors left behind are recorded in ``record.dropped_inventors``
+        and, by ``inventor_stragglers``, cancelled or left to finish and be
+        merged in before synthesis (see ``_collect_stragglers``).
+        """
+        self._progress("Phase 1: Running parallel inventors...")
         configs = self._build_inventor_configs(request, record)
+        # Valid solutions already in the record (a rerun's) are not generated again
+        configured = {cfg.inventor_id for cfg in configs}
+        kept = {
+            s.inventor_id: s for s in record.inventor_solutions
+            if self._is_valid_solution(s) and s.inventor_id in configured
+        }
+        pending = [cfg for cfg in configs if cfg.inventor_id not in kept]
+        # One call per inventor is set aside before any of them starts
+        reservations = await asyncio.to_thread(
+            self._budget(record).reserve, len(pending), min_tasks=0 if kept else 1, label="inventors"
+        ) if pending else []
+        if len(reservations) < len(pending):
+            dropped = pending[len(reservations):]
+            pending = pending[:len(reservations)]
+            logger.warning(
+                f"Phase 1: budget covers {len(pending)} of {len(pending) + len(dropped)} inventors — "
+                f"dropping {', '.join(c.inventor_id for c in dropped)}"
+            )
+            for cfg in dropped:
+                record.dropped_inventors[cfg.inventor_id] = "budget: no LLM call left to run it"
+        launched = {cfg.inventor_id for cfg in pending}
+        configs = [cfg for cfg in configs if cfg.inventor_id in kept or cfg.inventor_id in launched]
         record.inventor_configs = configs
+        if kept:
+            logger.info(f"Phase 1: Reusing solutions of inventors {', '.join(kept)}")
         default_phase_1_model = self._model_for("phase_1")
         inventor_models = {
             cfg.inventor_id: self._model_for(f"phase_1_inventor_{cfg.inventor_id}")
-            for cfg in configs
+            for cfg in pending
         }
         logger.info(
-            f"Phase 1: Launching {len(configs)} parallel inventors: "
-            f"{', '.join(f'{c.inventor_id}({c.inventor_type})' for c in configs)}"
+            f"Phase 1: Launching {len(pending)} parallel inventors: "
+            f"{', '.join(f'{c.inventor_id}({c.inventor_type})' for c in pending)}"
         )
         logger.info(
             "Phase 1 model routing — "
@@ -332,31 +916,69 @@ class RunController:
             + f" (default={default_phase_1_model})"
         )
 
-        self._check_budget(record, "inventors")
-        solutions, inv_usage = await self.inventor.generate_solutions(
-            record.problem_brief,
-            configs,
-            model=default_phase_1_model,
-            model_overrides=inventor_models,
+        for inventor_id, solution in kept.items():
+            graph.add(f"inventor_{inventor_id}", self._restored_solution, solution)
+        for cfg, reservation in zip(pending, reservations):
+            graph.add(
+                f"inventor_{cfg.inventor_id}",
+                self._reserved_step,
+                reservation,
+                self._generate_solution,
+                record.problem_brief,
+                cfg,
+                inventor_models.get(cfg.inventor_id, default_phase_1_model),
+                after=["libraries"],
+            )
+        quorum = Quorum(
+            graph,
+            [f"inventor_{cfg.inventor_id}" for cfg in configs],
+            size=self.budget_config.inventor_quorum,
+            deadline=self.budget_config.inventor_deadline,
+            accept=lambda result: self._is_valid_solution(result[0]),
         )
-        record.inventor_solutions = solutions
+        await self._schedule_cross_pollination(request, record, graph, quorum)
+
+        members = await quorum.wait()
+        if quorum.stragglers:
+            cancel = self.budget_config.inventor_stragglers == "cancel"
+            for name in quorum.stragglers:
+                record.dropped_inventors[name.removeprefix("inventor_")] = (
+                    f"straggler: {quorum.reason} — "
+                    + ("cancelled" if cancel else "still running when synthesis started")
+                )
+            if cancel:
+                await graph.cancel(*quorum.stragglers)
+
+        results = [await graph.result(name) for name in members]
+        inv_usage = {"tokens_in": 0, "tokens_out": 0, "llm_calls": 0}
+        for _, usage in results:
+            accumulate_usage(inv_usage, usage)
+        record.inventor_solutions = [solution for solution, _ in results]
         self._update_budget_aggregate(record, inv_usage)
 
-        valid_solutions = [s for s in solutions if not s.content.startswith("[Inventor")]
+        valid_solutions = [s for s in record.inventor_solutions if self._is_valid_solution(s)]
         logger.info(
-            f"Phase 1 complete — {len(valid_solutions)}/{len(solutions)} valid solutions  "
+            f"Phase 1 complete — {len(valid_solutions)}/{len(results)} valid solutions  "
             f"[budget: {record.budget_used.llm_calls} calls]"
         )
 
-    async def _phase_2(self, valid_solutions: list, record: RunRecord) -> None:
-        """Phase 2: Cross-Pollination (optional)."""
-        self.on_progress("Phase 2: Cross-pollination...")
-        logger.info(f"Phase 2: Cross-pollination with {len(valid_solutions)} solutions")
-        cross_critiques, cp_usage = await self._run_cross_pollination(
-            valid_solutions,
-            record,
-            model=self._model_for("phase_2"),
-        )
+    async def _phase_2(self, record: RunRecord, graph: PhaseGraph) -> None:
+        """Phase 2: Cross-Pollination (optional) — collect the critique steps."""
+        self._progress("Phase 2: Cross-pollination...")
+        steps = [
+            f"critique_{cfg.inventor_id}" for cfg in record.inventor_configs
+            if f"critique_{cfg.inventor_id}" in graph
+        ]
+        logger.info(f"Phase 2: Waiting on {len(steps)} cross-critiques")
+        cp_usage = {"tokens_in": 0, "tokens_out": 0, "llm_calls": 0}
+        cross_critiques = []
+        for result in await asyncio.gather(*(graph.result(step) for step in steps)):
+            if result is None:
+                continue
+            critique, usage = result
+            cross_critiques.append(critique)
+            accumulate_usage(cp_usage, usage)
+            cp_usage["llm_calls"] += 1
         record.cross_critiques = cross_critiques
         self._update_budget_aggregate(record, cp_usage)
         logger.info(
@@ -366,15 +988,16 @@ class RunController:
 
     async def _phase_3(self, record: RunRecord) -> None:
         """Phase 3: Convergent Synthesis."""
-        self.on_progress("Phase 3: Synthesizing solutions...")
+        self._progress("Phase 3: Synthesizing solutions...")
         logger.info("Phase 3: Synthesizing inventor solutions into unified draft")
-        self._check_budget(record, "synthesis")
-        synthesis_result, syn_usage = await self.synthesizer.synthesize(
-            record.problem_brief,
-            record.inventor_solutions,
-            record.cross_critiques if record.cross_critiques else None,
-            model=self._model_for("phase_3"),
-        )
+        async with await self._reserve_call(record, "synthesis") as reservation:
+            synthesis_result, syn_usage = await self._run.synthesizer.synthesize(
+                record.problem_brief,
+                record.inventor_solutions,
+                record.cross_critiques if record.cross_critiques else None,
+                model=self._model_for("phase_3"),
+            )
+            await asyncio.to_thread(reservation.consume, syn_usage.get("llm_calls", 1))
         record.synthesis_result = synthesis_result
         self._update_budget(record, syn_usage)
 
@@ -389,15 +1012,16 @@ class RunController:
 
     async def _phase_4(self, record: RunRecord) -> None:
         """Phase 4: Library-Informed Critique."""
-        self.on_progress("Phase 4: Running library critics...")
-        remaining = self.budget_config.max_llm_calls - record.budget_used.llm_calls
+        self._progress("Phase 4: Running library critics...")
+        remaining = await self._calls_left(record)
         logger.info(
             f"Phase 4: Running parallel library critics (budget remaining: {remaining} calls)"
         )
-        critique_result, crit_usage = await self.library_critic.critique(
+        critique_result, crit_usage = await self._run.library_critic.critique(
             record.synthesis_result.unified_draft,
             record.problem_brief.eval_criteria,
             model=self._model_for("phase_4"),
+            run_budget=self._budget(record),
         )
         record.library_critique = critique_result
         self._update_budget_aggregate(record, crit_usage)
@@ -411,12 +1035,12 @@ class RunController:
         """Phase 5: Iterative Refinement."""
         blockers = record.library_critique.blocker_count
         majors = record.library_critique.major_count
-        self.on_progress("Phase 5: Refining draft...")
+        self._progress("Phase 5: Refining draft...")
         logger.info(
             f"Phase 5: Refining draft — {blockers} blockers, {majors} major issues "
             f"(max {self.budget_config.max_revisions} revisions, {remaining} calls left)"
         )
-        final_draft, history, ref_usage = await self.refiner.refine(
+        final_draft, history, ref_usage = await self._run.refiner.refine(
             record.synthesis_result.unified_draft,
             record.library_critique,
             record.problem_brief,
@@ -424,6 +1048,7 @@ class RunController:
             budget_remaining=remaining,
             generation_model=self._model_for("phase_5"),
             critique_model=self._model_for("phase_5"),
+            run_budget=self._budget(record),
         )
         record.final_draft = final_draft
         record.refinement_history = history
@@ -435,12 +1060,14 @@ class RunController:
 
     async def _phase_6(self, record: RunRecord) -> None:
         """Phase 6: Output Assembly."""
-        self.on_progress("Phase 6: Assembling deliverables...")
+        self._progress("Phase 6: Assembling deliverables...")
         logger.info("Phase 6: Assembling 5 deliverables + evaluation scorecard")
         response, asm_usage = await self.assembler.assemble(
             record,
             model=self._model_for("phase_6"),
         )
+        # Assembly always runs, so its call is counted rather than reserved
+        await asyncio.to_thread(self._budget(record).consume, asm_usage.get("llm_calls", 1))
         self._update_budget(record, asm_usage)
         record.final_response = response
         logger.info(
@@ -454,53 +1081,106 @@ class RunController:
     # Cross-pollination helpers
     # ------------------------------------------------------------------
 
-    async def _run_cross_pollination(
+    async def _schedule_cross_pollination(
         self,
-        solutions,
-        record,
-        model: str | None = None,
-    ) -> tuple[list[CrossCritique], dict[str, int]]:
-        """Run cross-pollination: each inventor critiques one other."""
-        total_usage = {"tokens_in": 0, "tokens_out": 0, "llm_calls": 0}
-        critiques = []
-
-        tasks = []
-        for i, sol in enumerate(solutions):
-            target_idx = (i + 1) % len(solutions)
-            target = solutions[target_idx]
-
-            own_summary = sol.content[:2000] if sol.content else "No solution"
-            target_content = target.content[:5000] if target.content else "No solution"
-
-            prompt = InventorPrompts.CROSS_CRITIQUE.format(
-                critic_id=sol.inventor_id,
-                critic_type=sol.inventor_type,
-                own_solution_summary=own_summary,
-                target_id=target.inventor_id,
-                target_solution=target_content,
-                problem_brief=record.problem_brief.problem_statement,
-            )
-
-            tasks.append(self._run_single_cross_critique(
-                prompt,
-                sol.inventor_id,
-                target.inventor_id,
-                model=model,
-            ))
+        request: ZeusRequest,
+        record: RunRecord,
+        graph: PhaseGraph,
+        quorum: Quorum | None = None,
+    ) -> None:
+        """Add one critique step per inventor to ``graph`` if Phase 2 is on and affordable.
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Inventor calls are reserved before this runs, so the budget left is
+        what the later phases and Phase 2 share; critiques may take up to
+        half of it, reserved here before they are scheduled. Inventors
+        ``quorum`` leaves behind are neither critics nor targets.
+        """
+        configs = record.inventor_configs
+        if not request.enable_cross_pollination or len(configs) < 2:
+            logger.info("Phase 2: Skipped (cross-pollination disabled or <2 inventors)")
+            return
+        cross_poll_budget = min(await self._calls_left(record) // 2, len(configs) * 2)
+        if cross_poll_budget < 2:
+            logger.info("Phase 2: Skipped — insufficient budget for cross-pollination")
+            return
+        try:
+            reservations = await asyncio.to_thread(
+                self._budget(record).reserve,
+                min(len(configs), cross_poll_budget),
+                min_tasks=2,
+                label="cross-pollination",
+            )
+        except BudgetExceededError:
+            logger.info("Phase 2: Skipped — insufficient budget for cross-pollination")
+            return
 
-        for result in results:
-            if isinstance(result, Exception):
-                logger.warning(f"Cross-critique failed: {result}")
-                continue
-            critique, usage = result
-            critiques.append(critique)
-            total_usage["tokens_in"] += usage.get("tokens_in", 0)
-            total_usage["tokens_out"] += usage.get("tokens_out", 0)
-            total_usage["llm_calls"] += 1
+        ring = [cfg.inventor_id for cfg in configs]
+        model = self._model_for("phase_2")
+        for critic_id, reservation in zip(ring, reservations):
+            graph.add(
+                f"critique_{critic_id}",
+                self._cross_critique_step,
+                reservation,
+                critic_id,
+                ring,
+                record,
+                graph,
+                quorum,
+                model,
+            )
 
-        return critiques, total_usage
+    async def _cross_critique_step(
+        self,
+        reservation: BudgetReservation,
+        critic_id: str,
+        ring: list[str],
+        record: RunRecord,
+        graph: PhaseGraph,
+        quorum: Quorum | None,
+        model: str | None,
+    ) -> tuple[CrossCritique, dict[str, int]] | None:
+        """Have one inventor critique the next valid solution in ``ring``.
+
+        Starts as soon as the critic's and the target's solutions exist.
+        Returns None when there is nothing to critique or the call fails;
+        either way ``reservation`` is released when the step ends.
+        """
+        with self._phase_context("Phase 2"):
+            async with reservation:
+                critic = await self._inventor_solution(graph, quorum, critic_id)
+                if critic is None or not self._is_valid_solution(critic):
+                    return None
+                i = ring.index(critic_id)
+                for target_id in ring[i + 1:] + ring[:i]:
+                    target = await self._inventor_solution(graph, quorum, target_id)
+                    if target is not None and self._is_valid_solution(target):
+                        break
+                else:
+                    return None
+
+                own_summary = critic.content[:2000] if critic.content else "No solution"
+                target_content = target.content[:5000] if target.content else "No solution"
+
+                prompt = InventorPrompts.CROSS_CRITIQUE.format(
+                    critic_id=critic.inventor_id,
+                    critic_type=critic.inventor_type,
+                    own_solution_summary=own_summary,
+                    target_id=target.inventor_id,
+                    target_solution=target_content,
+                    problem_brief=record.problem_brief.problem_statement,
+                )
+                try:
+                    result = await self._run_single_cross_critique(
+                        prompt,
+                        critic.inventor_id,
+                        target.inventor_id,
+                        model=model,
+                    )
+                except Exception as e:
+                    logger.warning(f"Cross-critique failed: {e}")
+                    return None
+                await asyncio.to_thread(reservation.consume)
+                return result
 
     async def _run_single_cross_critique(
         self,
@@ -515,6 +1195,7 @@ class RunController:
             system=InventorPrompts.SYSTEM,
             temperature=0.5,
             model=model,
+            response_format=_CROSS_CRITIQUE_FORMAT,
         )
 
         critique = CrossCritique(
@@ -569,29 +1250,227 @@ class RunController:
 
         return configs
 
+    @staticmethod
+    def _is_valid_solution(solution) -> bool:
+        """Whether an inventor produced a solution (failures are placeholders)."""
+        return not solution.content.startswith("[Inventor")
+
+    async def _generate_solution(
+        self,
+        problem_brief: ProblemBrief,
+        config: InventorConfig,
+        model: str,
+    ) -> tuple[InventorSolution, dict[str, int]]:
+        """Run one inventor, or reuse its stored solution for the same inputs."""
+        memo_key = self._memo_key(
+            "phase_1_inventor", model, InventorPrompts, self._run.inventor.fingerprint(problem_brief, config)
+        )
+        stored = self._memo_get(memo_key)
+        if stored is not None:
+            logger.info(f"Inventor {config.inventor_id}: solution reused from the phase store")
+            solution = InventorSolution.model_validate(stored["solution"])
+            self._emit_result("phase_1", "inventor_solution", solution)
+            return solution, {"llm_calls": 0, "memoized_steps": 1}
+
+        solution, usage = await self._run.inventor.generate_solution(problem_brief, config, model)
+        if self._is_valid_solution(solution):
+            self._memo_put(memo_key, "phase_1_inventor", {"solution": solution.model_dump()})
+            self._emit_result("phase_1", "inventor_solution", solution)
+        return solution, usage
+
+    def _memo_key(self, phase: str, model: str, prompts: type, inputs: dict) -> str | None:
+        """Phase store key of a step, or None when memoization is off."""
+        if self.phase_store is None:
+            return None
+        return PhaseStore.make_key(phase, model, prompts.get_version_info(), inputs)
+
+    def _memo_get(self, key: str | None) -> dict | None:
+        """Stored result for ``key``; a failing store counts as a miss."""
+        if key is None:
+            return None
+        try:
+            return self.phase_store.get(key)
+        except Exception as e:
+            logger.warning(f"Phase store lookup failed: {e}")
+            return None
+
+    def _memo_put(self, key: str | None, phase: str, value: dict) -> None:
+        """Store a result for ``key``; a failing store never fails the run."""
+        if key is None:
+            return
+        try:
+            self.phase_store.put(key, phase, value)
+        except Exception as e:
+            logger.warning(f"Phase store write failed: {e}")
+
+    @staticmethod
+    async def _inventor_solution(
+        graph: PhaseGraph,
+        quorum: Quorum | None,
+        inventor_id: str,
+    ) -> InventorSolution | None:
+        """An inventor's solution, or None if Phase 1 went on without it."""
+        name = f"inventor_{inventor_id}"
+        result = await (quorum.result(name) if quorum else graph.result(name))
+        return result[0] if result else None
+
+    async def _collect_stragglers(self, record: RunRecord, graph: PhaseGraph) -> None:
+        """Merge in inventors left behind by Phase 1 that have finished since; cancel the rest."""
+        solved = {s.inventor_id for s in record.inventor_solutions}
+        names = [
+            f"inventor_{cfg.inventor_id}" for cfg in record.inventor_configs
+            if cfg.inventor_id not in solved and f"inventor_{cfg.inventor_id}" in graph
+        ]
+        finished = [
+            name for name in names
+            if graph.step(name).done() and not graph.step(name).cancelled()
+            and graph.step(name).exception() is None
+        ]
+        if names:
+            await graph.cancel(*names)
+
+        usage = {"tokens_in": 0, "tokens_out": 0, "llm_calls": 0}
+        for name in finished:
+            solution, step_usage = await graph.result(name)
+            record.inventor_solutions.append(solution)
+            record.dropped_inventors.pop(solution.inventor_id, None)
+            accumulate_usage(usage, step_usage)
+        if finished:
+            self._update_budget_aggregate(record, usage)
+            logger.info(f"Merged {len(finished)} late inventor(s) before synthesis: {', '.join(finished)}")
+
+    @staticmethod
+    async def _restored_solution(solution) -> tuple:
+        """Stand-in inventor step for a solution restored from a checkpoint."""
+        return solution, {}
+
+    async def _preload_libraries(self) -> None:
+        """Read every library file off the event loop so later phases hit the cache."""
+        try:
+            libs = await asyncio.to_thread(self._run.library_loader.get_all)
+            logger.info(f"Libraries preloaded — {len(libs)} available")
+        except Exception as e:
+            logger.warning(f"Library preload failed, loading on demand instead: {e}")
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def _emit(self, event_type: type[RunEvent], **fields: Any) -> None:
+        """Deliver an event of the current run to ``on_event`` and run_stream().
+
+        A ProgressEvent's message also goes to ``on_progress``. A failing
+        consumer never fails the run.
+        """
+        run = self._run
+        event = event_type(
+            run_id=run.run_id,
+            at=round(time.monotonic() - run.started, 3),
+            **fields,
+        )
+        consumers = [self.on_event, run.event_sink]
+        if isinstance(event, ProgressEvent):
+            consumers.append(lambda e: self.on_progress(e.message))
+        for consumer in consumers:
+            if consumer is None:
+                continue
+            try:
+                consumer(event)
+            except Exception as e:
+                logger.warning(f"Event consumer failed on {event.type}: {e}")
+
+    def _progress(self, message: str, transient: bool = False) -> None:
+        """Report free-text progress; ``transient`` for status updates not worth logging."""
+        self._emit(ProgressEvent, message=message, transient=transient)
+
+    def _record_error(self, record: RunRecord, message: str, phase: str | None = None) -> None:
+        """Add an error to the record and emit it."""
+        record.errors.append(message)
+        self._emit(ErrorEvent, message=message, phase=phase)
+
+    def _emit_result(self, phase: str, kind: str, value: Any) -> None:
+        """Emit an intermediate deliverable (a model, a list of models or text)."""
+        if isinstance(value, list):
+            content = [item.model_dump() for item in value]
+        elif hasattr(value, "model_dump"):
+            content = value.model_dump()
+        else:
+            content = value
+        self._emit(PartialResultEvent, phase=phase, kind=kind, content=content)
+
+    def _emit_budget(self, record: RunRecord) -> None:
+        """Emit the run's spend so far."""
+        used = record.budget_used
+        self._emit(
+            BudgetEvent,
+            llm_calls=used.llm_calls,
+            tokens_in=used.tokens_in,
+            tokens_out=used.tokens_out,
+            cost_usd=used.cost_usd,
+        )
+
     def _model_for(self, phase_key: str) -> str:
         """Resolve the model for a pipeline phase with fallback to default."""
         return self.model_overrides.get(phase_key, self.llm.model)
 
-    def _check_budget(self, record: RunRecord, phase: str) -> None:
-        """Check if budget allows another LLM call."""
-        if record.budget_used.llm_calls >= self.budget_config.max_llm_calls:
-            raise BudgetExceededError(
-                f"LLM call budget exhausted at phase '{phase}'. "
-                f"Used {record.budget_used.llm_calls}/{self.budget_config.max_llm_calls} calls."
-            )
+    def _new_budget(self, record: RunRecord) -> RunBudget:
+        """Build the budget of a run, drawing on ``budget_pool`` if set."""
+        return RunBudget(self.budget_config, record.budget_used, self.llm.model_pricing, pool=self.budget_pool)
+
+    def _budget(self, record: RunRecord) -> RunBudget:
+        """The current run's budget (created here when a phase runs outside ``run()``)."""
+        run = self._run
+        if run.budget is None:
+            run.budget = self._new_budget(record)
+        return run.budget
+
+    async def _calls_left(self, record: RunRecord) -> int:
+        """LLM calls neither spent nor reserved by the current run."""
+        left = await asyncio.to_thread(self._budget(record).calls_left)
+        return sys.maxsize if left is None else left
+
+    async def _reserve_call(self, record: RunRecord, phase: str) -> BudgetReservation:
+        """Reserve the one LLM call of a sequential phase.
+
+        Raises:
+            BudgetExceededError: If the budget has no call left.
+        """
+        [reservation] = await asyncio.to_thread(self._budget(record).reserve, label=phase)
+        return reservation
+
+    async def _reserved_step(self, reservation: BudgetReservation, fn: Callable, *args):
+        """Run a fan-out step within its reservation, counting its ``llm_calls``."""
+        async with reservation:
+            result = await fn(*args)
+            await asyncio.to_thread(reservation.consume, result[1].get("llm_calls", 1))
+            return result
 
     def _update_budget(self, record: RunRecord, usage: dict[str, int]) -> None:
         """Update budget from a single-call usage dict."""
         record.budget_used.llm_calls += usage.get("llm_calls", 1)
-        record.budget_used.tokens_in += usage.get("tokens_in", 0)
-        record.budget_used.tokens_out += usage.get("tokens_out", 0)
+        self._update_usage_counters(record, usage)
 
     def _update_budget_aggregate(self, record: RunRecord, usage: dict[str, int]) -> None:
         """Update budget from an aggregated usage dict (multiple calls)."""
         record.budget_used.llm_calls += usage.get("llm_calls", 0)
-        record.budget_used.tokens_in += usage.get("tokens_in", 0)
-        record.budget_used.tokens_out += usage.get("tokens_out", 0)
+        self._update_usage_counters(record, usage)
+
+    def _update_usage_counters(self, record: RunRecord, usage: dict[str, int]) -> None:
+        """Add token and per-call outcome counters from a usage dict."""
+        budget = record.budget_used
+        budget.tokens_in += usage.get("tokens_in", 0)
+        budget.tokens_out += usage.get("tokens_out", 0)
+        budget.tokens_in_cached += usage.get("tokens_in_cached", 0)
+        budget.tokens_in_uncached += usage.get("tokens_in_uncached", 0)
+        budget.cache_hits += usage.get("cache_hits", 0)
+        budget.json_repairs_local += usage.get("json_repairs_local", 0)
+        budget.json_repairs_llm += usage.get("json_repairs_llm", 0)
+        budget.hedged_calls += usage.get("hedged_calls", 0)
+        budget.hedge_wins += usage.get("hedge_wins", 0)
+        budget.model_fallbacks += usage.get("model_fallbacks", 0)
+        budget.continuations += usage.get("continuations", 0)
+        budget.memoized_steps += usage.get("memoized_steps", 0)
+        budget.cost_usd += usage.get("cost_usd", 0.0)
 
     def _get_prompt_versions(self) -> dict:
         """Get prompt version info for traceability."""
@@ -618,10 +1497,23 @@ async def run_zeus(
     api_key: str | None = None,
     model: str | None = None,
     phase_models: dict[str, str] | None = None,
+    phase_fallbacks: dict[str, list[str]] | None = None,
     on_progress: Callable[[str], None] | None = None,
+    on_event: Callable[[RunEvent], None] | None = None,
     max_llm_calls: int | None = None,
     max_revisions: int | None = None,
     per_call_timeout: float | None = None,
+    max_tokens_in: int | None = None,
+    max_tokens_out: int | None = None,
+    max_cost_usd: float | None = None,
+    inventor_quorum: int | None = None,
+    inventor_deadline: float | None = None,
+    inventor_stragglers: str | None = None,
+    stream: bool = False,
+    cache: bool = False,
+    cache_all: bool = False,
+    memoize: bool = False,
+    hedge_percentile: float | None = None,
 ) -> ZeusResponse:
     """Convenience function to run Zeus.
 
@@ -640,10 +1532,34 @@ async def run_zeus(
         phase_models: Optional model overrides by phase key
             (``phase_0``..``phase_6``) and optional inventor keys
             (``phase_1_inventor_A``..``phase_1_inventor_E``).
+        phase_fallbacks: Optional ordered fallback models by phase key,
+            e.g. ``{"phase_1": ["model-b", "model-c"]}``.
         on_progress: Optional progress callback.
+        on_event: Optional callback receiving every typed run event
+            (see ``RunController.run_stream``).
         max_llm_calls: Optional hard cap on LLM calls.
         max_revisions: Optional max refinement iterations.
         per_call_timeout: Optional timeout per LLM call in seconds.
+        max_tokens_in: Optional cap on prompt tokens across the run.
+        max_tokens_out: Optional cap on completion tokens across the run.
+        max_cost_usd: Optional cap on spend in USD across the run, priced
+            from the billed or listed cost of each call.
+        inventor_quorum: Optional number of inventor solutions after which
+            Phase 1 moves on without the rest.
+        inventor_deadline: Optional seconds after which Phase 1 moves on
+            with the solutions it has.
+        inventor_stragglers: What happens to inventors Phase 1 moved on
+            without: ``"merge"`` (default) or ``"cancel"``.
+        stream: Stream LLM responses and forward partial output through
+            ``on_progress``.
+        cache: Serve low-temperature calls (intake, JSON repair, assembly)
+            from the on-disk response cache.
+        cache_all: Cache every call, so re-running the same brief replays
+            completed phases instead of paying for them again.
+        memoize: Reuse the ProblemBrief and inventor solutions of earlier
+            runs with the same inputs, models and prompt versions.
+        hedge_percentile: Hedge calls that run past this percentile (0-1)
+            of recent latencies with a duplicate request; off by default.
 
     Returns:
         The ZeusResponse with 5 deliverables and evaluation scorecard.
@@ -667,23 +1583,209 @@ async def run_zeus(
         budget_kwargs["max_revisions"] = max_revisions
     if per_call_timeout is not None:
         budget_kwargs["per_call_timeout"] = per_call_timeout
+    if max_tokens_in is not None:
+        budget_kwargs["max_tokens_in"] = max_tokens_in
+    if max_tokens_out is not None:
+        budget_kwargs["max_tokens_out"] = max_tokens_out
+    if max_cost_usd is not None:
+        budget_kwargs["max_cost_usd"] = max_cost_usd
+    if inventor_quorum is not None:
+        budget_kwargs["inventor_quorum"] = inventor_quorum
+    if inventor_deadline is not None:
+        budget_kwargs["inventor_deadline"] = inventor_deadline
+    if inventor_stragglers is not None:
+        budget_kwargs["inventor_stragglers"] = inventor_stragglers
 
     budget_config = BudgetConfig(**budget_kwargs) if budget_kwargs else BudgetConfig()
 
-    client_kwargs = {}
+    response_cache = ResponseCache() if cache or cache_all else None
+    phase_store = PhaseStore() if memoize else None
+    client_kwargs = build_client_kwargs(
+        api_key, model, budget_config, stream, hedge_percentile, response_cache, cache_all
+    )
+
+    try:
+        async with OpenRouterClient(**client_kwargs) as client:
+            await client.load_model_limits()
+            controller = RunController(
+                client,
+                on_progress=on_progress,
+                budget_config=budget_config,
+                library_paths=library_paths,
+                model_overrides=phase_models,
+                fallback_models=phase_fallbacks,
+                phase_store=phase_store,
+                on_event=on_event,
+            )
+            return await controller.run(request)
+    finally:
+        if response_cache:
+            logger.info(f"LLM response cache: {response_cache.stats()}")
+            response_cache.close()
+        if phase_store:
+            logger.info(f"Phase store: {phase_store.stats()}")
+            phase_store.close()
+
+
+async def resume_zeus(
+    run_id: str,
+    api_key: str | None = None,
+    model: str | None = None,
+    on_progress: Callable[[str], None] | None = None,
+    stream: bool = False,
+    cache: bool = False,
+    hedge_percentile: float | None = None,
+) -> ZeusResponse:
+    """Convenience function to resume an interrupted run.
+
+    The run continues from its last checkpoint (see ``RunController.resume``)
+    with the model, per-phase models and fallbacks, and budget caps it was
+    started with.
+
+    Args:
+        run_id: ID (or prefix) of the run to resume.
+        api_key: Optional API key (uses env var if not provided).
+        model: Optional model override for the remaining phases.
+        on_progress: Optional progress callback.
+        stream: Stream LLM responses and forward partial output through
+            ``on_progress``.
+        cache: Serve low-temperature calls from the on-disk response cache.
+        hedge_percentile: Hedge calls that run past this latency percentile.
+
+    Returns:
+        The ZeusResponse of the completed run.
+
+    Raises:
+        ValueError: If no record exists for ``run_id``.
+    """
+    persistence = Persistence()
+    record = persistence.load(run_id)
+    if record is None:
+        raise ValueError(f"Run not found: {run_id}")
+    budget_config = record.budget_config or BudgetConfig()
+
+    response_cache = ResponseCache() if cache else None
+    client_kwargs = build_client_kwargs(
+        api_key, model or record.model_version, budget_config, stream, hedge_percentile, response_cache
+    )
+
+    try:
+        async with OpenRouterClient(**client_kwargs) as client:
+            await client.load_model_limits()
+            controller = RunController(
+                client,
+                persistence=persistence,
+                on_progress=on_progress,
+                budget_config=budget_config,
+                library_paths=record.request.library_paths,
+                model_overrides=record.prompt_versions.get("phase_models"),
+                fallback_models=record.prompt_versions.get("phase_fallbacks"),
+            )
+            return await controller.resume(record.run_id)
+    finally:
+        if response_cache:
+            logger.info(f"LLM response cache: {response_cache.stats()}")
+            response_cache.close()
+
+
+async def rerun_zeus(
+    run_id: str,
+    changes: dict[str, Any],
+    api_key: str | None = None,
+    model: str | None = None,
+    on_progress: Callable[[str], None] | None = None,
+    stream: bool = False,
+    cache: bool = False,
+    hedge_percentile: float | None = None,
+    from_phase: str | None = None,
+) -> ZeusResponse:
+    """Convenience function to rerun a finished run with a changed request.
+
+    Only the phases the changes affect run again (see
+    ``RunController.rerun``), with the model, per-phase models and
+    fallbacks, and budget caps of the original run.
+
+    Args:
+        run_id: ID (or prefix) of the finished run.
+        changes: ZeusRequest fields to change, e.g. ``{"constraints": [...]}``.
+        api_key: Optional API key (uses env var if not provided).
+        model: Optional model override for the repeated phases.
+        on_progress: Optional progress callback.
+        stream: Stream LLM responses and forward partial output through
+            ``on_progress``.
+        cache: Serve low-temperature calls from the on-disk response cache.
+        hedge_percentile: Hedge calls that run past this latency percentile.
+        from_phase: Repeat from this phase even if the changes would
+            leave its results valid.
+
+    Returns:
+        The ZeusResponse of the new run.
+
+    Raises:
+        ValueError: If no finished record exists for ``run_id``, or the
+            changed request is invalid.
+    """
+    persistence = Persistence()
+    record = persistence.load(run_id)
+    if record is None:
+        raise ValueError(f"Run not found: {run_id}")
+    try:
+        request = ZeusRequest.model_validate({**record.request.model_dump(), **changes})
+    except ValidationError as e:
+        raise ValueError(f"Invalid request: {e}") from e
+    budget_config = record.budget_config or BudgetConfig()
+
+    response_cache = ResponseCache() if cache else None
+    client_kwargs = build_client_kwargs(
+        api_key, model or record.model_version, budget_config, stream, hedge_percentile, response_cache
+    )
+
+    try:
+        async with OpenRouterClient(**client_kwargs) as client:
+            await client.load_model_limits()
+            controller = RunController(
+                client,
+                persistence=persistence,
+                on_progress=on_progress,
+                budget_config=budget_config,
+                library_paths=request.library_paths,
+                model_overrides=record.prompt_versions.get("phase_models"),
+                fallback_models=record.prompt_versions.get("phase_fallbacks"),
+            )
+            return await controller.rerun(record.run_id, request, from_phase)
+    finally:
+        if response_cache:
+            logger.info(f"LLM response cache: {response_cache.stats()}")
+            response_cache.close()
+
+
+def build_client_kwargs(
+    api_key: str | None,
+    model: str | None,
+    budget_config: BudgetConfig,
+    stream: bool,
+    hedge_percentile: float | None,
+    response_cache: ResponseCache | None,
+    cache_all: bool = False,
+    shared_rate_limit: SharedRateLimit | None = None,
+) -> dict:
+    """Build OpenRouterClient arguments for a run."""
+    # Reuse the process-wide connection pool so consecutive runs skip TLS setup
+    client_kwargs = {"shared_pool": True}
     if api_key:
         client_kwargs["api_key"] = api_key
     if model:
         client_kwargs["model"] = model
     if budget_config.per_call_timeout:
         client_kwargs["timeout"] = budget_config.per_call_timeout
-
-    async with OpenRouterClient(**client_kwargs) as client:
-        controller = RunController(
-            client,
-            on_progress=on_progress,
-            budget_config=budget_config,
-            library_paths=library_paths,
-            model_overrides=phase_models,
-        )
-        return await controller.run(request)
+    client_kwargs["max_continuations"] = budget_config.max_continuations
+    if stream:
+        client_kwargs["stream"] = True
+    if hedge_percentile is not None:
+        client_kwargs["hedge_percentile"] = hedge_percentile
+    if response_cache:
+        client_kwargs["cache"] = response_cache
+        client_kwargs["cache_all"] = cache_all
+    if shared_rate_limit:
+        client_kwargs["shared_rate_limit"] = shared_rate_limit
+    return client_kwargs
@@ -0,0 +1,189 @@
+"""Dependency-graph scheduling of pipeline steps."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PhaseGraph:
+    """Runs async pipeline steps as soon as the steps they depend on finish.
+
+    Steps are added by name with the names of the steps they need
+    (``after``); each becomes a task that waits for those steps and then
+    runs. Steps may be added while the graph is running, including by
+    other steps, and a step may ``await graph.result(name)`` to depend on
+    another one only when it needs it.
+
+    Used as an async context manager: leaving the block waits for every
+    step. The first step to raise cancels all the others and its
+    exception is re-raised unchanged, so callers handle it exactly as if
+    the step had been awaited directly. Steps whose failures are not
+    fatal should therefore catch them and return a fallback result.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def __aenter__(self) -> "PhaseGraph":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.wait()
+        else:
+            await self.cancel()
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        after: list[str] | tuple[str, ...] = (),
+    ) -> asyncio.Task:
+        """Schedule ``fn(*args)`` to start once every step in ``after`` has finished.
+
+        Returns:
+            The step's task; awaiting it returns ``fn``'s result.
+
+        Raises:
+            ValueError: If ``name`` is taken or a dependency is unknown.
+        """
+        if name in self._tasks:
+            raise ValueError(f"Step {name!r} is already scheduled")
+        missing = [dep for dep in after if dep not in self._tasks]
+        if missing:
+            raise ValueError(f"Step {name!r} depends on unknown step(s): {', '.join(missing)}")
+        deps = [self._tasks[dep] for dep in after]
+
+        async def run() -> Any:
+            if deps:
+                await asyncio.gather(*deps)
+            return await fn(*args)
+
+        task = asyncio.create_task(run(), name=name)
+        self._tasks[name] = task
+        return task
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tasks
+
+    def step(self, name: str) -> asyncio.Task:
+        """The task of step ``name``, e.g. to check whether it is done without waiting."""
+        return self._tasks[name]
+
+    async def result(self, name: str) -> Any:
+        """Wait for step ``name`` and return its result."""
+        return await self._tasks[name]
+
+    async def wait(self) -> None:
+        """Wait for every step, including ones added meanwhile.
+
+        Raises:
+            Exception: The first exception raised by a step, after the
+                remaining steps have been cancelled.
+        """
+        while True:
+            failed = next(
+                (t for t in self._tasks.values() if t.done() and not t.cancelled() and t.exception()),
+                None,
+            )
+            if failed is not None:
+                logger.debug(f"Step {failed.get_name()!r} failed — cancelling remaining steps")
+                await self.cancel()
+                raise failed.exception()
+            pending = [t for t in self._tasks.values() if not t.done()]
+            if not pending:
+                return
+            await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+
+    async def cancel(self, *names: str) -> None:
+        """Cancel the named unfinished steps (default: all) and wait for them to unwind."""
+        tasks = [self._tasks[name] for name in names] if names else self._tasks.values()
+        pending = [t for t in tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+class Quorum:
+    """Lets a phase move on once enough of its parallel steps are done.
+
+    ``wait`` returns as soon as ``size`` of the steps have produced a
+    result that ``accept`` approves, or, once ``deadline`` seconds have
+    passed, as soon as at least one has (the deadline is soft: with no
+    accepted result yet it keeps waiting). With neither set it waits for
+    every step. Steps not done by then are the ``stragglers``; they keep
+    running until the caller cancels or collects them.
+
+    Other steps that need a result should ask ``result``, which stops
+    waiting on a straggler once the quorum is decided, rather than
+    ``PhaseGraph.result``.
+    """
+
+    def __init__(
+        self,
+        graph: PhaseGraph,
+        names: list[str],
+        size: int = 0,
+        deadline: float = 0.0,
+        accept: Callable[[Any], bool] = lambda result: True,
+    ):
+        self.graph = graph
+        self.names = list(names)
+        self.size = size
+        self.deadline = deadline
+        self.accept = accept
+        self.members: list[str] = []
+        self.stragglers: list[str] = []
+        # Why the quorum was decided before every step was done
+        self.reason = ""
+        self.decided = asyncio.Event()
+
+    async def wait(self) -> list[str]:
+        """Wait for the quorum; return the names of the steps that made it, in order."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = {name: self.graph.step(name) for name in self.names}
+        pending = set(tasks.values())
+        accepted = 0
+        while pending:
+            if self.size and accepted >= self.size:
+                self.reason = f"quorum of {self.size} reached"
+                break
+            timeout = None
+            if self.deadline:
+                left = self.deadline - (loop.time() - start)
+                if left <= 0 and accepted:
+                    self.reason = f"deadline of {self.deadline:g}s passed"
+                    break
+                timeout = left if left > 0 else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            accepted += sum(
+                1 for t in done
+                if not t.cancelled() and t.exception() is None and self.accept(t.result())
+            )
+
+        self.members = [name for name, task in tasks.items() if task.done()]
+        self.stragglers = [name for name, task in tasks.items() if not task.done()]
+        if self.stragglers:
+            logger.info(
+                f"Quorum decided ({self.reason}) with {len(self.members)} of {len(self.names)} steps "
+                f"done after {loop.time() - start:.1f}s — left behind: {', '.join(self.stragglers)}"
+            )
+        self.decided.set()
+        return self.members
+
+    async def result(self, name: str) -> Any | None:
+        """Result of step ``name``, or None once the quorum went on without it."""
+        task = self.graph.step(name)
+        if not task.done() and not self.decided.is_set():
+            decided = asyncio.create_task(self.decided.wait())
+            try:
+                await asyncio.wait({task, decided}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                decided.cancel()
+        if name in self.stragglers:
+            return None
+        return await task
@@ -0,0 +1,600 @@
+"""Job server - a long-lived local HTTP service running Zeus requests from a queue.
+
+Endpoints (JSON unless noted):
+
+    POST   /runs               Queue a request: ZeusRequest fields plus an
+                               optional integer ``priority`` (higher runs
+                               first) and ``tenant`` (runs of a tenant share
+                               LLM call slots fairly with other tenants').
+                               Fields naming files on the server
+                               (``library_paths``, ``output_spec_path``,
+                               ``eval_criteria_path``) are refused.
+                               202 with the run id; 429 when the queue is full.
+    GET    /runs               Runs known to the server, newest first.
+    GET    /runs/{id}          Status of a run; its response once finished
+                               (read from Persistence, so earlier runs work too).
+    GET    /runs/{id}/events   Server-sent events of a run (text/event-stream):
+                               the events so far, then live ones up to
+                               ``run_finished``.
+    DELETE /runs/{id}          Cancel a queued or running run.
+    GET    /health             Queue and worker counts.
+
+All runs share one RunController, and so one client, connection pool,
+rate limiter, library cache, response cache and phase store.
+
+A server is one process: its runs' events, cancellation and status live
+in it, so it does not spread runs over worker processes the way
+``zeus batch --processes`` does. To use more cores, start more servers
+(or ``zeus queue work`` workers) with the same ``shared_state``, so that
+they share the provider's rate limits.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any
+from pydantic import BaseModel, ValidationError
+from src.models.events import OutputDeltaEvent, RunEvent, RunFinishedEvent
+from src.models.schemas import BudgetConfig, RunRecord, ZeusRequest
+from src.llm.openrouter import OpenRouterClient
+from src.llm.cache import ResponseCache
+from src.llm.rate_limiter import SharedRateLimit
+from src.llm.transport import close_shared_client
+from src.core.persistence import Persistence
+from src.core.phase_store import PhaseStore
+from src.core.run_controller import RunController, build_client_kwargs
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_HOST = "127.0.0.1"
+_DEFAULT_PORT = 8765
+_DEFAULT_WORKERS = 4
+# Runs waiting for a worker before submissions are turned away (429)
+_DEFAULT_MAX_QUEUED = 100
+# Seconds a client should wait before submitting again after a 429
+_RETRY_AFTER = 5
+
+# Largest request body accepted, in bytes
+_MAX_BODY_BYTES = 1024 * 1024
+# ZeusRequest fields naming files on the server's own disk: not settable over HTTP
+_LOCAL_FILE_FIELDS = {"library_paths", "output_spec_path", "eval_criteria_path"}
+# Events of a run kept for subscribers that connect late (output deltas are not kept)
+_EVENT_HISTORY = 500
+# Finished runs kept in memory; older ones are still served from Persistence
+_MAX_FINISHED_JOBS = 1000
+# Seconds between keep-alive comments on an idle event stream
+_SSE_KEEPALIVE = 15.0
+# Events buffered per event-stream client (more than the history it is replayed)
+_SUBSCRIBER_BUFFER = 2 * _EVENT_HISTORY
+
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+class _HTTPError(Exception):
+    """An error answered with ``status`` and a JSON ``{"error": message}`` body."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Job:
+    """One submitted run: its request, place in the queue and events."""
+
+    def __init__(self, request: ZeusRequest, priority: int = 0, tenant: str | None = None):
+        self.run_id = str(uuid.uuid4())
+        self.request = request
+        self.priority = priority
+        self.tenant = tenant
+        # queued → running → done | failed | cancelled
+        self.status = "queued"
+        self.error: str | None = None
+        self.submitted = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.task: asyncio.Task | None = None
+        self.events: deque[RunEvent] = deque(maxlen=_EVENT_HISTORY)
+        self._subscribers: list[asyncio.Queue[RunEvent | None]] = []
+
+    @property
+    def done(self) -> bool:
+        """Whether the run has finished, one way or another."""
+        return self.status in ("done", "failed", "cancelled")
+
+    def publish(self, event: RunEvent) -> None:
+        """Deliver an event to every subscriber, keeping it for later ones.
+
+        A subscriber that falls behind misses output deltas once its buffer
+        is half full; once it is full, its backlog is replaced by None,
+        telling it to disconnect (it can reconnect to replay the history).
+        """
+        delta = isinstance(event, OutputDeltaEvent)
+        if not delta:
+            self.events.append(event)
+        for queue in list(self._subscribers):
+            if delta and queue.qsize() >= queue.maxsize // 2:
+                continue
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning(f"Run {self.run_id}: event stream client fell behind — disconnecting it")
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                self.unsubscribe(queue)
+
+    def subscribe(self) -> asyncio.Queue[RunEvent | None]:
+        """A queue receiving the events so far, then each new one; None if it fell behind."""
+        queue: asyncio.Queue[RunEvent | None] = asyncio.Queue(maxsize=_SUBSCRIBER_BUFFER)
+        for event in self.events:
+            queue.put_nowait(event)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[RunEvent | None]) -> None:
+        """Stop delivering events to ``queue``."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def finish(self, status: str, error: str | None = None) -> None:
+        """Record the outcome; a run that never started gets its closing event here."""
+        self.status = status
+        self.error = error
+        self.finished = time.time()
+        if not self.events or not isinstance(self.events[-1], RunFinishedEvent):
+            self.publish(RunFinishedEvent(run_id=self.run_id, errors=[error] if error else []))
+
+    def summary(self) -> dict[str, Any]:
+        """JSON-ready status of the run."""
+        return {
+            "run_id": self.run_id,
+            "status": self.status,
+            "priority": self.priority,
+            "tenant": self.tenant,
+            "prompt": self.request.prompt[:100],
+            "submitted": self.submitted,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+
+class JobServer:
+    """Queues submitted requests and runs them on a bounded pool of workers.
+
+    Runs start in priority order (then submission order). At most
+    ``workers`` run at once and at most ``max_queued`` wait; further
+    submissions are rejected with 429 so callers back off instead of
+    piling up work the rate limits cannot serve.
+    """
+
+    def __init__(
+        self,
+        controller: RunController,
+        workers: int = _DEFAULT_WORKERS,
+        max_queued: int = _DEFAULT_MAX_QUEUED,
+    ):
+        self.controller = controller
+        self.persistence = controller.persistence
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        # (-priority, submission order, run id)
+        self._queue: asyncio.PriorityQueue[tuple[int, int, str]] = asyncio.PriorityQueue()
+        self._order = itertools.count()
+        self._queued = 0
+        self._running = 0
+        self._worker_tasks: list[asyncio.Task] = []
+        self._connections: set[asyncio.Task] = set()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self, host: str = _DEFAULT_HOST, port: int = _DEFAULT_PORT) -> tuple[str, int]:
+        """Start the workers and listen for HTTP connections.
+
+        Returns:
+            The address listened on (``port`` 0 picks a free port).
+        """
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, host, port)
+        address = self._server.sockets[0].getsockname()[:2]
+        logger.info(f"Job server listening on http://{address[0]}:{address[1]} ({self.workers} workers)")
+        return address
+
+    async def close(self) -> None:
+        """Stop accepting connections and cancel running runs (they are saved and can be resumed)."""
+        if self._server is not None:
+            self._server.close()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        if self._queued:
+            logger.warning(f"Job server stopped with {self._queued} run(s) still queued")
+
+    async def __aenter__(self) -> "JobServer":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    # ------------------------------------------------------------------
+    # Queue and workers
+    # ------------------------------------------------------------------
+
+    def submit(self, request: ZeusRequest, priority: int = 0, tenant: str | None = None) -> Job:
+        """Queue a request.
+
+        Raises:
+            OverflowError: If ``max_queued`` runs are already waiting.
+        """
+        if self._queued >= self.max_queued:
+            raise OverflowError(f"Queue full ({self._queued} runs waiting)")
+        job = Job(request, priority, tenant)
+        self.jobs[job.run_id] = job
+        self._queued += 1
+        self._queue.put_nowait((-priority, next(self._order), job.run_id))
+        logger.info(f"Queued run {job.run_id} (priority {priority}, {self._queued} waiting)")
+        return job
+
+    def cancel(self, run_id: str) -> Job | None:
+        """Cancel a queued or running run; None if the server does not know it."""
+        job = self.jobs.get(run_id)
+        if job is None or job.done:
+            return job
+        if job.status == "queued":
+            self._queued -= 1
+            job.finish("cancelled", "Run cancelled")
+            self._forget_finished()
+        elif job.task is not None:
+            job.task.cancel()
+        return job
+
+    async def _worker(self) -> None:
+        """Take runs off the queue, highest priority first, one at a time."""
+        while True:
+            _, _, run_id = await self._queue.get()
+            job = self.jobs.get(run_id)
+            if job is None or job.status != "queued":
+                continue  # Cancelled while waiting
+            self._queued -= 1
+            job.task = asyncio.create_task(self._execute(job))
+            try:
+                await asyncio.wait([job.task])
+            except asyncio.CancelledError:
+                job.task.cancel()
+                await asyncio.gather(job.task, return_exceptions=True)
+                raise
+
+    async def _execute(self, job: Job) -> None:
+        """Run a job through ``run_stream``, forwarding its events."""
+        job.status = "running"
+        job.started = time.time()
+        self._running += 1
+        try:
+            finished = None
+            async for event in self.controller.run_stream(job.request, run_id=job.run_id, tenant=job.tenant):
+                job.publish(event)
+                if isinstance(event, RunFinishedEvent):
+                    finished = event
+            if finished is None or finished.response is None:
+                job.finish("failed", "Run produced no response")
+            else:
+                job.finish("done")
+        except asyncio.CancelledError:
+            job.finish("cancelled", "Run cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Run {job.run_id} failed: {e}", exc_info=True)
+            job.finish("failed", str(e))
+        finally:
+            self._running -= 1
+            self._forget_finished()
+
+    def _forget_finished(self) -> None:
+        """Drop the oldest finished runs beyond ``_MAX_FINISHED_JOBS``."""
+        finished = [run_id for run_id, job in self.jobs.items() if job.done]
+        for run_id in finished[:max(0, len(finished) - _MAX_FINISHED_JOBS)]:
+            del self.jobs[run_id]
+
+    def health(self) -> dict[str, Any]:
+        """Queue and worker counts."""
+        return {
+            "status": "ok",
+            "queued": self._queued,
+            "running": self._running,
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+        }
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one connection (one request; every response closes the connection)."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            method, path, body = await self._read_request(reader)
+            await self._route(method, path, body, writer)
+        except _HTTPError as e:
+            await self._respond(writer, e.status, {"error": e.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error(f"Job server request failed: {e}", exc_info=True)
+            await self._respond(writer, 500, {"error": str(e)})
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+        """Parse the request line, headers and body of one HTTP/1.1 request."""
+        line = await reader.readline()
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise _HTTPError(400, "Malformed request line")
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HTTPError(400, "Invalid Content-Length")
+        if length > _MAX_BODY_BYTES:
+            raise _HTTPError(413, f"Body larger than {_MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+        return method.upper(), target.split("?", 1)[0], body
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        """Dispatch a request to its endpoint."""
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"] and method == "GET":
+            await self._respond(writer, 200, self.health())
+        elif parts == ["runs"] and method == "POST":
+            await self._post_run(body, writer)
+        elif parts == ["runs"] and method == "GET":
+            jobs = [job.summary() for job in reversed(self.jobs.values())]
+            await self._respond(writer, 200, {"runs": jobs})
+        elif len(parts) == 2 and parts[0] == "runs" and method == "GET":
+            await self._respond(writer, 200, await self._run_status(parts[1]))
+        elif len(parts) == 2 and parts[0] == "runs" and method == "DELETE":
+            job = self.cancel(parts[1])
+            if job is None:
+                raise _HTTPError(404, f"Run not found: {parts[1]}")
+            await self._respond(writer, 200, job.summary())
+        elif len(parts) == 3 and parts[0] == "runs" and parts[2] == "events" and method == "GET":
+            await self._stream_events(parts[1], writer)
+        elif parts[:1] in (["health"], ["runs"]):
+            raise _HTTPError(405, f"{method} not allowed on {path}")
+        else:
+            raise _HTTPError(404, f"No such endpoint: {path}")
+
+    async def _post_run(self, body: bytes, writer: asyncio.StreamWriter) -> None:
+        """Validate and queue a submitted request."""
+        try:
+            fields = json.loads(body or b"{}")
+            if not isinstance(fields, dict):
+                raise ValueError(f"expected an object, got {type(fields).__name__}")
+            priority = fields.pop("priority", 0)
+            if type(priority) is not int:
+                raise ValueError(f"priority must be an integer, got {json.dumps(priority)}")
+            tenant = fields.pop("tenant", None)
+            if tenant is not None and not isinstance(tenant, str):
+                raise ValueError(f"tenant must be a string, got {type(tenant).__name__}")
+            local = sorted(_LOCAL_FILE_FIELDS & fields.keys())
+            if local:
+                raise ValueError(f"{', '.join(local)} cannot be set over HTTP: the server reads no files for clients")
+            request = ZeusRequest.model_validate(fields)
+        except (TypeError, ValueError, ValidationError) as e:
+            raise _HTTPError(400, f"Invalid request: {e}")
+        try:
+            job = self.submit(request, priority, tenant)
+        except OverflowError as e:
+            await self._respond(writer, 429, {"error": str(e)}, {"Retry-After": str(_RETRY_AFTER)})
+            return
+        await self._respond(writer, 202, job.summary(), {"Location": f"/runs/{job.run_id}"})
+
+    async def _run_status(self, run_id: str) -> dict[str, Any]:
+        """Status of a run, with its response from Persistence once finished."""
+        job = self.jobs.get(run_id)
+        if job is not None and not job.done:
+            return job.summary()
+        record = await self._load_record(run_id)
+        if job is None and record is None:
+            raise _HTTPError(404, f"Run not found: {run_id}")
+        status = job.summary() if job else {
+            "run_id": record.run_id,
+            "status": "done" if record.final_response else "incomplete",
+        }
+        if record is not None:
+            status["errors"] = record.errors
+            status["response"] = record.final_response.model_dump(mode="json") if record.final_response else None
+        return status
+
+    async def _stream_events(self, run_id: str, writer: asyncio.StreamWriter) -> None:
+        """Send a run's events as server-sent events until it finishes."""
+        job = self.jobs.get(run_id)
+        if job is None:
+            record = await self._load_record(run_id)
+            if record is None:
+                raise _HTTPError(404, f"Run not found: {run_id}")
+            await self._start_stream(writer)
+            event = RunFinishedEvent(run_id=record.run_id, response=record.final_response, errors=record.errors)
+            await self._send_event(writer, event)
+            return
+
+        await self._start_stream(writer)
+        queue = job.subscribe()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=_SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+                if event is None:
+                    break  # Fell behind; the client may reconnect
+                await self._send_event(writer, event)
+                if isinstance(event, RunFinishedEvent):
+                    break
+        finally:
+            job.unsubscribe(queue)
+
+    async def _load_record(self, run_id: str) -> RunRecord | None:
+        """The record of exactly ``run_id`` (never one whose ID merely shares a prefix), read off the event loop."""
+        return await asyncio.to_thread(self.persistence.load, run_id, exact=True)
+
+    @staticmethod
+    async def _start_stream(writer: asyncio.StreamWriter) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def _send_event(writer: asyncio.StreamWriter, event: RunEvent) -> None:
+        writer.write(f"event: {event.type}\ndata: {event.model_dump_json()}\n\n".encode("utf-8"))
+        await writer.drain()
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict[str, Any] | BaseModel,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        if isinstance(payload, BaseModel):
+            payload = payload.model_dump(mode="json")
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+            *(f"{name}: {value}" for name, value in (headers or {}).items()),
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve_zeus(
+    host: str = _DEFAULT_HOST,
+    port: int = _DEFAULT_PORT,
+    workers: int = _DEFAULT_WORKERS,
+    max_queued: int = _DEFAULT_MAX_QUEUED,
+    api_key: str | None = None,
+    model: str | None = None,
+    phase_models: dict[str, str] | None = None,
+    phase_fallbacks: dict[str, list[str]] | None = None,
+    budget: dict[str, Any] | None = None,
+    stream: bool = False,
+    cache: bool = False,
+    cache_all: bool = False,
+    memoize: bool = False,
+    hedge_percentile: float | None = None,
+    persistence: Persistence | None = None,
+    tenant_weights: dict[str, float] | None = None,
+    requests_per_minute: float = 0.0,
+    shared_state: str | Path | None = None,
+) -> None:
+    """Run the job server until cancelled (e.g. by Ctrl+C).
+
+    Args:
+        host: Interface to listen on.
+        port: Port to listen on.
+        workers: Max runs in flight.
+        max_queued: Max runs waiting for a worker before submissions get 429.
+        api_key: Optional API key (uses env var if not provided).
+        model: Optional model override.
+        phase_models: Optional model overrides by phase key.
+        phase_fallbacks: Optional ordered fallback models by phase key.
+        budget: BudgetConfig fields every run is held to.
+        stream: Stream LLM responses, so event streams carry output deltas.
+        cache: Serve low-temperature calls from the response cache.
+        cache_all: Cache every call.
+        memoize: Reuse briefs and inventor solutions across runs.
+        hedge_percentile: Hedge calls past this latency percentile.
+        persistence: Where run records are kept.
+        tenant_weights: Relative share of LLM call slots per tenant;
+            unlisted tenants weigh 1.
+        requests_per_minute: Optional cap on requests per model per
+            minute across every process sharing ``shared_state``.
+        shared_state: Directory of rate-limit state shared with other
+            servers and workers; required for ``requests_per_minute``.
+
+    Raises:
+        ValueError: If ``requests_per_minute`` is set without ``shared_state``.
+    """
+    shared_limits = None
+    if shared_state:
+        shared_state = Path(shared_state)
+        shared_state.mkdir(parents=True, exist_ok=True)
+        # Servers sharing the state may run on other hosts: no WAL
+        shared_limits = SharedRateLimit(
+            shared_state / SharedRateLimit.DB_NAME, requests_per_minute, journal_mode="DELETE"
+        )
+    elif requests_per_minute:
+        raise ValueError("requests_per_minute needs a shared_state directory")
+    budget_config = BudgetConfig(**(budget or {}))
+    response_cache = ResponseCache() if cache or cache_all else None
+    phase_store = PhaseStore() if memoize else None
+    client_kwargs = build_client_kwargs(
+        api_key, model, budget_config, stream, hedge_percentile, response_cache, cache_all, shared_limits
+    )
+    if tenant_weights:
+        client_kwargs["tenant_weights"] = tenant_weights
+
+    try:
+        async with OpenRouterClient(**client_kwargs) as client:
+            await client.load_model_limits()
+            controller = RunController(
+                client,
+                persistence=persistence or Persistence(),
+                budget_config=budget_config,
+                model_overrides=phase_models,
+                fallback_models=phase_fallbacks,
+                phase_store=phase_store,
+            )
+            async with JobServer(controller, workers=workers, max_queued=max_queued) as server:
+                await server.start(host, port)
+                await asyncio.Event().wait()
+    finally:
+        if response_cache:
+            logger.info(f"LLM response cache: {response_cache.stats()}")
+            response_cache.close()
+        if phase_store:
+            logger.info(f"Phase store: {phase_store.stats()}")
+            phase_store.close()
+        if shared_limits:
+            shared_limits.close()
+        await close_shared_client()
@@ -6,11 +6,17 @@ from src.models.schemas import (
     SynthesisResult, Provenance, ResolvedConflict,
 )
 from src.llm.openrouter import OpenRouterClient
+from src.llm.structured import json_schema_format
 from src.prompts.synthesis import SynthesisPrompts
-from src.core.library_loader import LibraryLoader
+from src.core.library_loader import LibraryLoader, format_library_context
 
 logger = logging.getLogger(__name__)
 
+_MAX_TOKENS = 16384
+
+# The draft version is tracked locally, not by the model
+_SYNTHESIS_FORMAT = json_schema_format(SynthesisResult, exclude={"version"})
+
 
 class Synthesizer:
     """Combines inventor solutions into a unified draft."""
@@ -39,47 +45,58 @@ class Synthesizer:
         logger.info(f"Synthesizing {len(solutions)} inventor solutions" +
                      (f" with {len(cross_critiques)} cross-critiques" if cross_critiques else ""))
 
-        # Summarize each solution to manage context window
-        solutions_text = self._format_solutions(solutions)
-        logger.info(f"Formatted solutions text: {len(solutions_text)} chars")
-
         # Format cross-critiques if available
         cross_critiques_section = ""
         if cross_critiques:
             cross_critiques_section = "CROSS-CRITIQUES:\n" + self._format_cross_critiques(cross_critiques)
 
+        objectives_str = "\n".join(f"- {o}" for o in problem_brief.objectives) if problem_brief.objectives else "None"
+        constraints_str = "\n".join(f"- {c}" for c in problem_brief.constraints) if problem_brief.constraints else "None"
+
+        brief = SynthesisPrompts.BRIEF.format(
+            problem_brief=problem_brief.problem_statement,
+            objectives=objectives_str,
+            constraints=constraints_str,
+            eval_criteria=problem_brief.eval_criteria or "Not provided",
+        )
+        frame = SynthesisPrompts.SYNTHESIZE.format(
+            num_solutions=len(solutions),
+            solutions="",
+            cross_critiques_section=cross_critiques_section,
+        )
+
+        # Solutions get first claim on the window; libraries share what is left
+        budget = self.llm.prompt_budget(model, _MAX_TOKENS)
+        fixed = [SynthesisPrompts.SYSTEM, brief, frame]
+        contents = budget.fit(fixed + [self._format_solutions(solutions, [""] * len(solutions))],
+                              [sol.content for sol in solutions])
+        solutions_text = self._format_solutions(solutions, contents)
+        logger.info(f"Formatted solutions text: {len(solutions_text)} chars")
+
         # Build library context (synthesizer gets ALL libraries)
         all_libs = self.library_loader.get_all()
         library_context = ""
         if all_libs:
             logger.info(f"Loading {len(all_libs)} libraries for synthesis: {list(all_libs.keys())}")
-            parts = ["ALL REFERENCE LIBRARIES:"]
-            for name, content in all_libs.items():
-                truncated = content[:15000] if len(content) > 15000 else content
-                parts.append(f"\n--- {name.upper()} ---\n{truncated}")
-            library_context = "\n".join(parts)
-
-        objectives_str = "\n".join(f"- {o}" for o in problem_brief.objectives) if problem_brief.objectives else "None"
-        constraints_str = "\n".join(f"- {c}" for c in problem_brief.constraints) if problem_brief.constraints else "None"
+            library_context = format_library_context(
+                "ALL REFERENCE LIBRARIES:", all_libs, budget, fixed + [solutions_text],
+            )
 
         prompt = SynthesisPrompts.SYNTHESIZE.format(
             num_solutions=len(solutions),
-            problem_brief=problem_brief.problem_statement,
-            objectives=objectives_str,
-            constraints=constraints_str,
-            eval_criteria=problem_brief.eval_criteria or "Not provided",
-            library_context=library_context,
             solutions=solutions_text,
             cross_critiques_section=cross_critiques_section,
         )
 
-        logger.info(f"Calling LLM for synthesis (prompt {len(prompt)} chars)...")
+        logger.info(f"Calling LLM for synthesis (prompt {len(brief) + len(library_context) + len(prompt)} chars)...")
         response, usage = await self.llm.generate_json(
             prompt=prompt,
             system=SynthesisPrompts.SYSTEM,
             temperature=0.5,
-            max_tokens=16384,
+            max_tokens=budget.max_tokens,
             model=model,
+            response_format=_SYNTHESIS_FORMAT,
+            context_blocks=[brief, library_context],
         )
         logger.info(f"Synthesis LLM response received")
 
@@ -116,15 +133,13 @@ class Synthesizer:
                      f"{len(result.open_issues)} open issues")
         return result, usage
 
-    def _format_solutions(self, solutions: list[InventorSolution]) -> str:
-        """Format inventor solutions for the synthesis prompt."""
-        parts = []
-        for sol in solutions:
-            # Summarize long solutions to key elements
-            content = sol.content
-            if len(content) > 20000:
-                content = content[:20000] + "\n\n[... truncated for synthesis ...]"
+    def _format_solutions(self, solutions: list[InventorSolution], contents: list[str]) -> str:
+        """Format inventor solutions for the synthesis prompt.
 
+        ``contents`` holds each solution's content, already sized to the budget.
+        """
+        parts = []
+        for sol, content in zip(solutions, contents):
             parts.append(
                 f"\n{'='*60}\n"
                 f"INVENTOR {sol.inventor_id} ({sol.inventor_type}):\n"
@@ -1,5 +1,8 @@
 """LLM clients for Zeus."""
 
 from src.llm.openrouter import OpenRouterClient
+from src.llm.cache import ResponseCache
+from src.llm.rate_limiter import AdaptiveRateLimiter
+from src.llm.prompt_budget import PromptBudget, PromptTooLargeError
 
-__all__ = ["OpenRouterClient"]
+__all__ = ["OpenRouterClient", "ResponseCache", "AdaptiveRateLimiter", "PromptBudget", "PromptTooLargeError"]
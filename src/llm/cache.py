@@ -0,0 +1,238 @@
+"""Persistent, content-addressed caches: the LLM response cache and its SQLite base."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Payload fields that determine the completion; everything else
+# (stream flags, headers) is transport detail and must not affect the key.
+_KEY_FIELDS = ("model", "messages", "temperature", "max_tokens", "response_format")
+
+
+class SQLiteCache:
+    """Base of the SQLite-backed caches, with TTL and LRU eviction.
+
+    Subclasses name their ``TABLE`` and the ``COLUMNS`` they store next to
+    the common ``key``, ``size``, ``created_at`` and ``accessed_at``, and
+    build their keys and values on top of ``_lookup`` and ``_store``.
+    Expired entries are dropped on read; the least recently used entries
+    are evicted whenever the entry or byte limit is exceeded.
+    """
+
+    DEFAULT_DIR = ".zeus_cache"
+    DB_NAME = "cache.sqlite3"
+    TABLE = "entries"
+    # Column name -> SQL type of the subclass's own fields
+    COLUMNS: dict[str, str] = {}
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = 5000,
+        max_bytes: int | None = None,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite file, or a directory to create it in. Defaults to
+                $ZEUS_CACHE_DIR, else ./.zeus_cache/<DB_NAME>.
+            max_entries: Max number of entries.
+            max_bytes: Max total size of the entries in bytes; None for no cap.
+            ttl_seconds: Age after which an entry is treated as a miss.
+        """
+        db_path = Path(path or os.getenv("ZEUS_CACHE_DIR") or self.DEFAULT_DIR)
+        if db_path.suffix == "":
+            db_path = db_path / self.DB_NAME
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = db_path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = "".join(f"{name} {sql_type}, " for name, sql_type in self.COLUMNS.items())
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                key TEXT PRIMARY KEY,
+                {columns}
+                size INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({self.TABLE})")}
+        if "size" not in existing:
+            # Files written before entries were sized
+            self._conn.execute(f"ALTER TABLE {self.TABLE} ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_accessed ON {self.TABLE} (accessed_at)"
+        )
+        self._conn.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.TABLE}"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total_bytes,
+        }
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.TABLE}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _lookup(self, key: str, columns: tuple[str, ...]) -> tuple | None:
+        """Return ``columns`` of a live entry, marking it used; None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT created_at, {', '.join(columns)} FROM {self.TABLE} WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is not None and now - row[0] > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.TABLE} WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(f"UPDATE {self.TABLE} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return row[1:]
+
+    def _store(self, key: str, size: int, **fields: Any) -> None:
+        """Store an entry (``fields`` are the subclass's ``COLUMNS``) and evict beyond the limits."""
+        now = time.time()
+        names = ", ".join(fields)
+        marks = ", ".join("?" for _ in fields)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.TABLE} "
+                f"(key, {names}, size, created_at, accessed_at) VALUES (?, {marks}, ?, ?, ?)",
+                (key, *fields.values(), size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over the limits.
+
+        Caller must hold ``self._lock``.
+        """
+        cur = self._conn.execute(
+            f"DELETE FROM {self.TABLE} WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        self.evictions += cur.rowcount
+
+        max_bytes = self.max_bytes if self.max_bytes is not None else float("inf")
+        entries, total_bytes = self._conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.TABLE}"
+        ).fetchone()
+        if entries <= self.max_entries and total_bytes <= max_bytes:
+            return
+
+        rows = self._conn.execute(
+            f"SELECT key, size FROM {self.TABLE} ORDER BY accessed_at ASC"
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if entries <= self.max_entries and total_bytes <= max_bytes:
+                break
+            doomed.append((key,))
+            entries -= 1
+            total_bytes -= size
+
+        self._conn.executemany(f"DELETE FROM {self.TABLE} WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+        if doomed:
+            logger.info(f"{type(self).__name__} evicted {len(doomed)} least recently used entries")
+
+
+class ResponseCache(SQLiteCache):
+    """SQLite-backed LLM response cache with TTL and LRU eviction.
+
+    Entries are keyed by a SHA-256 hash of the request's model, messages,
+    temperature, max_tokens and response_format.
+    """
+
+    DB_NAME = "llm_responses.sqlite3"
+    TABLE = "responses"
+    COLUMNS = {"model": "TEXT NOT NULL", "content": "TEXT NOT NULL", "usage": "TEXT NOT NULL"}
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = 5000,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite file, or a directory to create it in. Defaults to
+                $ZEUS_CACHE_DIR, else ./.zeus_cache/llm_responses.sqlite3.
+            max_entries: Max number of cached responses.
+            max_bytes: Max total size of cached content in bytes.
+            ttl_seconds: Age after which an entry is treated as a miss.
+        """
+        super().__init__(path, max_entries, max_bytes, ttl_seconds)
+
+    @staticmethod
+    def make_key(payload: dict[str, Any]) -> str:
+        """Return the content hash identifying a request payload."""
+        keyed = {field: payload.get(field) for field in _KEY_FIELDS}
+        canonical = json.dumps(keyed, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> tuple[str, dict[str, int]] | None:
+        """Look up a cached response.
+
+        Returns:
+            Tuple of (content, original_usage_stats), or None on a miss.
+        """
+        row = self._lookup(key, ("content", "usage"))
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put(self, key: str, model: str, content: str, usage: dict[str, int]) -> None:
+        """Store a response and evict entries beyond the configured limits."""
+        size = len(content.encode("utf-8"))
+        self._store(key, size, model=model, content=content, usage=json.dumps(usage))
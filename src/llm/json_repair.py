@@ -0,0 +1,169 @@
+"""Deterministic local repair of malformed LLM JSON output."""
+
+import json
+from typing import Any
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# How many earlier comma cut-points to try when closing a truncated payload
+_MAX_CUT_ATTEMPTS = 50
+
+
+def repair_json(text: str) -> Any | None:
+    """Parse JSON from LLM output, repairing common defects locally.
+
+    Handles, in order:
+    - prose or markdown around the payload (the first balanced object or
+      array is extracted),
+    - trailing commas before ``}`` / ``]``,
+    - raw newlines, tabs and other control characters inside strings,
+    - truncation: an unterminated string is closed, a dangling key or
+      comma is dropped, and open objects/arrays are closed.
+
+    Returns:
+        The parsed value, or None if the text could not be repaired.
+    """
+    start = _find_start(text)
+    if start is None:
+        return None
+
+    pieces, cut_points, balanced = _normalize(text[start:])
+
+    if balanced:
+        try:
+            return json.loads("".join(pieces))
+        except json.JSONDecodeError:
+            return None
+
+    # Truncated: try closing at the end first, then at earlier commas
+    candidates = [(len(pieces), None)] + list(reversed(cut_points))[:_MAX_CUT_ATTEMPTS]
+    for cut, stack in candidates:
+        closed = _close("".join(pieces[:cut]), stack)
+        if closed is None:
+            continue
+        try:
+            return json.loads(closed)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def _find_start(text: str) -> int | None:
+    """Index of the first ``{`` (preferred) or ``[`` in ``text``."""
+    brace = text.find("{")
+    if brace != -1:
+        return brace
+    bracket = text.find("[")
+    return bracket if bracket != -1 else None
+
+
+def _normalize(text: str) -> tuple[list[str], list[tuple[int, list[str]]], bool]:
+    """Single pass over the payload fixing strings and trailing commas.
+
+    Returns:
+        Tuple of (pieces, cut_points, balanced). ``pieces`` joined give the
+        normalized text; ``cut_points`` are (piece_index, open_stack) pairs
+        just before each structural comma; ``balanced`` is True when the
+        first value closed completely (the text is cut right after it).
+    """
+    out: list[str] = []
+    stack: list[str] = []
+    cut_points: list[tuple[int, list[str]]] = []
+    in_string = False
+    escaped = False
+
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+                out.append(ch)
+            elif ch == "\\":
+                escaped = True
+                out.append(ch)
+            elif ch == '"':
+                in_string = False
+                out.append(ch)
+            elif ch == "\n":
+                out.append("\\n")
+            elif ch == "\r":
+                out.append("\\r")
+            elif ch == "\t":
+                out.append("\\t")
+            elif ord(ch) < 0x20:
+                out.append(f"\\u{ord(ch):04x}")
+            else:
+                out.append(ch)
+            continue
+
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in _CLOSERS:
+            stack.append(ch)
+            out.append(ch)
+        elif ch in ("}", "]"):
+            _strip_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                return out, cut_points, True
+        elif ch == ",":
+            cut_points.append((len(out), list(stack)))
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    if in_string:
+        if escaped:
+            out.pop()  # a lone trailing backslash would escape the closing quote
+        out.append('"')
+    return out, cut_points, False
+
+
+def _strip_trailing_comma(out: list[str]) -> None:
+    """Remove a trailing comma (and whitespace after it) from ``out``."""
+    i = len(out) - 1
+    while i >= 0 and out[i].isspace():
+        i -= 1
+    if i >= 0 and out[i] == ",":
+        del out[i:]
+
+
+def _close(text: str, stack: list[str] | None) -> str | None:
+    """Close a truncated payload by dropping dangling tokens and adding closers."""
+    if stack is None:
+        stack = _open_stack(text)
+        if stack is None:
+            return None
+
+    body = text.rstrip()
+    if body.endswith(","):
+        body = body[:-1].rstrip()
+    if body.endswith(":"):
+        body += " null"
+    return body + "".join(_CLOSERS[c] for c in reversed(stack))
+
+
+def _open_stack(text: str) -> list[str] | None:
+    """Return the brackets still open at the end of ``text`` (strings respected)."""
+    stack: list[str] = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in _CLOSERS:
+            stack.append(ch)
+        elif ch in ("}", "]"):
+            if not stack:
+                return None
+            stack.pop()
+    return stack
@@ -1,11 +1,27 @@
 """OpenRouter LLM client for Zeus."""
 
 import asyncio
+import contextvars
+import functools
 import os
 import json
 import logging
+import time
 import httpx
-from typing import Any
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable
+from src.llm.cache import ResponseCache
+from src.llm.rate_limiter import (
+    AdaptiveRateLimiter,
+    CallPriority,
+    ModelLimiter,
+    SharedRateLimit,
+    parse_retry_after,
+)
+from src.llm.transport import get_shared_client
+from src.llm.json_repair import repair_json
+from src.llm.prompt_budget import PromptBudget, PromptTooLargeError, estimate_messages_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -14,30 +30,205 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 _RETRY_MAX_ATTEMPTS = 3
-_RETRY_BASE_DELAY = 1.5   # seconds; doubles each attempt
+_RETRY_BASE_DELAY = 1.5   # seconds; doubles each attempt (jittered)
 _RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
+# ---------------------------------------------------------------------------
+# Streaming configuration
+# ---------------------------------------------------------------------------
+
+# A streamed call that receives no bytes for this long is treated as stuck
+# and failed (then retried) instead of waiting for the full per-call timeout.
+_DEFAULT_STALL_TIMEOUT = 45.0
+
+# Optional sink for streamed token deltas. Callers such as RunController set
+# this around a block of work; every streamed call made inside that context
+# forwards its deltas here in addition to any explicit ``on_delta`` callback.
+stream_listener: ContextVar[Callable[[str], None] | None] = ContextVar(
+    "stream_listener", default=None
+)
+
+# ---------------------------------------------------------------------------
+# Hedging and fallback configuration
+# ---------------------------------------------------------------------------
+
+# Ordered fallback models for the calls made in the current context. Callers
+# such as RunController set this per phase; when a call to the primary model
+# fails after its retries, the next model in the chain is tried.
+model_fallbacks: ContextVar[tuple[str, ...]] = ContextVar("model_fallbacks", default=())
+
+# Latency samples kept per (model, max_tokens) for the hedging percentile
+_HEDGE_WINDOW = 50
+# No hedging until this many samples exist for a (model, max_tokens) pair
+_HEDGE_MIN_SAMPLES = 5
+# Errors that would fail the same way on any model: do not fall back
+_NO_FALLBACK_STATUS_CODES = {401, 402, 403}
+
+# ---------------------------------------------------------------------------
+# Budget enforcement configuration
+# ---------------------------------------------------------------------------
+
+
+class CallBudget:
+    """Hook that admits, and accounts for, every request made in a context.
+
+    Set ``call_budget`` to an instance around a block of work (as
+    RunController does per phase). Before each request, ``admit`` gets the
+    model, the estimated prompt tokens and the requested ``max_tokens``; it
+    returns the ``max_tokens`` to actually send, or raises to refuse the
+    request. ``settle`` then receives the usage of each admitted request,
+    with the ``max_tokens`` it was admitted with; a request that failed
+    settles with empty usage, a cancelled one does not settle. This base
+    class admits everything.
+    """
+
+    def admit(self, model: str, prompt_tokens: int, max_tokens: int) -> int:
+        return max_tokens
+
+    def settle(self, model: str, usage: dict[str, Any], max_tokens: int = 0) -> None:
+        pass
+
+
+call_budget: ContextVar[CallBudget | None] = ContextVar("call_budget", default=None)
+
+# ---------------------------------------------------------------------------
+# Call profiling configuration
+# ---------------------------------------------------------------------------
+
+# Optional sink for the timing of each request sent (including retries), set
+# by callers such as RunController around a block of work. It is called when
+# the request starts, with ``status`` ``running``, and again when it ends with
+# a dict of ``model``, ``started`` and ``ended`` (time.monotonic()),
+# ``queue_ms`` (time spent waiting for a rate-limiter slot), ``retries``,
+# ``tokens_in``, ``tokens_out`` and ``status`` (``ok``, ``error`` or
+# ``cancelled``).
+call_observer: ContextVar[Callable[[dict[str, Any]], None] | None] = ContextVar(
+    "call_observer", default=None
+)
+
+# ---------------------------------------------------------------------------
+# Call scheduling configuration
+# ---------------------------------------------------------------------------
+
+# Scheduling tag of the calls made in the current context, set by callers
+# such as RunController per phase. When calls queue for a model's slots,
+# higher priorities start first and equal ones are shared between tenants
+# by weighted round-robin (see ``ModelLimiter``). Untagged calls rank 0.
+call_priority: ContextVar[CallPriority | None] = ContextVar("call_priority", default=None)
+
+# ---------------------------------------------------------------------------
+# Response cache configuration
+# ---------------------------------------------------------------------------
+
+# Calls at or below this temperature are near-deterministic (intake, JSON
+# repair) and are served from the response cache by default.
+_CACHE_MAX_AUTO_TEMPERATURE = 0.3
+
+# ---------------------------------------------------------------------------
+# Structured-output configuration
+# ---------------------------------------------------------------------------
+
+# Statuses with which a provider rejects a json_schema response_format it
+# does not support; the call is re-sent with plain json_object instead.
+_SCHEMA_REJECTED_STATUS_CODES = {400, 404, 422}
+
+# ---------------------------------------------------------------------------
+# Prompt caching configuration
+# ---------------------------------------------------------------------------
+
+# Anthropic accepts at most 4 cache breakpoints per request
+_MAX_CACHE_BREAKPOINTS = 4
+
+# ---------------------------------------------------------------------------
+# Truncation recovery configuration
+# ---------------------------------------------------------------------------
+
+# Continuation requests made for one call that stopped at max_tokens
+_DEFAULT_MAX_CONTINUATIONS = 2
+# Sent after the partial output to have the model resume it
+_CONTINUATION_PROMPT = (
+    "Your previous response was cut off by the output length limit. Continue it "
+    "from exactly where it stopped, without repeating any text and without "
+    "preamble, so that the two parts can be joined verbatim."
+)
+# Longest repeated prefix of a continuation that is trimmed when joining
+_MAX_OVERLAP_CHARS = 500
+# Shorter matches are likely coincidental, not a repeat
+_MIN_OVERLAP_CHARS = 16
+
+# Per-call timing fields; summing them across calls is meaningless
+_NON_ADDITIVE_USAGE_KEYS = {"latency_ms", "ttft_ms"}
+
+
+def accumulate_usage(total: dict[str, int], usage: dict[str, int]) -> dict[str, int]:
+    """Add the counters from one call's usage stats into ``total`` in place."""
+    for key, value in usage.items():
+        if key in _NON_ADDITIVE_USAGE_KEYS or not isinstance(value, (int, float)):
+            continue
+        total[key] = total.get(key, 0) + value
+    return total
+
+
+def _overlap_length(text: str, continuation: str) -> int:
+    """Length of the start of ``continuation`` that merely repeats the end of ``text``."""
+    longest = min(len(text), len(continuation), _MAX_OVERLAP_CHARS)
+    for size in range(longest, _MIN_OVERLAP_CHARS - 1, -1):
+        if text.endswith(continuation[:size]):
+            return size
+    return 0
+
 
 class OpenRouterClient:
     """Async client for the OpenRouter API.
 
     Wraps every LLM call with:
     - Configurable per-call timeout
-    - Automatic retry (up to 3×) with exponential back-off on transient
-      failures (timeouts, 429, 5xx).
-    - JSON-repair pass on parse failure.
+    - Automatic retry (up to 3×) with jittered exponential back-off on
+      transient failures (timeouts, 429, 5xx).
+    - A shared per-model AIMD concurrency limiter that honours
+      Retry-After / X-RateLimit-* headers, and starts queued calls by
+      priority and per-tenant share (see ``call_priority``).
+    - Local JSON repair on parse failure, with an LLM repair pass as fallback.
     - Defensive content validation so callers never receive None.
+    - Optional SSE streaming with time-to-first-token tracking and
+      stalled-stream detection.
+    - Optional persistent response cache for repeatable calls.
+    - Optional request hedging after a latency percentile, and ordered
+      model fallback chains (see ``model_fallbacks``).
+    - Continuation of completions truncated at ``max_tokens``.
     """
 
     BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
     MODELS_URL = "https://openrouter.ai/api/v1/models"
     DEFAULT_MODEL = "anthropic/claude-sonnet-4"
 
+    # model id -> (context_length, max_completion_tokens), shared by all
+    # clients in the process; filled by load_model_limits()
+    _model_limits: dict[str, tuple[int, int]] = {}
+
+    # model id -> (USD per prompt token, USD per completion token), shared by
+    # all clients in the process; filled by load_model_limits()
+    _model_pricing: dict[str, tuple[float, float]] = {}
+
+    # (model, max_tokens) -> recent successful latencies in seconds, shared
+    # by all clients in the process so hedging thresholds survive across runs
+    _latencies: dict[tuple[str, int], deque] = {}
+
     def __init__(
         self,
         api_key: str | None = None,
         model: str = DEFAULT_MODEL,
         timeout: float = 120.0,
+        stream: bool = False,
+        stall_timeout: float = _DEFAULT_STALL_TIMEOUT,
+        cache: ResponseCache | None = None,
+        cache_all: bool = False,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        shared_pool: bool = False,
+        hedge_percentile: float | None = None,
+        max_continuations: int = _DEFAULT_MAX_CONTINUATIONS,
+        shared_rate_limit: SharedRateLimit | None = None,
+        tenant_weights: dict[str, float] | None = None,
     ):
         """Initialize OpenRouter client.
 
@@ -45,6 +236,34 @@ class OpenRouterClient:
             api_key: OpenRouter API key. Defaults to OPENROUTER_API_KEY env var.
             model: Model to use for generation.
             timeout: Request timeout in seconds (applied per attempt).
+            stream: Stream every completion by default (SSE), delivering
+                token deltas to ``on_delta`` / ``stream_listener``.
+            stall_timeout: Max seconds without data on a streamed response
+                before the attempt is failed as stalled.
+            cache: Optional response cache. When set, calls with temperature
+                <= 0.3 are served from it by default.
+            cache_all: Also cache sampled (higher-temperature) calls, so a
+                re-run of the same brief replays every phase from cache.
+            rate_limiter: Per-model concurrency limiter. Defaults to a new
+                AdaptiveRateLimiter; pass one in to share it between clients.
+            shared_pool: Send requests through the process-wide pooled
+                HTTP client (HTTP/2 when available) instead of a private
+                one, keeping connections warm across runs. ``close()``
+                leaves the shared pool open.
+            hedge_percentile: Enable hedged requests. A call still running
+                after this percentile (0-1, e.g. 0.9) of recent latencies
+                for the same model and max_tokens gets a duplicate request,
+                to the next fallback model if one is set, else the same
+                model; the first to return wins.
+            max_continuations: Continuation requests allowed for a completion
+                that stops at ``max_tokens`` (``finish_reason="length"``);
+                their output is appended before the text is returned or
+                parsed. 0 disables continuation.
+            shared_rate_limit: Request rate and 429 pauses shared with
+                other processes, applied by the default ``rate_limiter``.
+            tenant_weights: Relative share of each model's slots per tenant
+                (see ``call_priority``), applied by the default
+                ``rate_limiter``; unlisted tenants weigh 1.
         """
         self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
         if not self.api_key:
@@ -54,7 +273,22 @@ class OpenRouterClient:
             )
         self.model = model
         self.timeout = timeout
-        self._client = httpx.AsyncClient(timeout=timeout)
+        self.streaming = stream
+        self.stall_timeout = min(stall_timeout, timeout)
+        self.cache = cache
+        self.cache_all = cache_all
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter(
+            base_delay=_RETRY_BASE_DELAY, shared=shared_rate_limit, tenant_weights=tenant_weights
+        )
+        self._owns_client = not shared_pool
+        self.hedge_percentile = hedge_percentile
+        self.max_continuations = max_continuations
+        # Models that rejected a json_schema response_format this session
+        self._schema_unsupported: set[str] = set()
+        # The shared pool is bound to the running loop, so it is resolved lazily
+        self._client: httpx.AsyncClient | None = (
+            None if shared_pool else httpx.AsyncClient(timeout=timeout)
+        )
 
     # ------------------------------------------------------------------
     # Public generation methods
@@ -68,37 +302,137 @@ class OpenRouterClient:
         max_tokens: int = 4096,
         json_mode: bool = False,
         model: str | None = None,
+        on_delta: Callable[[str], None] | None = None,
+        use_cache: bool | None = None,
+        response_format: dict[str, Any] | None = None,
+        context_blocks: list[str] | None = None,
     ) -> tuple[str, dict[str, int]]:
         """Generate a response from the LLM with automatic retry.
 
+        The request is streamed when the client was created with
+        ``stream=True`` or when ``on_delta`` is given. A streamed attempt
+        that fails mid-way is retried from scratch, so ``on_delta`` may see
+        the start of the completion more than once.
+
         Args:
             prompt: User prompt.
             system: Optional system prompt.
             temperature: Sampling temperature.
             max_tokens: Maximum tokens to generate.
             json_mode: Whether to request JSON output.
+            on_delta: Optional callback receiving each streamed text delta.
+            use_cache: Force the response cache on or off for this call.
+                Defaults to caching low-temperature calls (or all calls
+                with ``cache_all``) when the client has a cache.
+            response_format: Explicit ``response_format`` (e.g. from
+                ``json_schema_format``); overrides ``json_mode``. A
+                json_schema format the model rejects falls back to
+                ``json_object``, and the model is not sent schemas again.
+            context_blocks: Static content (libraries, the brief) sent ahead
+                of ``prompt`` in the user message. Each block is marked as
+                a provider prompt-cache breakpoint, so repeated calls that
+                share the same leading blocks pay the cached input rate.
+
+        When ``model_fallbacks`` is set, a model that still fails after its
+        retries is replaced by the next one in the chain. With hedging
+        enabled, slow calls are duplicated (see ``hedge_percentile``).
 
         Returns:
-            Tuple of (response_content, usage_stats).
+            Tuple of (response_content, usage_stats). ``usage_stats`` carries
+            ``latency_ms``, ``tokens_in_cached`` / ``tokens_in_uncached`` and,
+            for streamed calls, ``ttft_ms``. Response-cache hits report zero
+            tokens and ``cache_hits=1``. Hedged calls count ``hedged_calls``
+            and ``hedge_wins``; calls served by a fallback model count
+            ``model_fallbacks``. A completion that hit ``max_tokens`` counts
+            its ``continuations`` (tokens include them) and keeps
+            ``truncated=1`` if it was still cut off after the last one.
 
         Raises:
-            OpenRouterError: If all retry attempts fail.
+            OpenRouterError: If all retry attempts fail on every model.
         """
+        call = functools.partial(
+            self._generate_model,
+            prompt=prompt,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+            on_delta=on_delta,
+            use_cache=use_cache,
+            response_format=response_format,
+            context_blocks=context_blocks,
+        )
+        primary = model or self.model
+        chain = [primary] + [m for m in dict.fromkeys(model_fallbacks.get()) if m != primary]
+
+        for i, candidate in enumerate(chain):
+            try:
+                content, usage = await self._hedged(call, candidate, chain[i + 1:], max_tokens)
+            except (OpenRouterError, PromptTooLargeError) as e:
+                no_fallback = isinstance(e, OpenRouterHTTPError) and e.status_code in _NO_FALLBACK_STATUS_CODES
+                if i + 1 == len(chain) or no_fallback:
+                    raise
+                logger.warning(f"{candidate} failed — falling back to {chain[i + 1]}: {e}")
+                continue
+            if i > 0:
+                usage = accumulate_usage(dict(usage), {"model_fallbacks": 1})
+            return content, usage
+
+    async def _generate_model(
+        self,
+        model: str,
+        prompt: str,
+        system: str | None,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        on_delta: Callable[[str], None] | None,
+        use_cache: bool | None,
+        response_format: dict[str, Any] | None,
+        context_blocks: list[str] | None,
+    ) -> tuple[str, dict[str, int]]:
+        """Run one call against a single model, with retries (see ``generate``)."""
         messages = []
         if system:
             messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+        messages.append({"role": "user", "content": self._user_content(prompt, context_blocks)})
 
         payload: dict[str, Any] = {
-            "model": model or self.model,
+            "model": model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
+            # Ask for the billed cost of the call in usage.cost
+            "usage": {"include": True},
         }
 
-        if json_mode:
+        # Refuse or shrink before sending rather than failing at the provider
+        if payload["model"] in self._model_limits:
+            budget = self.prompt_budget(payload["model"], max_tokens)
+            payload["max_tokens"] = budget.completion_tokens(estimate_messages_tokens(messages))
+            if payload["max_tokens"] < max_tokens:
+                logger.info(
+                    f"max_tokens reduced {max_tokens:,} → {payload['max_tokens']:,} "
+                    f"to fit the {budget.context_length:,}-token window of {payload['model']}"
+                )
+
+        structured = (
+            response_format is not None
+            and response_format.get("type") == "json_schema"
+            and payload["model"] not in self._schema_unsupported
+        )
+        if structured:
+            payload["response_format"] = response_format
+        elif json_mode or response_format is not None:
             payload["response_format"] = {"type": "json_object"}
 
+        streaming = self.streaming or on_delta is not None
+        emit = None
+        if streaming:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+            emit = self._delta_emitter(on_delta)
+
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -106,36 +440,164 @@ class OpenRouterClient:
             "X-Title": "Zeus Design Agent",
         }
 
+        cache_key = None
+        if self._should_cache(temperature, use_cache):
+            cache_key = self.cache.make_key(payload)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                content, _ = cached
+                logger.info(f"LLM cache hit ← {payload['model']} ({len(content):,} chars)")
+                if streaming:
+                    emit(content)
+                return content, {"tokens_in": 0, "tokens_out": 0, "latency_ms": 0, "cache_hits": 1}
+
         logger.info(
-            f"LLM request → {payload['model']} | temp={temperature} max_tokens={max_tokens} "
-            f"json_mode={json_mode} msgs={len(messages)}"
+            f"LLM request → {payload['model']} | temp={temperature} max_tokens={payload['max_tokens']} "
+            f"json_mode={json_mode} structured={structured} stream={streaming} msgs={len(messages)}"
         )
 
+        try:
+            content, usage_stats = await self._send_with_retries(payload, headers, emit)
+        except OpenRouterHTTPError as e:
+            if not (structured and e.status_code in _SCHEMA_REJECTED_STATUS_CODES):
+                raise
+            self._schema_unsupported.add(payload["model"])
+            logger.warning(
+                f"{payload['model']} rejected the json_schema response format "
+                f"(HTTP {e.status_code}) — falling back to json_object"
+            )
+            return await self._generate_model(
+                model=model,
+                prompt=prompt,
+                system=system,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                json_mode=True,
+                on_delta=on_delta,
+                use_cache=use_cache,
+                response_format=None,
+                context_blocks=context_blocks,
+            )
+
+        if usage_stats.get("truncated"):
+            content, usage_stats = await self._continue_truncated(
+                payload, headers, content, usage_stats, emit
+            )
+        # A still-truncated output is not worth replaying
+        if cache_key is not None and not usage_stats.get("truncated"):
+            self.cache.put(cache_key, payload["model"], content, usage_stats)
+        return content, usage_stats
+
+    async def _send_with_retries(
+        self,
+        payload: dict[str, Any],
+        headers: dict[str, str],
+        emit: Callable[[str], None] | None,
+    ) -> tuple[str, dict[str, int]]:
+        """Send one request with rate limiting and retries; streamed when ``emit`` is set.
+
+        The request is admitted by the context's ``call_budget`` first, and
+        its usage (priced from ``model_pricing`` when the provider does not
+        report ``usage.cost``) is settled with it afterwards. The context's
+        ``call_observer`` receives the request's timing however it ends.
+        """
+        budget = call_budget.get()
+        if budget is not None:
+            payload = dict(payload)
+            # Off the event loop: a budget shared between processes waits on its file's lock
+            payload["max_tokens"] = await asyncio.to_thread(
+                budget.admit, payload["model"], estimate_messages_tokens(payload["messages"]), payload["max_tokens"]
+            )
+
+        limiter = self.rate_limiter.for_model(payload["model"])
+        observer = call_observer.get()
+        timing: dict[str, Any] = {
+            "model": payload["model"], "started": time.monotonic(), "queue_ms": 0,
+            "retries": 0, "tokens_in": 0, "tokens_out": 0, "status": "error",
+        }
+        self._notify(observer, dict(timing, status="running"))
+        try:
+            content, usage_stats = await self._send_attempts(payload, headers, emit, budget, limiter, timing)
+        except asyncio.CancelledError:
+            timing["status"] = "cancelled"
+            raise
+        except Exception:
+            if budget is not None:
+                await asyncio.to_thread(budget.settle, payload["model"], {}, payload["max_tokens"])
+            raise
+        finally:
+            timing["ended"] = time.monotonic()
+            self._notify(observer, timing)
+        return content, usage_stats
+
+    @staticmethod
+    def _notify(observer: Callable[[dict[str, Any]], None] | None, timing: dict[str, Any]) -> None:
+        """Pass a call's timing to the context's observer; a failing observer never fails the call."""
+        if observer is None:
+            return
+        try:
+            observer(timing)
+        except Exception as e:
+            logger.warning(f"Call observer failed: {e}")
+
+    async def _send_attempts(
+        self,
+        payload: dict[str, Any],
+        headers: dict[str, str],
+        emit: Callable[[str], None] | None,
+        budget: CallBudget | None,
+        limiter: ModelLimiter,
+        timing: dict[str, Any],
+    ) -> tuple[str, dict[str, int]]:
+        """The retry loop of ``_send_with_retries``, filling in ``timing`` as it goes."""
         last_error: Exception | None = None
 
         for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+            timing["retries"] = attempt - 1
             try:
-                content, usage_stats = await self._single_request(
-                    payload, headers, attempt
+                queued_at = time.monotonic()
+                started = None
+                async with limiter.slot(call_priority.get()) as started:
+                    timing["queue_ms"] += int((time.monotonic() - queued_at) * 1000)
+                    if emit:
+                        content, usage_stats = await self._single_stream_request(
+                            payload, headers, attempt, emit
+                        )
+                    else:
+                        content, usage_stats = await self._single_request(
+                            payload, headers, attempt
+                        )
+                limiter.record_success()
+                if "cost_usd" not in usage_stats:
+                    cost = self.estimate_cost(
+                        payload["model"], usage_stats["tokens_in"], usage_stats["tokens_out"]
+                    )
+                    if cost is not None:
+                        usage_stats["cost_usd"] = cost
+                if budget is not None:
+                    await asyncio.to_thread(budget.settle, payload["model"], usage_stats, payload["max_tokens"])
+                timing.update(
+                    status="ok", tokens_in=usage_stats["tokens_in"], tokens_out=usage_stats["tokens_out"]
                 )
                 return content, usage_stats
 
             except OpenRouterRateLimitError as e:
                 last_error = e
+                # The pause is shared: every queued call for this model waits it out
+                delay = self.rate_limiter.backoff_delay(attempt, e.retry_after)
+                limiter.record_rate_limited(delay, started)
                 if attempt < _RETRY_MAX_ATTEMPTS:
-                    delay = _RETRY_BASE_DELAY * (2 ** (attempt - 1))
                     logger.warning(
                         f"Rate limited (attempt {attempt}/{_RETRY_MAX_ATTEMPTS}) — "
-                        f"retrying in {delay:.1f}s: {e}"
+                        f"retrying in ~{delay:.1f}s: {e}"
                     )
-                    await asyncio.sleep(delay)
                 else:
                     logger.error(f"Rate limit persisted after {_RETRY_MAX_ATTEMPTS} attempts")
 
             except OpenRouterTransientError as e:
                 last_error = e
                 if attempt < _RETRY_MAX_ATTEMPTS:
-                    delay = _RETRY_BASE_DELAY * (2 ** (attempt - 1))
+                    delay = self.rate_limiter.backoff_delay(attempt)
                     logger.warning(
                         f"Transient error (attempt {attempt}/{_RETRY_MAX_ATTEMPTS}) — "
                         f"retrying in {delay:.1f}s: {e}"
@@ -147,7 +609,7 @@ class OpenRouterClient:
             except OpenRouterTimeoutError as e:
                 last_error = e
                 if attempt < _RETRY_MAX_ATTEMPTS:
-                    delay = _RETRY_BASE_DELAY * (2 ** (attempt - 1))
+                    delay = self.rate_limiter.backoff_delay(attempt)
                     logger.warning(
                         f"Request timeout (attempt {attempt}/{_RETRY_MAX_ATTEMPTS}) — "
                         f"retrying in {delay:.1f}s"
@@ -163,6 +625,95 @@ class OpenRouterClient:
         # All retries exhausted
         raise last_error or OpenRouterError("All retry attempts failed")
 
+    async def _continue_truncated(
+        self,
+        payload: dict[str, Any],
+        headers: dict[str, str],
+        content: str,
+        usage_stats: dict[str, int],
+        emit: Callable[[str], None] | None,
+    ) -> tuple[str, dict[str, int]]:
+        """Extend a completion cut off at ``max_tokens`` with continuation requests.
+
+        Each continuation replays the conversation with the partial output
+        as an assistant turn and asks the model to carry on from exactly
+        where it stopped; the new text is appended, minus any overlap the
+        model repeated. After ``max_continuations`` requests a still
+        truncated output is returned as is (``truncated`` stays 1).
+        """
+        usage = dict(usage_stats)
+        model = payload["model"]
+        for n in range(1, self.max_continuations + 1):
+            follow_up = {k: v for k, v in payload.items() if k != "response_format"}
+            follow_up["messages"] = payload["messages"] + [
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": _CONTINUATION_PROMPT},
+            ]
+            if model in self._model_limits:
+                budget = self.prompt_budget(model, payload["max_tokens"])
+                try:
+                    follow_up["max_tokens"] = budget.completion_tokens(
+                        estimate_messages_tokens(follow_up["messages"])
+                    )
+                except PromptTooLargeError:
+                    logger.warning(f"Truncated output of {model} no longer fits its window — not continuing")
+                    break
+
+            logger.warning(
+                f"{model} stopped at max_tokens after {len(content):,} chars — "
+                f"continuation {n}/{self.max_continuations}"
+            )
+            more, more_usage = await self._send_with_retries(follow_up, headers, emit)
+            content += more[_overlap_length(content, more):]
+            usage["latency_ms"] = usage.get("latency_ms", 0) + more_usage.get("latency_ms", 0)
+            truncated = more_usage.pop("truncated", 0)
+            accumulate_usage(usage, more_usage)
+            usage["continuations"] = n
+            if not truncated:
+                usage.pop("truncated", None)
+                break
+        return content, usage
+
+    async def stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        model: str | None = None,
+        context_blocks: list[str] | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream a completion, yielding text deltas as they arrive.
+
+        Retries behave as in ``generate()``; errors are raised from the
+        iterator once all attempts fail. Use ``generate(on_delta=...)``
+        instead when the usage stats of the call are also needed.
+
+        Yields:
+            Text deltas in arrival order.
+        """
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        task = asyncio.create_task(self.generate(
+            prompt=prompt,
+            system=system,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+            model=model,
+            on_delta=queue.put_nowait,
+            context_blocks=context_blocks,
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while (delta := await queue.get()) is not None:
+                yield delta
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
     async def generate_json(
         self,
         prompt: str,
@@ -170,16 +721,29 @@ class OpenRouterClient:
         temperature: float = 0.7,
         max_tokens: int = 4096,
         model: str | None = None,
+        on_delta: Callable[[str], None] | None = None,
+        response_format: dict[str, Any] | None = None,
+        context_blocks: list[str] | None = None,
     ) -> tuple[dict, dict[str, int]]:
         """Generate a JSON response from the LLM.
 
-        Includes one repair pass on parse failure before raising an error.
+        With ``response_format`` (see ``json_schema_format``) the output is
+        constrained to the schema on models that support structured
+        outputs; other models get plain JSON mode.
+
+        On parse failure the output is first repaired locally (see
+        ``repair_json``); only if that fails is one LLM repair pass made
+        before raising an error. Usage stats count ``json_repairs_local``
+        and ``json_repairs_llm``.
 
         Args:
             prompt: User prompt.
             system: Optional system prompt.
             temperature: Sampling temperature.
             max_tokens: Maximum tokens to generate.
+            on_delta: Optional callback receiving each streamed text delta.
+            response_format: Optional json_schema response format.
+            context_blocks: Cacheable static blocks sent ahead of ``prompt``.
 
         Returns:
             Tuple of (parsed_json, total_usage_stats).
@@ -191,6 +755,9 @@ class OpenRouterClient:
             max_tokens=max_tokens,
             json_mode=True,
             model=model,
+            on_delta=on_delta,
+            response_format=response_format,
+            context_blocks=context_blocks,
         )
 
         # First attempt: try to parse the response
@@ -203,8 +770,14 @@ class OpenRouterClient:
         except json.JSONDecodeError as e:
             parse_error = e
 
+        # Local repair: extract / fix / close the payload without another call
+        repaired = repair_json(content)
+        if isinstance(repaired, dict):
+            logger.info(f"JSON parse failed — repaired locally, LLM repair pass skipped: {parse_error}")
+            return repaired, accumulate_usage(dict(usage), {"json_repairs_local": 1})
+
         # Repair pass: ask LLM to fix the malformed JSON
-        logger.warning(f"JSON parse failed — attempting LLM repair pass: {parse_error}")
+        logger.warning(f"JSON parse failed — local repair failed, attempting LLM repair pass: {parse_error}")
         repair_prompt = self._build_repair_prompt(content, str(parse_error))
 
         try:
@@ -215,13 +788,12 @@ class OpenRouterClient:
                 max_tokens=max_tokens,
                 json_mode=True,
                 model=model,
+                response_format=response_format,
             )
 
             # Combine usage stats
-            total_usage = {
-                "tokens_in": usage.get("tokens_in", 0) + repair_usage.get("tokens_in", 0),
-                "tokens_out": usage.get("tokens_out", 0) + repair_usage.get("tokens_out", 0),
-            }
+            total_usage = accumulate_usage(dict(usage), repair_usage)
+            total_usage["json_repairs_llm"] = total_usage.get("json_repairs_llm", 0) + 1
 
             cleaned_repair = self._clean_json_response(repaired_content)
             parsed = json.loads(cleaned_repair)
@@ -233,6 +805,124 @@ class OpenRouterClient:
                 f"Original error: {parse_error}. Repair error: {repair_error}"
             ) from parse_error
 
+    # ------------------------------------------------------------------
+    # Request hedging
+    # ------------------------------------------------------------------
+
+    async def _hedged(
+        self,
+        call: Callable[..., Any],
+        model: str,
+        fallbacks: list[str],
+        max_tokens: int,
+    ) -> tuple[str, dict[str, int]]:
+        """Run ``call`` on ``model``, hedging it if it runs past the threshold.
+
+        The hedge goes to the first fallback model, or to ``model`` again.
+        Only the primary request streams deltas; the loser is cancelled.
+        """
+        threshold = self._hedge_threshold(model, max_tokens)
+        if threshold is None:
+            content, usage = await call(model=model)
+            self._record_latency(model, max_tokens, usage)
+            return content, usage
+
+        primary = asyncio.create_task(call(model=model))
+        done, _ = await asyncio.wait({primary}, timeout=threshold)
+        if done:
+            content, usage = primary.result()
+            self._record_latency(model, max_tokens, usage)
+            return content, usage
+
+        hedge_model = fallbacks[0] if fallbacks else model
+        logger.info(f"Hedging {model} call after {threshold:.1f}s → duplicate request to {hedge_model}")
+        # Keep the duplicate's deltas out of the phase's stream listener
+        hedge_context = contextvars.copy_context()
+        hedge_context.run(stream_listener.set, None)
+        hedge = asyncio.create_task(call(model=hedge_model, on_delta=None), context=hedge_context)
+
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = None
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        error = task.exception()
+                if winner is not None:
+                    content, usage = winner.result()
+                    if winner is primary:
+                        self._record_latency(model, max_tokens, usage)
+                    return content, accumulate_usage(
+                        dict(usage), {"hedged_calls": 1, "hedge_wins": int(winner is hedge)}
+                    )
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _hedge_threshold(self, model: str, max_tokens: int) -> float | None:
+        """Seconds after which a call should be hedged, or None to not hedge."""
+        if self.hedge_percentile is None:
+            return None
+        samples = self._latencies.get((model, max_tokens))
+        if not samples or len(samples) < _HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.hedge_percentile * len(ordered)))
+        return ordered[index]
+
+    def _record_latency(self, model: str, max_tokens: int, usage: dict[str, int]) -> None:
+        """Remember a successful call's latency (response-cache hits excluded)."""
+        if usage.get("cache_hits") or "latency_ms" not in usage:
+            return
+        samples = self._latencies.setdefault((model, max_tokens), deque(maxlen=_HEDGE_WINDOW))
+        samples.append(usage["latency_ms"] / 1000)
+
+    # ------------------------------------------------------------------
+    # Context-window budgeting
+    # ------------------------------------------------------------------
+
+    async def load_model_limits(self) -> None:
+        """Load context windows, completion caps and prices from the models endpoint.
+
+        Runs once per process; failures are logged and budgeting falls
+        back to ``DEFAULT_CONTEXT_LENGTH``.
+        """
+        if self._model_limits:
+            return
+        try:
+            models = await self.fetch_text_models_with_meta(api_key=self.api_key)
+        except OpenRouterError as e:
+            logger.warning(f"Could not load model context windows: {e}")
+            return
+        for meta in models:
+            self._model_limits[meta["id"]] = (meta["context_length"], meta["max_completion_tokens"])
+            if meta["prompt_price"] or meta["completion_price"]:
+                self._model_pricing[meta["id"]] = (meta["prompt_price"], meta["completion_price"])
+        logger.info(
+            f"Loaded context windows for {len(models)} models, pricing for {len(self._model_pricing)}"
+        )
+
+    def model_pricing(self, model: str | None) -> tuple[float, float] | None:
+        """USD per (prompt, completion) token of ``model``, or None if unknown."""
+        return self._model_pricing.get(model or self.model)
+
+    def estimate_cost(self, model: str | None, tokens_in: int, tokens_out: int) -> float | None:
+        """USD cost of a call at the model's list price, or None if unknown."""
+        pricing = self.model_pricing(model)
+        if pricing is None:
+            return None
+        return tokens_in * pricing[0] + tokens_out * pricing[1]
+
+    def prompt_budget(self, model: str | None, max_tokens: int) -> PromptBudget:
+        """Return the token plan for a call to ``model`` requesting ``max_tokens``."""
+        context_length, max_completion = self._model_limits.get(model or self.model, (0, 0))
+        return PromptBudget.for_model(context_length, max_tokens, max_completion)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
@@ -248,26 +938,28 @@ class OpenRouterClient:
         Raises typed subclasses of OpenRouterError so callers can decide
         whether to retry.
         """
-        import time as _time
-        _t0 = _time.monotonic()
+        t0 = time.monotonic()
 
         try:
-            response = await self._client.post(
+            response = await self._http().post(
                 self.BASE_URL,
                 json=payload,
                 headers=headers,
+                timeout=self.timeout,
             )
 
             # Surface HTTP errors with specific types
             if response.status_code == 429:
                 raise OpenRouterRateLimitError(
-                    f"Rate limited (HTTP 429): {response.text[:200]}"
+                    f"Rate limited (HTTP 429): {response.text[:200]}",
+                    retry_after=parse_retry_after(response.headers),
                 )
             if response.status_code in _RETRYABLE_STATUS_CODES:
                 raise OpenRouterTransientError(
                     f"Transient server error (HTTP {response.status_code}): {response.text[:200]}"
                 )
             response.raise_for_status()
+            self.rate_limiter.observe_headers(payload["model"], response.headers)
 
             data = response.json()
 
@@ -289,13 +981,10 @@ class OpenRouterClient:
                     "The model may have filtered this request."
                 )
 
-            usage = data.get("usage", {})
-            usage_stats = {
-                "tokens_in": usage.get("prompt_tokens", 0),
-                "tokens_out": usage.get("completion_tokens", 0),
-            }
-
-            elapsed = _time.monotonic() - _t0
+            elapsed = time.monotonic() - t0
+            usage_stats = self._usage_stats(data.get("usage") or {}, elapsed)
+            if choices[0].get("finish_reason") == "length":
+                usage_stats["truncated"] = 1
             logger.info(
                 f"LLM response ← {usage_stats['tokens_in']:,} in / "
                 f"{usage_stats['tokens_out']:,} out tokens "
@@ -314,8 +1003,9 @@ class OpenRouterClient:
                 f"LLM HTTP error {e.response.status_code} (attempt {attempt}): "
                 f"{e.response.text[:200]}"
             )
-            raise OpenRouterError(
-                f"API request failed: {e.response.status_code} - {e.response.text}"
+            raise OpenRouterHTTPError(
+                f"API request failed: {e.response.status_code} - {e.response.text}",
+                status_code=e.response.status_code,
             ) from e
         except httpx.RequestError as e:
             logger.error(f"LLM request error (attempt {attempt}): {e}")
@@ -324,6 +1014,186 @@ class OpenRouterClient:
             logger.error(f"LLM response parse error (attempt {attempt}): {e}")
             raise OpenRouterError(f"Invalid response format: {str(e)}") from e
 
+    async def _single_stream_request(
+        self,
+        payload: dict[str, Any],
+        headers: dict[str, str],
+        attempt: int,
+        on_delta: Callable[[str], None],
+    ) -> tuple[str, dict[str, int]]:
+        """Execute a single streamed (SSE) request and return (content, usage_stats).
+
+        Text deltas are passed to ``on_delta`` as they arrive. The read
+        timeout is ``stall_timeout``, so a stream that goes quiet fails
+        early instead of holding the call until ``timeout``.
+        """
+        t0 = time.monotonic()
+        first_token_at: float | None = None
+        parts: list[str] = []
+        usage: dict[str, Any] = {}
+        finish_reason: str | None = None
+
+        try:
+            async with self._http().stream(
+                "POST",
+                self.BASE_URL,
+                json=payload,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout, read=self.stall_timeout),
+            ) as response:
+                if response.status_code >= 400:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    if response.status_code == 429:
+                        raise OpenRouterRateLimitError(
+                            f"Rate limited (HTTP 429): {body[:200]}",
+                            retry_after=parse_retry_after(response.headers),
+                        )
+                    if response.status_code in _RETRYABLE_STATUS_CODES:
+                        raise OpenRouterTransientError(
+                            f"Transient server error (HTTP {response.status_code}): {body[:200]}"
+                        )
+                    raise OpenRouterHTTPError(
+                        f"API request failed: {response.status_code} - {body}",
+                        status_code=response.status_code,
+                    )
+                self.rate_limiter.observe_headers(payload["model"], response.headers)
+
+                async for line in response.aiter_lines():
+                    chunk = self._parse_sse_line(line)
+                    if chunk is None:
+                        continue
+
+                    if chunk.get("error"):
+                        # Providers report failures after the 200 status as an error chunk
+                        error = chunk["error"]
+                        message = error.get("message") if isinstance(error, dict) else error
+                        raise OpenRouterTransientError(f"Stream error: {message}")
+
+                    if chunk.get("usage"):
+                        usage = chunk["usage"]
+
+                    choices = chunk.get("choices") or []
+                    if not choices:
+                        continue
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+                        parts.append(delta)
+                        on_delta(delta)
+                    if choices[0].get("finish_reason"):
+                        finish_reason = choices[0]["finish_reason"]
+
+        except httpx.ReadTimeout as e:
+            logger.error(
+                f"LLM stream stalled — no data for {self.stall_timeout}s (attempt {attempt})"
+            )
+            raise OpenRouterTimeoutError(
+                f"Stream stalled: no data received for {self.stall_timeout}s"
+            ) from e
+        except httpx.TimeoutException as e:
+            logger.error(f"LLM timeout after {self.timeout}s (attempt {attempt}): {e}")
+            raise OpenRouterTimeoutError(
+                f"Request timed out after {self.timeout}s: {str(e)}"
+            ) from e
+        except httpx.RequestError as e:
+            logger.error(f"LLM request error (attempt {attempt}): {e}")
+            raise OpenRouterTransientError(f"Network request failed: {str(e)}") from e
+
+        if not parts:
+            raise OpenRouterError(
+                f"No content in response (finish_reason={finish_reason or 'unknown'!r}). "
+                "The model may have filtered this request."
+            )
+
+        elapsed = time.monotonic() - t0
+        usage_stats = self._usage_stats(usage, elapsed)
+        usage_stats["ttft_ms"] = int(((first_token_at or t0) - t0) * 1000)
+        if finish_reason == "length":
+            usage_stats["truncated"] = 1
+        logger.info(
+            f"LLM response ← {usage_stats['tokens_in']:,} in / "
+            f"{usage_stats['tokens_out']:,} out tokens "
+            f"(ttft {usage_stats['ttft_ms'] / 1000:.1f}s, total {elapsed:.1f}s, streamed)"
+        )
+        return "".join(parts), usage_stats
+
+    def _should_cache(self, temperature: float, use_cache: bool | None) -> bool:
+        """Decide whether a call goes through the response cache."""
+        if self.cache is None:
+            return False
+        if use_cache is not None:
+            return use_cache
+        return self.cache_all or temperature <= _CACHE_MAX_AUTO_TEMPERATURE
+
+    @staticmethod
+    def _parse_sse_line(line: str) -> dict | None:
+        """Parse one SSE line into a chunk dict; None for comments, blanks and [DONE]."""
+        if not line.startswith("data:"):
+            # Blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+            return None
+        data = line[len("data:"):].strip()
+        if not data or data == "[DONE]":
+            return None
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping malformed SSE chunk: {data[:200]}")
+            return None
+        return chunk if isinstance(chunk, dict) else None
+
+    @staticmethod
+    def _usage_stats(usage: dict[str, Any], elapsed: float) -> dict[str, int]:
+        """Convert an API ``usage`` block into Zeus usage stats."""
+        tokens_in = usage.get("prompt_tokens", 0) or 0
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0) or 0
+        stats = {
+            "tokens_in": tokens_in,
+            "tokens_out": usage.get("completion_tokens", 0) or 0,
+            "tokens_in_cached": cached,
+            "tokens_in_uncached": max(0, tokens_in - cached),
+            "latency_ms": int(elapsed * 1000),
+        }
+        # OpenRouter reports the billed cost (USD) when usage accounting is requested
+        if isinstance(usage.get("cost"), (int, float)):
+            stats["cost_usd"] = float(usage["cost"])
+        return stats
+
+    @staticmethod
+    def _user_content(prompt: str, context_blocks: list[str] | None) -> str | list[dict[str, Any]]:
+        """Build the user message content, with cache breakpoints on context blocks."""
+        blocks = [b for b in context_blocks or [] if b]
+        if not blocks:
+            return prompt
+        # Breakpoints go on the last blocks: a hit on a later one covers all before it
+        first_breakpoint = len(blocks) - _MAX_CACHE_BREAKPOINTS
+        content: list[dict[str, Any]] = []
+        for i, block in enumerate(blocks):
+            part: dict[str, Any] = {"type": "text", "text": block}
+            if i >= first_breakpoint:
+                part["cache_control"] = {"type": "ephemeral"}
+            content.append(part)
+        content.append({"type": "text", "text": prompt})
+        return content
+
+    @staticmethod
+    def _delta_emitter(
+        on_delta: Callable[[str], None] | None,
+    ) -> Callable[[str], None]:
+        """Fan a delta out to ``on_delta`` and the context's ``stream_listener``."""
+        listener = stream_listener.get()
+
+        def emit(delta: str) -> None:
+            for sink in (on_delta, listener):
+                if sink is None:
+                    continue
+                try:
+                    sink(delta)
+                except Exception as e:
+                    logger.warning(f"Stream delta callback failed: {e}")
+
+        return emit
+
     def _clean_json_response(self, content: str) -> str:
         """Clean JSON response by stripping markdown code blocks."""
         cleaned = content.strip()
@@ -346,9 +1216,16 @@ class OpenRouterClient:
             "Do not include any explanation or markdown formatting."
         )
 
+    def _http(self) -> httpx.AsyncClient:
+        """Return the HTTP client, binding to the shared pool on first use."""
+        if self._client is None:
+            self._client = get_shared_client()
+        return self._client
+
     async def close(self):
-        """Close the HTTP client."""
-        await self._client.aclose()
+        """Close the HTTP client (the shared pool stays open for reuse)."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
 
     # ------------------------------------------------------------------
     # Model listing
@@ -385,6 +1262,8 @@ class OpenRouterClient:
             - ``id``: model identifier string (e.g. ``"anthropic/claude-3-5-sonnet"``)
             - ``name``: human-readable display name
             - ``context_length``: max context window in tokens (int, 0 if unknown)
+            - ``max_completion_tokens``: provider cap on output tokens (int, 0 if unknown)
+            - ``prompt_price`` / ``completion_price``: USD per token (float, 0 if unknown)
             - ``description``: short description (may be empty)
 
         The list is sorted by ``id`` ascending.
@@ -403,10 +1282,11 @@ class OpenRouterClient:
             headers["Authorization"] = f"Bearer {resolved_api_key}"
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(cls.MODELS_URL, headers=headers)
-                response.raise_for_status()
-                payload = response.json()
+            response = await get_shared_client().get(
+                cls.MODELS_URL, headers=headers, timeout=timeout
+            )
+            response.raise_for_status()
+            payload = response.json()
         except httpx.TimeoutException as e:
             raise OpenRouterTimeoutError(
                 f"Model list request timed out after {timeout}s"
@@ -442,10 +1322,28 @@ class OpenRouterClient:
             except (TypeError, ValueError):
                 context_length = 0
 
+            top_provider = item.get("top_provider")
+            max_completion_tokens = top_provider.get("max_completion_tokens") if isinstance(top_provider, dict) else 0
+            try:
+                max_completion_tokens = int(max_completion_tokens or 0)
+            except (TypeError, ValueError):
+                max_completion_tokens = 0
+
+            pricing = item.get("pricing") if isinstance(item.get("pricing"), dict) else {}
+            prices = []
+            for key in ("prompt", "completion"):
+                try:
+                    prices.append(max(0.0, float(pricing.get(key) or 0)))
+                except (TypeError, ValueError):
+                    prices.append(0.0)
+
             models.append({
                 "id": model_id.strip(),
                 "name": item.get("name") or model_id.strip(),
                 "context_length": context_length,
+                "max_completion_tokens": max_completion_tokens,
+                "prompt_price": prices[0],
+                "completion_price": prices[1],
                 "description": (item.get("description") or "").strip(),
             })
 
@@ -511,7 +1409,18 @@ class OpenRouterTimeoutError(OpenRouterError):
 
 class OpenRouterRateLimitError(OpenRouterError):
     """Raised on HTTP 429 rate-limit responses."""
-    pass
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OpenRouterHTTPError(OpenRouterError):
+    """Raised on non-retryable HTTP error responses (4xx other than 429)."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 class OpenRouterTransientError(OpenRouterError):
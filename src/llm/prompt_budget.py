@@ -0,0 +1,155 @@
+"""Token estimation and context-window-aware prompt budgeting."""
+
+import math
+import os
+
+# Conservative characters-per-token ratio for English prose / Markdown.
+# Real tokenizers average ~4; erring low keeps estimates on the safe side.
+_CHARS_PER_TOKEN = 3.5
+# Per-message and chat-template overhead not visible in the text itself
+_MESSAGE_OVERHEAD_TOKENS = 8
+# Tokens held back from every window for estimation error
+_SAFETY_MARGIN_TOKENS = 512
+# Never plan a completion smaller than this
+_MIN_OUTPUT_TOKENS = 1024
+# A section is never cut below this many tokens (it is dropped instead)
+_MIN_SECTION_TOKENS = 256
+
+_TRUNCATION_MARKER = "\n\n[... truncated to fit the model's context window ...]"
+
+# Used when a model's context window is not known
+DEFAULT_CONTEXT_LENGTH = 128_000
+
+
+def _max_prompt_tokens() -> int:
+    """Cost ceiling on any one prompt, however large the model's window."""
+    val = os.getenv("ZEUS_MAX_PROMPT_TOKENS")
+    return int(val) if val else 100_000
+
+
+class PromptTooLargeError(ValueError):
+    """Raised when a prompt cannot fit the model's context window even after shrinking."""
+    pass
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of ``text`` (deliberately slightly high)."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def estimate_messages_tokens(messages: list[dict]) -> int:
+    """Estimate the prompt tokens of a chat ``messages`` list."""
+    total = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            total += sum(estimate_tokens(part.get("text", "")) for part in content)
+        else:
+            total += estimate_tokens(content)
+        total += _MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Cut ``text`` to about ``tokens`` tokens, marking the cut."""
+    if estimate_tokens(text) <= tokens:
+        return text
+    keep = max(0, int(tokens * _CHARS_PER_TOKEN) - len(_TRUNCATION_MARKER))
+    return text[:keep] + _TRUNCATION_MARKER
+
+
+class PromptBudget:
+    """Token plan for one call against one model's context window.
+
+    ``max_tokens`` is the completion size to request; ``input_tokens`` is
+    what remains for the prompt once it (and a safety margin) is reserved.
+    Optional context is further capped at ``max_prompt_tokens`` (env
+    ``ZEUS_MAX_PROMPT_TOKENS``) so long-context models do not get
+    arbitrarily expensive prompts.
+    """
+
+    def __init__(self, context_length: int, max_tokens: int, max_prompt_tokens: int | None = None):
+        self.context_length = context_length
+        self.max_tokens = max_tokens
+        self.max_prompt_tokens = max_prompt_tokens or _max_prompt_tokens()
+
+    @classmethod
+    def for_model(
+        cls,
+        context_length: int,
+        requested_max_tokens: int,
+        max_completion_tokens: int = 0,
+    ) -> "PromptBudget":
+        """Plan a call, shrinking ``max_tokens`` on short-context models.
+
+        The completion may take at most half the window, so that a prompt
+        always has room; the provider's completion cap is also honoured.
+        """
+        context_length = context_length or DEFAULT_CONTEXT_LENGTH
+        max_tokens = min(requested_max_tokens, max(_MIN_OUTPUT_TOKENS, context_length // 2))
+        if max_completion_tokens:
+            max_tokens = min(max_tokens, max_completion_tokens)
+        return cls(context_length=context_length, max_tokens=max_tokens)
+
+    @property
+    def input_tokens(self) -> int:
+        """Tokens available for the whole prompt."""
+        return max(0, self.context_length - self.max_tokens - _SAFETY_MARGIN_TOKENS)
+
+    def fit(self, fixed: list[str], sections: list[str]) -> list[str]:
+        """Shrink ``sections`` so that ``fixed`` + ``sections`` fit the window.
+
+        ``fixed`` text (templates, the brief, the draft being worked on) is
+        never cut. The space left (within ``max_prompt_tokens``) is shared
+        out fairly: sections smaller than an equal share keep their full
+        text and the remainder is split between the larger ones, which are
+        truncated. Sections that would get fewer than a minimal number of
+        tokens are dropped (empty).
+
+        Returns:
+            The sections, in order, each possibly truncated.
+
+        Raises:
+            PromptTooLargeError: If the fixed text alone does not fit.
+        """
+        fixed_tokens = sum(estimate_tokens(text) for text in fixed) + _MESSAGE_OVERHEAD_TOKENS * 2
+        if fixed_tokens > self.input_tokens:
+            raise PromptTooLargeError(
+                f"Prompt needs ~{fixed_tokens:,} tokens before optional context, but only "
+                f"{self.input_tokens:,} of the {self.context_length:,}-token window are "
+                f"available with max_tokens={self.max_tokens:,}"
+            )
+
+        available = max(0, min(self.input_tokens, self.max_prompt_tokens) - fixed_tokens)
+        sizes = [estimate_tokens(text) for text in sections]
+        allowance = [0] * len(sections)
+        remaining = available
+        pending = sorted(range(len(sections)), key=lambda i: sizes[i])
+        while pending:
+            share = remaining // len(pending)
+            i = pending.pop(0)
+            allowance[i] = min(sizes[i], share)
+            remaining -= allowance[i]
+
+        return [
+            text if allowance[i] >= sizes[i]
+            else truncate_to_tokens(text, allowance[i]) if allowance[i] >= _MIN_SECTION_TOKENS
+            else ""
+            for i, text in enumerate(sections)
+        ]
+
+    def completion_tokens(self, prompt_tokens: int) -> int:
+        """Return ``max_tokens``, reduced if needed to fit beside ``prompt_tokens``.
+
+        Raises:
+            PromptTooLargeError: If too little room is left for a useful completion.
+        """
+        room = self.context_length - prompt_tokens - _SAFETY_MARGIN_TOKENS
+        if room < min(self.max_tokens, _MIN_OUTPUT_TOKENS):
+            raise PromptTooLargeError(
+                f"Prompt of ~{prompt_tokens:,} tokens leaves no room for output in the "
+                f"{self.context_length:,}-token window"
+            )
+        return min(self.max_tokens, room)
@@ -0,0 +1,520 @@
+"""Adaptive per-model concurrency limiting and call scheduling for LLM calls."""
+
+import asyncio
+import itertools
+import logging
+import random
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Mapping
+
+logger = logging.getLogger(__name__)
+
+# Multiplicative decrease applied to the window on every 429
+_DECREASE_FACTOR = 0.5
+# Fraction of a server-mandated pause added as random spread per waiter,
+# so callers released by the same Retry-After do not retry in lockstep
+_RELEASE_SPREAD = 0.25
+# Longest single wait between checks of the shared rate-limit state
+_SHARED_POLL_MAX = 1.0
+# Seconds a process waits for another's lock on the shared state
+_SHARED_LOCK_TIMEOUT = 30.0
+# Tenants remembered per model before those with no credit left are dropped
+_MAX_TRACKED_TENANTS = 64
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the seconds to wait from Retry-After / X-RateLimit-* headers.
+
+    ``Retry-After`` may be delta-seconds or an HTTP date. When it is absent
+    and ``X-RateLimit-Remaining`` is 0, ``X-RateLimit-Reset`` is used; it is
+    accepted as epoch milliseconds (OpenRouter), epoch seconds or a delta.
+    """
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+
+    remaining = headers.get("x-ratelimit-remaining")
+    reset = headers.get("x-ratelimit-reset")
+    if remaining is None or reset is None:
+        return None
+    try:
+        if float(remaining) > 0:
+            return None
+        reset_value = float(reset)
+    except ValueError:
+        return None
+
+    if reset_value > 1e12:  # epoch milliseconds
+        return max(0.0, reset_value / 1000 - time.time())
+    if reset_value > 1e9:  # epoch seconds
+        return max(0.0, reset_value - time.time())
+    return max(0.0, reset_value)
+
+
+class CallPriority:
+    """Scheduling tag of an LLM call (see ``openrouter.call_priority``).
+
+    Calls waiting for a model's slots are started highest ``priority``
+    first. Calls of equal priority are shared out between tenants by
+    weighted round-robin, and each tenant's calls start in arrival order.
+    """
+
+    def __init__(
+        self,
+        priority: int = 0,
+        phase: str | None = None,
+        run_id: str | None = None,
+        tenant: str | None = None,
+    ):
+        self.priority = priority
+        self.phase = phase
+        self.run_id = run_id
+        # Fairness group: the run itself unless the caller names one
+        self.tenant = tenant or run_id or ""
+
+
+# Tag of calls made outside any tagged context
+_UNTAGGED = CallPriority()
+
+
+class _Waiter:
+    """A call waiting for a slot, in arrival order."""
+
+    def __init__(self, call: CallPriority, seq: int):
+        self.call = call
+        self.seq = seq
+
+
+class ModelLimiter:
+    """AIMD concurrency window for a single model.
+
+    Each success grows the window by ``1/window`` (about +1 per full window
+    of successes); a 429 halves it and pauses new requests until the
+    server's Retry-After has passed. A burst of 429s from requests that
+    were already in flight at the last decrease halves it only once.
+
+    Free slots go to waiting calls by their ``CallPriority``: highest
+    priority first, then the tenant furthest behind its weighted share
+    (stride scheduling), then the earliest arrival.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        initial_concurrency: float = 8.0,
+        min_concurrency: float = 1.0,
+        max_concurrency: float = 32.0,
+        shared: "SharedRateLimit | None" = None,
+        tenant_weights: Mapping[str, float] | None = None,
+    ):
+        self.model = model
+        # Request rate and pauses shared with other processes, if any
+        self.shared = shared
+        self.limit = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        # Relative share of slots per tenant; unlisted tenants weigh 1
+        self.tenant_weights = dict(tenant_weights or {})
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.successes = 0
+        self.rate_limited = 0
+        # time.monotonic() of the last decrease; 429s of older requests do not decrease again
+        self._decreased_at = float("-inf")
+        self._cond: asyncio.Condition | None = None
+        self._waiters: list[_Waiter] = []
+        self._arrivals = itertools.count()
+        # Tenant -> virtual time its next call is due at; advances by 1/weight per call
+        self._tenant_pass: dict[str, float] = {}
+        # Virtual time of the tenant furthest behind; new tenants start here
+        self._virtual_time = 0.0
+
+    @property
+    def waiting(self) -> int:
+        """Calls waiting for a slot."""
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self, priority: CallPriority | None = None) -> AsyncIterator[float]:
+        """Hold one concurrency slot for the duration of a request.
+
+        With a ``shared`` limit, the request also waits for the rate and
+        pauses it imposes across processes.
+
+        Yields:
+            ``time.monotonic()`` at which the request may start, to pass
+            to ``record_rate_limited`` if it gets a 429.
+        """
+        await self.acquire(priority)
+        try:
+            if self.shared is not None:
+                await self.shared.acquire(self.model)
+            yield time.monotonic()
+        finally:
+            await self.release()
+
+    async def acquire(self, priority: CallPriority | None = None) -> None:
+        """Wait for a free slot, for any rate-limit pause to pass, and for the call's turn."""
+        cond = self._condition()
+        waiter = _Waiter(priority or _UNTAGGED, next(self._arrivals))
+        async with cond:
+            self._waiters.append(waiter)
+            granted = False
+            try:
+                while True:
+                    pause = self.blocked_until - time.monotonic()
+                    if pause > 0:
+                        # Spread waiters over a window instead of releasing them together
+                        cond.release()
+                        try:
+                            await asyncio.sleep(pause + random.uniform(0, pause * _RELEASE_SPREAD))
+                        finally:
+                            await cond.acquire()
+                        continue
+                    if self.in_flight < max(1, int(self.limit)) and self._next_waiter() is waiter:
+                        break
+                    await cond.wait()
+                granted = True
+            finally:
+                self._waiters.remove(waiter)
+                if not granted:
+                    # A cancelled call may have been next in line
+                    cond.notify_all()
+            self.in_flight += 1
+            self._charge(waiter.call.tenant)
+            if self._waiters and self.in_flight < max(1, int(self.limit)):
+                # More slots are free: let the next call in line take one
+                cond.notify_all()
+
+    async def release(self) -> None:
+        """Return a slot and wake the next waiter."""
+        cond = self._condition()
+        async with cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            cond.notify_all()
+
+    def record_success(self) -> None:
+        """Additive increase after a successful request."""
+        self.successes += 1
+        self.limit = min(self.max_concurrency, self.limit + 1.0 / max(self.limit, 1.0))
+
+    def record_rate_limited(self, retry_after: float | None, started: float | None = None) -> None:
+        """Multiplicative decrease and pause after a 429.
+
+        Args:
+            retry_after: Seconds to pause new requests, if known.
+            started: When the rate-limited request started (from ``slot``).
+                A request started before the last decrease was sent under
+                the old window, so its 429 only extends the pause.
+        """
+        self.rate_limited += 1
+        if started is None or started >= self._decreased_at:
+            self.limit = max(self.min_concurrency, self.limit * _DECREASE_FACTOR)
+            self._decreased_at = time.monotonic()
+        if retry_after:
+            self.pause(retry_after)
+        logger.warning(
+            f"Rate limiter [{self.model}] — 429 received, window now {self.limit:.1f}"
+            + (f", pausing {retry_after:.1f}s" if retry_after else "")
+        )
+
+    def pause(self, seconds: float) -> None:
+        """Hold back new requests for ``seconds`` (never shortens an existing pause)."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        if self.shared is not None:
+            self._share_pause(seconds)
+
+    def _share_pause(self, seconds: float) -> None:
+        """Write a pause to the shared state, off the event loop when called from one."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.shared.pause(self.model, seconds)
+            return
+        # The local pause already holds this process back; others see it once written
+        written = loop.run_in_executor(None, self.shared.pause, self.model, seconds)
+        written.add_done_callback(self._log_share_failure)
+
+    def _log_share_failure(self, written: asyncio.Future) -> None:
+        if not written.cancelled() and written.exception() is not None:
+            logger.warning(f"Rate limiter [{self.model}] — could not share a pause: {written.exception()}")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the limiter's current state."""
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "paused_for_s": round(max(0.0, self.blocked_until - time.monotonic()), 2),
+            "successes": self.successes,
+            "rate_limited": self.rate_limited,
+        }
+
+    def _next_waiter(self) -> _Waiter:
+        """The waiting call the next free slot goes to."""
+        return min(
+            self._waiters,
+            key=lambda w: (-w.call.priority, self._tenant_due(w.call.tenant), w.seq),
+        )
+
+    def _tenant_due(self, tenant: str) -> float:
+        return max(self._tenant_pass.get(tenant, 0.0), self._virtual_time)
+
+    def _charge(self, tenant: str) -> None:
+        """Advance ``tenant``'s virtual time for a call it started."""
+        due = self._tenant_due(tenant)
+        weight = max(self.tenant_weights.get(tenant, 1.0), 1e-6)
+        self._tenant_pass[tenant] = due + 1.0 / weight
+        self._virtual_time = max(
+            self._virtual_time, min([due] + [self._tenant_due(w.call.tenant) for w in self._waiters])
+        )
+        if len(self._tenant_pass) > _MAX_TRACKED_TENANTS:
+            # A tenant with no credit left would start at the virtual time anyway
+            self._tenant_pass = {t: at for t, at in self._tenant_pass.items() if at > self._virtual_time}
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+
+class AdaptiveRateLimiter:
+    """Client-wide registry of per-model AIMD limiters.
+
+    Shared by every call made through one OpenRouterClient, so concurrent
+    inventors, critics and cross-critiques see the same rate-limit state.
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: float = 8.0,
+        min_concurrency: float = 1.0,
+        max_concurrency: float = 32.0,
+        base_delay: float = 1.5,
+        max_delay: float = 60.0,
+        shared: "SharedRateLimit | None" = None,
+        tenant_weights: Mapping[str, float] | None = None,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            initial_concurrency: Starting window per model.
+            min_concurrency: Floor for the window after repeated 429s.
+            max_concurrency: Ceiling for the window.
+            base_delay: Base back-off in seconds; doubles each attempt.
+            max_delay: Cap on any single back-off.
+            shared: Optional rate limit shared with other processes.
+            tenant_weights: Relative share of each model's slots per
+                tenant (see ``CallPriority``); unlisted tenants weigh 1.
+        """
+        self.shared = shared
+        self.tenant_weights = dict(tenant_weights or {})
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters: dict[str, ModelLimiter] = {}
+
+    def for_model(self, model: str) -> ModelLimiter:
+        """Return (creating on first use) the limiter for ``model``."""
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = ModelLimiter(
+                model,
+                initial_concurrency=self.initial_concurrency,
+                min_concurrency=self.min_concurrency,
+                max_concurrency=self.max_concurrency,
+                shared=self.shared,
+                tenant_weights=self.tenant_weights,
+            )
+            self._limiters[model] = limiter
+        return limiter
+
+    def observe_headers(self, model: str, headers: Mapping[str, str]) -> None:
+        """Pause a model pre-emptively when headers say its quota is spent."""
+        wait = parse_retry_after(headers)
+        if wait:
+            self.for_model(model).pause(min(wait, self.max_delay))
+
+    def backoff_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Jittered back-off before retry ``attempt + 1``.
+
+        Honours a server-provided Retry-After when present; otherwise uses
+        exponential back-off with equal jitter.
+        """
+        if retry_after is not None:
+            return min(self.max_delay, retry_after + random.uniform(0, retry_after * _RELEASE_SPREAD))
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the current state of every per-model limiter."""
+        return {model: limiter.snapshot() for model, limiter in self._limiters.items()}
+
+
+class SharedRateLimit:
+    """Per-model request rate and rate-limit pauses shared across processes.
+
+    State lives in an SQLite file, so every process (e.g. the workers of
+    a multi-process batch) pointed at the same file draws from one token
+    bucket per model and honours a 429 pause any of them received. The
+    per-process AIMD window still applies on top.
+
+    Times are wall-clock (``time.time()``), the only clock processes share.
+    Another process may hold the file's lock, so ``acquire`` reads and
+    writes it in a worker thread, and limiters write pauses there too.
+    """
+
+    DB_NAME = "rate_limits.sqlite3"
+
+    def __init__(
+        self,
+        path: str | Path,
+        requests_per_minute: float = 0.0,
+        burst: int | None = None,
+        journal_mode: str = "WAL",
+    ):
+        """Initialize the shared limit.
+
+        Args:
+            path: SQLite file, or a directory to create it in.
+            requests_per_minute: Requests per model per minute across all
+                processes; 0 shares only the pauses.
+            burst: Requests that may start at once after an idle spell;
+                defaults to a tenth of a minute's allowance (at least 1).
+            journal_mode: SQLite journal mode of the file. WAL only works
+                for processes of one host; use ``DELETE`` for a file shared
+                between hosts.
+        """
+        db_path = Path(path)
+        if db_path.suffix == "":
+            db_path = db_path / self.DB_NAME
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = db_path
+        self.requests_per_minute = max(0.0, requests_per_minute)
+        self.burst = float(burst or max(1, int(self.requests_per_minute / 10)))
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(db_path), timeout=_SHARED_LOCK_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS model_limits (
+                model TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                blocked_until REAL NOT NULL
+            )
+            """
+        )
+
+    async def acquire(self, model: str) -> None:
+        """Wait until ``model`` is not paused and a request token is free, then take it."""
+        while (wait := await asyncio.to_thread(self.try_acquire, model)) > 0:
+            await asyncio.sleep(min(wait, _SHARED_POLL_MAX) + random.uniform(0, 0.05))
+
+    def try_acquire(self, model: str) -> float:
+        """Take a request token for ``model``.
+
+        Returns:
+            0 if the token was taken, else the seconds until one may be.
+        """
+        now = time.time()
+        with self._transaction():
+            tokens, updated_at, blocked_until = self._row(model, now)
+            if blocked_until > now:
+                return blocked_until - now
+            if not self.requests_per_minute:
+                return 0.0
+            rate = self.requests_per_minute / 60
+            tokens = min(self.burst, tokens + (now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._conn.execute(
+                "UPDATE model_limits SET tokens = ?, updated_at = ? WHERE model = ?",
+                (tokens, now, model),
+            )
+            return wait
+
+    def pause(self, model: str, seconds: float) -> None:
+        """Hold back requests to ``model`` in every process (never shortens a pause)."""
+        until = time.time() + seconds
+        with self._transaction():
+            self._row(model, time.time())
+            self._conn.execute(
+                "UPDATE model_limits SET blocked_until = MAX(blocked_until, ?) WHERE model = ?",
+                (until, model),
+            )
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the shared state of every model."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute("SELECT model, tokens, blocked_until FROM model_limits").fetchall()
+        return {
+            model: {"tokens": round(tokens, 2), "paused_for_s": round(max(0.0, blocked_until - now), 2)}
+            for model, tokens, blocked_until in rows
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _row(self, model: str, now: float) -> tuple[float, float, float]:
+        """The model's (tokens, updated_at, blocked_until), created full. Caller holds a transaction."""
+        row = self._conn.execute(
+            "SELECT tokens, updated_at, blocked_until FROM model_limits WHERE model = ?", (model,)
+        ).fetchone()
+        if row is None:
+            row = (self.burst, now, 0.0)
+            self._conn.execute("INSERT INTO model_limits VALUES (?, ?, ?, ?)", (model, *row))
+        return row
+
+    def _transaction(self) -> "SQLiteTransaction":
+        """A write transaction on the shared file, exclusive across threads and processes."""
+        return SQLiteTransaction(self._conn, self._lock)
+
+
+class SQLiteTransaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` (or ``ROLLBACK`` on error) under a thread lock.
+
+    For state shared through an SQLite file (opened with
+    ``isolation_level=None``) by several threads and processes.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> None:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
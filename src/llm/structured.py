@@ -0,0 +1,66 @@
+"""JSON-schema structured-output formats built from the pydantic models."""
+
+import copy
+from typing import Any
+from pydantic import BaseModel
+
+# Keywords dropped from generated schemas: strict structured-output modes
+# reject defaults, and several providers reject numeric bounds.
+_UNSUPPORTED_KEYWORDS = ("default", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum")
+
+
+def json_schema_format(
+    model: type[BaseModel],
+    name: str | None = None,
+    exclude: set[str] | frozenset[str] = frozenset(),
+) -> dict[str, Any]:
+    """Build a ``response_format`` requesting output that matches ``model``.
+
+    The schema is made strict: every object lists all of its properties as
+    required and forbids additional ones, and unsupported keywords are
+    removed. Fields that the caller fills in itself (ids, version numbers)
+    can be left out with ``exclude``.
+
+    Args:
+        model: Pydantic model describing the expected JSON object.
+        name: Schema name sent to the provider. Defaults to the model name.
+        exclude: Top-level fields to leave out of the schema.
+
+    Returns:
+        A ``{"type": "json_schema", ...}`` dict for the request payload.
+    """
+    schema = copy.deepcopy(model.model_json_schema())
+    for field in exclude:
+        schema.get("properties", {}).pop(field, None)
+    _make_strict(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name or model.__name__,
+            "strict": True,
+            "schema": schema,
+        },
+    }
+
+
+def _make_strict(node: Any) -> None:
+    """Rewrite a JSON schema in place into the strict subset."""
+    if isinstance(node, list):
+        for item in node:
+            _make_strict(item)
+        return
+    if not isinstance(node, dict):
+        return
+
+    for keyword in _UNSUPPORTED_KEYWORDS:
+        node.pop(keyword, None)
+    if node.get("type") == "object" and "properties" in node:
+        node["required"] = list(node["properties"])
+        node["additionalProperties"] = False
+    for key, value in node.items():
+        if key in ("properties", "$defs"):
+            # Keys here are field / definition names, not schema keywords
+            for child in value.values():
+                _make_strict(child)
+        else:
+            _make_strict(value)
@@ -0,0 +1,103 @@
+"""Shared, long-lived HTTP connection pool for LLM clients."""
+
+import asyncio
+import logging
+import weakref
+from typing import Awaitable, TypeVar
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Pool sizing for the shared client; one run fans out to ~15 concurrent calls
+_POOL_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=300.0,
+)
+_DEFAULT_TIMEOUT = 120.0
+
+# httpx clients are bound to the event loop that opened their connections,
+# so "process-wide" means one pooled client per live event loop.
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def http2_available() -> bool:
+    """Return True when the optional ``h2`` package (httpx[http2]) is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the pooled AsyncClient for the running event loop, creating it once.
+
+    Uses HTTP/2 (many concurrent calls share one TLS connection); it is
+    a declared dependency, but an install without ``h2`` falls back to
+    HTTP/1.1 with keep-alive.
+
+    Raises:
+        RuntimeError: If called outside a running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        http2 = http2_available()
+        client = httpx.AsyncClient(
+            http2=http2,
+            limits=_POOL_LIMITS,
+            timeout=_DEFAULT_TIMEOUT,
+        )
+        _shared_clients[loop] = client
+        logger.info(f"Shared HTTP pool created (http2={http2}, max_connections={_POOL_LIMITS.max_connections})")
+    return client
+
+
+async def prewarm(url: str = "https://openrouter.ai/api/v1/models", connections: int = 1) -> None:
+    """Open pooled connections ahead of the first LLM call.
+
+    Completes the DNS lookup and TLS handshake so the first real request
+    does not pay for them. Failures are logged and ignored.
+
+    Args:
+        url: Any URL on the API host; only the connection matters.
+        connections: Connections to open in parallel (1 is enough for HTTP/2).
+    """
+    client = get_shared_client()
+
+    async def _touch() -> None:
+        try:
+            await client.head(url, timeout=10.0)
+        except httpx.HTTPError as e:
+            logger.warning(f"HTTP pool pre-warm failed: {e}")
+
+    await asyncio.gather(*(_touch() for _ in range(max(1, connections))))
+
+
+async def close_shared_client() -> None:
+    """Close the pooled client of the running event loop, if any.
+
+    Call it before a loop that used the pool shuts down, so its pooled
+    connections are closed cleanly rather than dropped with the loop.
+    """
+    client = _shared_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+        logger.info("Shared HTTP pool closed")
+
+
+async def closing_shared_pool(coro: Awaitable[T]) -> T:
+    """Await ``coro``, then close the running loop's pooled client.
+
+    For entry points that own their event loop, e.g.
+    ``asyncio.run(closing_shared_pool(run_zeus(...)))``.
+    """
+    try:
+        return await coro
+    finally:
+        await close_shared_client()
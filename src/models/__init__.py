@@ -18,11 +18,27 @@ from src.models.schemas import (
     CriterionScore,
     HardConstraintResult,
     SelfEvaluationScorecard,
+    EvaluationPayload,
+    AssemblyPayload,
     UsageStats,
     BudgetConfig,
     BudgetUsed,
     RunRecord,
 )
+from src.models.events import (
+    RunEvent,
+    ProgressEvent,
+    PhaseStartedEvent,
+    RunStepEvent,
+    PhaseFinishedEvent,
+    CallStartedEvent,
+    CallFinishedEvent,
+    OutputDeltaEvent,
+    PartialResultEvent,
+    BudgetEvent,
+    ErrorEvent,
+    RunFinishedEvent,
+)
 
 __all__ = [
     "ZeusRequest",
@@ -42,8 +58,22 @@ __all__ = [
     "CriterionScore",
     "HardConstraintResult",
     "SelfEvaluationScorecard",
+    "EvaluationPayload",
+    "AssemblyPayload",
     "UsageStats",
     "BudgetConfig",
     "BudgetUsed",
     "RunRecord",
+    "RunEvent",
+    "ProgressEvent",
+    "PhaseStartedEvent",
+    "RunStepEvent",
+    "PhaseFinishedEvent",
+    "CallStartedEvent",
+    "CallFinishedEvent",
+    "OutputDeltaEvent",
+    "PartialResultEvent",
+    "BudgetEvent",
+    "ErrorEvent",
+    "RunFinishedEvent",
 ]
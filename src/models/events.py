@@ -0,0 +1,104 @@
+"""Typed events emitted while a Zeus run progresses (see RunController.run_stream)."""
+
+from typing import Any, Literal
+from pydantic import BaseModel, Field
+from src.models.schemas import ZeusResponse
+
+
+class RunEvent(BaseModel):
+    """Base of all run events."""
+    type: str
+    run_id: str = ""
+    at: float = Field(default=0.0, description="Seconds from the start of the run")
+
+
+class ProgressEvent(RunEvent):
+    """Free-text progress message (what ``on_progress`` receives)."""
+    type: Literal["progress"] = "progress"
+    message: str
+    transient: bool = Field(
+        default=False, description="A status update superseded by the next one (e.g. streaming counts), not worth logging"
+    )
+
+
+class PhaseStartedEvent(RunEvent):
+    """A pipeline phase started."""
+    type: Literal["phase_started"] = "phase_started"
+    phase: str = Field(..., description="Phase key, e.g. phase_1")
+    name: str = Field(..., description="Display name, e.g. Phase 1")
+
+
+class RunStepEvent(RunEvent):
+    """A step of the run outside the phases started."""
+    type: Literal["run_step"] = "run_step"
+    step: Literal["assembling", "saving"] = Field(
+        ..., description="Best-effort assembly after a failed pipeline, or saving the run record"
+    )
+
+
+class PhaseFinishedEvent(RunEvent):
+    """A pipeline phase completed or failed."""
+    type: Literal["phase_finished"] = "phase_finished"
+    phase: str
+    name: str
+    status: Literal["completed", "failed"] = "completed"
+    wall_s: float = 0.0
+    error: str | None = None
+
+
+class CallStartedEvent(RunEvent):
+    """An LLM request was sent (or queued for a rate-limiter slot)."""
+    type: Literal["call_started"] = "call_started"
+    phase: str
+    model: str
+
+
+class CallFinishedEvent(RunEvent):
+    """An LLM request finished, with its retries."""
+    type: Literal["call_finished"] = "call_finished"
+    phase: str
+    model: str
+    status: Literal["ok", "error", "cancelled"] = "ok"
+    wall_s: float = 0.0
+    queue_s: float = 0.0
+    retries: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+
+
+class OutputDeltaEvent(RunEvent):
+    """A streamed piece of an LLM completion (streaming clients only)."""
+    type: Literal["output_delta"] = "output_delta"
+    phase: str
+    text: str
+
+
+class PartialResultEvent(RunEvent):
+    """An intermediate deliverable: the brief, an inventor solution, the synthesis, ..."""
+    type: Literal["partial_result"] = "partial_result"
+    phase: str
+    kind: str = Field(..., description="e.g. problem_brief, inventor_solution, synthesis_result")
+    content: Any = None
+
+
+class BudgetEvent(RunEvent):
+    """Spend of the run so far."""
+    type: Literal["budget"] = "budget"
+    llm_calls: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    cost_usd: float = 0.0
+
+
+class ErrorEvent(RunEvent):
+    """An error recorded in the run (the run may still produce output)."""
+    type: Literal["error"] = "error"
+    message: str
+    phase: str | None = None
+
+
+class RunFinishedEvent(RunEvent):
+    """The run ended; always the last event."""
+    type: Literal["run_finished"] = "run_finished"
+    response: ZeusResponse | None = Field(default=None, description="None if the run was cancelled")
+    errors: list[str] = Field(default_factory=list)
@@ -200,6 +200,27 @@ class SelfEvaluationScorecard(BaseModel):
     identified_weaknesses: list[str] = Field(default_factory=list, description="Lowest-scoring areas")
 
 
+# ============================================================================
+# Phase 6: Assembly Models
+# ============================================================================
+
+class EvaluationPayload(BaseModel):
+    """Raw self-evaluation returned by the assembly call."""
+    criteria_scores: list[CriterionScore] = Field(default_factory=list, description="All 13 criterion scores")
+    hard_constraints: list[HardConstraintResult] = Field(default_factory=list, description="HARD constraint results")
+    identified_weaknesses: list[str] = Field(default_factory=list, description="Weakest areas and why")
+
+
+class AssemblyPayload(BaseModel):
+    """JSON payload returned by the assembly call."""
+    executive_summary: str = Field(default="", description="Deliverable 1 content in Markdown")
+    solution_design_document: str = Field(default="", description="Deliverable 2 content in Markdown")
+    foundation_documentation: str = Field(default="", description="Deliverable 3 content in Markdown")
+    self_evaluation_scorecard: str = Field(default="", description="Deliverable 4 content in Markdown")
+    run_log: str = Field(default="", description="Deliverable 5 content in Markdown")
+    evaluation: EvaluationPayload = Field(default_factory=EvaluationPayload)
+
+
 # ============================================================================
 # Output Models
 # ============================================================================
@@ -262,6 +283,34 @@ class BudgetConfig(BaseModel):
         default_factory=lambda: _env_float("ZEUS_PER_CALL_TIMEOUT", 120.0),
         description="Timeout per LLM call in seconds"
     )
+    max_continuations: int = Field(
+        default_factory=lambda: _env_int("ZEUS_MAX_CONTINUATIONS", 2),
+        description="Continuation requests allowed per call truncated at max_tokens"
+    )
+    max_tokens_in: int = Field(
+        default_factory=lambda: _env_int("ZEUS_MAX_TOKENS_IN", 0),
+        description="Cap on prompt tokens across the run (0 = no cap)"
+    )
+    max_tokens_out: int = Field(
+        default_factory=lambda: _env_int("ZEUS_MAX_TOKENS_OUT", 0),
+        description="Cap on completion tokens across the run (0 = no cap)"
+    )
+    max_cost_usd: float = Field(
+        default_factory=lambda: _env_float("ZEUS_MAX_COST_USD", 0.0),
+        description="Cap on spend in USD across the run (0 = no cap)"
+    )
+    inventor_quorum: int = Field(
+        default_factory=lambda: _env_int("ZEUS_INVENTOR_QUORUM", 0),
+        description="Move past Phase 1 once this many inventors produced a solution (0 = wait for all)"
+    )
+    inventor_deadline: float = Field(
+        default_factory=lambda: _env_float("ZEUS_INVENTOR_DEADLINE", 0.0),
+        description="Seconds after which Phase 1 moves on with the solutions it has, if any (0 = none)"
+    )
+    inventor_stragglers: Literal["merge", "cancel"] = Field(
+        default_factory=lambda: os.getenv("ZEUS_INVENTOR_STRAGGLERS") or "merge",
+        description="Inventors left behind by Phase 1: merged in if done before synthesis, or cancelled"
+    )
 
 
 class BudgetUsed(BaseModel):
@@ -269,7 +318,58 @@ class BudgetUsed(BaseModel):
     llm_calls: int = 0
     tokens_in: int = 0
     tokens_out: int = 0
+    tokens_in_cached: int = 0
+    tokens_in_uncached: int = 0
     revisions: int = 0
+    cache_hits: int = 0
+    json_repairs_local: int = 0
+    json_repairs_llm: int = 0
+    hedged_calls: int = 0
+    hedge_wins: int = 0
+    model_fallbacks: int = 0
+    continuations: int = 0
+    memoized_steps: int = 0
+    cost_usd: float = 0.0
+
+
+class CallTiming(BaseModel):
+    """Timing of one LLM request (with its retries) made during a run."""
+    phase: str = Field(..., description="Phase key the call was made in, e.g. phase_1")
+    model: str
+    start_s: float = Field(default=0.0, description="Seconds from the start of the run")
+    wall_s: float = Field(default=0.0, description="Seconds from first attempt to result, queueing included")
+    queue_s: float = Field(default=0.0, description="Seconds spent waiting for a rate-limiter slot")
+    retries: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    status: Literal["ok", "error", "cancelled"] = "ok"
+
+
+class PhaseTiming(BaseModel):
+    """Timing and resource use of one pipeline phase."""
+    phase: str = Field(..., description="Phase key, e.g. phase_1")
+    start_s: float = Field(default=0.0, description="Seconds from the start of the run")
+    wall_s: float = 0.0
+    cpu_s: float = Field(default=0.0, description="Process CPU time while the phase ran")
+    peak_rss_mb: float = Field(default=0.0, description="Process peak resident memory at the end of the phase")
+    llm_calls: int = 0
+    queue_s: float = 0.0
+    retries: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+
+
+class RunTimings(BaseModel):
+    """Per-phase and per-call timings of a run, those of phases kept from an earlier execution included."""
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: float = 0.0
+    phases: list[PhaseTiming] = Field(default_factory=list)
+    calls: list[CallTiming] = Field(default_factory=list)
+    critical_path: list[int] = Field(
+        default_factory=list,
+        description="Indices into calls of the chain of calls that bounded the run's wall time"
+    )
 
 
 class RunRecord(BaseModel):
@@ -284,6 +384,10 @@ class RunRecord(BaseModel):
     # Phase 1
     inventor_configs: list[InventorConfig] = Field(default_factory=list)
     inventor_solutions: list[InventorSolution] = Field(default_factory=list)
+    dropped_inventors: dict[str, str] = Field(
+        default_factory=dict,
+        description="Inventors whose solutions the run went on without, by id, with the reason"
+    )
 
     # Phase 2
     cross_critiques: list[CrossCritique] = Field(default_factory=list)
@@ -305,5 +409,22 @@ class RunRecord(BaseModel):
     # Traceability
     model_version: str = "anthropic/claude-sonnet-4"
     prompt_versions: dict = Field(default_factory=dict)
+    budget_config: BudgetConfig | None = Field(default=None, description="Caps the run was started with")
     budget_used: BudgetUsed = Field(default_factory=BudgetUsed)
     errors: list[str] = Field(default_factory=list)
+
+    # Checkpointing
+    completed_phases: list[str] = Field(
+        default_factory=list,
+        description="Phase keys (phase_0..phase_6) finished so far; a resumed run skips them"
+    )
+
+    # Profiling
+    timings: RunTimings = Field(default_factory=RunTimings)
+
+    # Reruns
+    rerun_of: str | None = Field(default=None, description="Run whose results this rerun started from")
+    reused_phases: list[str] = Field(
+        default_factory=list,
+        description="Phase keys whose results were taken over from the run in rerun_of"
+    )
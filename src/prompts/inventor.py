@@ -4,7 +4,7 @@
 class InventorPrompts:
     """Prompts for Phase 1: parallel divergent generation by inventors."""
 
-    VERSION = "2.0.0"
+    VERSION = "2.1.0"
 
     # Per-inventor type configurations
     INVENTOR_TYPES = {
@@ -41,9 +41,8 @@ Instructions:
 6. Do not ask clarifying questions - proceed with available information
 7. Deliver a complete solution"""
 
-    GENERATE = """You are Inventor {inventor_id} ({inventor_type}).
-
-PROBLEM BRIEF:
+    # Static context shared by every inventor; sent as a cacheable prefix
+    BRIEF = """PROBLEM BRIEF:
 {problem_brief}
 
 OBJECTIVES:
@@ -52,13 +51,15 @@ OBJECTIVES:
 CONSTRAINTS:
 {constraints}
 
-{library_context}
-
 OUTPUT SPECIFICATION:
 {output_spec}
 
 EVALUATION CRITERIA:
-{eval_criteria}
+{eval_criteria}"""
+
+    GENERATE = """You are Inventor {inventor_id} ({inventor_type}).
+
+The problem brief and your reference libraries are given above.
 
 YOUR EMPHASIS:
 {emphasis}
@@ -4,7 +4,7 @@
 class LibraryCritiquePrompts:
     """Prompts for Phase 4: critiquing unified draft through library lenses."""
 
-    VERSION = "2.0.0"
+    VERSION = "2.1.0"
 
     SYSTEM = """You are an expert critic evaluating a solution through the lens of a specific reference library. Your role is to systematically validate the solution against the library's principles, identifying what's embodied, what's violated, and what's missing."""
 
@@ -70,18 +70,19 @@ class LibraryCritiquePrompts:
         },
     }
 
+    # Static per-library context, repeated on every re-critique; sent as a cacheable prefix
+    CONTEXT = """REFERENCE LIBRARY ({library_name}):
+{library_content}
+
+EVALUATION CRITERIA:
+{eval_criteria}"""
+
     CRITIQUE = """You are the {critic_name}.
 
 UNIFIED SOLUTION DRAFT:
 {draft}
 
-REFERENCE LIBRARY ({library_name}):
-{library_content}
-
-EVALUATION CRITERIA:
-{eval_criteria}
-
-Evaluate the solution through the lens of this library. Answer these questions:
+Evaluate the solution through the lens of the reference library given above. Answer these questions:
 {questions}
 
 Return a JSON object:
@@ -4,11 +4,18 @@
 class RefinementPrompts:
     """Prompts for Phase 5: refining the unified draft based on critique."""
 
-    VERSION = "2.0.0"
+    VERSION = "2.1.0"
 
     SYSTEM = """You are an expert solution refiner. Your role is to address issues identified by critics while maintaining solution coherence and quality. Focus on the highest-severity issues first."""
 
-    REFINE = """Refine the solution to address the identified issues.
+    # Static context, identical in every iteration; sent as a cacheable prefix
+    BRIEF = """PROBLEM BRIEF:
+{problem_brief}
+
+CONSTRAINTS (must all be preserved):
+{constraints}"""
+
+    REFINE = """Refine the solution to address the identified issues, within the problem brief and constraints given above.
 
 CURRENT SOLUTION DRAFT (version {version}):
 {draft}
@@ -16,14 +23,6 @@ CURRENT SOLUTION DRAFT (version {version}):
 ISSUES TO ADDRESS (prioritized by severity):
 {issues}
 
-PROBLEM BRIEF:
-{problem_brief}
-
-CONSTRAINTS (must all be preserved):
-{constraints}
-
-{library_context}
-
 INSTRUCTIONS:
 1. Address all blocker issues - these MUST be resolved
 2. Address major issues where possible
@@ -4,7 +4,7 @@
 class SynthesisPrompts:
     """Prompts for Phase 3: combining inventor solutions into unified draft."""
 
-    VERSION = "2.0.0"
+    VERSION = "2.1.0"
 
     SYSTEM = """You are an expert solution synthesizer. Your role is to combine the best elements from multiple independent solution proposals into a single unified solution that is better than any individual proposal.
 
@@ -16,9 +16,8 @@ You must:
 5. Preserve dissenting views for reference
 6. Resolve conflicts with clear rationale"""
 
-    SYNTHESIZE = """You have received {num_solutions} independent solutions to the same problem. Your task is to synthesize the best unified solution.
-
-PROBLEM BRIEF:
+    # Static context; sent as a cacheable prefix ahead of the solutions
+    BRIEF = """PROBLEM BRIEF:
 {problem_brief}
 
 OBJECTIVES:
@@ -28,9 +27,9 @@ CONSTRAINTS:
 {constraints}
 
 EVALUATION CRITERIA:
-{eval_criteria}
+{eval_criteria}"""
 
-{library_context}
+    SYNTHESIZE = """You have received {num_solutions} independent solutions to the same problem, defined by the problem brief above. Your task is to synthesize the best unified solution.
 
 INVENTOR SOLUTIONS:
 {solutions}
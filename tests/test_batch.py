@@ -0,0 +1,148 @@
+"""Tests for batch execution."""
+
+import json
+import logging
+import pytest
+from src.core.batch import BatchItem, BatchManifest, load_batch, run_batch
+from src.core.persistence import Persistence
+from src.core.run_controller import RunController
+from src.llm.openrouter import OpenRouterClient
+from src.models.schemas import ZeusRequest, ZeusResponse
+
+
+class TestLoadBatch:
+    """Tests for reading batch files."""
+
+    def test_jsonl_with_ids_and_budgets(self, tmp_path):
+        path = tmp_path / "briefs.jsonl"
+        path.write_text(
+            json.dumps({"id": "cache", "prompt": "Design a cache", "max_llm_calls": 12}) + "\n\n"
+            + json.dumps({"prompt": "Design a queue", "constraints": ["durable"]}) + "\n"
+        )
+        first, second = load_batch(path)
+
+        assert first.item_id == "cache"
+        assert first.budget == {"max_llm_calls": 12}
+        assert second.item_id == "line-3"
+        assert second.request.constraints == ["durable"]
+
+    def test_csv_list_cells(self, tmp_path):
+        path = tmp_path / "briefs.csv"
+        path.write_text(
+            "id,prompt,constraints,num_inventors,max_llm_calls\n"
+            'a,Design a cache,thread-safe | TTL,2,\n'
+            'b,Design a queue,"[""durable""]",,10\n'
+        )
+        a, b = load_batch(path)
+
+        assert a.request.constraints == ["thread-safe", "TTL"]
+        assert a.request.num_inventors == 2
+        assert a.budget == {}
+        assert b.request.constraints == ["durable"]
+        assert b.budget == {"max_llm_calls": "10"}
+
+    def test_invalid_row_names_its_line(self, tmp_path):
+        path = tmp_path / "briefs.jsonl"
+        path.write_text(json.dumps({"prompt": "ok"}) + "\n" + json.dumps({"constraints": []}) + "\n")
+        with pytest.raises(ValueError, match=":2:"):
+            load_batch(path)
+
+    def test_invalid_budget_names_its_line(self, tmp_path):
+        path = tmp_path / "briefs.jsonl"
+        path.write_text(json.dumps({"prompt": "ok"}) + "\n" + json.dumps({"prompt": "p", "max_llm_calls": "lots"}) + "\n")
+        with pytest.raises(ValueError, match=r":2: invalid budget"):
+            load_batch(path)
+        with pytest.raises(ValueError, match=r":1: invalid budget"):
+            load_batch(path, {"max_cost_usd": "free"})
+
+
+class TestRunBatch:
+    """Tests for run_batch."""
+
+    @pytest.mark.asyncio
+    async def test_results_stream_and_rerun_skips_done(self, tmp_path, monkeypatch):
+        calls = []
+
+        async def fake_run(self, request, run_id=None):
+            calls.append((request.prompt, self.budget_config.max_llm_calls))
+            if request.prompt == "boom":
+                raise RuntimeError("boom")
+            return ZeusResponse(output="ok", run_id=run_id, total_score=150.0)
+
+        async def no_limits(self):
+            return None
+
+        monkeypatch.setattr(RunController, "run", fake_run)
+        monkeypatch.setattr(OpenRouterClient, "load_model_limits", no_limits)
+        batch = tmp_path / "briefs.jsonl"
+        batch.write_text("\n".join(json.dumps(row) for row in [
+            {"id": "a", "prompt": "Design a cache", "max_llm_calls": 9},
+            {"id": "b", "prompt": "boom"},
+        ]))
+        output = tmp_path / "results.jsonl"
+        kwargs = dict(api_key="test-key", budget={"max_llm_calls": 20}, persistence=Persistence(tmp_path / "runs"))
+
+        counts = await run_batch(load_batch(batch), output, **kwargs)
+
+        assert counts == {"total": 2, "skipped": 0, "succeeded": 1, "failed": 1}
+        assert sorted(calls) == [("Design a cache", 9), ("boom", 20)]
+        results = {r["id"]: r for r in map(json.loads, output.read_text().splitlines())}
+        assert results["a"]["status"] == "done"
+        assert results["a"]["score"] == 150.0
+        assert results["b"]["status"] == "failed"
+        manifest = BatchManifest(tmp_path / "results.jsonl.manifest.jsonl")
+        assert manifest.status("a") == "done"
+        assert manifest.run_id("a") == results["a"]["run_id"]
+
+        calls.clear()
+        counts = await run_batch(load_batch(batch), output, **kwargs)
+        assert counts["skipped"] == 1
+        assert calls == [("boom", 20)]
+
+    @pytest.mark.asyncio
+    async def test_item_that_cannot_start_fails_alone(self, tmp_path, monkeypatch):
+        async def fake_run(self, request, run_id=None):
+            return ZeusResponse(output="ok", run_id=run_id, total_score=150.0)
+
+        async def no_limits(self):
+            return None
+
+        monkeypatch.setattr(RunController, "run", fake_run)
+        monkeypatch.setattr(OpenRouterClient, "load_model_limits", no_limits)
+        items = [
+            BatchItem("bad", ZeusRequest(prompt="p"), {"max_llm_calls": "lots"}),
+            BatchItem("good", ZeusRequest(prompt="q")),
+        ]
+        output = tmp_path / "results.jsonl"
+
+        counts = await run_batch(items, output, api_key="test-key", persistence=Persistence(tmp_path / "runs"))
+
+        assert counts == {"total": 2, "skipped": 0, "succeeded": 1, "failed": 1}
+        results = {r["id"]: r for r in map(json.loads, output.read_text().splitlines())}
+        assert results["good"]["status"] == "done"
+        assert "max_llm_calls" in results["bad"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_shards_run_in_worker_processes(self, tmp_path, caplog):
+        # Nothing can be patched in a spawned worker: an input cap of 1 token
+        # refuses each run's first request before anything is sent
+        items = [BatchItem(key, ZeusRequest(prompt=f"Design {key}")) for key in "abc"]
+        items.append(BatchItem("bad", ZeusRequest(prompt="Design d"), {"max_llm_calls": "lots"}))
+        output = tmp_path / "results.jsonl"
+        persistence = Persistence(tmp_path / "runs")
+
+        with caplog.at_level(logging.INFO, logger="src.core.batch"):
+            counts = await run_batch(
+                items, output, api_key="test-key", budget={"max_tokens_in": 1},
+                persistence=persistence, processes=2,
+            )
+
+        assert "4 runs across 2 processes" in caplog.text
+        assert counts == {"total": 4, "skipped": 0, "succeeded": 3, "failed": 1}
+        results = {r["id"]: r for r in map(json.loads, output.read_text().splitlines())}
+        assert sorted(results) == ["a", "b", "bad", "c"]
+        assert "max_llm_calls" in results["bad"]["error"]
+        assert len(persistence.list_runs()) == 3
+        manifest = BatchManifest(tmp_path / "results.jsonl.manifest.jsonl")
+        assert all(manifest.status(key) == "done" for key in "abc")
+        assert (tmp_path / "results.jsonl.shared" / "rate_limits.sqlite3").exists()
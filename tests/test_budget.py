@@ -0,0 +1,286 @@
+"""Tests for token- and cost-denominated run budgets."""
+
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+import httpx
+import pytest
+from src.core.budget import BudgetExceededError, RunBudget, SharedBudget
+from src.core.run_controller import RunController
+from src.core.scheduler import PhaseGraph
+from src.llm.openrouter import OpenRouterClient, call_budget
+from src.models.schemas import BudgetConfig, BudgetUsed, InventorSolution, ProblemBrief, RunRecord, ZeusRequest
+
+# $1 per 1M prompt tokens, $10 per 1M completion tokens
+_PRICES = {"m": (1e-6, 1e-5)}
+
+
+def _budget(used: BudgetUsed | None = None, pool: RunBudget | None = None, **caps) -> RunBudget:
+    config = BudgetConfig(**{"max_tokens_in": 0, "max_tokens_out": 0, "max_cost_usd": 0.0, **caps})
+    return RunBudget(config, used or BudgetUsed(), _PRICES.get, pool=pool)
+
+
+class TestRunBudget:
+    """Tests for RunBudget admission and settlement."""
+
+    def test_no_caps_admits_everything(self):
+        assert _budget().admit("m", 10_000_000, 16384) == 16384
+
+    def test_prompt_over_input_cap_is_refused(self):
+        budget = _budget(BudgetUsed(tokens_in=9_000), max_tokens_in=10_000)
+        assert budget.admit("m", 900, 4096) == 4096
+        with pytest.raises(BudgetExceededError):
+            budget.admit("m", 1_100, 4096)
+
+    def test_max_tokens_cut_to_remaining_output(self):
+        budget = _budget(BudgetUsed(tokens_out=8_000), max_tokens_out=10_000)
+        assert budget.admit("m", 100, 4096) == 2_000
+        budget.settle("m", {"tokens_out": 1_900})
+        with pytest.raises(BudgetExceededError):
+            budget.admit("m", 100, 4096)
+
+    def test_max_tokens_cut_to_what_cost_cap_pays_for(self):
+        # $0.05 left, prompt costs $0.01 → $0.04 buys 4,000 completion tokens
+        budget = _budget(BudgetUsed(cost_usd=0.05), max_cost_usd=0.10)
+        assert 3_999 <= budget.admit("m", 10_000, 16384) <= 4_000
+
+    def test_unknown_pricing_refused_only_once_cap_is_spent(self):
+        budget = _budget(max_cost_usd=0.10)
+        assert budget.admit("unpriced", 10_000, 4096) == 4096
+        budget.settle("unpriced", {"cost_usd": 0.10})
+        with pytest.raises(BudgetExceededError):
+            budget.admit("unpriced", 10, 4096)
+
+
+class TestBudgetReservation:
+    """Tests for reserving budget ahead of concurrent tasks."""
+
+    def test_fan_out_gets_only_the_calls_left(self):
+        budget = _budget(BudgetUsed(llm_calls=28), max_llm_calls=30)
+        assert len(budget.reserve(10, min_tasks=1)) == 2
+        assert budget.calls_left() == 0
+        with pytest.raises(BudgetExceededError):
+            budget.reserve(1)
+
+    def test_unused_reservations_are_returned(self):
+        budget = _budget(max_llm_calls=10)
+        first, second, third = budget.reserve(3)
+        with first:
+            first.consume()
+        second.release()
+        assert budget.calls_left() == 8
+        third.release()
+        assert budget.calls_left() == 9
+        assert budget.calls == 1
+
+    def test_output_cap_is_split_between_tasks(self):
+        budget = _budget(max_tokens_out=10_000)
+        reservations = budget.reserve(4, tokens_out=4096)
+        assert [r.tokens_out for r in reservations] == [2_500] * 4
+
+        with reservations[0] as reservation:
+            assert call_budget.get() is reservation
+            assert reservation.admit("m", 100, 4096) == 2_500
+            reservation.settle("m", {"tokens_out": 1_000})
+        # Unspent tokens go back, but only to tasks reserving after this
+        assert budget.reserve(1, tokens_out=4096)[0].tokens_out == 1_500
+
+    def test_every_request_is_counted_against_the_call_cap(self):
+        budget = _budget(max_llm_calls=3)
+        first, second = budget.reserve(2)
+
+        # A JSON repair pass in each task: the first takes the call left, the second is refused
+        with first:
+            first.admit("m", 100, 4096)
+            first.admit("m", 100, 4096)
+        with second:
+            second.admit("m", 100, 4096)
+            with pytest.raises(BudgetExceededError):
+                second.admit("m", 100, 4096)
+            # Calls already admitted are not counted again
+            second.consume()
+        assert (budget.calls, budget.reserved_calls) == (3, 0)
+
+        # A response-cache hit sends no request but is still reported
+        [third] = _budget(max_llm_calls=3).reserve(1)
+        with third:
+            third.consume()
+        assert third.budget.calls == 1
+
+    def test_requests_in_flight_hold_their_tokens(self):
+        budget = _budget(max_tokens_out=10_000)
+        [reservation] = budget.reserve(1, tokens_out=2_500)
+
+        with reservation:
+            assert reservation.admit("m", 100, 2_000) == 2_000
+            # A hedged duplicate only gets what the primary does not hold
+            assert reservation.admit("m", 100, 2_000) == 500
+            with pytest.raises(BudgetExceededError):
+                reservation.admit("m", 100, 2_000)
+            reservation.settle("m", {"tokens_out": 300}, 2_000)
+            assert reservation.tokens_out_left() == 1_700
+        # The cancelled hedge never settled: its hold goes back on release
+        assert (budget.tokens_out, budget.reserved_tokens_out) == (300, 0)
+
+    @pytest.mark.asyncio
+    async def test_runs_sharing_a_pool_cannot_exceed_it(self):
+        pool = _budget(max_llm_calls=3)
+        runs = [_budget(pool=pool, max_llm_calls=30) for _ in range(3)]
+
+        async def run(budget):
+            for reservation in budget.reserve(2, min_tasks=0):
+                with reservation:
+                    await asyncio.sleep(0)
+                    reservation.consume()
+
+        await asyncio.gather(*(run(budget) for budget in runs))
+
+        assert pool.calls == 3
+        assert [budget.calls for budget in runs] == [2, 1, 0]
+        assert pool.reserved_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_phase_1_launches_only_inventors_the_budget_covers(self):
+        controller = RunController(
+            OpenRouterClient(api_key="test-key", shared_pool=True),
+            budget_config=BudgetConfig(max_llm_calls=10),
+        )
+        launched = []
+
+        async def generate_solution(problem_brief, config, model=None):
+            launched.append(config.inventor_id)
+            solution = InventorSolution(
+                inventor_id=config.inventor_id,
+                inventor_type=config.inventor_type,
+                content="solution",
+            )
+            return solution, {"tokens_in": 1, "tokens_out": 1, "llm_calls": 1}
+
+        controller.inventor.generate_solution = generate_solution
+        request = ZeusRequest(prompt="p", num_inventors=4)
+        record = RunRecord(
+            request=request,
+            problem_brief=ProblemBrief(problem_statement="p"),
+            budget_used=BudgetUsed(llm_calls=8),
+        )
+
+        async with PhaseGraph() as graph:
+            graph.add("libraries", asyncio.sleep, 0)
+            await controller._phase_1(request, record, graph)
+
+        assert sorted(launched) == ["A", "B"]
+        assert [cfg.inventor_id for cfg in record.inventor_configs] == ["A", "B"]
+        assert record.budget_used.llm_calls == 10
+        assert controller._budget(record).calls_left() == 0
+
+
+class TestSharedBudget:
+    """Tests for SharedBudget, the pool of a multi-process batch."""
+
+    def _pool(self, path, **caps) -> SharedBudget:
+        config = BudgetConfig(**{"max_tokens_in": 0, "max_tokens_out": 0, "max_cost_usd": 0.0, **caps})
+        return SharedBudget(config, path, _PRICES.get)
+
+    def test_spend_and_reservations_are_shared(self, tmp_path):
+        # Two handles on one file stand in for two processes
+        first = self._pool(tmp_path, max_llm_calls=5)
+        second = self._pool(tmp_path, max_llm_calls=5)
+        second.owner = "other-host:1"
+
+        held = _budget(pool=first).reserve(tasks=3)
+        assert second.calls_left() == 2
+        _budget(pool=second).consume(2)
+        assert first.calls_left() == 0
+        with pytest.raises(BudgetExceededError):
+            _budget(pool=second).reserve()
+
+        for reservation in held:
+            reservation.release()
+        _budget(pool=first).settle("m", {"tokens_in": 10, "tokens_out": 5, "cost_usd": 0.01})
+        assert second.calls_left() == 3
+        assert (second.tokens_in, second.tokens_out) == (10, 5)
+        first.close()
+        second.close()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="exited processes are only detected on POSIX")
+    def test_reservations_of_exited_processes_are_dropped(self, tmp_path):
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        crashed = self._pool(tmp_path, max_llm_calls=4)
+        crashed.owner = f"{socket.gethostname()}:{exited.pid}"
+        crashed.reserve(tasks=3)
+
+        pool = self._pool(tmp_path, max_llm_calls=4)
+        assert pool.calls_left() == 4
+        pool.close()
+
+        SharedBudget.reset(tmp_path)
+        assert self._pool(tmp_path, max_llm_calls=4).calls_left() == 4
+
+    def test_reservations_not_refreshed_expire_on_any_host(self, tmp_path):
+        config = BudgetConfig(max_llm_calls=4, max_tokens_in=0, max_tokens_out=0, max_cost_usd=0.0)
+        alive = SharedBudget(config, tmp_path, _PRICES.get, reservation_ttl=0.15)
+        alive.owner = "other-host:1"
+        alive.reserve(tasks=1)
+        crashed = SharedBudget(config, tmp_path, _PRICES.get, reservation_ttl=0.15)
+        crashed.owner = "other-host:2"
+        crashed.reserve(tasks=2)
+        # The host is gone: its refresh stops, and its pid means nothing here
+        crashed._closed.set()
+        time.sleep(0.3)
+
+        pool = self._pool(tmp_path, max_llm_calls=4)
+        assert pool.calls_left() == 3
+        alive.close()
+        pool.close()
+
+
+class TestClientAccounting:
+    """Tests for cost reporting and call_budget hooks in OpenRouterClient."""
+
+    @pytest.mark.asyncio
+    async def test_billed_cost_and_admitted_max_tokens(self):
+        sent = []
+
+        def handler(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 50, "cost": 0.0123},
+            })
+
+        budget = _budget(max_tokens_out=1_000)
+        token = call_budget.set(budget)
+        try:
+            client = OpenRouterClient(api_key="test-key")
+            client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with client:
+                _, usage = await client.generate("hi", model="m", max_tokens=4096)
+        finally:
+            call_budget.reset(token)
+
+        assert sent[0]["max_tokens"] == 1_000
+        assert sent[0]["usage"] == {"include": True}
+        assert usage["cost_usd"] == pytest.approx(0.0123)
+        assert budget.tokens_out == 50
+        assert budget.cost_usd == pytest.approx(0.0123)
+
+    @pytest.mark.asyncio
+    async def test_list_price_used_without_billed_cost(self, monkeypatch):
+        monkeypatch.setattr(OpenRouterClient, "_model_pricing", dict(_PRICES))
+
+        def handler(request):
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {"prompt_tokens": 1_000, "completion_tokens": 100},
+            })
+
+        client = OpenRouterClient(api_key="test-key")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            _, usage = await client.generate("hi", model="m")
+
+        assert usage["cost_usd"] == pytest.approx(0.002)
@@ -0,0 +1,178 @@
+"""Tests for the typed run event stream."""
+
+import asyncio
+import pytest
+from src.core.persistence import Persistence
+from src.core.run_controller import RunController
+from src.llm.openrouter import OpenRouterClient, call_priority
+from src.models.events import (
+    ErrorEvent,
+    OutputDeltaEvent,
+    PartialResultEvent,
+    PhaseFinishedEvent,
+    PhaseStartedEvent,
+    ProgressEvent,
+    RunFinishedEvent,
+    RunStepEvent,
+)
+from src.models.schemas import (
+    InventorSolution,
+    ProblemBrief,
+    RunRecord,
+    SynthesisResult,
+    ZeusRequest,
+    ZeusResponse,
+)
+
+
+def _controller(tmp_path, **kwargs) -> RunController:
+    controller = RunController(
+        OpenRouterClient(api_key="test-key", shared_pool=True),
+        persistence=Persistence(base_dir=tmp_path),
+        **kwargs,
+    )
+
+    async def phase_0(request, record):
+        controller._progress("Phase 0: Normalizing input...")
+        record.problem_brief = ProblemBrief(problem_statement=request.prompt)
+
+    async def phase_1(request, record, graph):
+        record.inventor_solutions = [InventorSolution(inventor_id="A", inventor_type="foundational", content="a")]
+
+    async def phase_3(record):
+        record.synthesis_result = SynthesisResult(unified_draft="unified")
+
+    async def phase_4(record):
+        raise RuntimeError("critics unavailable")
+
+    async def phase_6(record):
+        record.final_response = ZeusResponse(run_id=record.run_id, output="done")
+
+    controller._phase_0 = phase_0
+    controller._phase_1 = phase_1
+    controller._phase_3 = phase_3
+    controller._phase_4 = phase_4
+    controller._phase_6 = phase_6
+    return controller
+
+
+class TestRunStream:
+    """Tests for RunController.run_stream."""
+
+    @pytest.mark.asyncio
+    async def test_events_cover_phases_results_and_errors(self, tmp_path):
+        progress = []
+        controller = _controller(tmp_path, on_progress=progress.append)
+
+        events = [event async for event in controller.run_stream(ZeusRequest(prompt="Design a cache"))]
+
+        started = [e.phase for e in events if isinstance(e, PhaseStartedEvent)]
+        assert started == ["phase_0", "phase_1", "phase_3", "phase_4", "phase_6"]
+        failed = [e for e in events if isinstance(e, PhaseFinishedEvent) and e.status == "failed"]
+        assert [e.phase for e in failed] == ["phase_4"]
+        assert "critics unavailable" in failed[0].error
+        assert any(isinstance(e, ErrorEvent) and e.phase == "phase_4" for e in events)
+
+        results = {e.kind: e.content for e in events if isinstance(e, PartialResultEvent)}
+        assert results["problem_brief"]["problem_statement"] == "Design a cache"
+        assert results["synthesis_result"]["unified_draft"] == "unified"
+
+        last = events[-1]
+        assert isinstance(last, RunFinishedEvent)
+        assert last.response.output == "done"
+        assert {e.run_id for e in events} == {last.response.run_id}
+        # on_progress is fed from the same events
+        assert "Phase 0: Normalizing input..." in progress
+
+    @pytest.mark.asyncio
+    async def test_streaming_and_run_steps_are_typed(self, tmp_path):
+        controller = _controller(tmp_path)
+
+        async def phase_1(request, record, graph):
+            controller._stream_progress("Phase 1")("first draft")
+            record.inventor_solutions = [InventorSolution(inventor_id="A", inventor_type="foundational", content="a")]
+
+        controller._phase_1 = phase_1
+        events = [event async for event in controller.run_stream(ZeusRequest(prompt="Design a cache"))]
+
+        assert [e.text for e in events if isinstance(e, OutputDeltaEvent)] == ["first draft"]
+        streaming = [e for e in events if isinstance(e, ProgressEvent) and "streaming" in e.message]
+        assert streaming and all(e.transient for e in streaming)
+        assert not any(e.transient for e in events if isinstance(e, ProgressEvent) and e not in streaming)
+        assert [e.step for e in events if isinstance(e, RunStepEvent)] == ["saving"]
+
+    @pytest.mark.asyncio
+    async def test_leaving_the_stream_cancels_the_run(self, tmp_path):
+        controller = _controller(tmp_path)
+
+        async def phase_1(request, record, graph):
+            await asyncio.Event().wait()
+
+        controller._phase_1 = phase_1
+        stream = controller.run_stream(ZeusRequest(prompt="Design a cache"))
+        async for event in stream:
+            if isinstance(event, PhaseStartedEvent) and event.phase == "phase_1":
+                break
+        await stream.aclose()
+
+        [run] = Persistence(base_dir=tmp_path).list_runs()
+        assert Persistence(base_dir=tmp_path).load(run["run_id"]).errors == ["Run cancelled"]
+
+
+class TestConcurrentRuns:
+    """Tests for overlapping runs of one RunController."""
+
+    @pytest.mark.asyncio
+    async def test_runs_keep_their_own_libraries_budget_and_events(self, tmp_path):
+        events = []
+        controller = _controller(tmp_path, on_event=events.append)
+        seen = {}
+
+        async def phase_1(request, record, graph):
+            await asyncio.sleep(0.01)
+            record.inventor_solutions = [InventorSolution(inventor_id="A", inventor_type="foundational", content="a")]
+            seen[record.run_id] = (
+                controller._run.inventor.library_loader.user_paths,
+                controller._run.budget is controller._budget(record),
+                controller._run.record is record,
+            )
+
+        controller._phase_1 = phase_1
+        first, second = await asyncio.gather(
+            controller.run(ZeusRequest(prompt="Design a cache", library_paths=["/libs/a.md"])),
+            controller.run(ZeusRequest(prompt="Design a queue", library_paths=["/libs/b.md"])),
+        )
+
+        assert seen[first.run_id] == (["/libs/a.md"], True, True)
+        assert seen[second.run_id] == (["/libs/b.md"], True, True)
+        assert controller.inventor.library_loader.user_paths == []
+        briefs = {
+            e.run_id: e.content["problem_statement"]
+            for e in events if isinstance(e, PartialResultEvent) and e.kind == "problem_brief"
+        }
+        assert briefs == {first.run_id: "Design a cache", second.run_id: "Design a queue"}
+
+    @pytest.mark.asyncio
+    async def test_phase_calls_are_tagged_with_run_tenant_and_priority(self, tmp_path):
+        controller = _controller(tmp_path)
+        tags = {}
+
+        async def phase_1(request, record, graph):
+            tags[record.run_id, "phase_1"] = call_priority.get()
+            record.inventor_solutions = [InventorSolution(inventor_id="A", inventor_type="foundational", content="a")]
+
+        async def phase_3(record):
+            tags[record.run_id, "phase_3"] = call_priority.get()
+            record.synthesis_result = SynthesisResult(unified_draft="unified")
+
+        controller._phase_1 = phase_1
+        controller._phase_3 = phase_3
+        first = await controller.run(ZeusRequest(prompt="Design a cache"), tenant="acme")
+        second = await controller.run(ZeusRequest(prompt="Design a queue"))
+
+        inventors = tags[first.run_id, "phase_1"]
+        assert (inventors.phase, inventors.run_id, inventors.tenant) == ("phase_1", first.run_id, "acme")
+        # Without a tenant, each run is its own fairness group
+        assert tags[second.run_id, "phase_1"].tenant == second.run_id
+        assert tags[first.run_id, "phase_3"].priority > inventors.priority
+        assert call_priority.get() is None
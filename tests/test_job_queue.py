@@ -0,0 +1,172 @@
+"""Tests for the shared job queue."""
+
+import asyncio
+import sqlite3
+import time
+import pytest
+from src.core.job_queue import SQLiteJobQueue, add_batch, work_queue
+from src.core.batch import BatchItem
+from src.core.persistence import Persistence
+from src.core.run_controller import RunController
+from src.llm.openrouter import OpenRouterClient
+from src.models.schemas import RunRecord, ZeusRequest, ZeusResponse
+
+
+def _queue(tmp_path, **kwargs) -> SQLiteJobQueue:
+    return SQLiteJobQueue(tmp_path / "queue" / SQLiteJobQueue.DB_NAME, **kwargs)
+
+
+class TestSQLiteJobQueue:
+    """Tests for SQLiteJobQueue."""
+
+    def test_keys_are_idempotent_and_priority_claims_first(self, tmp_path):
+        job_queue = _queue(tmp_path)
+        items = [BatchItem("a", ZeusRequest(prompt="Design a cache")), BatchItem("b", ZeusRequest(prompt="Design a queue"))]
+
+        assert add_batch(job_queue, items) == 2
+        assert add_batch(job_queue, items) == 0
+        assert job_queue.add("urgent", ZeusRequest(prompt="Design a lock"), {"max_llm_calls": 5}, priority=9)
+
+        # Another handle on the same file, as a worker on another host would have
+        other = _queue(tmp_path)
+        first = other.claim("w1", 60)
+        second = job_queue.claim("w2", 60)
+        assert (first.key, first.budget, first.attempts) == ("urgent", {"max_llm_calls": 5}, 1)
+        assert second.key == "a"
+        assert job_queue.counts() == {"queued": 1, "leased": 2, "done": 0, "failed": 0}
+        other.close()
+        job_queue.close()
+
+    def test_queue_file_uses_a_rollback_journal(self, tmp_path):
+        # WAL's shared-memory index does not work for workers on other hosts
+        job_queue = _queue(tmp_path)
+        other = _queue(tmp_path)
+        job_queue.add("a", ZeusRequest(prompt="Design a cache"))
+
+        assert other.claim("w1", 60).key == "a"
+        assert job_queue.claim("w2", 60) is None
+        for handle in (job_queue, other):
+            assert handle._conn.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+        assert not list(job_queue.path.parent.glob("*-wal")) and not list(job_queue.path.parent.glob("*-shm"))
+        other.close()
+        job_queue.close()
+
+    def test_expired_leases_are_retried_then_failed(self, tmp_path):
+        job_queue = _queue(tmp_path, max_attempts=2)
+        job_queue.add("a", ZeusRequest(prompt="Design a cache"))
+
+        first = job_queue.claim("w1", 0.05)
+        assert job_queue.claim("w2", 60) is None
+        time.sleep(0.1)
+        # w1's lease expired: w2 takes the job over under the same run id
+        second = job_queue.claim("w2", 0.05)
+        assert (second.run_id, second.attempts) == (first.run_id, 2)
+        assert not job_queue.heartbeat("a", first.lease, 60)
+        time.sleep(0.1)
+
+        assert job_queue.claim("w3", 60) is None
+        [result] = job_queue.results()
+        assert result["status"] == "failed"
+        assert "Lease expired 2 times" in result["error"]
+
+    def test_heartbeat_keeps_the_lease_and_failures_are_retried(self, tmp_path):
+        job_queue = _queue(tmp_path, max_attempts=2)
+        job_queue.add("a", ZeusRequest(prompt="Design a cache"))
+
+        first = job_queue.claim("w1", 0.1)
+        for _ in range(3):
+            time.sleep(0.05)
+            assert job_queue.heartbeat("a", first.lease, 0.1)
+        assert job_queue.claim("w2", 60) is None
+
+        assert job_queue.fail("a", first.lease, "boom")
+        second = job_queue.claim("w2", 60)
+        assert second.attempts == 2
+        assert not job_queue.fail("a", second.lease, "boom again")
+        assert job_queue.counts()["failed"] == 1
+        assert job_queue.results()[0]["error"] == "boom again (after 2 attempts)"
+
+    def test_a_lost_lease_cannot_renew_or_finish_the_job(self, tmp_path):
+        job_queue = _queue(tmp_path)
+        job_queue.add("a", ZeusRequest(prompt="Design a cache"))
+
+        old = job_queue.claim("w1", 0.05)
+        time.sleep(0.1)
+        # The same worker (host:pid) claims the expired job again
+        new = job_queue.claim("w1", 60)
+        assert new.lease != old.lease
+        assert not job_queue.heartbeat("a", old.lease, 60)
+        assert not job_queue.complete("a", old.lease, {"id": "a", "status": "done"})
+        assert not job_queue.fail("a", old.lease, "late failure")
+        assert job_queue.counts()["leased"] == 1
+
+        assert job_queue.complete("a", new.lease, {"id": "a", "status": "done"})
+        assert job_queue.results() == [{"id": "a", "status": "done"}]
+
+
+class TestWorkQueue:
+    """Tests for work_queue."""
+
+    @pytest.mark.asyncio
+    async def test_workers_share_the_queue_and_resume_taken_over_runs(self, tmp_path, monkeypatch):
+        calls = []
+
+        async def fake_run(self, request, run_id=None):
+            calls.append(("run", request.prompt))
+            await asyncio.sleep(0.01)
+            return ZeusResponse(output=request.prompt, run_id=run_id, total_score=120.0)
+
+        async def fake_resume(self, run_id):
+            calls.append(("resume", run_id))
+            return ZeusResponse(output="resumed", run_id=run_id, total_score=120.0)
+
+        async def no_limits(self):
+            return None
+
+        monkeypatch.setattr(RunController, "run", fake_run)
+        monkeypatch.setattr(RunController, "resume", fake_resume)
+        monkeypatch.setattr(OpenRouterClient, "load_model_limits", no_limits)
+        persistence = Persistence(tmp_path / "runs")
+        job_queue = _queue(tmp_path)
+        for key in "abc":
+            job_queue.add(key, ZeusRequest(prompt=f"Design {key}"))
+        job_queue.add("d", ZeusRequest(prompt="Design d"), priority=1)
+
+        # A worker that died holding "d": its checkpoint is in the shared records
+        dead = job_queue.claim("dead-worker", 0.01)
+        persistence.save(RunRecord(run_id=dead.run_id, request=dead.request))
+        # Another run whose ID merely shares a prefix with job "a"'s is not a checkpoint of it
+        with sqlite3.connect(job_queue.path) as db:
+            [(run_id_a,)] = db.execute("SELECT run_id FROM jobs WHERE key = 'a'").fetchall()
+        persistence.save(RunRecord(run_id=f"{run_id_a[:8]}-other-run", request=dead.request))
+        await asyncio.sleep(0.05)
+
+        kwargs = dict(api_key="test-key", persistence=persistence, concurrency=2)
+        one, two = await asyncio.gather(
+            work_queue(job_queue, worker="w1", **kwargs),
+            work_queue(_queue(tmp_path), worker="w2", **kwargs),
+        )
+
+        assert one["succeeded"] + two["succeeded"] == 4
+        assert sorted(calls) == [("resume", dead.run_id), ("run", "Design a"), ("run", "Design b"), ("run", "Design c")]
+        results = {r["id"]: r for r in job_queue.results()}
+        assert results["d"]["run_id"] == dead.run_id
+        assert {r["status"] for r in results.values()} == {"done"}
+
+
+    @pytest.mark.asyncio
+    async def test_job_that_cannot_start_is_failed(self, tmp_path, monkeypatch):
+        async def no_limits(self):
+            return None
+
+        monkeypatch.setattr(OpenRouterClient, "load_model_limits", no_limits)
+        job_queue = _queue(tmp_path, max_attempts=2)
+        job_queue.add("bad", ZeusRequest(prompt="Design a cache"), {"max_llm_calls": "lots"})
+
+        counts = await work_queue(
+            job_queue, api_key="test-key", persistence=Persistence(tmp_path / "runs"), worker="w1"
+        )
+
+        assert counts == {"succeeded": 0, "failed": 1, "retried": 1}
+        [result] = job_queue.results()
+        assert "max_llm_calls" in result["error"]
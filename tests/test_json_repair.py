@@ -0,0 +1,39 @@
+"""Tests for the local JSON repair engine."""
+
+import pytest
+from src.llm.json_repair import repair_json
+
+
+class TestRepairJson:
+    """Tests for repair_json()."""
+
+    def test_extracts_object_from_prose(self):
+        text = 'Here is the result:\n```json\n{"a": 1}\n```\nLet me know!'
+        assert repair_json(text) == {"a": 1}
+
+    def test_ignores_text_after_first_balanced_object(self):
+        assert repair_json('{"a": 1} and also {"b": 2}') == {"a": 1}
+
+    def test_trailing_commas(self):
+        assert repair_json('{"a": [1, 2, ], "b": {"c": 3,},}') == {"a": [1, 2], "b": {"c": 3}}
+
+    def test_unescaped_control_characters_in_strings(self):
+        assert repair_json('{"content": "line1\nline2\tend"}') == {"content": "line1\nline2\tend"}
+
+    def test_braces_inside_strings_are_not_structural(self):
+        assert repair_json('{"code": "if (x) { return [1, 2]; }"}') == {
+            "code": "if (x) { return [1, 2]; }"
+        }
+
+    @pytest.mark.parametrize("text, expected", [
+        ('{"content": "a long docu', {"content": "a long docu"}),
+        ('{"a": 1, "b": [1, 2', {"a": 1, "b": [1, 2]}),
+        ('{"a": 1, "b":', {"a": 1, "b": None}),
+        ('{"a": 1, "b"', {"a": 1}),
+        ('{"a": {"b": {"c": "x\\', {"a": {"b": {"c": "x"}}}),
+    ])
+    def test_closes_truncated_payloads(self, text, expected):
+        assert repair_json(text) == expected
+
+    def test_returns_none_without_json(self):
+        assert repair_json("I cannot help with that.") is None
@@ -0,0 +1,645 @@
+"""Tests for the OpenRouter client (no network — uses httpx.MockTransport)."""
+
+import asyncio
+import json
+import sqlite3
+import time
+from collections import deque
+import httpx
+import pytest
+from src.llm.cache import ResponseCache
+from src.llm.openrouter import (
+    OpenRouterClient,
+    OpenRouterError,
+    OpenRouterHTTPError,
+    model_fallbacks,
+    stream_listener,
+)
+from src.llm.rate_limiter import AdaptiveRateLimiter, CallPriority, SharedRateLimit, parse_retry_after
+from src.llm.structured import json_schema_format
+from src.llm.transport import close_shared_client, closing_shared_pool, get_shared_client
+from src.models.schemas import AssemblyPayload, InventorSolution
+
+
+def _sse(*chunks: dict | str) -> bytes:
+    """Encode chunks as an SSE body, terminated by [DONE]."""
+    lines = [": OPENROUTER PROCESSING", ""]
+    for chunk in chunks:
+        data = chunk if isinstance(chunk, str) else json.dumps(chunk)
+        lines.extend([f"data: {data}", ""])
+    lines.extend(["data: [DONE]", ""])
+    return "\n".join(lines).encode()
+
+
+def _delta(text: str, finish_reason: str | None = None) -> dict:
+    return {"choices": [{"delta": {"content": text}, "finish_reason": finish_reason}]}
+
+
+def _make_client(handler, **kwargs) -> OpenRouterClient:
+    client = OpenRouterClient(api_key="test-key", **kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestStreaming:
+    """Tests for SSE streaming completions."""
+
+    @pytest.mark.asyncio
+    async def test_generate_streams_deltas(self):
+        seen_payloads = []
+
+        def handler(request):
+            seen_payloads.append(json.loads(request.content))
+            return httpx.Response(200, content=_sse(
+                _delta("Hel"),
+                _delta("lo"),
+                {"choices": [], "usage": {"prompt_tokens": 12, "completion_tokens": 2}},
+            ))
+
+        deltas = []
+        async with _make_client(handler) as client:
+            content, usage = await client.generate("hi", on_delta=deltas.append)
+
+        assert content == "Hello"
+        assert deltas == ["Hel", "lo"]
+        assert seen_payloads[0]["stream"] is True
+        assert usage["tokens_in"] == 12
+        assert usage["tokens_out"] == 2
+        assert 0 <= usage["ttft_ms"] <= usage["latency_ms"]
+
+    @pytest.mark.asyncio
+    async def test_stream_listener_receives_deltas(self):
+        def handler(request):
+            return httpx.Response(200, content=_sse(_delta("a"), _delta("b", "stop")))
+
+        received = []
+        token = stream_listener.set(received.append)
+        try:
+            async with _make_client(handler, stream=True) as client:
+                content, _ = await client.generate("hi")
+        finally:
+            stream_listener.reset(token)
+
+        assert content == "ab"
+        assert received == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_stream_iterator(self):
+        def handler(request):
+            return httpx.Response(200, content=_sse(_delta("x"), _delta("y"), _delta("z")))
+
+        async with _make_client(handler) as client:
+            deltas = [d async for d in client.stream("hi")]
+
+        assert deltas == ["x", "y", "z"]
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_raises(self):
+        def handler(request):
+            return httpx.Response(200, content=_sse(
+                {"choices": [{"delta": {}, "finish_reason": "content_filter"}]}
+            ))
+
+        async with _make_client(handler, stream=True) as client:
+            with pytest.raises(OpenRouterError, match="content_filter"):
+                await client.generate("hi")
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_reports_latency(self):
+        def handler(request):
+            assert "stream" not in json.loads(request.content)
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 1},
+            })
+
+        async with _make_client(handler) as client:
+            content, usage = await client.generate("hi")
+
+        assert content == "ok"
+        assert "latency_ms" in usage
+        assert "ttft_ms" not in usage
+
+
+class TestResponseCache:
+    """Tests for the persistent response cache and its client integration."""
+
+    @staticmethod
+    def _ok_handler(calls: list):
+        def handler(request):
+            calls.append(json.loads(request.content))
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": f"answer {len(calls)}"}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 50},
+            })
+        return handler
+
+    def test_key_ignores_transport_fields(self):
+        base = {"model": "m", "messages": [{"role": "user", "content": "x"}],
+                "temperature": 0.0, "max_tokens": 10}
+        streamed = dict(base, stream=True, stream_options={"include_usage": True})
+        assert ResponseCache.make_key(base) == ResponseCache.make_key(streamed)
+        assert ResponseCache.make_key(base) != ResponseCache.make_key(dict(base, temperature=0.5))
+
+    def test_lru_eviction_by_entry_count(self, tmp_path):
+        cache = ResponseCache(tmp_path, max_entries=2)
+        cache.put("a", "m", "A", {})
+        cache.put("b", "m", "B", {})
+        cache.get("a")  # touch "a" so "b" is least recently used
+        cache.put("c", "m", "C", {})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+        cache.close()
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = ResponseCache(tmp_path, ttl_seconds=-1)
+        cache.put("a", "m", "A", {})
+        assert cache.get("a") is None
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_deterministic_calls_hit_cache(self, tmp_path):
+        calls = []
+        cache = ResponseCache(tmp_path)
+        async with _make_client(self._ok_handler(calls), cache=cache) as client:
+            first, usage1 = await client.generate("hi", temperature=0.0)
+            second, usage2 = await client.generate("hi", temperature=0.0)
+
+        assert first == second == "answer 1"
+        assert len(calls) == 1
+        assert usage1["tokens_in"] == 100
+        assert usage2 == {"tokens_in": 0, "tokens_out": 0, "latency_ms": 0, "cache_hits": 1}
+        assert cache.stats()["hits"] == 1
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_sampled_calls_bypass_cache_unless_cache_all(self, tmp_path):
+        calls = []
+        cache = ResponseCache(tmp_path)
+        async with _make_client(self._ok_handler(calls), cache=cache) as client:
+            await client.generate("hi", temperature=0.7)
+            await client.generate("hi", temperature=0.7)
+        assert len(calls) == 2
+
+        async with _make_client(self._ok_handler(calls), cache=cache, cache_all=True) as client:
+            await client.generate("hi", temperature=0.7)
+            await client.generate("hi", temperature=0.7)
+        assert len(calls) == 3
+        cache.close()
+
+
+class TestRateLimiter:
+    """Tests for the adaptive per-model limiter and Retry-After handling."""
+
+    def test_parse_retry_after_seconds(self):
+        assert parse_retry_after({"retry-after": "3"}) == 3.0
+
+    def test_parse_ratelimit_reset_epoch_ms(self):
+        reset_ms = str(int((time.time() + 10) * 1000))
+        wait = parse_retry_after({"x-ratelimit-remaining": "0", "x-ratelimit-reset": reset_ms})
+        assert 8.0 < wait <= 10.0
+
+    def test_parse_ignores_reset_while_quota_remains(self):
+        assert parse_retry_after({"x-ratelimit-remaining": "5", "x-ratelimit-reset": "10"}) is None
+
+    def test_aimd_window(self):
+        limiter = AdaptiveRateLimiter(initial_concurrency=8.0).for_model("m")
+        limiter.record_rate_limited(None)
+        assert limiter.limit == 4.0
+        for _ in range(4):
+            limiter.record_success()
+        assert 4.9 < limiter.limit < 5.0
+
+    @pytest.mark.asyncio
+    async def test_burst_of_429s_from_one_window_decreases_once(self):
+        limiter = AdaptiveRateLimiter(initial_concurrency=8.0).for_model("m")
+        starts = []
+        for _ in range(4):
+            async with limiter.slot() as started:
+                starts.append(started)
+
+        for started in starts:
+            limiter.record_rate_limited(None, started)
+        assert limiter.limit == 4.0
+        assert limiter.rate_limited == 4
+
+        # A request sent under the smaller window may decrease it again
+        async with limiter.slot() as started:
+            pass
+        limiter.record_rate_limited(None, started)
+        assert limiter.limit == 2.0
+
+    def test_backoff_honours_retry_after(self):
+        limiter = AdaptiveRateLimiter()
+        delay = limiter.backoff_delay(1, retry_after=2.0)
+        assert 2.0 <= delay <= 2.5
+        assert 0.75 <= limiter.backoff_delay(1) <= 1.5
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        limiter = AdaptiveRateLimiter(initial_concurrency=2.0, max_concurrency=2.0).for_model("m")
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work() for _ in range(6)))
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_calls_start_by_priority_and_skip_cancelled(self):
+        limiter = AdaptiveRateLimiter(initial_concurrency=1.0, max_concurrency=1.0).for_model("m")
+        order = []
+
+        async def work(name, priority):
+            async with limiter.slot(CallPriority(priority, run_id="r")):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        first = asyncio.create_task(work("first", 0))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(work(name, p)) for name, p in [("critique", 0), ("gone", 9), ("synthesis", 5)]]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+        await asyncio.gather(first, *tasks, return_exceptions=True)
+
+        assert order == ["first", "synthesis", "critique"]
+        assert limiter.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_tenants_share_slots_by_weight(self):
+        limiter = AdaptiveRateLimiter(
+            initial_concurrency=1.0, max_concurrency=1.0, tenant_weights={"big": 2.0}
+        ).for_model("m")
+        order = []
+
+        async def work(tenant):
+            async with limiter.slot(CallPriority(tenant=tenant)):
+                order.append(tenant)
+                await asyncio.sleep(0)
+
+        # "big" queues all its calls first, yet "small" gets every third slot
+        await asyncio.gather(*[work("big") for _ in range(6)], *[work("small") for _ in range(3)])
+        assert order == ["big", "small", "big", "big", "small", "big", "big", "small", "big"]
+
+    @pytest.mark.asyncio
+    async def test_429_retry_uses_retry_after_and_shrinks_window(self):
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0.05"}, text="slow down"),
+            httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]}),
+        ]
+
+        async with _make_client(lambda request: responses.pop(0)) as client:
+            started = time.monotonic()
+            content, _ = await client.generate("hi", model="m")
+            elapsed = time.monotonic() - started
+
+        assert content == "ok"
+        assert elapsed >= 0.05
+        state = client.rate_limiter.snapshot()["m"]
+        assert state["rate_limited"] == 1
+        assert state["limit"] < 8.0
+
+    @pytest.mark.asyncio
+    async def test_shared_limit_spans_processes(self, tmp_path):
+        # Two handles on one file stand in for two processes
+        first = SharedRateLimit(tmp_path, requests_per_minute=60, burst=2)
+        second = SharedRateLimit(tmp_path, requests_per_minute=60, burst=2)
+
+        assert first.try_acquire("m") == 0
+        assert second.try_acquire("m") == 0
+        assert 0.9 < first.try_acquire("m") <= 1.0
+        assert second.try_acquire("other") == 0
+
+        AdaptiveRateLimiter(shared=first).for_model("other").record_rate_limited(5.0)
+        # The pause is written off the event loop
+        for _ in range(100):
+            if second.snapshot()["other"]["paused_for_s"]:
+                break
+            await asyncio.sleep(0.01)
+        assert 4.0 < second.try_acquire("other") <= 5.0
+        assert second.snapshot()["other"]["paused_for_s"] > 4.0
+        first.close()
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_waiting_for_the_shared_file_does_not_block_the_loop(self, tmp_path):
+        shared = SharedRateLimit(tmp_path, requests_per_minute=60)
+        # Another process in the middle of a write transaction
+        other = sqlite3.connect(str(shared.path), isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+
+        acquire = asyncio.create_task(shared.acquire("m"))
+        await asyncio.sleep(0.1)
+        assert not acquire.done()
+        other.execute("COMMIT")
+        await asyncio.wait_for(acquire, 5)
+        other.close()
+        shared.close()
+
+
+class TestSharedPool:
+    """Tests for the process-wide pooled HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_one_pool_per_loop(self):
+        first = OpenRouterClient(api_key="test-key", shared_pool=True)
+        second = OpenRouterClient(api_key="test-key", shared_pool=True)
+        try:
+            assert first._http() is second._http() is get_shared_client()
+            await first.close()
+            assert not get_shared_client().is_closed
+        finally:
+            await close_shared_client()
+
+    @pytest.mark.asyncio
+    async def test_closing_shared_pool_closes_it_after_the_entry_point(self):
+        async def entry_point():
+            return get_shared_client()
+
+        pool = await closing_shared_pool(entry_point())
+        assert pool.is_closed
+        assert get_shared_client() is not pool
+        await close_shared_client()
+
+
+class TestJsonRepair:
+    """Tests for the repair path of generate_json()."""
+
+    @pytest.mark.asyncio
+    async def test_local_repair_skips_llm_pass(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": 'Result: {"content": "draft", "items": [1, 2,'}}],
+            })
+
+        async with _make_client(handler) as client:
+            parsed, usage = await client.generate_json("hi")
+
+        assert parsed == {"content": "draft", "items": [1, 2]}
+        assert len(calls) == 1
+        assert usage["json_repairs_local"] == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_llm_repair(self):
+        replies = ["not json at all", '{"fixed": true}']
+
+        def handler(request):
+            return httpx.Response(200, json={"choices": [{"message": {"content": replies.pop(0)}}]})
+
+        async with _make_client(handler) as client:
+            parsed, usage = await client.generate_json("hi")
+
+        assert parsed == {"fixed": True}
+        assert usage["json_repairs_llm"] == 1
+
+
+class TestStructuredOutputs:
+    """Tests for json_schema structured outputs and their fallback."""
+
+    def test_schema_is_strict(self):
+        fmt = json_schema_format(InventorSolution, exclude={"inventor_id", "inventor_type"})
+        schema = fmt["json_schema"]["schema"]
+
+        assert fmt["type"] == "json_schema"
+        assert fmt["json_schema"]["strict"] is True
+        assert set(schema["required"]) == {"content", "assumptions", "reasoning_trace", "libraries_used"}
+        assert schema["additionalProperties"] is False
+        assert "default" not in schema["properties"]["content"]
+
+    def test_nested_definitions_are_strict(self):
+        schema = json_schema_format(AssemblyPayload)["json_schema"]["schema"]
+        score = schema["$defs"]["CriterionScore"]
+
+        assert score["additionalProperties"] is False
+        assert "raw_score" in score["required"]
+        assert "minimum" not in score["properties"]["raw_score"]
+
+    @pytest.mark.asyncio
+    async def test_schema_sent_when_supported(self):
+        formats = []
+
+        def handler(request):
+            formats.append(json.loads(request.content)["response_format"])
+            return httpx.Response(200, json={"choices": [{"message": {"content": '{"content": "x"}'}}]})
+
+        fmt = json_schema_format(InventorSolution)
+        async with _make_client(handler) as client:
+            parsed, _ = await client.generate_json("hi", response_format=fmt)
+
+        assert parsed == {"content": "x"}
+        assert formats == [fmt]
+
+    @pytest.mark.asyncio
+    async def test_rejected_schema_falls_back_to_json_object(self):
+        formats = []
+
+        def handler(request):
+            response_format = json.loads(request.content)["response_format"]
+            formats.append(response_format["type"])
+            if response_format["type"] == "json_schema":
+                return httpx.Response(400, text="response_format json_schema is not supported")
+            return httpx.Response(200, json={"choices": [{"message": {"content": '{"ok": true}'}}]})
+
+        fmt = json_schema_format(InventorSolution)
+        async with _make_client(handler) as client:
+            first, _ = await client.generate_json("hi", model="m", response_format=fmt)
+            second, _ = await client.generate_json("hi", model="m", response_format=fmt)
+
+        assert first == second == {"ok": True}
+        # The model is remembered as unsupported and not sent schemas again
+        assert formats == ["json_schema", "json_object", "json_object"]
+
+
+class TestPromptCaching:
+    """Tests for cacheable context blocks and cached-token accounting."""
+
+    @pytest.mark.asyncio
+    async def test_context_blocks_get_cache_breakpoints(self):
+        messages = []
+
+        def handler(request):
+            messages.extend(json.loads(request.content)["messages"])
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": "ok"}}],
+                "usage": {
+                    "prompt_tokens": 1000,
+                    "completion_tokens": 10,
+                    "prompt_tokens_details": {"cached_tokens": 800},
+                },
+            })
+
+        async with _make_client(handler) as client:
+            _, usage = await client.generate("task", system="sys", context_blocks=["library", "", "brief"])
+
+        content = messages[1]["content"]
+        assert [part["text"] for part in content] == ["library", "brief", "task"]
+        assert all(part["cache_control"] == {"type": "ephemeral"} for part in content[:2])
+        assert "cache_control" not in content[2]
+        assert usage["tokens_in_cached"] == 800
+        assert usage["tokens_in_uncached"] == 200
+
+    def test_breakpoints_capped_at_last_blocks(self):
+        content = OpenRouterClient._user_content("task", [f"b{i}" for i in range(6)])
+        marked = [part["text"] for part in content if "cache_control" in part]
+        assert marked == ["b2", "b3", "b4", "b5"]
+
+    def test_plain_prompt_without_context(self):
+        assert OpenRouterClient._user_content("task", None) == "task"
+
+
+class TestHedgingAndFallback:
+    """Tests for model fallback chains and hedged requests."""
+
+    @staticmethod
+    def _by_model(replies: dict):
+        seen = []
+
+        def handler(request):
+            model = json.loads(request.content)["model"]
+            seen.append(model)
+            status, content = replies[model]
+            if status != 200:
+                return httpx.Response(status, text="error")
+            return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+        return handler, seen
+
+    @pytest.mark.asyncio
+    async def test_falls_back_along_chain(self):
+        handler, seen = self._by_model({"a": (400, None), "b": (200, "from b")})
+        token = model_fallbacks.set(("b",))
+        try:
+            async with _make_client(handler) as client:
+                content, usage = await client.generate("hi", model="a")
+        finally:
+            model_fallbacks.reset(token)
+
+        assert content == "from b"
+        assert seen == ["a", "b"]
+        assert usage["model_fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_auth_errors_do_not_fall_back(self):
+        handler, seen = self._by_model({"a": (401, None), "b": (200, "from b")})
+        token = model_fallbacks.set(("b",))
+        try:
+            async with _make_client(handler) as client:
+                with pytest.raises(OpenRouterHTTPError):
+                    await client.generate("hi", model="a")
+        finally:
+            model_fallbacks.reset(token)
+        assert seen == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged(self, monkeypatch):
+        monkeypatch.setattr(OpenRouterClient, "_latencies", {("slow", 4096): deque([0.02] * 10)})
+        seen = []
+
+        async def handler(request):
+            model = json.loads(request.content)["model"]
+            seen.append(model)
+            if model == "slow":
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"choices": [{"message": {"content": f"from {model}"}}]})
+
+        token = model_fallbacks.set(("fast",))
+        try:
+            async with _make_client(handler, hedge_percentile=0.9) as client:
+                started = time.monotonic()
+                content, usage = await client.generate("hi", model="slow")
+                elapsed = time.monotonic() - started
+        finally:
+            model_fallbacks.reset(token)
+
+        assert content == "from fast"
+        assert seen == ["slow", "fast"]
+        assert usage["hedged_calls"] == 1
+        assert usage["hedge_wins"] == 1
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_no_hedging_without_latency_history(self, monkeypatch):
+        monkeypatch.setattr(OpenRouterClient, "_latencies", {})
+        handler, seen = self._by_model({"m": (200, "ok")})
+        async with _make_client(handler, hedge_percentile=0.9) as client:
+            _, usage = await client.generate("hi", model="m")
+
+        assert seen == ["m"]
+        assert "hedged_calls" not in usage
+        assert len(OpenRouterClient._latencies[("m", 4096)]) == 1
+
+
+class TestTruncationContinuation:
+    """Tests for continuing completions cut off at max_tokens."""
+
+    @staticmethod
+    def _replies(*parts: tuple[str, str]):
+        queue = list(parts)
+        seen = []
+
+        def handler(request):
+            seen.append(json.loads(request.content))
+            content, finish_reason = queue.pop(0)
+            return httpx.Response(200, json={
+                "choices": [{"message": {"content": content}, "finish_reason": finish_reason}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5},
+            })
+
+        return handler, seen
+
+    @pytest.mark.asyncio
+    async def test_truncated_json_is_continued_before_parsing(self):
+        handler, seen = self._replies(
+            ('{"content": "first half of the draft', "length"),
+            ('first half of the draft, second half"}', "stop"),
+        )
+        async with _make_client(handler) as client:
+            parsed, usage = await client.generate_json("hi", response_format={"type": "json_object"})
+
+        assert parsed == {"content": "first half of the draft, second half"}
+        assert usage["continuations"] == 1
+        assert usage["tokens_out"] == 10
+        assert "truncated" not in usage
+        follow_up = seen[1]
+        assert "response_format" not in follow_up
+        assert follow_up["messages"][-2] == {"role": "assistant", "content": '{"content": "first half of the draft'}
+        assert follow_up["messages"][-1]["role"] == "user"
+
+    @pytest.mark.asyncio
+    async def test_continuations_are_capped(self):
+        handler, seen = self._replies(("a", "length"), ("b", "length"), ("c", "length"))
+        async with _make_client(handler, max_continuations=2) as client:
+            content, usage = await client.generate("hi")
+
+        assert content == "abc"
+        assert len(seen) == 3
+        assert usage["continuations"] == 2
+        assert usage["truncated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_truncation_is_continued(self):
+        bodies = [
+            _sse(_delta("Hello, "), _delta("wor", finish_reason="length")),
+            _sse(_delta("ld", finish_reason="stop")),
+        ]
+
+        def handler(request):
+            return httpx.Response(200, content=bodies.pop(0))
+
+        deltas = []
+        async with _make_client(handler) as client:
+            content, usage = await client.generate("hi", on_delta=deltas.append)
+
+        assert content == "Hello, world"
+        assert "".join(deltas) == "Hello, world"
+        assert usage["continuations"] == 1
@@ -0,0 +1,268 @@
+"""Tests for run record persistence, checkpointing and resume."""
+
+import threading
+
+import pytest
+from src.core.persistence import Persistence
+from src.core.run_controller import RunController
+from src.llm.openrouter import OpenRouterClient
+from src.models.schemas import (
+    BudgetUsed,
+    InventorSolution,
+    PhaseTiming,
+    ProblemBrief,
+    RunRecord,
+    RunTimings,
+    SynthesisResult,
+    ZeusRequest,
+    ZeusResponse,
+)
+
+
+def _record(**kwargs) -> RunRecord:
+    return RunRecord(request=ZeusRequest(prompt="Design a cache"), **kwargs)
+
+
+class TestAtomicSave:
+    """Tests for Persistence.save."""
+
+    def test_save_overwrites_in_place_without_temp_files(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        record = _record()
+        first = persistence.save(record)
+        record.completed_phases.append("phase_0")
+        second = persistence.save(record)
+
+        assert first == second
+        assert [p.name for p in tmp_path.iterdir()] == [first.name]
+        assert persistence.load(record.run_id).completed_phases == ["phase_0"]
+
+    def test_interrupted_run_is_listed_as_resumable(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        persistence.save(_record(completed_phases=["phase_0", "phase_1"]))
+
+        [run] = persistence.list_runs()
+        assert run["status"] == "Interrupted (resumable)"
+
+
+class TestResume:
+    """Tests for RunController.resume."""
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_phases_and_keeps_budget(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        record = _record(
+            problem_brief=ProblemBrief(problem_statement="Design a cache"),
+            inventor_solutions=[InventorSolution(inventor_id="A", inventor_type="foundational", content="draft A")],
+            synthesis_result=SynthesisResult(unified_draft="unified"),
+            budget_used=BudgetUsed(llm_calls=6, tokens_in=1000, tokens_out=500),
+            completed_phases=["phase_0", "phase_1", "phase_3"],
+            # Phase 4 was cut short by the interruption
+            timings=RunTimings(wall_s=40.0, phases=[
+                PhaseTiming(phase=phase, wall_s=10.0) for phase in ("phase_0", "phase_1", "phase_3", "phase_4")
+            ]),
+        )
+        persistence.save(record)
+
+        controller = RunController(OpenRouterClient(api_key="test-key", shared_pool=True), persistence=persistence)
+        ran = []
+
+        def fake_phase(name):
+            async def phase(*args):
+                ran.append(name)
+                rec = args[-1] if isinstance(args[-1], RunRecord) else args[0]
+                rec.budget_used.llm_calls += 1
+                if name == "phase_6":
+                    rec.final_response = ZeusResponse(run_id=rec.run_id, output="done")
+            return phase
+
+        for name in ("phase_0", "phase_1", "phase_2", "phase_3", "phase_4", "phase_5", "phase_6"):
+            setattr(controller, f"_{name}", fake_phase(name))
+
+        response = await controller.resume(record.run_id[:8])
+
+        assert response.output == "done"
+        assert ran == ["phase_4", "phase_6"]
+        saved = persistence.load(record.run_id)
+        assert saved.budget_used.llm_calls == 8
+        assert saved.budget_used.tokens_in == 1000
+        assert saved.completed_phases == ["phase_0", "phase_1", "phase_3", "phase_4", "phase_6"]
+        assert [p.phase for p in saved.timings.phases] == ["phase_0", "phase_1", "phase_3", "phase_4", "phase_6"]
+        assert saved.timings.phases[3].wall_s < 10.0
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_are_written_off_the_event_loop(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        record = _record(
+            problem_brief=ProblemBrief(problem_statement="Design a cache"),
+            inventor_solutions=[InventorSolution(inventor_id="A", inventor_type="foundational", content="draft A")],
+            synthesis_result=SynthesisResult(unified_draft="unified"),
+            completed_phases=["phase_0", "phase_1", "phase_3", "phase_4"],
+        )
+        persistence.save(record)
+        controller = RunController(OpenRouterClient(api_key="test-key", shared_pool=True), persistence=persistence)
+
+        async def phase_6(*args):
+            args[-1].final_response = ZeusResponse(run_id=record.run_id, output="done")
+
+        controller._phase_6 = phase_6
+        save = persistence.save
+        threads = []
+
+        def recording_save(rec):
+            threads.append(threading.current_thread())
+            return save(rec)
+
+        persistence.save = recording_save
+        await controller.resume(record.run_id)
+
+        # The phase_6 checkpoint and the final save
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_unknown_run_raises(self, tmp_path):
+        controller = RunController(
+            OpenRouterClient(api_key="test-key", shared_pool=True),
+            persistence=Persistence(base_dir=tmp_path),
+        )
+        with pytest.raises(ValueError):
+            await controller.resume("missing")
+
+
+class TestRerun:
+    """Tests for RunController.rerun."""
+
+    def _finished_run(self, persistence: Persistence, **request) -> RunRecord:
+        record = RunRecord(
+            request=ZeusRequest(prompt="Design a cache", num_inventors=2, **request),
+            problem_brief=ProblemBrief(
+                problem_statement="Design a cache",
+                constraints=["Under 1GB", "Extracted constraint"],
+            ),
+            inventor_solutions=[
+                InventorSolution(inventor_id=i, inventor_type="foundational", content=f"draft {i}")
+                for i in ("A", "B")
+            ],
+            synthesis_result=SynthesisResult(unified_draft="unified"),
+            final_response=ZeusResponse(run_id="x", output="first"),
+            completed_phases=["phase_0", "phase_1", "phase_3", "phase_4", "phase_6"],
+        )
+        record.request.constraints.append("Under 1GB")
+        persistence.save(record)
+        return record
+
+    def _controller(self, persistence: Persistence, ran: list[str], real: tuple[str, ...] = ()) -> RunController:
+        controller = RunController(OpenRouterClient(api_key="test-key", shared_pool=True), persistence=persistence)
+
+        def fake_phase(name):
+            async def phase(*args):
+                ran.append(name)
+                rec = next(arg for arg in args if isinstance(arg, RunRecord))
+                if name == "phase_1":
+                    rec.inventor_solutions = [
+                        InventorSolution(inventor_id=i, inventor_type="foundational", content=f"redraft {i}")
+                        for i in ("A", "B")
+                    ]
+                if name == "phase_3":
+                    rec.synthesis_result = SynthesisResult(unified_draft="unified again")
+                if name == "phase_6":
+                    rec.final_response = ZeusResponse(run_id=rec.run_id, output="second")
+            return phase
+
+        for name in ("phase_0", "phase_1", "phase_2", "phase_3", "phase_4", "phase_5", "phase_6"):
+            if name not in real:
+                setattr(controller, f"_{name}", fake_phase(name))
+        return controller
+
+    @pytest.mark.asyncio
+    async def test_added_constraint_repeats_the_inventors_onwards(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        previous = self._finished_run(persistence)
+        ran = []
+        controller = self._controller(persistence, ran)
+
+        request = previous.request.model_copy(update={"constraints": ["Under 1GB", "Must run on-prem"]})
+        response = await controller.rerun(previous.run_id[:8], request)
+
+        assert response.output == "second"
+        # The inventors designed against the old constraints; intake is patched instead of repeated
+        assert ran == ["phase_1", "phase_3", "phase_4", "phase_6"]
+        [rerun] = [r for r in map(persistence.load, [response.run_id]) if r]
+        assert rerun.rerun_of == previous.run_id
+        assert rerun.reused_phases == ["phase_0"]
+        assert rerun.problem_brief.constraints == ["Under 1GB", "Must run on-prem", "Extracted constraint"]
+        assert [s.content for s in rerun.inventor_solutions] == ["redraft A", "redraft B"]
+        # The original record is left as it was
+        assert persistence.load(previous.run_id).final_response.output == "first"
+
+    @pytest.mark.asyncio
+    async def test_changed_eval_criteria_repeat_critique_and_assembly(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        previous = self._finished_run(persistence)
+        criteria = tmp_path / "criteria.md"
+        criteria.write_text("Latency under 5ms")
+        ran = []
+        controller = self._controller(persistence, ran)
+
+        request = previous.request.model_copy(update={"eval_criteria_path": str(criteria)})
+        response = await controller.rerun(previous.run_id, request)
+
+        assert ran == ["phase_4", "phase_6"]
+        rerun = persistence.load(response.run_id)
+        assert rerun.problem_brief.eval_criteria == "Latency under 5ms"
+        assert rerun.synthesis_result.unified_draft == "unified"
+
+    @pytest.mark.asyncio
+    async def test_added_inventor_is_the_only_one_run(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        previous = self._finished_run(persistence)
+        ran = []
+        controller = self._controller(persistence, ran, real=("phase_1",))
+        generated = []
+
+        async def generate_solution(problem_brief, config, model=None):
+            generated.append(config.inventor_id)
+            solution = InventorSolution(
+                inventor_id=config.inventor_id,
+                inventor_type=config.inventor_type,
+                content=f"draft {config.inventor_id}",
+            )
+            return solution, {"tokens_in": 1, "tokens_out": 1, "llm_calls": 1}
+
+        controller.inventor.generate_solution = generate_solution
+        request = previous.request.model_copy(update={"num_inventors": 3})
+        response = await controller.rerun(previous.run_id, request)
+
+        assert generated == ["C"]
+        assert ran == ["phase_3", "phase_4", "phase_6"]
+        rerun = persistence.load(response.run_id)
+        assert sorted(s.inventor_id for s in rerun.inventor_solutions) == ["A", "B", "C"]
+        assert rerun.budget_used.llm_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_from_phase_repeats_phases_the_changes_leave_valid(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        previous = self._finished_run(persistence)
+        ran = []
+        controller = self._controller(persistence, ran)
+
+        response = await controller.rerun(previous.run_id, previous.request, from_phase="phase_3")
+
+        assert ran == ["phase_3", "phase_4", "phase_6"]
+        assert persistence.load(response.run_id).reused_phases == ["phase_0", "phase_1", "phase_2"]
+        with pytest.raises(ValueError, match="Unknown phase"):
+            await controller.rerun(previous.run_id, previous.request, from_phase="phase_9")
+
+    @pytest.mark.asyncio
+    async def test_unchanged_request_returns_previous_response(self, tmp_path):
+        persistence = Persistence(base_dir=tmp_path)
+        previous = self._finished_run(persistence)
+        ran = []
+        controller = self._controller(persistence, ran)
+
+        response = await controller.rerun(previous.run_id, previous.request)
+
+        assert response.output == "first"
+        assert ran == []
+        assert len(persistence.list_runs()) == 1
@@ -0,0 +1,97 @@
+"""Tests for phase-level memoization."""
+
+import pytest
+from src.core.phase_store import PhaseStore
+from src.core.run_controller import RunController
+from src.llm.openrouter import OpenRouterClient
+from src.models.schemas import (
+    InventorConfig,
+    InventorSolution,
+    ProblemBrief,
+    RunRecord,
+    ZeusRequest,
+)
+from src.prompts.intake import IntakePrompts
+
+
+class TestPhaseStore:
+    """Tests for PhaseStore."""
+
+    def test_roundtrip_and_key_inputs(self, tmp_path):
+        store = PhaseStore(tmp_path)
+        key = PhaseStore.make_key("phase_0", "m", {"intake_prompts": "1.0"}, {"prompt": "p"})
+        store.put(key, "phase_0", {"problem_brief": {"problem_statement": "p"}})
+
+        assert store.get(key) == {"problem_brief": {"problem_statement": "p"}}
+        assert key != PhaseStore.make_key("phase_0", "m", {"intake_prompts": "1.1"}, {"prompt": "p"})
+        assert key != PhaseStore.make_key("phase_0", "other", {"intake_prompts": "1.0"}, {"prompt": "p"})
+        assert key != PhaseStore.make_key("phase_0", "m", {"intake_prompts": "1.0"}, {"prompt": "q"})
+        store.close()
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        store = PhaseStore(tmp_path, max_entries=2)
+        for key in ("a", "b", "c"):
+            store.put(key, "phase_0", {"key": key})
+
+        assert store.get("a") is None
+        assert store.stats()["entries"] == 2
+        store.close()
+
+
+class TestMemoizedPhases:
+    """Tests for RunController reuse of stored phase results."""
+
+    def _controller(self, tmp_path) -> RunController:
+        return RunController(
+            OpenRouterClient(api_key="test-key", shared_pool=True),
+            phase_store=PhaseStore(tmp_path),
+        )
+
+    @pytest.mark.asyncio
+    async def test_phase_0_reused_until_prompt_version_changes(self, tmp_path, monkeypatch):
+        controller = self._controller(tmp_path)
+        calls = []
+
+        async def normalize(request, model=None):
+            calls.append(request.prompt)
+            return ProblemBrief(problem_statement=request.prompt), {"tokens_in": 10, "tokens_out": 5}
+
+        controller.normalizer.normalize = normalize
+        request = ZeusRequest(prompt="Design a cache")
+
+        first = RunRecord(request=request)
+        await controller._phase_0(request, first)
+        second = RunRecord(request=request)
+        await controller._phase_0(request, second)
+
+        assert calls == ["Design a cache"]
+        assert second.problem_brief == first.problem_brief
+        assert second.budget_used.memoized_steps == 1
+        assert second.budget_used.llm_calls == 0
+
+        monkeypatch.setattr(IntakePrompts, "VERSION", IntakePrompts.VERSION + "-next")
+        await controller._phase_0(request, RunRecord(request=request))
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_only_valid_inventor_solutions_are_reused(self, tmp_path):
+        controller = self._controller(tmp_path)
+        outcomes = ["[Inventor A failed: timeout]", "solution A"]
+        calls = []
+
+        async def generate_solution(problem_brief, config, model=None):
+            calls.append(config.inventor_id)
+            content = outcomes[len(calls) - 1]
+            solution = InventorSolution(inventor_id="A", inventor_type="foundational", content=content)
+            return solution, {"tokens_in": 1, "tokens_out": 1, "llm_calls": 1}
+
+        controller.inventor.generate_solution = generate_solution
+        brief = ProblemBrief(problem_statement="Design a cache")
+        config = InventorConfig(inventor_id="A", inventor_type="foundational")
+
+        for _ in range(3):
+            solution, usage = await controller._generate_solution(brief, config, "m")
+
+        assert calls == ["A", "A"]
+        assert solution.content == "solution A"
+        assert usage == {"llm_calls": 0, "memoized_steps": 1}
@@ -0,0 +1,132 @@
+"""Tests for per-phase and per-call run timings."""
+
+import time
+
+import httpx
+import pytest
+from src.core.persistence import Persistence
+from src.core.profiling import RunProfiler, critical_path, kept_timings
+from src.core.run_controller import RunContext, RunController
+from src.llm.openrouter import OpenRouterClient, call_observer
+from src.models.schemas import CallTiming, PhaseTiming, RunRecord, RunTimings, ZeusRequest
+
+
+def _ok(request):
+    return httpx.Response(200, json={
+        "choices": [{"message": {"content": "ok"}}],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 20},
+    })
+
+
+def _make_client(handler) -> OpenRouterClient:
+    client = OpenRouterClient(api_key="test-key")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestCriticalPath:
+    """Tests for critical_path."""
+
+    def test_follows_the_calls_each_step_waited_on(self):
+        calls = [
+            CallTiming(phase="phase_0", model="m", start_s=0.0, wall_s=2.0),
+            CallTiming(phase="phase_1", model="m", start_s=2.1, wall_s=8.0),
+            CallTiming(phase="phase_1", model="m", start_s=2.1, wall_s=3.0),
+            CallTiming(phase="phase_1", model="m", start_s=6.0, wall_s=4.2, status="cancelled"),
+            CallTiming(phase="phase_3", model="m", start_s=10.2, wall_s=5.0),
+        ]
+        assert critical_path(calls) == [0, 1, 4]
+
+    def test_no_calls(self):
+        assert critical_path([]) == []
+
+
+class TestCallTimings:
+    """Tests for call_observer and RunProfiler."""
+
+    @pytest.mark.asyncio
+    async def test_observer_sees_retries_and_tokens(self):
+        responses = [httpx.Response(503, text="busy"), None]
+
+        def handler(request):
+            return responses.pop(0) or _ok(request)
+
+        seen = []
+        client = _make_client(handler)
+        client.rate_limiter.backoff_delay = lambda attempt, retry_after=None: 0.0
+        token = call_observer.set(seen.append)
+        try:
+            async with client:
+                await client.generate("hi", model="m")
+        finally:
+            call_observer.reset(token)
+
+        started, call = seen
+        assert started["status"] == "running"
+        assert call["status"] == "ok"
+        assert call["retries"] == 1
+        assert (call["tokens_in"], call["tokens_out"]) == (100, 20)
+        assert call["ended"] >= call["started"]
+
+    @pytest.mark.asyncio
+    async def test_phase_timings_include_their_calls(self, tmp_path):
+        client = _make_client(_ok)
+        controller = RunController(client, persistence=Persistence(base_dir=tmp_path))
+        record = RunRecord(request=ZeusRequest(prompt="p"))
+
+        async def phase():
+            await controller.llm.generate("hi", model="m")
+
+        with controller._bind(RunContext(controller, record)) as run:
+            async with client:
+                await controller._safe_phase("Phase 0", record, phase)
+        run.profiler.finish()
+
+        timings: RunTimings = record.timings
+        [phase_timing] = timings.phases
+        assert phase_timing.phase == "phase_0"
+        assert phase_timing.llm_calls == 1
+        assert phase_timing.tokens_out == 20
+        assert timings.calls[0].phase == "phase_0"
+        assert timings.critical_path == [0]
+        assert timings.peak_rss_mb >= 0
+
+
+class TestKeptTimings:
+    """Tests for kept_timings and a profiler continuing an earlier execution."""
+
+    def test_repeated_phases_are_timed_afresh_after_the_kept_ones(self):
+        earlier = RunTimings(
+            wall_s=30.0,
+            cpu_s=2.0,
+            phases=[
+                PhaseTiming(phase="phase_0", wall_s=5.0, llm_calls=1),
+                PhaseTiming(phase="phase_3", start_s=5.0, wall_s=25.0, llm_calls=1),
+            ],
+            calls=[
+                CallTiming(phase="phase_0", model="m", start_s=0.0, wall_s=5.0),
+                CallTiming(phase="phase_3", model="m", start_s=5.0, wall_s=25.0, status="error"),
+            ],
+            critical_path=[0, 1],
+        )
+
+        timings = kept_timings(earlier, ["phase_0"])
+        assert [p.phase for p in timings.phases] == ["phase_0"]
+        assert [c.phase for c in timings.calls] == ["phase_0"]
+        assert timings.critical_path == [0]
+
+        profiler = RunProfiler(timings)
+        with profiler.phase("phase_3"):
+            now = time.monotonic()
+            profiler.observer("phase_3")({
+                "model": "m", "started": now, "ended": now + 1.0, "queue_ms": 0,
+                "retries": 0, "tokens_in": 1, "tokens_out": 1, "status": "ok",
+            })
+        profiler.finish()
+
+        assert [p.phase for p in timings.phases] == ["phase_0", "phase_3"]
+        # This execution continues the run's clock where the earlier one ended
+        assert timings.calls[1].start_s >= 30.0
+        assert timings.phases[1].start_s >= 30.0
+        assert timings.wall_s >= 30.0
+        assert timings.critical_path == [0, 1]
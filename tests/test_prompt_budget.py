@@ -0,0 +1,86 @@
+"""Tests for token estimation and context-window-aware prompt budgeting."""
+
+import json
+import httpx
+import pytest
+from src.llm.openrouter import OpenRouterClient
+from src.llm.prompt_budget import (
+    PromptBudget,
+    PromptTooLargeError,
+    estimate_tokens,
+)
+
+
+class TestPromptBudget:
+    """Tests for PromptBudget planning and section fitting."""
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("x" * 350) == 100
+
+    def test_short_context_shrinks_max_tokens(self):
+        budget = PromptBudget.for_model(8_000, 16_384)
+        assert budget.max_tokens == 4_000
+        assert PromptBudget.for_model(200_000, 16_384).max_tokens == 16_384
+        assert PromptBudget.for_model(200_000, 16_384, max_completion_tokens=8_192).max_tokens == 8_192
+
+    def test_unknown_context_uses_default(self):
+        assert PromptBudget.for_model(0, 4096).context_length == 128_000
+
+    def test_fit_keeps_everything_when_it_fits(self):
+        budget = PromptBudget(200_000, 4096)
+        assert budget.fit(["fixed"], ["a" * 1000, "b" * 2000]) == ["a" * 1000, "b" * 2000]
+
+    def test_fit_shares_space_fairly(self):
+        budget = PromptBudget(20_000, 4096, max_prompt_tokens=100_000)
+        small, large_1, large_2 = budget.fit([], ["s" * 3_500, "x" * 200_000, "y" * 200_000])
+
+        assert small == "s" * 3_500
+        assert large_1.endswith("context window ...]")
+        assert abs(len(large_1) - len(large_2)) < 10
+        total = sum(estimate_tokens(t) for t in (small, large_1, large_2))
+        assert total <= budget.input_tokens
+
+    def test_fit_respects_prompt_cap(self):
+        budget = PromptBudget(1_000_000, 4096, max_prompt_tokens=10_000)
+        [section] = budget.fit([], ["x" * 1_000_000])
+        assert estimate_tokens(section) <= 10_000
+
+    def test_fit_refuses_oversized_fixed_text(self):
+        budget = PromptBudget(8_000, 4_000)
+        with pytest.raises(PromptTooLargeError):
+            budget.fit(["x" * 50_000], ["library"])
+
+
+class TestClientBudgeting:
+    """Tests for the pre-send context-window check in generate()."""
+
+    @pytest.fixture(autouse=True)
+    def _limits(self, monkeypatch):
+        monkeypatch.setattr(OpenRouterClient, "_model_limits", {"small": (8_000, 0)})
+
+    @pytest.mark.asyncio
+    async def test_max_tokens_shrunk_to_fit(self):
+        sent = []
+
+        def handler(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+        client = OpenRouterClient(api_key="test-key")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            await client.generate("x" * 14_000, model="small", max_tokens=16_384)
+
+        assert sent[0]["max_tokens"] < 4_000
+
+    @pytest.mark.asyncio
+    async def test_oversized_prompt_refused_before_sending(self):
+        def handler(request):
+            raise AssertionError("request should not be sent")
+
+        client = OpenRouterClient(api_key="test-key")
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            with pytest.raises(PromptTooLargeError):
+                await client.generate("x" * 40_000, model="small")
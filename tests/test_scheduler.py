@@ -0,0 +1,204 @@
+"""Tests for dependency-graph scheduling of pipeline steps."""
+
+import asyncio
+import pytest
+from src.core.run_controller import RunController
+from src.core.scheduler import PhaseGraph, Quorum
+from src.llm.openrouter import OpenRouterClient
+from src.models.schemas import (
+    BudgetConfig,
+    CrossCritique,
+    InventorSolution,
+    ProblemBrief,
+    RunRecord,
+    ZeusRequest,
+)
+
+
+class TestPhaseGraph:
+    """Tests for PhaseGraph."""
+
+    @pytest.mark.asyncio
+    async def test_steps_wait_for_dependencies(self):
+        order = []
+
+        async def step(name, delay):
+            await asyncio.sleep(delay)
+            order.append(name)
+            return name
+
+        async with PhaseGraph() as graph:
+            graph.add("slow", step, "slow", 0.05)
+            graph.add("fast", step, "fast", 0)
+            graph.add("after_slow", step, "after_slow", 0, after=["slow"])
+
+        assert order == ["fast", "slow", "after_slow"]
+        assert await graph.result("after_slow") == "after_slow"
+
+    @pytest.mark.asyncio
+    async def test_steps_can_be_added_while_running(self):
+        async def parent(graph):
+            graph.add("child", asyncio.sleep, 0, "child result")
+            return await graph.result("child")
+
+        async with PhaseGraph() as graph:
+            graph.add("parent", parent, graph)
+
+        assert await graph.result("parent") == "child result"
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_other_steps_and_reraises(self):
+        cancelled = asyncio.Event()
+
+        async def fail():
+            raise KeyError("boom")
+
+        async def wait_forever():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(KeyError):
+            async with PhaseGraph() as graph:
+                graph.add("forever", wait_forever)
+                graph.add("fail", fail)
+        assert cancelled.is_set()
+
+    def test_unknown_dependency_is_rejected(self):
+        graph = PhaseGraph()
+        with pytest.raises(ValueError):
+            graph.add("step", asyncio.sleep, 0, after=["missing"])
+
+
+class TestPipelineOverlap:
+    """Tests that Phase 2 overlaps Phase 1 in RunController."""
+
+    @pytest.mark.asyncio
+    async def test_cross_critique_starts_before_slowest_inventor(self):
+        controller = RunController(OpenRouterClient(api_key="test-key", shared_pool=True))
+        delays = {"A": 0, "B": 0, "C": 0.2}
+        events = []
+
+        async def generate_solution(problem_brief, config, model=None):
+            await asyncio.sleep(delays[config.inventor_id])
+            events.append(f"inventor {config.inventor_id}")
+            solution = InventorSolution(
+                inventor_id=config.inventor_id,
+                inventor_type=config.inventor_type,
+                content=f"solution {config.inventor_id}",
+            )
+            return solution, {"tokens_in": 1, "tokens_out": 1, "llm_calls": 1}
+
+        async def cross_critique(prompt, critic_id, target_id, model=None):
+            events.append(f"critique {critic_id}->{target_id}")
+            return CrossCritique(critic_id=critic_id, target_id=target_id), {"tokens_in": 1, "tokens_out": 1}
+
+        controller.inventor.generate_solution = generate_solution
+        controller._run_single_cross_critique = cross_critique
+        request = ZeusRequest(prompt="p", num_inventors=3, enable_cross_pollination=True)
+        record = RunRecord(request=request, problem_brief=ProblemBrief(problem_statement="p"))
+
+        async with PhaseGraph() as graph:
+            graph.add("libraries", asyncio.sleep, 0)
+            await controller._phase_1(request, record, graph)
+            await controller._phase_2(record, graph)
+
+        assert events.index("critique A->B") < events.index("inventor C")
+        assert {(c.critic_id, c.target_id) for c in record.cross_critiques} == {("A", "B"), ("B", "C"), ("C", "A")}
+        assert record.budget_used.llm_calls == 6
+
+
+class TestQuorum:
+    """Tests for Quorum."""
+
+    @pytest.mark.asyncio
+    async def test_moves_on_once_enough_steps_are_accepted(self):
+        async def step(delay, ok=True):
+            await asyncio.sleep(delay)
+            return ok
+
+        async with PhaseGraph() as graph:
+            graph.add("fast", step, 0)
+            graph.add("failed", step, 0, False)
+            graph.add("medium", step, 0.01)
+            graph.add("slow", step, 10)
+            quorum = Quorum(graph, ["fast", "failed", "medium", "slow"], size=2, accept=bool)
+
+            assert await quorum.wait() == ["fast", "failed", "medium"]
+            assert quorum.stragglers == ["slow"]
+            assert quorum.reason == "quorum of 2 reached"
+            assert await quorum.result("slow") is None
+            assert await quorum.result("medium") is True
+            await graph.cancel("slow")
+
+    @pytest.mark.asyncio
+    async def test_deadline_waits_for_a_first_accepted_result(self):
+        async def step(delay):
+            await asyncio.sleep(delay)
+            return delay
+
+        async with PhaseGraph() as graph:
+            graph.add("a", step, 0.05)
+            graph.add("b", step, 10)
+            quorum = Quorum(graph, ["a", "b"], deadline=0.01)
+
+            assert await quorum.wait() == ["a"]
+            assert quorum.reason == "deadline of 0.01s passed"
+            await graph.cancel("b")
+
+
+class TestInventorQuorum:
+    """Tests for quorum-based progression past straggling inventors."""
+
+    async def _run(self, stragglers: str, straggler_delay: float) -> RunRecord:
+        controller = RunController(
+            OpenRouterClient(api_key="test-key", shared_pool=True),
+            budget_config=BudgetConfig(inventor_quorum=2, inventor_stragglers=stragglers),
+        )
+        delays = {"A": 0, "B": 0, "C": straggler_delay}
+
+        async def generate_solution(problem_brief, config, model=None):
+            await asyncio.sleep(delays[config.inventor_id])
+            solution = InventorSolution(
+                inventor_id=config.inventor_id,
+                inventor_type=config.inventor_type,
+                content=f"solution {config.inventor_id}",
+            )
+            return solution, {"tokens_in": 1, "tokens_out": 1, "llm_calls": 1}
+
+        async def cross_critique(prompt, critic_id, target_id, model=None):
+            await asyncio.sleep(0.05)
+            return CrossCritique(critic_id=critic_id, target_id=target_id), {"tokens_in": 1, "tokens_out": 1}
+
+        controller.inventor.generate_solution = generate_solution
+        controller._run_single_cross_critique = cross_critique
+        request = ZeusRequest(prompt="p", num_inventors=3, enable_cross_pollination=True)
+        record = RunRecord(request=request, problem_brief=ProblemBrief(problem_statement="p"))
+
+        async with PhaseGraph() as graph:
+            graph.add("libraries", asyncio.sleep, 0)
+            await controller._phase_1(request, record, graph)
+            assert [s.inventor_id for s in record.inventor_solutions] == ["A", "B"]
+            await controller._phase_2(record, graph)
+            await controller._collect_stragglers(record, graph)
+        return record
+
+    @pytest.mark.asyncio
+    async def test_straggler_is_cancelled_and_recorded(self):
+        record = await self._run("cancel", straggler_delay=10)
+
+        assert [s.inventor_id for s in record.inventor_solutions] == ["A", "B"]
+        assert record.dropped_inventors["C"].startswith("straggler: quorum of 2 reached")
+        assert "cancelled" in record.dropped_inventors["C"]
+        assert {(c.critic_id, c.target_id) for c in record.cross_critiques} == {("A", "B"), ("B", "A")}
+        assert record.budget_used.llm_calls == 4
+
+    @pytest.mark.asyncio
+    async def test_straggler_done_before_synthesis_is_merged(self):
+        record = await self._run("merge", straggler_delay=0.01)
+
+        assert [s.inventor_id for s in record.inventor_solutions] == ["A", "B", "C"]
+        assert record.dropped_inventors == {}
+        assert record.budget_used.llm_calls == 5
@@ -0,0 +1,165 @@
+"""Tests for the local job server."""
+
+import asyncio
+import json
+import httpx
+import pytest
+from src.core.persistence import Persistence
+from src.core.run_controller import RunController
+from src.core.server import Job, JobServer
+from src.llm.openrouter import OpenRouterClient
+from src.models.events import OutputDeltaEvent, PhaseStartedEvent
+from src.models.schemas import (
+    InventorSolution,
+    ProblemBrief,
+    SynthesisResult,
+    ZeusRequest,
+    ZeusResponse,
+)
+
+
+def _controller(tmp_path, gate: asyncio.Event | None = None, started: list | None = None) -> RunController:
+    controller = RunController(
+        OpenRouterClient(api_key="test-key", shared_pool=True),
+        persistence=Persistence(base_dir=tmp_path),
+    )
+
+    async def phase_0(request, record):
+        if started is not None:
+            started.append(request.prompt)
+        record.problem_brief = ProblemBrief(problem_statement=request.prompt)
+
+    async def phase_1(request, record, graph):
+        if gate is not None:
+            await gate.wait()
+        record.inventor_solutions = [InventorSolution(inventor_id="A", inventor_type="foundational", content="a")]
+
+    async def phase_3(record):
+        record.synthesis_result = SynthesisResult(unified_draft="unified")
+
+    async def noop(record):
+        pass
+
+    async def phase_6(record):
+        record.final_response = ZeusResponse(run_id=record.run_id, output=f"done: {record.request.prompt}")
+
+    controller._phase_0 = phase_0
+    controller._phase_1 = phase_1
+    controller._phase_3 = phase_3
+    controller._phase_4 = noop
+    controller._phase_5 = noop
+    controller._phase_6 = phase_6
+    return controller
+
+
+class TestJobServer:
+    """Tests for JobServer over HTTP."""
+
+    @pytest.mark.asyncio
+    async def test_submit_stream_and_fetch_result(self, tmp_path):
+        async with JobServer(_controller(tmp_path), workers=2) as server:
+            host, port = await server.start("127.0.0.1", 0)
+            async with httpx.AsyncClient(base_url=f"http://{host}:{port}") as http:
+                submitted = await http.post("/runs", json={"prompt": "Design a cache"})
+                assert submitted.status_code == 202
+                run_id = submitted.json()["run_id"]
+
+                events = []
+                async with http.stream("GET", f"/runs/{run_id}/events") as stream:
+                    assert stream.headers["content-type"] == "text/event-stream"
+                    async for line in stream.aiter_lines():
+                        if line.startswith("data: "):
+                            events.append(json.loads(line[len("data: "):]))
+
+                status = (await http.get(f"/runs/{run_id}")).json()
+                invalid = await http.post("/runs", json={"constraints": ["no prompt"]})
+                bad_priorities = [
+                    await http.post("/runs", json={"prompt": "p", "priority": priority})
+                    for priority in (None, True, "7", 3.9)
+                ]
+                local_file = await http.post("/runs", json={"prompt": "p", "library_paths": ["/etc/passwd"]})
+                missing = await http.get("/runs/no-such-run")
+                # Neither a prefix of the id nor a fragment of a file name finds the run
+                prefixes = [await http.get(f"/runs/{fragment}") for fragment in (run_id[:8], "_")]
+                prefix_events = await http.get(f"/runs/{run_id[:8]}/events")
+
+        types = [e["type"] for e in events]
+        assert types[-1] == "run_finished"
+        assert "phase_started" in types and "partial_result" in types
+        assert {e["run_id"] for e in events} == {run_id}
+        assert status["status"] == "done"
+        assert status["response"]["output"] == "done: Design a cache"
+        assert invalid.status_code == 400
+        assert [r.status_code for r in bad_priorities] == [400] * 4
+        assert local_file.status_code == 400
+        assert "library_paths" in local_file.json()["error"]
+        assert missing.status_code == 404
+        assert [r.status_code for r in prefixes] == [404, 404]
+        assert prefix_events.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_priority_order_and_admission_control(self, tmp_path):
+        gate = asyncio.Event()
+        started = []
+        async with JobServer(_controller(tmp_path, gate, started), workers=1, max_queued=2) as server:
+            host, port = await server.start("127.0.0.1", 0)
+            first = server.submit(ZeusRequest(prompt="first"))
+            while not started:
+                await asyncio.sleep(0.01)
+            low = server.submit(ZeusRequest(prompt="low"), priority=0)
+            high = server.submit(ZeusRequest(prompt="high"), priority=5)
+
+            async with httpx.AsyncClient(base_url=f"http://{host}:{port}") as http:
+                rejected = await http.post("/runs", json={"prompt": "one too many"})
+                health = (await http.get("/health")).json()
+
+            gate.set()
+            while not all(job.done for job in (first, low, high)):
+                await asyncio.sleep(0.01)
+
+        assert rejected.status_code == 429
+        assert "retry-after" in rejected.headers
+        assert health["queued"] == 2 and health["running"] == 1
+        assert started == ["first", "high", "low"]
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_and_running_runs(self, tmp_path):
+        gate = asyncio.Event()
+        started = []
+        async with JobServer(_controller(tmp_path, gate, started), workers=1) as server:
+            host, port = await server.start("127.0.0.1", 0)
+            running = server.submit(ZeusRequest(prompt="running"))
+            queued = server.submit(ZeusRequest(prompt="queued"))
+            while not started:
+                await asyncio.sleep(0.01)
+
+            async with httpx.AsyncClient(base_url=f"http://{host}:{port}") as http:
+                assert (await http.delete(f"/runs/{queued.run_id}")).json()["status"] == "cancelled"
+                await http.delete(f"/runs/{running.run_id}")
+                while not running.done:
+                    await asyncio.sleep(0.01)
+                status = (await http.get(f"/runs/{running.run_id}")).json()
+
+        assert started == ["running"]
+        assert status["status"] == "cancelled"
+        assert status["errors"] == ["Run cancelled"]
+
+
+class TestJob:
+    """Tests for Job event delivery."""
+
+    def test_stalled_subscriber_loses_deltas_then_is_disconnected(self):
+        job = Job(ZeusRequest(prompt="p"))
+        queue = job.subscribe()
+
+        for _ in range(queue.maxsize):
+            job.publish(OutputDeltaEvent(run_id=job.run_id, phase="phase_1", text="x"))
+        assert queue.qsize() == queue.maxsize // 2
+
+        for _ in range(queue.maxsize):
+            job.publish(PhaseStartedEvent(run_id=job.run_id, phase="phase_1", name="Phase 1"))
+
+        assert queue.get_nowait() is None
+        assert queue.empty()
+        # Later subscribers still get the history
+        assert job.subscribe().qsize() == len(job.events)
@@ -2,6 +2,7 @@
 
 import streamlit as st
 import asyncio
+import atexit
 import logging
 import threading
 import time
@@ -12,8 +13,10 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from src.core.run_controller import run_zeus
 from src.core.persistence import Persistence
+from src.models.events import OutputDeltaEvent, PhaseStartedEvent, ProgressEvent, RunStepEvent
 from src.utils.read_file import read_file_content
 from src.llm.openrouter import OpenRouterClient
+from src.llm.transport import close_shared_client, prewarm
 from streamlit_mermaid import st_mermaid
 from dotenv import load_dotenv
 
@@ -386,8 +389,8 @@ PHASE_PROGRESS = {
     "Phase 4": 0.70,
     "Phase 5": 0.82,
     "Phase 6": 0.92,
-    "Assembling": 0.96,
-    "Saving": 0.99,
+    "assembling": 0.96,
+    "saving": 0.99,
 }
 
 PIPELINE_STEPS = [
@@ -474,13 +477,55 @@ Return JSON with exactly these keys:
 Be creative and varied. Do NOT generate generic problems. Make them feel like real startup or investment design challenges."""
 
 
+# ============================================================================
+# Shared Event Loop (keeps the pooled HTTP connections warm across runs)
+# ============================================================================
+
+# Like _zeus_state below, stored on the `threading` module so it survives
+# Streamlit reruns. All async work (runs, model listing, example generation)
+# is submitted to this one loop, which owns the shared HTTP connection pool.
+if not hasattr(threading, "_zeus_loop_lock"):
+    threading._zeus_loop_lock = threading.Lock()
+    threading._zeus_loop = None
+
+
+def _get_shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the long-lived background event loop, starting it on first use."""
+    with threading._zeus_loop_lock:
+        loop = threading._zeus_loop
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="zeus-event-loop", daemon=True
+            ).start()
+            threading._zeus_loop = loop
+            asyncio.run_coroutine_threadsafe(prewarm(), loop)
+            atexit.register(_stop_shared_loop, loop)
+        return loop
+
+
+def _stop_shared_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Close the loop's pooled HTTP connections and stop it (at interpreter exit)."""
+    if not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_shared_client(), loop).result(timeout=5)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Closing the shared HTTP pool failed: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def _run_async(coro):
+    """Run a coroutine on the shared loop and block until it completes."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_shared_loop()).result()
+
+
 def _generate_example():
     """Call Gemini Flash to generate a fresh random example."""
-    loop = asyncio.new_event_loop()
     try:
         async def _call():
             async with OpenRouterClient(
-                model="google/gemini-2.0-flash-001", timeout=15.0
+                model="google/gemini-2.0-flash-001", timeout=15.0, shared_pool=True
             ) as client:
                 result, _ = await client.generate_json(
                     prompt=EXAMPLE_GEN_PROMPT,
@@ -490,7 +535,7 @@ def _generate_example():
                 )
                 return result
 
-        result = loop.run_until_complete(_call())
+        result = _run_async(_call())
         return {
             "problem": result.get("problem", ""),
             "constraints": "\n".join(result.get("constraints", [])),
@@ -502,8 +547,6 @@ def _generate_example():
             "constraints": FALLBACK_CONSTRAINTS,
             "objectives": FALLBACK_OBJECTIVES,
         }
-    finally:
-        loop.close()
 
 
 @st.cache_data(ttl=1800, show_spinner=False)
@@ -515,18 +558,13 @@ def _fetch_openrouter_models_meta() -> tuple[list[dict], str | None]:
         ``id``, ``name``, ``context_length``, ``description``.
         On success error_message is None.
     """
-    loop = asyncio.new_event_loop()
     try:
-        asyncio.set_event_loop(loop)
-        models = loop.run_until_complete(
+        models = _run_async(
             OpenRouterClient.fetch_text_models_with_meta(timeout=15.0)
         )
         return models, None
     except Exception as e:
         return [], str(e)
-    finally:
-        loop.close()
-        asyncio.set_event_loop(None)
 
 
 # ============================================================================
@@ -575,19 +613,23 @@ def _run_pipeline_thread(prompt, constraints, objectives, context, settings):
     })
 
     handler = None
-    loop = None
 
     def _log(msg, level="INFO"):
         ts = datetime.now().strftime("%H:%M:%S")
         _thread_state["logs"].append((ts, level, msg))
 
-    def on_progress(msg):
-        _thread_state["msg"] = msg
-        _log(msg)
-        for key, pct in PHASE_PROGRESS.items():
-            if key in msg:
-                _thread_state["pct"] = pct
-                break
+    def on_event(event):
+        if isinstance(event, OutputDeltaEvent):
+            return
+        if isinstance(event, ProgressEvent):
+            _thread_state["msg"] = event.message
+            # Streaming status updates the status line only, not the log
+            if not event.transient:
+                _log(event.message)
+        elif isinstance(event, PhaseStartedEvent):
+            _thread_state["pct"] = max(_thread_state["pct"], PHASE_PROGRESS.get(event.name, 0.0))
+        elif isinstance(event, RunStepEvent):
+            _thread_state["pct"] = max(_thread_state["pct"], PHASE_PROGRESS[event.step])
 
     try:
         # Set up log capture for all src.* loggers
@@ -607,9 +649,7 @@ def _run_pipeline_thread(prompt, constraints, objectives, context, settings):
             )
             _log(f"Phase model overrides — {compact}")
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        response = loop.run_until_complete(run_zeus(
+        response = _run_async(run_zeus(
             prompt=prompt,
             constraints=constraints,
             objectives=objectives,
@@ -618,13 +658,13 @@ def _run_pipeline_thread(prompt, constraints, objectives, context, settings):
             eval_criteria_path=settings.get("eval_criteria_path"),
             enable_cross_pollination=settings["cross_pollinate"],
             num_inventors=settings["num_inventors"],
-            on_progress=on_progress,
+            on_event=on_event,
             max_llm_calls=settings["max_llm_calls"],
             max_revisions=settings["max_revisions"],
             model=settings["model"],
             phase_models=settings.get("phase_models"),
+            stream=True,
         ))
-        loop.close()
         _thread_state["response"] = response
         _thread_state["pct"] = 1.0
         _thread_state["msg"] = "Complete"
@@ -671,11 +711,6 @@ def _run_pipeline_thread(prompt, constraints, objectives, context, settings):
         _log(tb, "ERROR")
     finally:
         # Guarantee the UI is unblocked even on SystemExit / KeyboardInterrupt
-        try:
-            if loop is not None:
-                loop.close()
-        except Exception:
-            pass
         try:
             if handler:
                 logging.getLogger("src").removeHandler(handler)